@@ -0,0 +1,73 @@
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+INTERNAL_DIR = Path(__file__).resolve().parent.parent
+SERVICES_DIR = INTERNAL_DIR / "services"
+
+# Settings are loaded from the environment; benchmarks never reach these hosts.
+DEFAULT_ENV = {
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_USER": "root",
+    "POSTGRES_PASSWORD": "root",
+    "POSTGRES_DB": "payment_gateway",
+    "JWT_SECRET_KEY": "benchmark",
+    "SMTP_USER": "",
+    "SMTP_PASSWORD": "",
+}
+
+
+def use_service(name: str) -> None:
+    """
+    Make `lib` and the given service's top-level packages (`domain`,
+    `infrastructure`, ...) importable, the same way the service Dockerfiles lay
+    them out under /app.
+    """
+    for key, value in DEFAULT_ENV.items():
+        os.environ.setdefault(key, value)
+
+    for path in (str(SERVICES_DIR / name), str(INTERNAL_DIR)):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def bench(label: str, fn: Callable[[], object], repeat: int = 5, number: int = 1) -> float:
+    """
+    Run `fn` `number` times per round for `repeat` rounds and print the best round.
+    Returns the best per-call time in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+
+    print(f"{label:<48} {best * 1000:10.3f} ms")
+    return best
+
+
+def async_bench(
+    label: str, fn: Callable[[], Awaitable[object]], repeat: int = 5, number: int = 1000
+) -> float:
+    """
+    Await `fn()` `number` times per round inside one event loop, for `repeat`
+    rounds, and print the best round. Returns the best per-call time in seconds.
+    """
+
+    async def rounds() -> float:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                await fn()
+            best = min(best, (time.perf_counter() - start) / number)
+        return best
+
+    best = asyncio.run(rounds())
+    print(f"{label:<48} {best * 1_000_000:10.1f} us")
+    return best
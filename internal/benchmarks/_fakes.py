@@ -0,0 +1,183 @@
+"""
+In-memory stand-ins for the repositories, Kafka and password hashing, so the
+service-layer benchmarks measure the services themselves: tracing, logging,
+request and record DTOs and response models.
+
+Services never share an import root, so the fakes take the service's record
+DTO classes as arguments instead of importing `domain` themselves. They
+implement only what the benchmarked calls use.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Type
+
+from pydantic import BaseModel
+
+
+NOW = datetime(2024, 12, 1, 12, 0, 0)
+
+
+class InMemoryUserRepository:
+    def __init__(self, record: Type[BaseModel]):
+        self.record = record
+        self.users: Dict[int, BaseModel] = {}
+        self.emails: Dict[str, BaseModel] = {}
+        self.nocs: Dict[str, int] = {}
+
+    def add(self, user_id: int, email: str, password: str) -> BaseModel:
+        user = self.record(
+            user_id=user_id,
+            firstname="Bench",
+            lastname=f"User{user_id}",
+            email=email,
+            password=password,
+            noc_transfer=f"4{user_id:015d}",
+            created_at=NOW,
+            updated_at=NOW,
+        )
+        self.users[user_id] = user
+        self.emails[email] = user
+        self.nocs[user.noc_transfer] = user_id
+        return user
+
+    async def find_by_id(self, id: int) -> Optional[BaseModel]:
+        return self.users.get(id)
+
+    async def find_by_email(self, email: str) -> Optional[BaseModel]:
+        return self.emails.get(email)
+
+    async def find_credentials_by_email(self, email: str) -> Optional[BaseModel]:
+        return self.emails.get(email)
+
+    async def find_id_by_noc_transfer(self, noc_transfer: str) -> Optional[int]:
+        return self.nocs.get(noc_transfer)
+
+
+class InMemoryTokenRepository:
+    """Keeps issued refresh tokens; the benchmarked calls only issue them."""
+
+    def __init__(self):
+        self.refresh_tokens: Dict[str, BaseModel] = {}
+
+    async def create_refresh_token(self, token: BaseModel) -> None:
+        self.refresh_tokens[token.token_hash] = token
+
+
+class InMemorySaldoRepository:
+    def __init__(self, record: Type[BaseModel]):
+        self.record = record
+        self.saldos: Dict[int, BaseModel] = {}
+
+    def add(self, user_id: int, total_balance: int) -> BaseModel:
+        saldo = self.record(
+            saldo_id=user_id,
+            user_id=user_id,
+            total_balance=total_balance,
+            withdraw_amount=None,
+            withdraw_time=None,
+            created_at=NOW,
+            updated_at=NOW,
+        )
+        self.saldos[user_id] = saldo
+        return saldo
+
+    def apply(self, user_id: int, amount: int) -> None:
+        """Move a balance the way a ledger posting would."""
+        saldo = self.saldos[user_id]
+        self.saldos[user_id] = saldo.model_copy(
+            update={"total_balance": saldo.total_balance + amount}
+        )
+
+    async def find_by_user_id(self, user_id: int) -> Optional[BaseModel]:
+        return self.saldos.get(user_id)
+
+
+class _MovementRepository:
+    def __init__(self, record: Type[BaseModel], saldo_repository: InMemorySaldoRepository):
+        self.record = record
+        self.saldo_repository = saldo_repository
+        self.rows: List[BaseModel] = []
+
+    def _store(self, **fields) -> BaseModel:
+        row = self.record(**fields, created_at=NOW, updated_at=NOW)
+        self.rows.append(row)
+        return row
+
+
+class InMemoryTransferRepository(_MovementRepository):
+    async def create(self, input) -> BaseModel:
+        self.saldo_repository.apply(input.transfer_from, -input.transfer_amount)
+        self.saldo_repository.apply(input.transfer_to, input.transfer_amount)
+        return self._store(
+            transfer_id=len(self.rows) + 1,
+            transfer_from=input.transfer_from,
+            transfer_to=input.transfer_to,
+            transfer_amount=input.transfer_amount,
+            transfer_time=NOW,
+        )
+
+
+class InMemoryTopupRepository(_MovementRepository):
+    async def create(self, input) -> BaseModel:
+        self.saldo_repository.apply(input.user_id, input.topup_amount)
+        return self._store(
+            topup_id=len(self.rows) + 1,
+            user_id=input.user_id,
+            topup_amount=input.topup_amount,
+            topup_method=input.topup_method,
+            topup_time=NOW,
+        )
+
+
+class InMemoryWithdrawRepository(_MovementRepository):
+    async def create(self, input) -> BaseModel:
+        self.saldo_repository.apply(input.user_id, -input.withdraw_amount)
+        return self._store(
+            withdraw_id=len(self.rows) + 1,
+            user_id=input.user_id,
+            withdraw_amount=input.withdraw_amount,
+            withdraw_time=input.withdraw_time,
+        )
+
+
+class StubProducer:
+    def __init__(self):
+        self.sent = 0
+
+    async def send(self, topic: str, value: bytes = None, key: bytes = None, **kwargs) -> None:
+        self.sent += 1
+
+    async def send_and_wait(self, topic: str, value: bytes = None, key: bytes = None, **kwargs) -> None:
+        self.sent += 1
+
+    async def stop(self) -> None:
+        pass
+
+
+class StubKafkaManager:
+    """Hands out one producer that only counts messages; nothing is instrumented or sent."""
+
+    def __init__(self):
+        self._producer = StubProducer()
+
+    async def get_producer(self) -> StubProducer:
+        return self._producer
+
+    async def producer(self) -> StubProducer:
+        return self._producer
+
+
+class PlainHashing:
+    """Compares passwords as plain text; bcrypt is benchmarked on its own."""
+
+    async def hash_password(self, password: str) -> str:
+        return password
+
+    async def compare_password(self, hashed_password: str, password: str) -> None:
+        if hashed_password != password:
+            raise ValueError("Passwords do not match.")
+
+    async def verify_password(self, hashed_password: str, password: str) -> bool:
+        return hashed_password == password
+
+    async def verify_dummy(self, password: str) -> None:
+        pass
@@ -0,0 +1,232 @@
+"""
+Consume throughput of N email service instances in one consumer group over a
+keyed topic, and a check that per-key ordering holds across them: every
+user's events must be handled by exactly one member, in the order they were
+published.
+
+Each member is its own process, like a replica of the service: a consumer in
+the group hands its messages to an `EmailService` the way `start()` does, so
+they are handled --concurrency at a time and chained per key. Handling an
+event sleeps up to --delay seconds instead of sending email, so messages of
+different keys finish out of order and only the chaining keeps one user's in
+order.
+
+Events are `TopupCreated`, keyed by user like the topup service sends them,
+on a throwaway topic created with --partitions partitions. Needs a Kafka
+broker (`docker compose up kafka`, then --bootstrap localhost:9092).
+
+Usage:
+    python benchmarks/bench_consumer_group.py [--bootstrap localhost:9092]
+        [--consumers 3] [--partitions 6] [--users 200] [--events 50]
+        [--concurrency 8] [--delay 0.005]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import queue
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+from _bootstrap import use_service
+
+use_service("email_service")
+
+from aiokafka import AIOKafkaConsumer  # noqa: E402
+from aiokafka.admin import AIOKafkaAdminClient  # noqa: E402
+from opentelemetry.trace import NoOpTracer  # noqa: E402
+
+from lib.events.codec import encode_event  # noqa: E402
+from lib.events.events import TopupCreated  # noqa: E402
+from lib.kafka.kafka_config import KafkaManager  # noqa: E402
+from lib.otel.otel_config import OpenTelemetryManager  # noqa: E402
+from service import EmailService  # noqa: E402
+
+
+class RecordingEmailService(EmailService):
+    """Records the events it handles, in the order it handles them, instead of emailing."""
+
+    def __init__(self, index: int, delay: float, concurrency: int):
+        otel = OpenTelemetryManager(service_name="email-service")
+        otel.tracer = NoOpTracer()
+        super().__init__(
+            kafka_manager=None, transport=None, sender="bench@example.com", otel_manager=otel, concurrency=concurrency
+        )
+        self.index = index
+        self.delay = delay
+        self.handled: List[Tuple[int, int, int]] = []
+
+    async def process_event(self, event, topic=None, produced_at=None):
+        await asyncio.sleep(random.uniform(0, self.delay))
+        self.handled.append((self.index, event.user_id, event.topup_id))
+
+
+async def run_member(index: int, args: argparse.Namespace, topic: str, status, stop) -> List[Tuple[int, int, int]]:
+    service = RecordingEmailService(index, args.delay, args.concurrency)
+    consumer = AIOKafkaConsumer(
+        topic,
+        group_id=topic,
+        bootstrap_servers=args.bootstrap,
+        auto_offset_reset="earliest",
+        enable_auto_commit=False,
+    )
+    await consumer.start()
+    reported = None
+    try:
+        while not stop.is_set():
+            batches = await consumer.getmany(timeout_ms=200)
+            for tp, messages in batches.items():
+                for msg in messages:
+                    await service._slots.acquire()
+                    service._dispatch(tp, msg)
+            current = (len(consumer.assignment()), len(service.handled))
+            if current != reported:
+                status.put((index, *current))
+                reported = current
+        await service._settle()
+    finally:
+        await consumer.stop()
+    return service.handled
+
+
+def member(index: int, args: argparse.Namespace, topic: str, status, stop, results) -> None:
+    handled = []
+    try:
+        handled = asyncio.run(run_member(index, args, topic, status, stop))
+    finally:
+        # Reported even when the member failed, so the run does not wait on it.
+        results.put(handled)
+
+
+def wait_for(status, members: Dict[int, Tuple[int, int]], done, timeout: float) -> bool:
+    """Read member reports into `members` until `done(members)`; False on timeout."""
+    deadline = time.monotonic() + timeout
+    while not done(members):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        try:
+            index, assigned, handled = status.get(timeout=min(remaining, 0.5))
+        except queue.Empty:
+            continue
+        members[index] = (assigned, handled)
+    return True
+
+
+def check_order(received: List[Tuple[int, int, int]], users: int, events: int) -> List[str]:
+    owners: Dict[int, set] = defaultdict(set)
+    sequences: Dict[int, List[int]] = defaultdict(list)
+    for index, user_id, sequence in received:
+        owners[user_id].add(index)
+        sequences[user_id].append(sequence)
+
+    problems = []
+    for user_id in range(users):
+        if len(owners[user_id]) != 1:
+            problems.append(f"user {user_id} was handled by members {sorted(owners[user_id])}")
+        if sequences[user_id] != list(range(events)):
+            problems.append(f"user {user_id} events were handled as {sequences[user_id][:10]}...")
+    return problems
+
+
+async def publish(kafka: KafkaManager, topic: str, users: int, events: int) -> None:
+    producer = await kafka.producer()
+    try:
+        for sequence in range(events):
+            for user_id in range(users):
+                event = TopupCreated(
+                    topup_id=sequence, user_id=user_id, email=f"user{user_id}@example.com",
+                    name=f"User {user_id}", amount=50000, balance=50000 * (sequence + 1),
+                )
+                await producer.send(topic, encode_event(event), key=event.key())
+        await producer.flush()
+    finally:
+        await kafka.close()
+
+
+async def delete_topic(bootstrap: str, topic: str) -> None:
+    admin = AIOKafkaAdminClient(bootstrap_servers=bootstrap)
+    await admin.start()
+    try:
+        await admin.delete_topics([topic])
+    finally:
+        await admin.close()
+
+
+def run(args: argparse.Namespace) -> int:
+    topic = f"bench-keyed-{uuid.uuid4().hex[:8]}"
+    kafka = KafkaManager(bootstrap_servers=args.bootstrap, instrumented=True)
+    asyncio.run(kafka.ensure_topics([topic], args.partitions))
+
+    context = multiprocessing.get_context("spawn")
+    status, results, stop = context.Queue(), context.Queue(), context.Event()
+    processes = [
+        context.Process(target=member, args=(index, args, topic, status, stop, results))
+        for index in range(args.consumers)
+    ]
+    for process in processes:
+        process.start()
+
+    expected = args.users * args.events
+    members: Dict[int, Tuple[int, int]] = {}
+    received: List[Tuple[int, int, int]] = []
+    per_member: Dict[int, int] = {}
+    try:
+        # Publishing only once every member has its partitions keeps the
+        # rebalance from handing a partition over mid-run.
+        spread = min(args.consumers, args.partitions)
+        if not wait_for(
+            status, members,
+            lambda m: sum(a for a, _ in m.values()) == args.partitions and sum(1 for a, _ in m.values() if a) == spread,
+            60,
+        ):
+            raise SystemExit(f"partitions were not spread over the group: {members}")
+
+        started = time.monotonic()
+        asyncio.run(publish(kafka, topic, args.users, args.events))
+        wait_for(status, members, lambda m: sum(h for _, h in m.values()) >= expected, args.timeout)
+        elapsed = time.monotonic() - started
+    finally:
+        stop.set()
+        for _ in processes:
+            handled = results.get(timeout=args.timeout)
+            if handled:
+                per_member[handled[0][0]] = len(handled)
+            received.extend(handled)
+        for process in processes:
+            process.join()
+        asyncio.run(delete_topic(args.bootstrap, topic))
+
+    print(f"{args.consumers} members, {args.partitions} partitions, {args.users} users x {args.events} events")
+    print(f"handled {len(received)}/{expected} in {elapsed:.2f}s ({len(received) / elapsed:,.0f} events/s)")
+    for index in range(args.consumers):
+        print(f"  member {index}: {per_member.get(index, 0)} events")
+
+    problems = check_order(received, args.users, args.events)
+    if len(received) != expected:
+        problems.insert(0, f"expected {expected} events, got {len(received)}")
+    for problem in problems[:20]:
+        print(f"FAIL {problem}")
+    print("per-key order held" if not problems else f"{len(problems)} problems")
+    return 1 if problems else 0
+
+
+def main(argv: Sequence[str]) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bootstrap", default="localhost:9092")
+    parser.add_argument("--consumers", type=int, default=3, help="Group members, one process each.")
+    parser.add_argument("--partitions", type=int, default=6)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--events", type=int, default=50, help="Events per user.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Messages each member handles at once.")
+    parser.add_argument("--delay", type=float, default=0.005, help="Longest time handling one event takes.")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args(argv)
+    sys.exit(run(args))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,88 @@
+"""
+Cost of rendering the transfer emails (sender and receiver, subject, text
+and html) from the Mako templates of the email service, against the
+f-strings they replaced, and the one-off compile the first render of each
+template pays.
+
+The cached case is what every message costs once the consumer is warm,
+including the reload check; the cold case builds a fresh `EmailTemplates`
+each time, so it compiles the templates (and the layout) from disk.
+
+Usage:
+    python benchmarks/bench_email_templates.py [--number 20000]
+"""
+import argparse
+import timeit
+from typing import Callable
+
+from _bootstrap import use_service
+
+use_service("email_service")
+
+from email_templates import EmailTemplates  # noqa: E402
+from render import render  # noqa: E402
+
+from lib.events.events import TransferCreated  # noqa: E402
+
+
+EVENT = TransferCreated(
+    transfer_id=5510293,
+    amount=75000,
+    sender_id=104,
+    sender_email="renaldy.hidayat@example.com",
+    sender_name="Renaldy Hidayat",
+    sender_balance=225000,
+    receiver_id=2381,
+    receiver_email="siti.rahmawati@example.com",
+    receiver_name="Siti Rahmawati",
+    receiver_balance=1075000,
+)
+
+
+def fstrings() -> list:
+    e = EVENT
+    return [
+        (
+            e.sender_email,
+            "Transfer Successful",
+            f"Hi {e.sender_name}, you have successfully transferred {e.amount} to {e.receiver_name}. "
+            f"Your new balance is {e.sender_balance}.",
+            None,
+        ),
+        (
+            e.receiver_email,
+            "Transfer Received",
+            f"Hi {e.receiver_name}, you have received {e.amount} from {e.sender_name}. "
+            f"Your new balance is {e.receiver_balance}.",
+            None,
+        ),
+    ]
+
+
+def per_call_us(fn: Callable[[], object], number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+
+    warm = EmailTemplates()
+    render(warm, EVENT)
+    warm_id = EmailTemplates(default_locale="id")
+    render(warm_id, EVENT)
+
+    cases = (
+        ("f-strings (text only)", fstrings, args.number),
+        ("mako, cached, en", lambda: render(warm, EVENT), args.number),
+        ("mako, cached, id", lambda: render(warm_id, EVENT), args.number),
+        ("mako, cold compile", lambda: render(EmailTemplates(), EVENT), max(args.number // 100, 10)),
+    )
+    print(f"{'transfer emails':<28} {'us':>10}")
+    for label, fn, number in cases:
+        print(f"{label:<28} {per_call_us(fn, number):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Emails per second through the email service's transports, against a local
+SMTP sink that answers every command after a fixed delay, standing in for
+the round trip to a real mail server.
+
+- "blocking smtplib" is how `EmailService.send_email` used to send: one
+  message at a time, each on a fresh connection, and blocking the event loop
+  while it does.
+- "smtp pool" sends through `SmtpPoolTransport` with as many messages in
+  flight as it has connections, the way the service now consumes.
+- "maildir" stores the messages locally.
+
+STARTTLS and login are left out on both SMTP paths, so the difference shown
+is a lower bound: every reused connection also saves a TLS handshake and an
+AUTH round trip.
+
+Usage:
+    python benchmarks/bench_email_transport.py [--messages 500] [--latency-ms 5] [--pool-size 8]
+"""
+import argparse
+import asyncio
+import smtplib
+import sys
+import tempfile
+import threading
+import time
+from email.message import EmailMessage
+from typing import Callable, Sequence
+
+from _bootstrap import use_service
+
+
+class SmtpSink:
+    """Minimal SMTP server on its own thread and event loop; it only counts messages."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.received = 0
+        self.port = None
+        self._ready = threading.Event()
+        threading.Thread(target=asyncio.run, args=(self._serve(),), daemon=True).start()
+        self._ready.wait()
+
+    async def _reply(self, writer: asyncio.StreamWriter, reply: bytes) -> None:
+        await asyncio.sleep(self.latency)
+        writer.write(reply)
+        await writer.drain()
+
+    async def _session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await self._reply(writer, b"220 sink ESMTP\r\n")
+        while line := await reader.readline():
+            command = line[:4].upper()
+            if command == b"EHLO":
+                await self._reply(writer, b"250-sink\r\n250 8BITMIME\r\n")
+            elif command == b"DATA":
+                await self._reply(writer, b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                while await reader.readline() != b".\r\n":
+                    pass
+                self.received += 1
+                await self._reply(writer, b"250 OK\r\n")
+            elif command == b"QUIT":
+                await self._reply(writer, b"221 Bye\r\n")
+                break
+            else:
+                await self._reply(writer, b"250 OK\r\n")
+        writer.close()
+
+    async def _serve(self) -> None:
+        server = await asyncio.start_server(self._session, "127.0.0.1", 0)
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        async with server:
+            await server.serve_forever()
+
+
+def message(number: int) -> EmailMessage:
+    msg = EmailMessage()
+    msg["Subject"] = "Transfer Successful"
+    msg["From"] = "noreply@example.com"
+    msg["To"] = f"user{number}@example.com"
+    msg.set_content(f"Hi user {number}, you have successfully transferred 50000.")
+    return msg
+
+
+def report(label: str, count: int, seconds: float) -> None:
+    print(f"{label:<32} {count / seconds:10.1f} emails/s {seconds / count * 1000:10.2f} ms/email")
+
+
+def run_blocking(port: int, count: int) -> None:
+    async def send_all() -> None:
+        for number in range(count):
+            msg = message(number)
+            with smtplib.SMTP("127.0.0.1", port) as server:
+                server.sendmail(msg["From"], msg["To"], msg.as_string())
+
+    started = time.perf_counter()
+    asyncio.run(send_all())
+    report("blocking smtplib", count, time.perf_counter() - started)
+
+
+def run_transport(label: str, create: Callable[[], object], count: int, concurrency: int) -> None:
+    async def send_all() -> float:
+        transport = create()
+        slots = asyncio.Semaphore(concurrency)
+
+        async def send(number: int) -> None:
+            async with slots:
+                await transport.send(message(number))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(send(number) for number in range(count)))
+        elapsed = time.perf_counter() - started
+        await transport.close()
+        return elapsed
+
+    report(label, count, asyncio.run(send_all()))
+
+
+def main(argv: Sequence[str]) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Delay before each SMTP reply.")
+    parser.add_argument("--pool-size", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    use_service("email_service")
+    from transport import MaildirTransport, SmtpPoolTransport
+
+    sink = SmtpSink(args.latency_ms / 1000)
+    print(f"{args.messages} messages, {args.latency_ms:g} ms per SMTP reply")
+
+    # The old path is far slower; a tenth of the messages is enough to time it.
+    run_blocking(sink.port, max(1, args.messages // 10))
+    run_transport(
+        f"smtp pool ({args.pool_size} connections)",
+        lambda: SmtpPoolTransport("127.0.0.1", sink.port, start_tls=False, pool_size=args.pool_size),
+        args.messages,
+        args.pool_size,
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        run_transport("maildir", lambda: MaildirTransport(directory), args.messages, args.pool_size)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
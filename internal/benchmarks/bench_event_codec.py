@@ -0,0 +1,136 @@
+"""
+Bytes per message and encode/decode cost of the Kafka notification payloads:
+the JSON documents with the rendered email that producers used to send,
+against the msgpack events of `lib.events`.
+
+Both sides do what a producer and the email service do per message: the
+JSON side includes rendering the body (which used to happen in the
+producer), the event side builds the event and reads it back into the
+typed class.
+
+Usage:
+    python benchmarks/bench_event_codec.py [--number 100000]
+"""
+import argparse
+import json
+import timeit
+from typing import Callable, Dict, Tuple
+
+from _bootstrap import use_service
+
+use_service("email_service")
+
+from lib.events.codec import decode_event, encode_event  # noqa: E402
+from lib.events.events import SaldoCreated, TopupCreated, TransferCreated  # noqa: E402
+
+
+SENDER = ("Renaldy", "Hidayat", "renaldy.hidayat@example.com", 104)
+RECEIVER = ("Siti", "Rahmawati", "siti.rahmawati@example.com", 2381)
+
+
+def legacy_saldo() -> bytes:
+    first, last, email, _ = SENDER
+    return json.dumps(
+        {
+            "email": email,
+            "subject": "Saldo Created",
+            "body": f"Hi {first} {last}, your saldo has been successfully created with an amount of {250000}.",
+        }
+    ).encode("utf-8")
+
+
+def legacy_topup() -> bytes:
+    first, last, email, _ = SENDER
+    return json.dumps(
+        {
+            "email": email,
+            "subject": "Top-Up Successful",
+            "body": f"Hi {first} {last}, your top-up of {50000} has been successfully added. Your new balance is {300000}.",
+        }
+    ).encode("utf-8")
+
+
+def legacy_transfer() -> bytes:
+    s_first, s_last, s_email, _ = SENDER
+    r_first, r_last, r_email, _ = RECEIVER
+    return json.dumps(
+        {
+            "sender_email": s_email,
+            "receiver_email": r_email,
+            "subject": "Transfer Successful",
+            "body": (
+                f"Hi {s_first} {s_last}, you have successfully transferred {75000} to {r_first} {r_last}. "
+                f"Your new balance is {225000}. \n\n"
+                f"Hi {r_first} {r_last}, you have received {75000} from {s_first} {s_last}. "
+                f"Your new balance is {1075000}."
+            ),
+        }
+    ).encode("utf-8")
+
+
+def event_saldo() -> bytes:
+    first, last, email, user_id = SENDER
+    return encode_event(SaldoCreated(user_id=user_id, email=email, name=f"{first} {last}", total_balance=250000))
+
+
+def event_topup() -> bytes:
+    first, last, email, user_id = SENDER
+    return encode_event(
+        TopupCreated(
+            topup_id=918273, user_id=user_id, email=email, name=f"{first} {last}", amount=50000, balance=300000
+        )
+    )
+
+
+def event_transfer() -> bytes:
+    s_first, s_last, s_email, s_id = SENDER
+    r_first, r_last, r_email, r_id = RECEIVER
+    return encode_event(
+        TransferCreated(
+            transfer_id=5510293,
+            amount=75000,
+            sender_id=s_id,
+            sender_email=s_email,
+            sender_name=f"{s_first} {s_last}",
+            sender_balance=225000,
+            receiver_id=r_id,
+            receiver_email=r_email,
+            receiver_name=f"{r_first} {r_last}",
+            receiver_balance=1075000,
+        )
+    )
+
+
+CASES: Dict[str, Tuple[Tuple[Callable[[], bytes], Callable[[bytes], object]], ...]] = {
+    "saldo_created": ((legacy_saldo, json.loads), (event_saldo, decode_event)),
+    "topup_created": ((legacy_topup, json.loads), (event_topup, decode_event)),
+    "transfer_created": ((legacy_transfer, json.loads), (event_transfer, decode_event)),
+}
+
+
+def per_call_us(fn: Callable[[], object], number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'payload':<28} {'bytes':>7} {'encode us':>10} {'decode us':>10}")
+    for name, ((legacy_encode, legacy_decode), (event_encode, event_decode)) in CASES.items():
+        sizes = []
+        for label, encode, decode in (
+            (f"{name} json", legacy_encode, legacy_decode),
+            (f"{name} event", event_encode, event_decode),
+        ):
+            payload = encode()
+            sizes.append(len(payload))
+            encode_us = per_call_us(encode, args.number)
+            decode_us = per_call_us(lambda: decode(payload), args.number)
+            print(f"{label:<28} {len(payload):>7} {encode_us:>10.2f} {decode_us:>10.2f}")
+        print(f"{'':<28} {sizes[1] / sizes[0]:>7.0%} of the JSON size")
+
+
+if __name__ == "__main__":
+    main()
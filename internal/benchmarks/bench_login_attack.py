@@ -0,0 +1,168 @@
+"""
+`AuthService.login_user` under a credential-stuffing workload: --logins
+attempts, --unknown of them with emails no user has (drawn from a list of
+--pool such emails, as stuffing lists retry each one many times), the rest
+with real emails and wrong passwords.
+
+Run with the unknown-email cache off (size 0, every login queries) and on,
+against the in-memory user repository with --latency seconds per query and
+at most --connections queries at a time, to stand in for Postgres behind
+the service's pool, and --concurrency logins in flight.
+Password checks, tracing and logging are taken out here (`PlainHashing`,
+the no-op tracer), so the database work is what differs; queries per login
+are counted.
+
+Then, with real bcrypt, the median time of a few logins of each kind, to
+show that an unknown email, cached or not, takes as long as a wrong
+password.
+
+Usage:
+    python benchmarks/bench_login_attack.py
+        [--logins 20000] [--unknown 0.95] [--pool 5000]
+        [--latency 0.0005] [--connections 10] [--concurrency 50]
+        [--timing-samples 5]
+"""
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import sys
+import time
+from typing import List, Optional, Sequence
+
+from _bootstrap import use_service
+
+use_service("auth_service")
+
+import bcrypt  # noqa: E402
+import structlog  # noqa: E402
+from opentelemetry.trace import NoOpTracer  # noqa: E402
+from pydantic import BaseModel  # noqa: E402
+
+from _fakes import InMemoryTokenRepository, InMemoryUserRepository, PlainHashing, StubKafkaManager  # noqa: E402
+from domain.dtos.record.user import UserRecordDTO  # noqa: E402
+from domain.dtos.request.auth import LoginRequest  # noqa: E402
+from infrastructure.service.auth import AuthService  # noqa: E402
+from lib.otel.otel_config import OpenTelemetryManager  # noqa: E402
+from lib.security.hash_password import Hashing  # noqa: E402
+from lib.security.jwt import JwtConfig  # noqa: E402
+from lib.security.unknown_emails import UnknownEmailCache  # noqa: E402
+
+USERS = 1000
+
+
+class SlowUserRepository(InMemoryUserRepository):
+    """Counts credential queries, and runs `connections` of them at a time, `latency` seconds each."""
+
+    def __init__(self, latency: float, connections: int):
+        super().__init__(UserRecordDTO)
+        self.latency = latency
+        self.connections = asyncio.Semaphore(connections)
+        self.queries = 0
+
+    async def find_credentials_by_email(self, email: str) -> Optional[BaseModel]:
+        self.queries += 1
+        async with self.connections:
+            await asyncio.sleep(self.latency)
+        return await super().find_credentials_by_email(email)
+
+
+def make_service(repository: SlowUserRepository, hashing, cache_size: int) -> AuthService:
+    otel = OpenTelemetryManager(service_name="auth-service")
+    otel.tracer = NoOpTracer()
+    return AuthService(
+        repository=repository,
+        hashing=hashing,
+        jwt_config=JwtConfig("benchmark", 60),
+        otel_manager=otel,
+        account_numbers=None,  # Only registration allocates.
+        kafka_manager=StubKafkaManager(),
+        unknown_emails=UnknownEmailCache(size=cache_size),
+        token_repository=InMemoryTokenRepository(),
+        refresh_token_expiration_minutes=60,
+    )
+
+
+def workload(args: argparse.Namespace) -> List[LoginRequest]:
+    rng = random.Random(0)
+    requests = []
+    for _ in range(args.logins):
+        if rng.random() < args.unknown:
+            email = f"leaked{rng.randrange(args.pool)}@elsewhere.example"
+        else:
+            email = f"user{rng.randrange(1, USERS + 1)}@example.com"
+        requests.append(LoginRequest(email=email, password=f"guess{rng.randrange(10**6)}"))
+    return requests
+
+
+async def attack(service: AuthService, requests: List[LoginRequest], concurrency: int) -> float:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def login(request: LoginRequest) -> None:
+        async with slots:
+            await service.login_user(request)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login(request) for request in requests))
+    return time.perf_counter() - start
+
+
+async def throughput(args: argparse.Namespace) -> None:
+    requests = workload(args)
+    for label, cache_size in (("without cache", 0), ("with cache", args.pool)):
+        repository = SlowUserRepository(args.latency, args.connections)
+        for user_id in range(1, USERS + 1):
+            repository.add(user_id, f"user{user_id}@example.com", "password")
+        service = make_service(repository, PlainHashing(), cache_size)
+        elapsed = await attack(service, requests, args.concurrency)
+        print(
+            f"  {label:<16} {len(requests) / elapsed:>10,.0f} logins/s"
+            f" {repository.queries / len(requests):>8.3f} queries/login"
+        )
+
+
+async def timing(args: argparse.Namespace) -> None:
+    repository = SlowUserRepository(args.latency, args.connections)
+    repository.add(1, "user1@example.com", bcrypt.hashpw(b"password", bcrypt.gensalt()).decode())
+    service = make_service(repository, Hashing(), cache_size=args.pool)
+
+    async def median(make_request) -> float:
+        times = []
+        for i in range(args.timing_samples):
+            request = make_request(i)
+            start = time.perf_counter()
+            await service.login_user(request)
+            times.append(time.perf_counter() - start)
+        return statistics.median(times)
+
+    cases = (
+        ("wrong password", lambda i: LoginRequest(email="user1@example.com", password="wrong-password")),
+        # A new email each time, so every one is a database miss.
+        ("unknown email", lambda i: LoginRequest(email=f"new{i}@elsewhere.example", password="wrong-password")),
+        ("unknown email, cached", lambda i: LoginRequest(email="new0@elsewhere.example", password="wrong-password")),
+    )
+    for label, make_request in cases:
+        print(f"  {label:<24} {await median(make_request) * 1000:10.1f} ms")
+
+
+def main(argv: Sequence[str]) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=20000)
+    parser.add_argument("--unknown", type=float, default=0.95, help="Share of logins with unknown emails.")
+    parser.add_argument("--pool", type=int, default=5000, help="Distinct unknown emails in the attack.")
+    parser.add_argument("--latency", type=float, default=0.0005, help="Seconds per database query.")
+    parser.add_argument("--connections", type=int, default=10, help="Queries the pool runs at a time.")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--timing-samples", type=int, default=5)
+    args = parser.parse_args(argv)
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL))
+
+    print(f"{args.logins} logins, {args.unknown:.0%} with {args.pool} unknown emails (bcrypt left out)")
+    asyncio.run(throughput(args))
+    print("median login time, bcrypt at its default cost")
+    asyncio.run(timing(args))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
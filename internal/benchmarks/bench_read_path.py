@@ -0,0 +1,99 @@
+"""
+Compare the ORM -> TransferRecordDTO -> TransferResponse read path against the
+row-tuple path (`find_all_rows` + `TransferResponse.from_rows`).
+
+Runs against an in-memory SQLite database so only the mapping cost differs between
+the two paths; the driver and query work is the same for both.
+
+Usage:
+    python benchmarks/bench_read_path.py [--rows 100000]
+"""
+import argparse
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from _bootstrap import bench, use_service
+
+use_service("transfer_service")
+
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from domain.dtos.record.transfer import TransferRecordDTO  # noqa: E402
+from domain.dtos.response.transfer import TransferResponse  # noqa: E402
+from infrastructure.repository.transfer import TRANSFER_RESPONSE_COLUMNS  # noqa: E402
+from lib.model.base import Base  # noqa: E402
+from lib.model.transfer import Transfer  # noqa: E402
+
+
+def seed(engine, rows: int) -> None:
+    Base.metadata.create_all(engine)
+    now = datetime(2024, 12, 1, 12, 0, 0)
+    with Session(engine) as session:
+        session.execute(
+            insert(Transfer),
+            [
+                {
+                    "transfer_id": i,
+                    "transfer_from": i % 1000,
+                    "transfer_to": (i + 1) % 1000,
+                    "transfer_amount": 50000 + i,
+                    "transfer_time": now + timedelta(seconds=i),
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(1, rows + 1)
+            ],
+        )
+        session.commit()
+
+
+def allocations(fn: Callable[[], List], rows: int) -> str:
+    """
+    Peak traced bytes and blocks still held by the result, both per row.
+    """
+    tracemalloc.start()
+    result = fn()
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(result) == rows
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+    return f"{peak / rows:8.1f} B peak/row {blocks / rows:6.1f} blocks/row"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    seed(engine, args.rows)
+
+    def orm_path() -> List[TransferResponse]:
+        with Session(engine) as session:
+            transfers = session.execute(select(Transfer)).scalars().all()
+            dtos = [TransferRecordDTO.from_orm(transfer) for transfer in transfers]
+            return TransferResponse.from_dtos(dtos)
+
+    def row_path() -> List[dict]:
+        with Session(engine) as session:
+            rows = session.execute(select(*TRANSFER_RESPONSE_COLUMNS)).tuples().all()
+            return TransferResponse.from_rows(rows)
+
+    assert [r.model_dump() for r in orm_path()] == row_path()
+
+    print(f"get_transfers read path with {args.rows} rows")
+    baseline = bench("ORM -> RecordDTO -> Response", orm_path, repeat=3)
+    optimized = bench("Row tuples -> dict", row_path, repeat=3)
+    print(f"{'rows/sec (ORM)':<48} {args.rows / baseline:10.0f}")
+    print(f"{'rows/sec (rows)':<48} {args.rows / optimized:10.0f}")
+    print(f"{'speedup':<48} {baseline / optimized:10.2f} x")
+    print(f"{'allocations (ORM)':<24} {allocations(orm_path, args.rows)}")
+    print(f"{'allocations (rows)':<24} {allocations(row_path, args.rows)}")
+
+
+if __name__ == "__main__":
+    main()
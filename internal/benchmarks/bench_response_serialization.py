@@ -0,0 +1,72 @@
+"""
+Compare the default FastAPI response path against the orjson response class for a
+`get_transfers` style payload.
+
+Usage:
+    python benchmarks/bench_response_serialization.py [--rows 10000]
+"""
+import argparse
+import json
+from datetime import datetime, timedelta
+from typing import List
+
+from _bootstrap import bench, use_service
+
+use_service("transfer_service")
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from domain.dtos.response.api import ApiResponse  # noqa: E402
+from domain.dtos.response.transfer import TransferResponse  # noqa: E402
+from lib.http.response import ORJSONResponse  # noqa: E402
+
+
+def build_response(rows: int) -> ApiResponse:
+    now = datetime(2024, 12, 1, 12, 0, 0)
+    transfers = [
+        TransferResponse(
+            transfer_id=i,
+            transfer_from=i % 1000,
+            transfer_to=(i + 1) % 1000,
+            transfer_amount=50000 + i,
+            transfer_time=now + timedelta(seconds=i),
+        )
+        for i in range(rows)
+    ]
+    return ApiResponse(
+        status="success", message="Transfers retrieved successfully", data=transfers
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    response = build_response(args.rows)
+    adapter = TypeAdapter(ApiResponse[List[TransferResponse]])
+
+    def fastapi_default() -> bytes:
+        # What FastAPI does with a `response_model` and the stdlib JSONResponse:
+        # dump the returned model, validate it against the response model again,
+        # serialize it to JSON-compatible python and encode with `json`.
+        content = response.model_dump()
+        value = adapter.validate_python(content)
+        data = adapter.dump_python(value, mode="json")
+        return json.dumps(
+            data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+        ).encode("utf-8")
+
+    def orjson_response() -> bytes:
+        return ORJSONResponse(response).body
+
+    assert json.loads(fastapi_default()) == json.loads(orjson_response())
+
+    print(f"ApiResponse[List[TransferResponse]] with {args.rows} rows")
+    baseline = bench("response_model validation + json", fastapi_default)
+    optimized = bench("ORJSONResponse (no re-validation)", orjson_response)
+    print(f"{'speedup':<48} {baseline / optimized:10.2f} x")
+
+
+if __name__ == "__main__":
+    main()
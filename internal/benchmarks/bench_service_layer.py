@@ -0,0 +1,241 @@
+"""
+Per-call cost of the service-layer write paths with the database, Kafka and
+bcrypt taken out: `TransferService.create_transfer`, `TopupService.create_topup`,
+`WithdrawService.create_withdraw` and `AuthService.login_user` run against the
+in-memory fakes in `_fakes.py`, with tracing and logging configured the way the
+services configure them (SDK tracer with a batch processor, structlog over
+stdlib logging). Spans are exported to nowhere. Transfers are run both by
+receiver id and by receiver noc_transfer, which the resolver cache answers.
+
+Each call is also measured with tracing switched to the no-op tracer, and with
+logging disabled on top, to show what the instrumentation itself costs.
+
+Every service has its own import root, so each one is benchmarked in its own
+process; without --service all of them are run in turn.
+
+Usage:
+    python benchmarks/bench_service_layer.py [--service transfer] [--number 2000]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+from datetime import datetime
+from typing import Awaitable, Callable, Sequence
+
+from _bootstrap import async_bench, bench, use_service
+
+# benchmark name -> (service directory, logger name the service configures)
+SERVICES = {
+    "transfer": ("transfer_service", "transfer-service"),
+    "transfer_noc": ("transfer_service", "transfer-service"),
+    "topup": ("topup_service", "topup-service"),
+    "withdraw": ("withdraw_service", "withdraw-service"),
+    "auth": ("auth_service", "auth-service"),
+}
+
+USERS = 1000
+BALANCE = 10**15
+
+
+def configure_instrumentation(logger_name: str) -> None:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+    from opentelemetry.trace import set_tracer_provider
+
+    from lib.logging.logging_config import LoggerConfigurator
+
+    class DiscardingExporter(SpanExporter):
+        def export(self, spans) -> SpanExportResult:
+            return SpanExportResult.SUCCESS
+
+    # OpenTelemetryManager reuses an SDK provider that is already installed.
+    provider = TracerProvider()
+    provider.add_span_processor(BatchSpanProcessor(DiscardingExporter()))
+    set_tracer_provider(provider)
+
+    LoggerConfigurator(logger_name=logger_name).configure_logger(json_logs=True)
+    # Records are still formatted on the listener thread, just not printed.
+    for handler in LoggerConfigurator._listener.handlers:
+        handler.setStream(open(os.devnull, "w"))
+
+
+def setup_transfer(otel, by_noc: bool = False) -> Callable[[], Awaitable[object]]:
+    from _fakes import InMemorySaldoRepository, InMemoryTransferRepository, InMemoryUserRepository, StubKafkaManager
+    from domain.dtos.record.saldo import SaldoRecordDTO
+    from domain.dtos.record.transfer import TransferRecordDTO
+    from domain.dtos.record.user import UserRecordDTO
+    from domain.dtos.request.transfer import CreateTransferRequest
+    from infrastructure.service.transfer import TransferService
+
+    users = InMemoryUserRepository(UserRecordDTO)
+    saldos = InMemorySaldoRepository(SaldoRecordDTO)
+    for user_id in range(1, USERS + 1):
+        users.add(user_id, f"user{user_id}@example.com", "password")
+        saldos.add(user_id, BALANCE)
+
+    service = TransferService(
+        transfer_repository=InMemoryTransferRepository(TransferRecordDTO, saldos),
+        user_repository=users,
+        saldo_repository=saldos,
+        daily_summary_repository=None,
+        kafka_manager=StubKafkaManager(),
+        otel_manager=otel,
+    )
+    if by_noc:
+        receiver = {"transfer_to_noc": users.users[2].noc_transfer}
+    else:
+        receiver = {"transfer_to": 2}
+    request = CreateTransferRequest(transfer_from=1, transfer_amount=50000, **receiver)
+    return lambda: service.create_transfer(request)
+
+
+def setup_topup(otel) -> Callable[[], Awaitable[object]]:
+    from _fakes import InMemorySaldoRepository, InMemoryTopupRepository, InMemoryUserRepository, StubKafkaManager
+    from domain.dtos.record.saldo import SaldoRecordDTO
+    from domain.dtos.record.topup import TopupRecordDTO
+    from domain.dtos.record.user import UserRecordDTO
+    from domain.dtos.request.topup import CreateTopupRequest
+    from infrastructure.service.topup import TopupService
+
+    users = InMemoryUserRepository(UserRecordDTO)
+    saldos = InMemorySaldoRepository(SaldoRecordDTO)
+    for user_id in range(1, USERS + 1):
+        users.add(user_id, f"user{user_id}@example.com", "password")
+        saldos.add(user_id, 0)
+
+    service = TopupService(
+        topup_repository=InMemoryTopupRepository(TopupRecordDTO, saldos),
+        user_repository=users,
+        saldo_repository=saldos,
+        daily_summary_repository=None,
+        kafka_manager=StubKafkaManager(),
+        otel_manager=otel,
+    )
+    request = CreateTopupRequest(user_id=1, topup_no="bench", topup_amount=50000, topup_method="bca")
+    return lambda: service.create_topup(request)
+
+
+def setup_withdraw(otel) -> Callable[[], Awaitable[object]]:
+    from _fakes import InMemorySaldoRepository, InMemoryUserRepository, InMemoryWithdrawRepository, StubKafkaManager
+    from domain.dtos.record.saldo import SaldoRecordDTO
+    from domain.dtos.record.user import UserRecordDTO
+    from domain.dtos.record.withdraw import WithdrawRecordDTO
+    from domain.dtos.request.withdraw import CreateWithdrawRequest
+    from infrastructure.service.withdraw import WithdrawService
+
+    users = InMemoryUserRepository(UserRecordDTO)
+    saldos = InMemorySaldoRepository(SaldoRecordDTO)
+    for user_id in range(1, USERS + 1):
+        users.add(user_id, f"user{user_id}@example.com", "password")
+        saldos.add(user_id, BALANCE)
+
+    service = WithdrawService(
+        withdraw_repository=InMemoryWithdrawRepository(WithdrawRecordDTO, saldos),
+        user_repository=users,
+        saldo_repository=saldos,
+        daily_summary_repository=None,
+        kafka_manager=StubKafkaManager(),
+        otel_manager=otel,
+    )
+    request = CreateWithdrawRequest(user_id=1, withdraw_amount=50000, withdraw_time=datetime(2024, 12, 1))
+    return lambda: service.create_withdraw(request)
+
+
+def setup_auth(otel) -> Callable[[], Awaitable[object]]:
+    from _fakes import InMemoryTokenRepository, InMemoryUserRepository, PlainHashing, StubKafkaManager
+    from domain.dtos.record.user import UserRecordDTO
+    from domain.dtos.request.auth import LoginRequest
+    from infrastructure.service.auth import AuthService
+    from lib.security.jwt import JwtConfig
+    from lib.security.unknown_emails import UnknownEmailCache
+
+    users = InMemoryUserRepository(UserRecordDTO)
+    for user_id in range(1, USERS + 1):
+        users.add(user_id, f"user{user_id}@example.com", "password")
+
+    service = AuthService(
+        repository=users,
+        hashing=PlainHashing(),
+        jwt_config=JwtConfig("benchmark", 60),
+        otel_manager=otel,
+        account_numbers=None,  # Only registration allocates.
+        kafka_manager=StubKafkaManager(),
+        unknown_emails=UnknownEmailCache(),
+        token_repository=InMemoryTokenRepository(),
+        refresh_token_expiration_minutes=60,
+    )
+    request = LoginRequest(email="user1@example.com", password="password")
+    return lambda: service.login_user(request)
+
+
+SETUPS = {
+    "transfer": (setup_transfer, "TransferService.create_transfer"),
+    "transfer_noc": (
+        lambda otel: setup_transfer(otel, by_noc=True),
+        "TransferService.create_transfer (by noc_transfer)",
+    ),
+    "topup": (setup_topup, "TopupService.create_topup"),
+    "withdraw": (setup_withdraw, "WithdrawService.create_withdraw"),
+    "auth": (setup_auth, "AuthService.login_user"),
+}
+
+
+def run_service(name: str, number: int) -> None:
+    directory, logger_name = SERVICES[name]
+    use_service(directory)
+    configure_instrumentation(logger_name)
+
+    from opentelemetry.trace import NoOpTracer
+
+    from domain.dtos.response.api import ApiResponse
+    from lib.otel.otel_config import OpenTelemetryManager
+
+    setup, label = SETUPS[name]
+    otel = OpenTelemetryManager(service_name=logger_name)
+    call = setup(otel)
+
+    result = asyncio.run(call())
+    assert isinstance(result, ApiResponse), result
+
+    print(label)
+    full = async_bench("  traced + logged", call, number=number)
+    sdk_tracer, otel.tracer = otel.tracer, NoOpTracer()
+    untraced = async_bench("  no-op tracer", call, number=number)
+    logging.disable(logging.CRITICAL)
+    bare = async_bench("  no-op tracer, logging disabled", call, number=number)
+    logging.disable(logging.NOTSET)
+    otel.tracer = sdk_tracer
+
+    print(f"  {'tracing share':<46} {(full - untraced) / full:10.0%}")
+    print(f"  {'logging share':<46} {(untraced - bare) / full:10.0%}")
+
+    if name == "auth":
+        # What PlainHashing leaves out, at the cost factor Hashing uses.
+        import bcrypt
+
+        hashed = bcrypt.hashpw(b"password", bcrypt.gensalt())
+        bench("  bcrypt.checkpw (default cost)", lambda: bcrypt.checkpw(b"password", hashed), repeat=3)
+
+
+def main(argv: Sequence[str]) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--service", choices=sorted(SERVICES))
+    parser.add_argument("--number", type=int, default=2000, help="Calls per round.")
+    args = parser.parse_args(argv)
+
+    if args.service:
+        run_service(args.service, args.number)
+        return
+
+    for name in SERVICES:
+        subprocess.run(
+            [sys.executable, __file__, "--service", name, "--number", str(args.number)],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
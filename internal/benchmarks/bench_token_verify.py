@@ -0,0 +1,91 @@
+"""
+Per-request cost of checking an access token: `JwtConfig.verify_token`
+(signature, expiry and the in-memory revocation lookup) with an empty
+revocation list and with --revoked entries, against `decode_token` alone,
+which skips the lookup. The lookup is a dict membership test, so its cost
+does not grow with the list; the signature check dominates.
+
+Then the same check per signing algorithm: HS256 with the shared secret,
+and ES256 and EdDSA against a public key already in the verifier's key
+set, the way a service checks tokens once it has fetched the auth
+service's JWKS. Also the cost of signing, paid once per login or refresh.
+
+Also the cost of a revocation poll's worth of `RevocationSet.add` calls.
+
+Usage:
+    python benchmarks/bench_token_verify.py [--revoked 100000] [--number 20000]
+"""
+import argparse
+import sys
+import time
+import uuid
+from typing import Sequence
+
+from _bootstrap import bench, use_service
+
+use_service("auth_service")
+
+from lib.security.jwt import JwtConfig  # noqa: E402
+from lib.security.keys import ASYMMETRIC_ALGORITHMS, KeySet, SigningKey  # noqa: E402
+from lib.security.revocation import RevocationSet  # noqa: E402
+from lib.utils.errors import TokenRevokedError  # noqa: E402
+
+
+def main(argv: Sequence[str]) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--revoked", type=int, default=100000, help="Entries in the full revocation list.")
+    parser.add_argument("--number", type=int, default=20000, help="Calls per round.")
+    args = parser.parse_args(argv)
+
+    expires_at = time.time() + 3600
+    empty = JwtConfig("benchmark", 15, RevocationSet())
+    full = JwtConfig("benchmark", 15, RevocationSet())
+    for _ in range(args.revoked):
+        full.revocations.add(uuid.uuid4().hex, expires_at)
+
+    token = empty.generate_token(42)
+    revoked_token, claims = full.issue_token(42)
+    full.revocations.add(claims.jti, claims.exp)
+
+    def refused() -> None:
+        try:
+            full.verify_token(revoked_token)
+        except TokenRevokedError:
+            pass
+
+    print(f"access token check ({args.revoked} revoked in the full list)")
+    bench("  decode_token (no revocation lookup)", lambda: empty.decode_token(token), number=args.number)
+    bench("  verify_token, empty list", lambda: empty.verify_token(token), number=args.number)
+    bench("  verify_token, full list", lambda: full.verify_token(token), number=args.number)
+    bench("  verify_token, full list, revoked", refused, number=args.number)
+
+    print("per algorithm, key cached")
+    issuers = {"HS256": JwtConfig("benchmark", 15)}
+    verifiers = {"HS256": issuers["HS256"]}
+    for algorithm in ASYMMETRIC_ALGORITHMS:
+        signing_key = SigningKey.generate(algorithm)
+        issuers[algorithm] = JwtConfig(
+            "", 15, algorithm=algorithm, signing_key=signing_key, keys=KeySet([signing_key.public_jwk])
+        )
+        # A verifier holds only the public key, as fetched from the JWKS.
+        verifiers[algorithm] = JwtConfig(
+            "", 15, algorithm=algorithm, keys=KeySet(issuers[algorithm].jwks()["keys"])
+        )
+    for algorithm, issuer in issuers.items():
+        signed = issuer.generate_token(42)
+        verifier = verifiers[algorithm]
+        bench(f"  {algorithm} verify_token", lambda: verifier.verify_token(signed), number=args.number)
+        bench(f"  {algorithm} generate_token", lambda: issuer.generate_token(42), number=args.number // 10)
+
+    jtis = [uuid.uuid4().hex for _ in range(1000)]
+
+    def poll() -> None:
+        revocations = RevocationSet()
+        for jti in jtis:
+            revocations.add(jti, expires_at)
+
+    bench("  RevocationSet.add x1000 (one large poll)", poll, number=20)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,156 @@
+"""
+Requests per second of one service as the number of server workers grows, to
+check that throughput scales with the workers up to the number of cores.
+
+For each worker count the service is started through `lib.runtime.server`
+(the same launcher `main.py` uses, so multiprocess metrics are on), and
+client processes hammer one path over keep-alive connections for a fixed
+time. The default target is the gateway's `/healthz`, which needs no
+database: it measures the framework and middleware stack every request
+goes through, which is the CPU-bound part the workers are meant to scale.
+
+The clients share the machine with the server, so scaling flattens once
+clients and workers together use every core; give --clients as the number
+of cores left over, or point --host at a server started elsewhere.
+
+Usage:
+    python benchmarks/bench_workers.py [--service api_gateway] [--path /healthz]
+        [--workers 1,2,4] [--clients 2] [--connections 32] [--duration 10]
+"""
+import argparse
+import asyncio
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from typing import Sequence
+
+from _bootstrap import DEFAULT_ENV, INTERNAL_DIR, SERVICES_DIR
+
+CONTENT_LENGTH = re.compile(rb"content-length:\s*(\d+)", re.IGNORECASE)
+
+
+async def _connection(host: str, port: int, path: str, count_from: float, until: float) -> int:
+    reader, writer = await asyncio.open_connection(host, port)
+    request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode()
+    done = 0
+    try:
+        while (now := time.monotonic()) < until:
+            writer.write(request)
+            header = await reader.readuntil(b"\r\n\r\n")
+            await reader.readexactly(int(CONTENT_LENGTH.search(header).group(1)))
+            if now >= count_from:
+                done += 1
+    finally:
+        writer.close()
+    return done
+
+
+def _client(host: str, port: int, path: str, connections: int, warmup: float, duration: float) -> int:
+    async def run() -> int:
+        count_from = time.monotonic() + warmup
+        counts = await asyncio.gather(
+            *(_connection(host, port, path, count_from, count_from + duration) for _ in range(connections))
+        )
+        return sum(counts)
+
+    return asyncio.run(run())
+
+
+def _start_server(service: str, port: int, workers: int) -> subprocess.Popen:
+    root = SERVICES_DIR / service
+    env = dict(DEFAULT_ENV, **os.environ)
+    env.update(
+        PYTHONPATH=os.pathsep.join([str(root), str(INTERNAL_DIR)]),
+        SERVER_WORKERS=str(workers),
+        SERVER_RELOAD="false",
+        OTEL_ENABLED="false",
+        DRAIN_DELAY_SECONDS="0",
+        LOGGING_LEVEL="30",
+    )
+    # The launcher picks the metrics directory for more than one worker.
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    return subprocess.Popen(
+        [sys.executable, "-c", f"from lib.runtime.server import serve; serve('main:app', port={port})"],
+        cwd=root,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _ready_workers(host: str, port: int) -> int:
+    with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=1) as response:
+        for line in response.read().decode().splitlines():
+            if line.startswith("service_ready "):
+                return int(float(line.split()[1]))
+    return 0
+
+
+def _wait_ready(host: str, port: int, workers: int, timeout: float = 120) -> None:
+    # The first worker up answers everything while the others still start,
+    # so wait until the shared metrics count all of them as ready.
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if _ready_workers(host, port) >= workers:
+                return
+        except OSError:
+            pass
+        if time.monotonic() > deadline:
+            raise SystemExit("server did not become ready")
+        time.sleep(0.2)
+
+
+def measure(args: argparse.Namespace, workers: int) -> float:
+    server = None
+    if args.host in ("127.0.0.1", "localhost"):
+        server = _start_server(args.service, args.port, workers)
+    try:
+        _wait_ready(args.host, args.port, workers)
+        with ProcessPoolExecutor(args.clients) as pool:
+            futures = [
+                pool.submit(_client, args.host, args.port, args.path, args.connections, args.warmup, args.duration)
+                for _ in range(args.clients)
+            ]
+            return sum(future.result() for future in futures) / args.duration
+    finally:
+        if server is not None:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+
+
+def main(argv: Sequence[str]) -> None:
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    default_workers = sorted({1, *(2**i for i in range(1, cores.bit_length()) if 2**i <= cores), cores})
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--service", default="api_gateway")
+    parser.add_argument("--path", default="/healthz")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--workers", default=",".join(map(str, default_workers)))
+    parser.add_argument("--clients", type=int, default=max(1, cores // 2), help="Client processes.")
+    parser.add_argument("--connections", type=int, default=32, help="Connections per client process.")
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    print(f"{args.service} GET {args.path}, {cores} cores, {args.clients} client processes")
+    print(f"{'workers':>8} {'req/s':>12} {'speedup':>9} {'efficiency':>11}")
+    counts = [int(value) for value in args.workers.split(",")]
+    baseline = None
+    for workers in counts:
+        rps = measure(args, workers)
+        baseline = baseline or rps
+        speedup = rps / baseline
+        # Relative to perfect scaling from the first worker count.
+        print(f"{workers:>8} {rps:>12,.0f} {speedup:>8.2f}x {speedup * counts[0] / workers:>10.0%}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
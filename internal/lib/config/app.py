@@ -12,13 +12,31 @@ class AppSettings(BaseAppSettings):
     openapi_url: str = "/openapi.json"
     redoc_url: str = "/redoc"
 
-    jwt_secret_key: str
-
     api_prefix: str = "/api/v1"
 
     allowed_hosts: list[str] = ["*"]
 
     logging_level: int = logging.INFO
+    logging_queue_size: int = 10000
+    # Share of requests whose debug and info events are kept, overridable per
+    # route template, e.g. {"POST /api/topup/": 0.1, "/api/saldo/{id}": 0.01}.
+    logging_sample_rate: float = 1.0
+    logging_route_sample_rates: dict[str, float] = {}
+
+    # Server processes per container; 0 runs one per available CPU.
+    server_workers: int = 1
+    server_reload: bool = False
+    # Where the workers share their Prometheus metrics; wiped at launch.
+    prometheus_multiproc_dir: str = "/tmp/prometheus-multiproc"
+
+    # Readiness fails while this many requests are in flight (0: no limit).
+    max_in_flight_requests: int = 0
+    health_check_timeout_seconds: float = 2.0
+    # On SIGTERM readiness fails first; the server stops after
+    # `drain_delay_seconds`, once in-flight requests are done or
+    # `drain_timeout_seconds` have passed.
+    drain_delay_seconds: float = 5.0
+    drain_timeout_seconds: float = 30.0
 
     class Config:
         validate_assignment = True
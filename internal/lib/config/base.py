@@ -1,3 +1,5 @@
+from typing import List
+
 from pydantic import Extra, computed_field
 from pydantic_settings import BaseSettings
 from sqlalchemy import URL
@@ -18,12 +20,98 @@ class BaseAppSettings(BaseSettings):
     postgres_password: str
     postgres_db: str
 
-    jwt_secret_key: str
-    jwt_token_expiration_minutes: int = 60 * 24 * 7  # one week.
+    # With HS256 every service signs or checks tokens with this shared
+    # secret. With ES256 or EdDSA the auth service signs with the private
+    # key at jwt_private_key_path (`python -m lib.security.keys` makes one)
+    # and publishes the public keys at /.well-known/jwks.json; the other
+    # services and the gateway fetch them from jwt_jwks_url, again when a
+    # token names a key they have not seen, at most every
+    # jwt_jwks_min_refresh_seconds. No secret is needed then.
+    jwt_secret_key: str = ""
+    # Access tokens are short-lived; clients renew them with a refresh token,
+    # which is single use and replaced on every refresh.
+    jwt_token_expiration_minutes: int = 15
+    jwt_refresh_token_expiration_minutes: int = 60 * 24 * 30  # thirty days.
     jwt_algorithm: str = "HS256"
+    jwt_private_key_path: str = ""
+    # Public keys of earlier signing keys, still published until the tokens
+    # they signed have expired.
+    jwt_retired_public_key_paths: List[str] = []
+    jwt_jwks_url: str = "http://auth-service:8001/.well-known/jwks.json"
+    jwt_jwks_min_refresh_seconds: float = 30.0
+    # How often each process reads new access token revocations into memory.
+    token_revocation_poll_seconds: float = 2.0
 
     smtp_user: str
     smtp_password: str
+    smtp_host: str = "smtp.ethereal.email"
+    smtp_port: int = 587
+    smtp_start_tls: bool = True
+    smtp_pool_size: int = 8
+    smtp_max_messages_per_connection: int = 100
+    smtp_timeout_seconds: float = 30.0
+    # "smtp", or "maildir" to store messages under email_maildir_path instead.
+    email_transport: str = "smtp"
+    email_maildir_path: str = "maildir"
+    # Notifications to one recipient less than the window apart are sent as one
+    # digest, held for at most the max delay; a window of 0 turns this off.
+    email_coalesce_window_seconds: float = 2.0
+    email_coalesce_max_delay_seconds: float = 30.0
+    email_coalesce_max_batch: int = 100
+    # How often the email service reports its consumer lag.
+    email_lag_interval_seconds: float = 15.0
+    # Directory under services/email_service/templates to render from, the
+    # locale used when a template has no version in the requested one, and how
+    # often template files are checked for edits (0: never).
+    email_template_version: str = "v1"
+    email_default_locale: str = "en"
+    email_template_reload_seconds: float = 2.0
+
+    # Partitions of the event topics: how many email service instances can
+    # share the load, each partition being read by one of them at a time.
+    kafka_topic_partitions: int = 6
+    kafka_topic_replication_factor: int = 1
+
+    ledger_checkpoint_interval: int = 100
+
+    # noc_transfer -> user id answers kept per process by the transfer and
+    # topup services. Entries are dropped when the user changes; the ttl
+    # bounds their age while those events are not arriving.
+    noc_resolver_size: int = 10000
+    noc_resolver_ttl_seconds: float = 300.0
+    # noc_transfer numbers each process reserves from the sequence at a time.
+    noc_block_size: int = 100
+
+    # Emails without a user that the auth service remembers per process, so
+    # logins with them skip the database. Taken emails are dropped at once;
+    # the ttl bounds their age while those events are not arriving.
+    login_unknown_email_cache_size: int = 50000
+    login_unknown_email_ttl_seconds: float = 600.0
+
+    partition_premake_months: int = 3
+    partition_retention_months: int = 24
+    partition_archive_schema: str = "archive"
+
+    # Per process: every worker of a service has its own pool.
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    # Connections all workers of a service may hold together (0: no cap); the
+    # launcher splits it into the per-worker pool sizes.
+    db_max_connections: int = 0
+
+    # Pooled database connections opened before a service reports ready.
+    startup_db_connections: int = 4
+
+    otel_enabled: bool = True
+    otel_sample_ratio: float = 1.0
+    # Traces left out by the ratio are still exported when they fail or are slow.
+    otel_tail_keep_errors: bool = True
+    otel_tail_slow_ms: float = 1000.0
+    otel_tail_max_pending_traces: int = 4096
+    otel_export_max_queue_size: int = 2048
+    otel_export_max_batch_size: int = 512
+    otel_export_schedule_delay_ms: int = 5000
+    otel_export_timeout_ms: int = 30000
 
     class Config:
         env_file = ".env"
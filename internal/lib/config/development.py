@@ -12,6 +12,8 @@ class DevAppSettings(AppSettings):
 
     logging_level: int = logging.DEBUG
 
+    server_reload: bool = True
+
     class Config(AppSettings.Config):
         env_file = ".env.dev"
 
@@ -0,0 +1,70 @@
+import struct
+
+import msgpack
+from aiokafka import AIOKafkaProducer
+
+from lib.events.events import Event
+from lib.events.registry import SchemaRegistry, registry as default_registry
+
+
+# Never the first byte of a JSON document (nor a valid msgpack value), so
+# consumers can tell events from the JSON payloads that came before them.
+MAGIC = 0xC1
+# Magic byte, schema id, schema version.
+HEADER = struct.Struct(">BHB")
+
+
+class EventDecodeError(ValueError):
+    """The payload is not an event this registry can read."""
+
+
+def is_event(data: bytes) -> bool:
+    return data[:1] == b"\xc1"
+
+
+def encode_event(event: Event, registry: SchemaRegistry = default_registry) -> bytes:
+    """
+    Header, then the field values of the latest schema version as one
+    msgpack array: field names are in the schema, not in every message.
+    """
+    schema = registry.by_type[type(event)]
+    values = schema.values(event)
+    if not all(map(isinstance, values, schema.types)):
+        for (name, field_type), value in zip(schema.fields, values):
+            if not isinstance(value, field_type):
+                raise TypeError(f"{schema.name}.{name} must be {field_type.__name__}, got {type(value).__name__}")
+    return HEADER.pack(MAGIC, schema.id, schema.version) + msgpack.packb(values)
+
+
+async def publish(producer: AIOKafkaProducer, event: Event, registry: SchemaRegistry = default_registry) -> None:
+    """Send `event` to its topic, keyed so that events for the same key stay in order."""
+    await producer.send(topic=event.topic, value=encode_event(event, registry), key=event.key())
+
+
+def decode_event(data: bytes, registry: SchemaRegistry = default_registry) -> Event:
+    """Read a message written with any registered version of its schema."""
+    if len(data) < HEADER.size or not is_event(data):
+        raise EventDecodeError("Not an event payload")
+    _, schema_id, version = HEADER.unpack_from(data)
+
+    schema = registry.by_id.get(schema_id)
+    if schema is None or schema.event_type is None:
+        raise EventDecodeError(f"Unknown schema id {schema_id}")
+    field_list = schema.versions.get(version)
+    if field_list is None:
+        raise EventDecodeError(f"Unknown version {version} of schema {schema.name}")
+
+    try:
+        values = msgpack.unpackb(memoryview(data)[HEADER.size:])
+    except (ValueError, msgpack.UnpackException) as e:
+        raise EventDecodeError(f"Corrupt {schema.name} payload: {e}") from e
+    if not isinstance(values, list) or len(values) != len(field_list):
+        raise EventDecodeError(f"{schema.name} v{version} payload does not match its schema")
+
+    if version == schema.version:
+        return schema.event_type(*values)
+    # Older versions: fields dropped since are ignored, fields added since take their defaults.
+    known = {name for name, _ in schema.fields}
+    return schema.event_type(
+        **{name: value for (name, _), value in zip(field_list, values) if name in known}
+    )
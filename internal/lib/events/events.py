@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from typing import ClassVar
+
+
+@dataclass(slots=True)
+class Event:
+    """
+    Base for the events services publish to Kafka. Each subclass names its
+    schema in `lib/events/schemas`, the topic it is published on, and the
+    field it is keyed by; its fields must match the latest version of that
+    schema, in order.
+
+    Events with the same key go to the same partition, so they are consumed
+    in the order they were published.
+    """
+
+    schema: ClassVar[str]
+    topic: ClassVar[str]
+    key_field: ClassVar[str]
+
+    def key(self) -> bytes:
+        return str(getattr(self, self.key_field)).encode()
+
+
+@dataclass(slots=True)
+class SaldoCreated(Event):
+    schema: ClassVar[str] = "saldo_created"
+    topic: ClassVar[str] = "email-service-topic-saldo"
+    key_field: ClassVar[str] = "user_id"
+
+    user_id: int
+    email: str
+    name: str
+    total_balance: int
+
+
+@dataclass(slots=True)
+class TopupCreated(Event):
+    schema: ClassVar[str] = "topup_created"
+    topic: ClassVar[str] = "email-service-topic-topup"
+    key_field: ClassVar[str] = "user_id"
+
+    topup_id: int
+    user_id: int
+    email: str
+    name: str
+    amount: int
+    balance: int
+
+
+@dataclass(slots=True)
+class TransferCreated(Event):
+    schema: ClassVar[str] = "transfer_created"
+    topic: ClassVar[str] = "email-service-topic-transfer"
+    key_field: ClassVar[str] = "sender_id"
+
+    transfer_id: int
+    amount: int
+    sender_id: int
+    sender_email: str
+    sender_name: str
+    sender_balance: int
+    receiver_id: int
+    receiver_email: str
+    receiver_name: str
+    receiver_balance: int
+
+
+@dataclass(slots=True)
+class UserChanged(Event):
+    """
+    A user was created, updated or deleted; services caching users by
+    noc_transfer or by email drop what they hold on them. `email` is the
+    user's current one.
+    """
+
+    schema: ClassVar[str] = "user_changed"
+    topic: ClassVar[str] = "user-service-topic-user"
+    key_field: ClassVar[str] = "user_id"
+
+    user_id: int
+    noc_transfer: str
+    deleted: bool
+    email: str = ""
+
+
+# The events the email service turns into emails, and the topics it reads them from.
+NOTIFICATION_TYPES = (SaldoCreated, TopupCreated, TransferCreated)
+NOTIFICATION_TOPICS = tuple(sorted({event_type.topic for event_type in NOTIFICATION_TYPES}))
+
+EVENT_TYPES = NOTIFICATION_TYPES + (UserChanged,)
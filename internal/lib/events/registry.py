@@ -0,0 +1,98 @@
+import json
+from dataclasses import MISSING, fields
+from operator import attrgetter
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple, Type
+
+from lib.events.events import EVENT_TYPES, Event
+
+
+SCHEMA_DIR = Path(__file__).resolve().parent / "schemas"
+
+FIELD_TYPES = {"int": int, "str": str, "bool": bool, "float": float}
+
+
+class SchemaError(Exception):
+    """A schema file is malformed, or does not match its event class."""
+
+
+class Schema:
+    """
+    One event schema: a stable numeric id written into every message, and
+    the field list of each version. Messages are written with the latest
+    version and can be read from any registered one.
+    """
+
+    def __init__(self, id: int, name: str, versions: Dict[int, List[Tuple[str, type]]]):
+        self.id = id
+        self.name = name
+        self.versions = versions
+        self.version = max(versions)
+        self.fields = versions[self.version]
+        self.event_type: Type[Event] = None
+        # Encoding reads the latest version's fields in one call, and checks their types in one pass.
+        self.values = attrgetter(*(name for name, _ in self.fields))
+        self.types = tuple(field_type for _, field_type in self.fields)
+
+    @classmethod
+    def load(cls, path: Path) -> "Schema":
+        try:
+            data = json.loads(path.read_text())
+            versions = {
+                int(version): [(name, FIELD_TYPES[type_name]) for name, type_name in field_list]
+                for version, field_list in data["versions"].items()
+            }
+            return cls(int(data["id"]), data["name"], versions)
+        except (KeyError, TypeError, ValueError) as e:
+            raise SchemaError(f"Invalid schema file {path.name}: {e!r}") from e
+
+    def bind(self, event_type: Type[Event]) -> None:
+        """
+        Check that `event_type` can write the latest version and read every
+        older one: its fields are the latest version's, and any field an
+        older version lacks has a default.
+        """
+        declared = [(field.name, field.type) for field in fields(event_type)]
+        if declared != self.fields:
+            raise SchemaError(
+                f"{event_type.__name__} fields do not match version {self.version} of schema {self.name}"
+            )
+        defaults = {
+            field.name
+            for field in fields(event_type)
+            if field.default is not MISSING or field.default_factory is not MISSING
+        }
+        for version, field_list in self.versions.items():
+            missing = {name for name, _ in self.fields} - {name for name, _ in field_list} - defaults
+            if missing:
+                raise SchemaError(
+                    f"{event_type.__name__} cannot read version {version} of schema {self.name}: "
+                    f"no default for {', '.join(sorted(missing))}"
+                )
+        self.event_type = event_type
+
+
+class SchemaRegistry:
+    """Event schemas loaded from the JSON files in a directory, by id and by event type."""
+
+    def __init__(self, directory: Path = SCHEMA_DIR, event_types: Iterable[Type[Event]] = EVENT_TYPES):
+        self.by_id: Dict[int, Schema] = {}
+        self.by_type: Dict[Type[Event], Schema] = {}
+
+        by_name: Dict[str, Schema] = {}
+        for path in sorted(directory.glob("*.json")):
+            schema = Schema.load(path)
+            if schema.id in self.by_id:
+                raise SchemaError(f"Schema id {schema.id} is used by both {self.by_id[schema.id].name} and {schema.name}")
+            self.by_id[schema.id] = schema
+            by_name[schema.name] = schema
+
+        for event_type in event_types:
+            schema = by_name.get(event_type.schema)
+            if schema is None:
+                raise SchemaError(f"No schema file for {event_type.__name__} ({event_type.schema})")
+            schema.bind(event_type)
+            self.by_type[event_type] = schema
+
+
+registry = SchemaRegistry()
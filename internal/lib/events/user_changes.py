@@ -0,0 +1,69 @@
+import asyncio
+from typing import Optional, Sequence
+
+import structlog
+
+from lib.events.codec import EventDecodeError, decode_event
+from lib.events.events import UserChanged
+from lib.kafka.kafka_config import KafkaManager
+
+
+logger = structlog.get_logger(__name__)
+
+
+class UserChangeFollower:
+    """
+    Reads `UserChanged` events and hands them to the `user_changed` method
+    of every cache in `caches`.
+    Every process reads every event: the consumer has no group, and starts
+    from the end of the topic, since the caches start empty. Reconnects
+    after `retry_seconds` when Kafka is unreachable; the caches are cleared
+    then, as changes may have been missed meanwhile.
+    """
+
+    def __init__(self, kafka_manager: KafkaManager, caches: Sequence, retry_seconds: float = 5.0):
+        self.kafka_manager = kafka_manager
+        self.caches = caches
+        self.retry_seconds = retry_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                consumer = await self.kafka_manager.get_consumer(
+                    topic=[UserChanged.topic], group_id=None, auto_offset_reset="latest"
+                )
+            except Exception as e:
+                logger.warning("Could not follow user changes", error=str(e))
+                await asyncio.sleep(self.retry_seconds)
+                continue
+            try:
+                async for message in consumer:
+                    self.handle(message.value)
+            except Exception as e:
+                logger.warning("Stopped following user changes", error=str(e))
+                for cache in self.caches:
+                    cache.clear()
+            finally:
+                await consumer.stop()
+            await asyncio.sleep(self.retry_seconds)
+
+    def handle(self, value: bytes) -> None:
+        try:
+            event = decode_event(value)
+        except EventDecodeError as e:
+            logger.warning("Skipping undecodable user change", error=str(e))
+            return
+        if isinstance(event, UserChanged):
+            for cache in self.caches:
+                cache.user_changed(event)
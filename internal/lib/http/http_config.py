@@ -1,3 +1,4 @@
+from datetime import date
 from typing import Any, Dict, Optional, Union
 import httpx
 
@@ -6,6 +7,7 @@ class HttpClientError(Exception):
     """Custom exception for HTTP client errors."""
     def __init__(self, message: str, status_code: int = None, details: Any = None):
         super().__init__(message)
+        self.message = message
         self.status_code = status_code
         self.details = details
 
@@ -14,10 +16,25 @@ class HttpClient:
     def __init__(self, base_url: str):
         self.client = httpx.AsyncClient(base_url=base_url)
 
+    async def close(self) -> None:
+        """Close the pooled connections to the upstream service."""
+        await self.client.aclose()
+
+    @staticmethod
+    def _query(params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Drop unset query parameters and render dates as ISO 8601."""
+        if params is None:
+            return None
+        return {
+            key: value.isoformat() if isinstance(value, date) else value
+            for key, value in params.items()
+            if value is not None
+        }
+
     async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> Any:
         """Send a GET request."""
         try:
-            response = await self.client.get(endpoint, params=params, headers=headers)
+            response = await self.client.get(endpoint, params=self._query(params), headers=headers)
             response.raise_for_status()
             return response.json()
         except httpx.HTTPStatusError as e:
@@ -0,0 +1,23 @@
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Pydantic models are dumped as-is, without being validated again against the
+    route's `response_model`. Return an instance of this class from a handler when
+    the service already built the response model, so FastAPI skips its own
+    validation and `jsonable_encoder` pass.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            content = content.model_dump()
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -1,12 +1,40 @@
-from aiokafka import AIOKafkaProducer, AIOKafkaConsumer
-from opentelemetry.instrumentation.aiokafka import AIOKafkaInstrumentor
+import asyncio
+from typing import Iterable, Optional
+
+import structlog
+from aiokafka import AIOKafkaProducer, AIOKafkaConsumer, ConsumerRebalanceListener
+from aiokafka.admin import AIOKafkaAdminClient, NewPartitions, NewTopic
+from aiokafka.errors import InvalidPartitionsError, TopicAlreadyExistsError, for_code
+
+
+logger = structlog.get_logger(__name__)
+
+
+_instrumented = False
+
+
+def instrument_kafka() -> None:
+    """
+    Trace aiokafka sends and receives. Patching is process-wide, so it is done
+    once, and the instrumentation package is only imported when it is needed.
+    """
+    global _instrumented
+    if _instrumented:
+        return
+    from opentelemetry.instrumentation.aiokafka import AIOKafkaInstrumentor
+
+    AIOKafkaInstrumentor().instrument()
+    _instrumented = True
 
 
 class KafkaManager:
     def __init__(self, bootstrap_servers: str, instrumented: bool = False):
         if not instrumented:
-            AIOKafkaInstrumentor().instrument()
+            instrument_kafka()
         self.bootstrap_servers = bootstrap_servers
+        self._producer: Optional[AIOKafkaProducer] = None
+        self._producer_lock = asyncio.Lock()
+        self._connecting: Optional[asyncio.Task] = None
 
     async def get_producer(self):
         producer = AIOKafkaProducer(
@@ -14,17 +42,114 @@ class KafkaManager:
             max_request_size=104857600,
             max_batch_size=104857600,
         )
-        await producer.start()
+        try:
+            await producer.start()
+        except Exception:
+            await producer.stop()
+            raise
         return producer
 
-    async def get_consumer(self, topic: list, group_id: str):
+    async def producer(self) -> AIOKafkaProducer:
+        """
+        The producer shared by every request of this process. It is started on
+        first use (or by the startup warmup) and stays connected until `close`.
+        """
+        if self._producer is None:
+            async with self._producer_lock:
+                if self._producer is None:
+                    self._producer = await self.get_producer()
+        return self._producer
+
+    async def check(self, timeout: float = 2.0) -> None:
+        """
+        Raise unless the shared producer is connected and a broker answers a
+        metadata request within `timeout` seconds. While the producer is not
+        started, one attempt at a time is made to start it in the background,
+        so readiness recovers once Kafka is back.
+        """
+        if self._producer is not None:
+            # A started producer says nothing about the brokers still being there.
+            await asyncio.wait_for(self._producer.client.fetch_all_metadata(), timeout)
+            return
+        if self._connecting is None or self._connecting.done():
+            self._connecting = asyncio.ensure_future(self.producer())
+            # The outcome is reported by the next check, not by the task.
+            self._connecting.add_done_callback(lambda task: task.cancelled() or task.exception())
+        raise ConnectionError("Kafka producer is not connected")
+
+    async def close(self) -> None:
+        """Flush and stop the shared producer, if it was started."""
+        if self._producer is not None:
+            producer, self._producer = self._producer, None
+            await producer.stop()
+
+    async def ensure_topics(self, topics: Iterable[str], partitions: int, replication_factor: int = 1) -> None:
+        """
+        Create the missing `topics` with `partitions` partitions, so that
+        producing to them does not auto-create them with the broker default
+        of one partition, and add partitions to existing ones that have
+        fewer. Safe to call from every instance at once.
+
+        Adding partitions moves some keys to another partition, so for a
+        moment their new messages can be consumed ahead of their old ones.
+        """
+        topics = set(topics)
+        admin = AIOKafkaAdminClient(bootstrap_servers=self.bootstrap_servers)
+        await admin.start()
+        try:
+            existing = topics & set(await admin.list_topics())
+            missing = topics - existing
+
+            if missing:
+                response = await admin.create_topics(
+                    [NewTopic(topic, partitions, replication_factor) for topic in sorted(missing)]
+                )
+                for topic, code, *message in response.topic_errors:
+                    if code and code != TopicAlreadyExistsError.errno:
+                        raise for_code(code)(f"Could not create topic {topic}: {message}")
+                logger.info("Kafka topics created", topics=sorted(missing), partitions=partitions)
+
+            if existing:
+                counts = {
+                    topic["topic"]: len(topic["partitions"])
+                    for topic in await admin.describe_topics(sorted(existing))
+                }
+                grow = {topic: NewPartitions(partitions) for topic, count in counts.items() if count < partitions}
+                if grow:
+                    logger.warning(
+                        "Adding Kafka partitions; some keys move partition",
+                        topics={topic: counts[topic] for topic in grow},
+                        partitions=partitions,
+                    )
+                    try:
+                        await admin.create_partitions(grow)
+                    except InvalidPartitionsError:
+                        pass  # Another instance got there first.
+        finally:
+            await admin.close()
+
+    async def get_consumer(
+        self,
+        topic: list,
+        group_id: Optional[str],
+        listener: Optional[ConsumerRebalanceListener] = None,
+        auto_offset_reset: str = "earliest",
+        enable_auto_commit: bool = True,
+    ):
+        """
+        A started consumer subscribed to `topic`. Without a `group_id` it
+        reads every partition and commits nothing, for consumers that each
+        process needs its own copy of. Without `enable_auto_commit` the
+        caller commits the offsets it is done with itself.
+        """
         consumer = AIOKafkaConsumer(
-            *topic,  # Unpacking list into multiple arguments
             group_id=group_id,
             bootstrap_servers=self.bootstrap_servers,
-            auto_offset_reset="earliest",
-            enable_auto_commit=True,
+            auto_offset_reset=auto_offset_reset,
+            enable_auto_commit=enable_auto_commit,
             max_partition_fetch_bytes=209715200
         )
+        # Same as passing the topics to the constructor, which takes no listener.
+        consumer.subscribe(topics=topic, listener=listener)
         await consumer.start()
         return consumer
@@ -0,0 +1,255 @@
+from datetime import datetime
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from lib.model.ledger import LedgerCheckpoint, LedgerEntry
+from lib.model.saldo import Saldo
+from lib.utils.errors import InsufficientBalanceError, ValidationError
+
+
+WALLET = "wallet"
+SYSTEM_TOPUP = "system:topup"
+SYSTEM_WITHDRAW = "system:withdraw"
+SYSTEM_ADJUSTMENT = "system:adjustment"
+SYSTEM_OPENING = "system:opening"
+
+
+class LedgerLeg(NamedTuple):
+    account: str
+    user_id: Optional[int]
+    debit: int = 0
+    credit: int = 0
+
+
+def _pair(
+    debit_account: str,
+    debit_user: Optional[int],
+    credit_account: str,
+    credit_user: Optional[int],
+    amount: int,
+) -> List[LedgerLeg]:
+    # A negative amount is the reversal of the same movement.
+    if amount < 0:
+        debit_account, credit_account = credit_account, debit_account
+        debit_user, credit_user = credit_user, debit_user
+        amount = -amount
+
+    return [
+        LedgerLeg(debit_account, debit_user, debit=amount),
+        LedgerLeg(credit_account, credit_user, credit=amount),
+    ]
+
+
+def topup_legs(user_id: int, amount: int) -> List[LedgerLeg]:
+    return _pair(SYSTEM_TOPUP, None, WALLET, user_id, amount)
+
+
+def withdraw_legs(user_id: int, amount: int) -> List[LedgerLeg]:
+    return _pair(WALLET, user_id, SYSTEM_WITHDRAW, None, amount)
+
+
+def transfer_legs(transfer_from: int, transfer_to: int, amount: int) -> List[LedgerLeg]:
+    return _pair(WALLET, transfer_from, WALLET, transfer_to, amount)
+
+
+def adjustment_legs(user_id: int, amount: int) -> List[LedgerLeg]:
+    return _pair(SYSTEM_ADJUSTMENT, None, WALLET, user_id, amount)
+
+
+def reverse(legs: Sequence[LedgerLeg]) -> List[LedgerLeg]:
+    return [leg._replace(debit=leg.credit, credit=leg.debit) for leg in legs]
+
+
+class LedgerManager:
+    """
+    Writes balanced ledger postings and keeps `saldo` in step with them.
+
+    `post` runs inside the caller's session and never commits, so the ledger
+    entries, the saldo projection and the movement row itself land in one
+    transaction. Wallet balances are updated incrementally with
+    `total_balance + delta`, which keeps balance reads O(1); the ledger is the
+    source of truth that `balance_from_ledger` and `rebuild` read back.
+    """
+
+    def __init__(self, checkpoint_interval: int = 100):
+        self.checkpoint_interval = checkpoint_interval
+
+    async def post(
+        self,
+        session: AsyncSession,
+        movement_type: str,
+        movement_id: Optional[int],
+        legs: Sequence[LedgerLeg],
+    ) -> None:
+        if any(leg.debit < 0 or leg.credit < 0 for leg in legs):
+            raise ValidationError("Ledger amounts must not be negative")
+        if sum(leg.debit for leg in legs) != sum(leg.credit for leg in legs):
+            raise ValidationError("Ledger posting is not balanced")
+
+        # Net the legs per account first, so that e.g. reversing and re-posting
+        # a movement for the same user only moves the difference.
+        net = {}
+        for leg in legs:
+            key = (leg.account, leg.user_id)
+            net[key] = net.get(key, 0) + leg.credit - leg.debit
+
+        # Wallet rows are locked in user order so concurrent transfers between
+        # the same two users cannot deadlock.
+        legs = sorted(
+            (
+                LedgerLeg(account, user_id, debit=max(-amount, 0), credit=max(amount, 0))
+                for (account, user_id), amount in net.items()
+                if amount
+            ),
+            key=lambda leg: (leg.account != WALLET, leg.user_id or 0),
+        )
+
+        for leg in legs:
+            if leg.account != WALLET:
+                await self._insert_entry(session, movement_type, movement_id, leg, None)
+                continue
+
+            balance, entries = await self._apply(session, leg.user_id, leg.credit - leg.debit)
+            entry_id = await self._insert_entry(
+                session, movement_type, movement_id, leg, balance
+            )
+            if entries >= self.checkpoint_interval:
+                await self._checkpoint(session, leg.user_id, entry_id, balance)
+
+    async def _apply(
+        self, session: AsyncSession, user_id: int, delta: int
+    ) -> Tuple[int, int]:
+        """
+        Add `delta` to the user's saldo and return the new balance together with
+        the number of entries posted since the last checkpoint.
+        """
+        now = datetime.utcnow()
+
+        if delta < 0:
+            result = await session.execute(
+                update(Saldo)
+                .where(Saldo.user_id == user_id, Saldo.total_balance + delta >= 0)
+                .values(
+                    total_balance=Saldo.total_balance + delta,
+                    entries_since_checkpoint=Saldo.entries_since_checkpoint + 1,
+                    updated_at=now,
+                )
+                .returning(Saldo.total_balance, Saldo.entries_since_checkpoint)
+            )
+            row = result.first()
+            if row is None:
+                raise InsufficientBalanceError(user_id)
+            return row.total_balance, row.entries_since_checkpoint
+
+        stmt = insert(Saldo).values(
+            user_id=user_id,
+            total_balance=delta,
+            entries_since_checkpoint=1,
+            created_at=now,
+            updated_at=now,
+        )
+        result = await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[Saldo.user_id],
+                set_={
+                    "total_balance": Saldo.total_balance + delta,
+                    "entries_since_checkpoint": Saldo.entries_since_checkpoint + 1,
+                    "updated_at": now,
+                },
+            ).returning(Saldo.total_balance, Saldo.entries_since_checkpoint)
+        )
+        row = result.one()
+        return row.total_balance, row.entries_since_checkpoint
+
+    async def _insert_entry(
+        self,
+        session: AsyncSession,
+        movement_type: str,
+        movement_id: Optional[int],
+        leg: LedgerLeg,
+        balance_after: Optional[int],
+    ) -> int:
+        result = await session.execute(
+            insert(LedgerEntry)
+            .values(
+                movement_type=movement_type,
+                movement_id=movement_id,
+                account=leg.account,
+                user_id=leg.user_id,
+                debit=leg.debit,
+                credit=leg.credit,
+                balance_after=balance_after,
+                created_at=datetime.utcnow(),
+            )
+            .returning(LedgerEntry.entry_id)
+        )
+        return result.scalar_one()
+
+    async def _checkpoint(
+        self, session: AsyncSession, user_id: int, entry_id: int, balance: int
+    ) -> None:
+        await session.execute(
+            insert(LedgerCheckpoint).values(
+                user_id=user_id,
+                entry_id=entry_id,
+                balance=balance,
+                created_at=datetime.utcnow(),
+            )
+        )
+        await session.execute(
+            update(Saldo)
+            .where(Saldo.user_id == user_id)
+            .values(entries_since_checkpoint=0)
+        )
+
+    async def balance_from_ledger(self, session: AsyncSession, user_id: int) -> int:
+        """
+        Recompute a user's wallet balance from the latest checkpoint plus the
+        entries posted after it.
+        """
+        result = await session.execute(
+            select(LedgerCheckpoint.entry_id, LedgerCheckpoint.balance)
+            .where(LedgerCheckpoint.user_id == user_id)
+            .order_by(LedgerCheckpoint.entry_id.desc())
+            .limit(1)
+        )
+        checkpoint = result.first()
+        entry_id, balance = checkpoint if checkpoint else (0, 0)
+
+        result = await session.execute(
+            select(func.coalesce(func.sum(LedgerEntry.credit - LedgerEntry.debit), 0))
+            .where(
+                LedgerEntry.user_id == user_id,
+                LedgerEntry.account == WALLET,
+                LedgerEntry.entry_id > entry_id,
+            )
+        )
+        return balance + result.scalar_one()
+
+    async def rebuild(self, session: AsyncSession) -> int:
+        """
+        Overwrite every saldo with the balance summed from the ledger in a single
+        sequential pass. Returns the number of saldo rows that changed. Does not
+        commit.
+        """
+        balances = (
+            select(
+                LedgerEntry.user_id,
+                func.sum(LedgerEntry.credit - LedgerEntry.debit).label("balance"),
+            )
+            .where(LedgerEntry.account == WALLET)
+            .group_by(LedgerEntry.user_id)
+            .subquery()
+        )
+        result = await session.execute(
+            update(Saldo)
+            .where(
+                Saldo.user_id == balances.c.user_id,
+                Saldo.total_balance != balances.c.balance,
+            )
+            .values(total_balance=balances.c.balance, updated_at=datetime.utcnow())
+        )
+        return result.rowcount
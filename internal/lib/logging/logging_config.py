@@ -1,10 +1,50 @@
+import atexit
 import logging
+import logging.handlers
+import queue
+import sys
+import time
+from typing import Optional
+
+import orjson
 import structlog
 
+from prometheus_client import Counter
 from structlog.typing import EventDict, Processor
 from lib.config.main import get_app_settings
+from lib.logging.sampling import RouteSampler
+
+
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_count", "Log records dropped because the log queue was full"
+)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the listener thread untouched, so formatting and writing
+    happen off the event loop, and drops records instead of blocking when the
+    queue is full.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+def _orjson_dumps(obj, default=None, **_) -> str:
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
 
 class LoggerConfigurator:
+    _listener: Optional[logging.handlers.QueueListener] = None
+    _handler: Optional[logging.Handler] = None
+
     def __init__(self, logger_name: str = "payment-gateway-api"):
         self.logger_name = logger_name
         self.settings = get_app_settings()
@@ -27,66 +67,125 @@ class LoggerConfigurator:
         event_dict.pop("color_message", None)
         return event_dict
 
+    def add_service_name(self, _: logging.Logger, __: str, event_dict: EventDict) -> EventDict:
+        event_dict["service"] = self.logger_name
+        return event_dict
+
+    @staticmethod
+    def add_record_timestamp(_: logging.Logger, __: str, event_dict: EventDict) -> EventDict:
+        """
+        Stamp the event with the time its log record was created. Runs on the
+        listener thread, so the time is taken from the record, not the clock.
+        """
+        record = event_dict.get("_record")
+        created = record.created if record is not None else time.time()
+        event_dict["timestamp"] = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(created))
+        return event_dict
+
+    @staticmethod
+    def capture_exc_info(_: logging.Logger, __: str, event_dict: EventDict) -> EventDict:
+        """
+        Resolve `exc_info=True` to the exception being handled, while still on
+        the thread that handles it; it is rendered on the listener thread.
+        """
+        if event_dict.get("exc_info") is True:
+            event_dict["exc_info"] = sys.exc_info()
+        return event_dict
+
+    @staticmethod
+    def stop_listener() -> None:
+        """Write out the queued records and stop the listener thread."""
+        if LoggerConfigurator._listener is not None:
+            LoggerConfigurator._listener.stop()
+            LoggerConfigurator._listener = None
+
     def configure_logger(self, json_logs: bool = False) -> None:
-        timestamper = structlog.processors.TimeStamper(fmt="%Y-%m-%d %H:%M:%S")
+        # Only this part runs on the logging call itself. Levels below
+        # `logging_level` are no-ops on the bound logger, and debug and info
+        # events of requests that are not sampled are dropped here.
+        structlog.configure(
+            processors=[
+                RouteSampler(
+                    default_rate=self.settings.logging_sample_rate,
+                    route_rates=self.settings.logging_route_sample_rates,
+                ),
+                structlog.contextvars.merge_contextvars,
+                self.capture_exc_info,
+                structlog.processors.StackInfoRenderer(),
+                structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+            ],
+            wrapper_class=structlog.make_filtering_bound_logger(self.settings.logging_level),
+            logger_factory=structlog.stdlib.LoggerFactory(),
+            cache_logger_on_first_use=True,
+        )
 
-        shared_processors: list[Processor] = [
-            structlog.contextvars.merge_contextvars,
+        # Everything else runs on the listener thread.
+        formatter_processors: list[Processor] = [
+            self.add_record_timestamp,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
             structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.stdlib.ExtraAdder(),
             self.drop_color_message_key,
-            timestamper,
-            structlog.processors.StackInfoRenderer(),
+            self.add_service_name,
         ]
 
         if json_logs:
             # We rename the `event` key to `message` only in JSON logs.
-            shared_processors.append(self.rename_event_key)
+            formatter_processors.append(self.rename_event_key)
             # Format the exception only for JSON logs, as we want to pretty-print them when
             # using the ConsoleRenderer.
-            shared_processors.append(structlog.processors.format_exc_info)
-
-        structlog.configure(
-            processors=shared_processors
-            + [structlog.stdlib.ProcessorFormatter.wrap_for_formatter],
-            logger_factory=structlog.stdlib.LoggerFactory(),
-            cache_logger_on_first_use=True,
-        )
+            formatter_processors.append(structlog.processors.format_exc_info)
 
         log_renderer = (
-            structlog.processors.JSONRenderer()
+            structlog.processors.JSONRenderer(serializer=_orjson_dumps)
             if json_logs
             else structlog.dev.ConsoleRenderer()
         )
 
-        self._configure_default_logging_by_custom(shared_processors, log_renderer)
+        self._configure_default_logging_by_custom(formatter_processors, log_renderer)
 
     def _configure_default_logging_by_custom(
-        self, shared_processors: list[Processor], log_renderer: structlog.types.Processor
+        self, formatter_processors: list[Processor], log_renderer: structlog.types.Processor
     ) -> None:
         # Use `ProcessorFormatter` to format all `logging` entries.
         formatter = structlog.stdlib.ProcessorFormatter(
-            foreign_pre_chain=shared_processors,
+            foreign_pre_chain=[structlog.stdlib.ExtraAdder()],
             processors=[
+                *formatter_processors,
                 # Remove _record & _from_structlog.
                 structlog.stdlib.ProcessorFormatter.remove_processors_meta,
                 log_renderer,
             ],
         )
 
-        handler = logging.StreamHandler()
+        stream_handler = logging.StreamHandler()
         # Use structlog `ProcessorFormatter` to format all `logging` entries.
-        handler.setFormatter(formatter)
+        stream_handler.setFormatter(formatter)
+
+        # Records are queued on the calling thread and formatted and written by
+        # a listener thread, so a slow stderr never blocks the event loop.
+        log_queue: queue.Queue = queue.Queue(maxsize=self.settings.logging_queue_size)
+        handler = NonBlockingQueueHandler(log_queue)
+        listener = logging.handlers.QueueListener(log_queue, stream_handler)
 
         logging.getLogger("asyncio").setLevel(logging.WARNING)
 
-        # Set logging level.
-        root_logger = logging.getLogger(self.logger_name)
+        # Service modules log through loggers named after themselves, so the
+        # handler goes on the root logger. Configuring again replaces it.
+        root_logger = logging.getLogger()
+        if LoggerConfigurator._handler is not None:
+            root_logger.removeHandler(LoggerConfigurator._handler)
+            LoggerConfigurator.stop_listener()
+        else:
+            # Flush what is still queued when the process exits.
+            atexit.register(LoggerConfigurator.stop_listener)
         root_logger.addHandler(handler)
         root_logger.setLevel(self.settings.logging_level)
 
+        listener.start()
+        LoggerConfigurator._handler = handler
+        LoggerConfigurator._listener = listener
+
         for _log in ["uvicorn", "uvicorn.error", "uvicorn.access"]:
             # Clear the log handlers for uvicorn loggers, and enable propagation
             # so the messages are caught by our root logger and formatted correctly
@@ -0,0 +1,91 @@
+import random
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+import structlog
+from structlog.typing import EventDict, WrappedLogger
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+SAMPLED_METHODS = frozenset({"debug", "info"})
+
+
+class _RequestLogState:
+    __slots__ = ("scope", "keep")
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.keep: Optional[bool] = None
+
+
+_request_log_state: ContextVar[Optional[_RequestLogState]] = ContextVar(
+    "request_log_state", default=None
+)
+
+
+class LogSamplingMiddleware:
+    """
+    Makes the current request visible to `RouteSampler`. The route is looked
+    up from the ASGI scope when the first event is logged, after routing has
+    filled it in.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _request_log_state.set(_RequestLogState(scope))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_log_state.reset(token)
+
+
+class RouteSampler:
+    """
+    structlog processor that keeps the debug and info events of a sampled
+    share of requests and drops the rest. Warnings and errors, and events
+    logged outside a request, are always kept.
+
+    The decision is made once per request, so a kept request keeps all of its
+    events. `route_rates` is keyed by route template, with or without the
+    method (`"POST /api/topup/"` or `"/api/topup/"`); other routes use
+    `default_rate`.
+    """
+
+    def __init__(self, default_rate: float = 1.0, route_rates: Optional[Dict[str, float]] = None):
+        self.default_rate = default_rate
+        self.route_rates = route_rates or {}
+
+    def _rate(self, scope: Scope) -> Optional[float]:
+        route = scope.get("route")
+        path = getattr(route, "path", None)
+        if path is None:
+            return None
+        method_path = f"{scope.get('method')} {path}"
+        if method_path in self.route_rates:
+            return self.route_rates[method_path]
+        return self.route_rates.get(path, self.default_rate)
+
+    def __call__(self, _: WrappedLogger, method_name: str, event_dict: EventDict) -> EventDict:
+        if method_name not in SAMPLED_METHODS:
+            return event_dict
+
+        state = _request_log_state.get()
+        if state is None:
+            return event_dict
+
+        if state.keep is None:
+            rate = self._rate(state.scope)
+            if rate is None:
+                # Not routed yet; decide on a later event.
+                return event_dict
+            state.keep = rate >= 1 or random.random() < rate
+
+        if not state.keep:
+            raise structlog.DropEvent
+        return event_dict
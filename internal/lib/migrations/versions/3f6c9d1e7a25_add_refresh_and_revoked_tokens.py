@@ -0,0 +1,53 @@
+"""add refresh and revoked tokens
+
+Revision ID: 3f6c9d1e7a25
+Revises: 8e41d7a2c3f9
+Create Date: 2024-12-16 14:03:51.772904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import func
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6c9d1e7a25'
+down_revision: Union[str, None] = '8e41d7a2c3f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        'refresh_tokens',
+        sa.Column('token_hash', sa.Text, primary_key=True),
+        sa.Column(
+            'user_id', sa.Integer, sa.ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False
+        ),
+        sa.Column('family_id', sa.Text, nullable=False),
+        sa.Column('access_jti', sa.Text, nullable=False),
+        sa.Column('access_expires_at', sa.TIMESTAMP, nullable=False),
+        sa.Column('expires_at', sa.TIMESTAMP, nullable=False),
+        sa.Column('used_at', sa.TIMESTAMP, nullable=True),
+        sa.Column('revoked_at', sa.TIMESTAMP, nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP, server_default=func.current_timestamp()),
+    )
+    op.create_index('ix_refresh_tokens_family_id', 'refresh_tokens', ['family_id'])
+
+    op.create_table(
+        'revoked_tokens',
+        sa.Column('jti', sa.Text, primary_key=True),
+        sa.Column('expires_at', sa.TIMESTAMP, nullable=False),
+        sa.Column('revoked_at', sa.TIMESTAMP, nullable=False, server_default=func.current_timestamp()),
+    )
+    # Services poll the rows revoked since their last poll.
+    op.create_index('ix_revoked_tokens_revoked_at', 'revoked_tokens', ['revoked_at'])
+
+
+def downgrade():
+    op.drop_index('ix_revoked_tokens_revoked_at', table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
+    op.drop_index('ix_refresh_tokens_family_id', table_name='refresh_tokens')
+    op.drop_table('refresh_tokens')
@@ -0,0 +1,33 @@
+"""index movement user columns
+
+Revision ID: 50bb5fc04aa2
+Revises: c29d83ec430a
+Create Date: 2024-12-11 09:41:27.904551
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '50bb5fc04aa2'
+down_revision: Union[str, None] = 'c29d83ec430a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # Postgres does not index foreign keys on its own. The reconciliation worker
+    # aggregates each movement table over user_id ranges and needs these.
+    op.create_index('ix_topups_user_id', 'topups', ['user_id'])
+    op.create_index('ix_transfers_transfer_from', 'transfers', ['transfer_from'])
+    op.create_index('ix_transfers_transfer_to', 'transfers', ['transfer_to'])
+    op.create_index('ix_withdraws_user_id', 'withdraws', ['user_id'])
+
+
+def downgrade():
+    op.drop_index('ix_withdraws_user_id', table_name='withdraws')
+    op.drop_index('ix_transfers_transfer_to', table_name='transfers')
+    op.drop_index('ix_transfers_transfer_from', table_name='transfers')
+    op.drop_index('ix_topups_user_id', table_name='topups')
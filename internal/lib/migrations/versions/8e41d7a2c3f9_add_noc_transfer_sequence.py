@@ -0,0 +1,29 @@
+"""add noc_transfer sequence
+
+Revision ID: 8e41d7a2c3f9
+Revises: b5c147c06941
+Create Date: 2024-12-14 09:12:37.204318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e41d7a2c3f9'
+down_revision: Union[str, None] = 'b5c147c06941'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # Account numbers are permuted from this sequence's values, which never
+    # repeat, so new noc_transfer numbers cannot collide. The numbers handed
+    # out so far by random_vcc are 17 digits long, the new ones 16.
+    op.execute(sa.schema.CreateSequence(sa.Sequence('noc_transfer_seq')))
+
+
+def downgrade():
+    op.execute(sa.schema.DropSequence(sa.Sequence('noc_transfer_seq')))
@@ -0,0 +1,68 @@
+"""add daily transaction summaries
+
+Revision ID: b5c147c06941
+Revises: e725b5b469d4
+Create Date: 2024-12-13 10:22:48.630117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import func
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5c147c06941'
+down_revision: Union[str, None] = 'e725b5b469d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# transaction type -> (movement table, user column, amount column)
+SOURCES = {
+    'topup': ('topups', 'user_id', 'topup_amount'),
+    'withdraw': ('withdraws', 'user_id', 'withdraw_amount'),
+    'transfer_out': ('transfers', 'transfer_from', 'transfer_amount'),
+    'transfer_in': ('transfers', 'transfer_to', 'transfer_amount'),
+}
+
+
+def upgrade():
+    # Create the 'daily_transaction_summaries' table
+    op.create_table(
+        'daily_transaction_summaries',
+        sa.Column('user_id', sa.Integer, sa.ForeignKey('users.user_id'), nullable=False),
+        sa.Column('day', sa.Date, nullable=False),
+        sa.Column('transaction_type', sa.Text, nullable=False),
+        sa.Column('transaction_count', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('total_amount', sa.BigInteger, nullable=False, server_default='0'),
+        sa.Column('min_amount', sa.Integer, nullable=True),
+        sa.Column('max_amount', sa.Integer, nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP, server_default=func.current_timestamp()),
+        sa.PrimaryKeyConstraint('user_id', 'day', 'transaction_type'),
+    )
+    op.create_index(
+        'ix_daily_transaction_summaries_day',
+        'daily_transaction_summaries',
+        ['day', 'transaction_type'],
+    )
+
+    # Backfill from the movements still in the live tables. From here on the
+    # movement repositories keep the rollups current in their own transactions.
+    for transaction_type, (table, user_column, amount_column) in SOURCES.items():
+        op.execute(
+            f"""
+            INSERT INTO daily_transaction_summaries
+                (user_id, day, transaction_type, transaction_count, total_amount, min_amount, max_amount)
+            SELECT {user_column}, created_at::date, '{transaction_type}',
+                   count(*), sum({amount_column}), min({amount_column}), max({amount_column})
+            FROM {table}
+            GROUP BY {user_column}, created_at::date
+            """
+        )
+
+
+def downgrade():
+    op.drop_index('ix_daily_transaction_summaries_day', table_name='daily_transaction_summaries')
+    op.drop_table('daily_transaction_summaries')
@@ -0,0 +1,117 @@
+"""add ledger
+
+Revision ID: c29d83ec430a
+Revises: 5d683a99d478
+Create Date: 2024-12-09 10:04:51.318212
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import func
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c29d83ec430a'
+down_revision: Union[str, None] = '5d683a99d478'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # One saldo per user, so balance postings can upsert on user_id. Fails if
+    # duplicate saldo rows exist; those have to be merged by hand first.
+    op.create_unique_constraint('uq_saldo_user_id', 'saldo', ['user_id'])
+    op.add_column(
+        'saldo',
+        sa.Column('entries_since_checkpoint', sa.Integer, nullable=False, server_default='0'),
+    )
+
+    # Create the 'ledger_entries' table
+    op.create_table(
+        'ledger_entries',
+        sa.Column('entry_id', sa.BigInteger, primary_key=True, autoincrement=True),
+        sa.Column('movement_type', sa.Text, nullable=False),
+        sa.Column('movement_id', sa.Integer, nullable=True),
+        sa.Column('account', sa.Text, nullable=False),
+        sa.Column('user_id', sa.Integer, sa.ForeignKey('users.user_id'), nullable=True),
+        sa.Column('debit', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('credit', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('balance_after', sa.Integer, nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP, server_default=func.current_timestamp()),
+    )
+    op.create_index('ix_ledger_entries_user_id_entry_id', 'ledger_entries', ['user_id', 'entry_id'])
+    op.create_index('ix_ledger_entries_movement', 'ledger_entries', ['movement_type', 'movement_id'])
+
+    # Create the 'ledger_checkpoints' table
+    op.create_table(
+        'ledger_checkpoints',
+        sa.Column('checkpoint_id', sa.BigInteger, primary_key=True, autoincrement=True),
+        sa.Column('user_id', sa.Integer, sa.ForeignKey('users.user_id'), nullable=False),
+        sa.Column('entry_id', sa.BigInteger, nullable=False),
+        sa.Column('balance', sa.Integer, nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP, server_default=func.current_timestamp()),
+    )
+    op.create_index('ix_ledger_checkpoints_user_id_entry_id', 'ledger_checkpoints', ['user_id', 'entry_id'])
+
+    # Create the 'ledger_openings' table
+    op.create_table(
+        'ledger_openings',
+        sa.Column('movement_table', sa.Text, primary_key=True),
+        sa.Column('last_movement_id', sa.Integer, nullable=False),
+    )
+
+    # The opening balances below already include every movement so far;
+    # remember where each movement table stood, so reconciliation only adds
+    # the movements after it.
+    op.execute(
+        """
+        INSERT INTO ledger_openings (movement_table, last_movement_id)
+        SELECT 'topups', coalesce(max(topup_id), 0) FROM topups
+        UNION ALL
+        SELECT 'transfers', coalesce(max(transfer_id), 0) FROM transfers
+        UNION ALL
+        SELECT 'withdraws', coalesce(max(withdraw_id), 0) FROM withdraws
+        """
+    )
+
+    # Open the ledger with the current balances, balanced against a system account,
+    # and checkpoint every wallet at its opening entry.
+    op.execute(
+        """
+        INSERT INTO ledger_entries (movement_type, movement_id, account, user_id, debit, credit, balance_after)
+        SELECT 'opening', saldo_id, 'wallet', user_id,
+               GREATEST(-total_balance, 0), GREATEST(total_balance, 0), total_balance
+        FROM saldo
+        WHERE total_balance <> 0
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO ledger_entries (movement_type, movement_id, account, user_id, debit, credit, balance_after)
+        SELECT 'opening', saldo_id, 'system:opening', NULL,
+               GREATEST(total_balance, 0), GREATEST(-total_balance, 0), NULL
+        FROM saldo
+        WHERE total_balance <> 0
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO ledger_checkpoints (user_id, entry_id, balance)
+        SELECT user_id, entry_id, balance_after
+        FROM ledger_entries
+        WHERE movement_type = 'opening' AND account = 'wallet'
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('ledger_openings')
+    op.drop_index('ix_ledger_checkpoints_user_id_entry_id', table_name='ledger_checkpoints')
+    op.drop_table('ledger_checkpoints')
+    op.drop_index('ix_ledger_entries_movement', table_name='ledger_entries')
+    op.drop_index('ix_ledger_entries_user_id_entry_id', table_name='ledger_entries')
+    op.drop_table('ledger_entries')
+    op.drop_column('saldo', 'entries_since_checkpoint')
+    op.drop_constraint('uq_saldo_user_id', 'saldo', type_='unique')
@@ -0,0 +1,184 @@
+"""partition movement tables
+
+Revision ID: e725b5b469d4
+Revises: 50bb5fc04aa2
+Create Date: 2024-12-12 08:17:03.511842
+
+"""
+from datetime import date, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import func
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e725b5b469d4'
+down_revision: Union[str, None] = '50bb5fc04aa2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Months of empty partitions to create past the current one. Afterwards the
+# partition maintenance command keeps this window moving.
+PREMAKE_MONTHS = 3
+
+ARCHIVE_SCHEMA = 'archive'
+
+
+def _columns(table):
+    if table == 'topups':
+        return [
+            sa.Column('topup_id', sa.Integer, nullable=False, server_default=sa.text("nextval('topups_topup_id_seq')")),
+            sa.Column('user_id', sa.Integer, sa.ForeignKey('users.user_id'), nullable=False),
+            sa.Column('topup_no', sa.Text, nullable=False),
+            sa.Column('topup_amount', sa.Integer, nullable=False),
+            sa.Column('topup_method', sa.Text, nullable=False),
+            sa.Column('topup_time', sa.TIMESTAMP, nullable=False),
+        ]
+    if table == 'transfers':
+        return [
+            sa.Column('transfer_id', sa.Integer, nullable=False, server_default=sa.text("nextval('transfers_transfer_id_seq')")),
+            sa.Column('transfer_from', sa.Integer, sa.ForeignKey('users.user_id'), nullable=False),
+            sa.Column('transfer_to', sa.Integer, sa.ForeignKey('users.user_id'), nullable=False),
+            sa.Column('transfer_amount', sa.Integer, nullable=False),
+            sa.Column('transfer_time', sa.TIMESTAMP, nullable=False),
+        ]
+    return [
+        sa.Column('withdraw_id', sa.Integer, nullable=False, server_default=sa.text("nextval('withdraws_withdraw_id_seq')")),
+        sa.Column('user_id', sa.Integer, sa.ForeignKey('users.user_id'), nullable=False),
+        sa.Column('withdraw_amount', sa.Integer, nullable=False),
+        sa.Column('withdraw_time', sa.TIMESTAMP, nullable=False),
+    ]
+
+
+# table -> (primary key column, columns indexed together with created_at)
+TABLES = {
+    'topups': ('topup_id', [['user_id']]),
+    'transfers': ('transfer_id', [['transfer_from'], ['transfer_to']]),
+    'withdraws': ('withdraw_id', [['user_id']]),
+}
+
+
+def _add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_month_partitions(table, first_month, last_month):
+    month = first_month
+    while month <= last_month:
+        following = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE {table}_y{month.year:04d}m{month.month:02d} "
+            f"PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        month = following
+
+
+def upgrade():
+    op.execute(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}")
+
+    # Net effect per user of every movement that was moved out of the live tables
+    # by the retention policy, so reconciliation still balances afterwards.
+    op.create_table(
+        'archived_movement_totals',
+        sa.Column('partition_name', sa.Text, nullable=False),
+        sa.Column('user_id', sa.Integer, sa.ForeignKey('users.user_id'), nullable=False),
+        sa.Column('amount', sa.BigInteger, nullable=False),
+        sa.Column('archived_at', sa.TIMESTAMP, server_default=func.current_timestamp()),
+        sa.PrimaryKeyConstraint('partition_name', 'user_id'),
+    )
+
+    bind = op.get_bind()
+    this_month = date.today().replace(day=1)
+
+    for table, (pk, indexed) in TABLES.items():
+        legacy = f'{table}_legacy'
+
+        # Move the heap table out of the way. Its sequence is kept and handed
+        # over to the partitioned table, so ids keep counting from where they were.
+        for columns in indexed:
+            op.drop_index(f'ix_{table}_{columns[0]}', table_name=table)
+        op.rename_table(table, legacy)
+        op.execute(f"ALTER INDEX {table}_pkey RENAME TO {legacy}_pkey")
+        op.execute(f"ALTER SEQUENCE {table}_{pk}_seq OWNED BY NONE")
+
+        # The partition key has to be part of the primary key.
+        op.create_table(
+            table,
+            *_columns(table),
+            sa.Column('created_at', sa.TIMESTAMP, nullable=False, server_default=func.current_timestamp()),
+            sa.Column('updated_at', sa.TIMESTAMP, server_default=func.current_timestamp()),
+            sa.PrimaryKeyConstraint(pk, 'created_at', name=f'{table}_pkey'),
+            postgresql_partition_by='RANGE (created_at)',
+        )
+        for columns in indexed:
+            op.create_index(
+                f'ix_{table}_{columns[0]}_created_at', table, [*columns, 'created_at']
+            )
+
+        # Catches rows outside every monthly partition instead of failing the
+        # insert; the maintenance command moves them out when their month is created.
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+        oldest = bind.execute(
+            sa.text(
+                f"SELECT min(coalesce(created_at, updated_at)) FROM {legacy}"
+            )
+        ).scalar()
+        first_month = (oldest.date() if isinstance(oldest, datetime) else this_month).replace(day=1)
+        _create_month_partitions(
+            table, min(first_month, this_month), _add_months(this_month, PREMAKE_MONTHS)
+        )
+
+        columns = [column.name for column in _columns(table)]
+        column_list = ', '.join(columns)
+        op.execute(
+            f"""
+            INSERT INTO {table} ({column_list}, created_at, updated_at)
+            SELECT {column_list}, coalesce(created_at, updated_at, now()), updated_at
+            FROM {legacy}
+            """
+        )
+        op.execute(
+            f"SELECT setval('{table}_{pk}_seq', coalesce((SELECT max({pk}) FROM {table}), 0) + 1, false)"
+        )
+        op.execute(f"ALTER SEQUENCE {table}_{pk}_seq OWNED BY {table}.{pk}")
+        op.drop_table(legacy)
+
+
+def downgrade():
+    # Partitions already moved to the archive schema are not brought back.
+    for table, (pk, indexed) in TABLES.items():
+        partitioned = f'{table}_partitioned'
+
+        op.execute(f"ALTER SEQUENCE {table}_{pk}_seq OWNED BY NONE")
+        op.rename_table(table, partitioned)
+        op.execute(f"ALTER INDEX {table}_pkey RENAME TO {partitioned}_pkey")
+
+        op.create_table(
+            table,
+            *_columns(table),
+            sa.Column('created_at', sa.TIMESTAMP, server_default=func.current_timestamp()),
+            sa.Column('updated_at', sa.TIMESTAMP, server_default=func.current_timestamp()),
+            sa.PrimaryKeyConstraint(pk, name=f'{table}_pkey'),
+        )
+        columns = [column.name for column in _columns(table)]
+        column_list = ', '.join(columns)
+        op.execute(
+            f"""
+            INSERT INTO {table} ({column_list}, created_at, updated_at)
+            SELECT {column_list}, created_at, updated_at
+            FROM {partitioned}
+            """
+        )
+        op.execute(f"ALTER SEQUENCE {table}_{pk}_seq OWNED BY {table}.{pk}")
+        # Dropping the parent drops every attached partition with it.
+        op.drop_table(partitioned)
+        for columns in indexed:
+            op.create_index(f'ix_{table}_{columns[0]}', table, columns)
+
+    op.drop_table('archived_movement_totals')
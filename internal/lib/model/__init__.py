@@ -3,7 +3,11 @@ from .topup import Topup
 from .saldo import Saldo
 from .transfer import Transfer
 from .withdraw import Withdraw
+from .ledger import LedgerEntry, LedgerCheckpoint, LedgerOpening
+from .archive import ArchivedMovementTotal
+from .summary import DailyTransactionSummary
+from .token import RefreshToken, RevokedToken
 
 
 
-__all__ = ["User", "Topup", "Saldo", "Transfer", "Withdraw"]
+__all__ = ["User", "Topup", "Saldo", "Transfer", "Withdraw", "LedgerEntry", "LedgerCheckpoint", "LedgerOpening", "ArchivedMovementTotal", "DailyTransactionSummary", "RefreshToken", "RevokedToken"]
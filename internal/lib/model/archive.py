@@ -0,0 +1,19 @@
+from sqlalchemy import BigInteger, Integer, ForeignKey, Text, TIMESTAMP, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class ArchivedMovementTotal(Base):
+    """
+    Net balance effect per user of a movement partition that was detached by the
+    retention policy, so totals over the live tables plus these rows still add
+    up to the wallet balance.
+    """
+
+    __tablename__ = 'archived_movement_totals'
+
+    partition_name: Mapped[str] = mapped_column(Text, primary_key=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey('users.user_id'), primary_key=True)
+    amount: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    archived_at: Mapped[str] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
@@ -0,0 +1,60 @@
+from sqlalchemy import BigInteger, Integer, ForeignKey, Index, Text, TIMESTAMP, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class LedgerEntry(Base):
+    """
+    One leg of a double-entry posting. Rows are only ever inserted; corrections
+    are posted as reversing entries.
+    """
+
+    __tablename__ = 'ledger_entries'
+
+    entry_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    movement_type: Mapped[str] = mapped_column(Text, nullable=False)
+    movement_id: Mapped[int] = mapped_column(Integer, nullable=True)
+    account: Mapped[str] = mapped_column(Text, nullable=False)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey('users.user_id'), nullable=True)
+    debit: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    credit: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    balance_after: Mapped[int] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[str] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+
+    __table_args__ = (
+        Index('ix_ledger_entries_user_id_entry_id', 'user_id', 'entry_id'),
+        Index('ix_ledger_entries_movement', 'movement_type', 'movement_id'),
+    )
+
+
+class LedgerCheckpoint(Base):
+    """
+    Wallet balance of a user as of `entry_id`, so a balance can be recomputed
+    from the ledger without scanning the user's whole history.
+    """
+
+    __tablename__ = 'ledger_checkpoints'
+
+    checkpoint_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey('users.user_id'), nullable=False)
+    entry_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    balance: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[str] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+
+    __table_args__ = (
+        Index('ix_ledger_checkpoints_user_id_entry_id', 'user_id', 'entry_id'),
+    )
+
+
+class LedgerOpening(Base):
+    """
+    Last id of a movement table when the ledger was opened. Opening balances
+    already include every movement up to it, so balances are reconciled
+    against the movements after it only.
+    """
+
+    __tablename__ = 'ledger_openings'
+
+    movement_table: Mapped[str] = mapped_column(Text, primary_key=True)
+    last_movement_id: Mapped[int] = mapped_column(Integer, nullable=False)
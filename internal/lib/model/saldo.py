@@ -13,10 +13,11 @@ class Saldo(Base):
     __tablename__ = 'saldo'
 
     saldo_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_id: Mapped[int] = mapped_column(Integer, ForeignKey('users.user_id'), nullable=False)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey('users.user_id'), unique=True, nullable=False)
     total_balance: Mapped[int] = mapped_column(Integer, nullable=False)
     withdraw_amount: Mapped[int] = mapped_column(Integer, default=0)
     withdraw_time: Mapped[str] = mapped_column(TIMESTAMP)
+    entries_since_checkpoint: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
     created_at: Mapped[str] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
     updated_at: Mapped[str] = mapped_column(TIMESTAMP, server_default=func.current_timestamp(), onupdate=func.current_timestamp())
 
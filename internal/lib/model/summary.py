@@ -0,0 +1,26 @@
+from sqlalchemy import BigInteger, Date, Integer, ForeignKey, Index, Text, TIMESTAMP, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class DailyTransactionSummary(Base):
+    """
+    Per user, per day and per transaction type rollup of the movement tables,
+    maintained in the same transaction as the movement itself.
+    """
+
+    __tablename__ = 'daily_transaction_summaries'
+
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey('users.user_id'), primary_key=True)
+    day: Mapped[str] = mapped_column(Date, primary_key=True)
+    transaction_type: Mapped[str] = mapped_column(Text, primary_key=True)
+    transaction_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_amount: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    min_amount: Mapped[int] = mapped_column(Integer, nullable=True)
+    max_amount: Mapped[int] = mapped_column(Integer, nullable=True)
+    updated_at: Mapped[str] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+
+    __table_args__ = (
+        Index('ix_daily_transaction_summaries_day', 'day', 'transaction_type'),
+    )
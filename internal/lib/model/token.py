@@ -0,0 +1,50 @@
+from sqlalchemy import Integer, ForeignKey, Index, Text, TIMESTAMP, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class RefreshToken(Base):
+    """
+    A refresh token, by the SHA-256 of its value; the value itself is only
+    ever known to the client. Tokens are single use: refreshing marks the
+    token used and issues the next one in the same family. A used token
+    presented again revokes its whole family, as it must have been copied.
+    """
+
+    __tablename__ = 'refresh_tokens'
+
+    token_hash: Mapped[str] = mapped_column(Text, primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False
+    )
+    family_id: Mapped[str] = mapped_column(Text, nullable=False)
+    # The access token issued along with this one, revoked with the family.
+    access_jti: Mapped[str] = mapped_column(Text, nullable=False)
+    access_expires_at: Mapped[str] = mapped_column(TIMESTAMP, nullable=False)
+    expires_at: Mapped[str] = mapped_column(TIMESTAMP, nullable=False)
+    used_at: Mapped[str] = mapped_column(TIMESTAMP, nullable=True)
+    revoked_at: Mapped[str] = mapped_column(TIMESTAMP, nullable=True)
+    created_at: Mapped[str] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+
+    __table_args__ = (
+        Index('ix_refresh_tokens_family_id', 'family_id'),
+    )
+
+
+class RevokedToken(Base):
+    """
+    An access token revoked before it expires, by its `jti` claim. Every
+    service polls the rows revoked since its last poll into memory (see
+    lib.security.revocation); rows can go once the token has expired.
+    """
+
+    __tablename__ = 'revoked_tokens'
+
+    jti: Mapped[str] = mapped_column(Text, primary_key=True)
+    expires_at: Mapped[str] = mapped_column(TIMESTAMP, nullable=False)
+    revoked_at: Mapped[str] = mapped_column(TIMESTAMP, nullable=False, server_default=func.current_timestamp())
+
+    __table_args__ = (
+        Index('ix_revoked_tokens_revoked_at', 'revoked_at'),
+    )
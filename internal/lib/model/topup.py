@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    create_engine, Column, Integer, String, ForeignKey, Text, Sequence, TIMESTAMP, func
+    create_engine, Column, Index, Integer, String, ForeignKey, Text, Sequence, TIMESTAMP, func
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, declarative_base
@@ -19,8 +19,15 @@ class Topup(Base):
     topup_amount: Mapped[int] = mapped_column(Integer, nullable=False)
     topup_method: Mapped[str] = mapped_column(Text, nullable=False)
     topup_time: Mapped[str] = mapped_column(TIMESTAMP, nullable=False)
-    created_at: Mapped[str] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+    created_at: Mapped[str] = mapped_column(TIMESTAMP, primary_key=True, nullable=False, server_default=func.current_timestamp())
     updated_at: Mapped[str] = mapped_column(TIMESTAMP, server_default=func.current_timestamp(), onupdate=func.current_timestamp())
 
+    # Range-partitioned by month on created_at, which is therefore part of the
+    # primary key. Partitions are managed by lib.partition.
+    __table_args__ = (
+        Index('ix_topups_user_id_created_at', 'user_id', 'created_at'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+
     # Relationships
     user = relationship('User', back_populates='topups')
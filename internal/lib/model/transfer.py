@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    create_engine, Column, Integer, String, ForeignKey, Text, Sequence, TIMESTAMP, func
+    create_engine, Column, Index, Integer, String, ForeignKey, Text, Sequence, TIMESTAMP, func
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, declarative_base
@@ -16,9 +16,17 @@ class Transfer(Base):
     transfer_to: Mapped[int] = mapped_column(Integer, ForeignKey('users.user_id'), nullable=False)
     transfer_amount: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     transfer_time: Mapped[str] = mapped_column(TIMESTAMP, nullable=False)
-    created_at: Mapped[str] = mapped_column(TIMESTAMP, server_default=func.current_timestamp())
+    created_at: Mapped[str] = mapped_column(TIMESTAMP, primary_key=True, nullable=False, server_default=func.current_timestamp())
     updated_at: Mapped[str] = mapped_column(TIMESTAMP, server_default=func.current_timestamp(), onupdate=func.current_timestamp())
 
+    # Range-partitioned by month on created_at, which is therefore part of the
+    # primary key. Partitions are managed by lib.partition.
+    __table_args__ = (
+        Index('ix_transfers_transfer_from_created_at', 'transfer_from', 'created_at'),
+        Index('ix_transfers_transfer_to_created_at', 'transfer_to', 'created_at'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+
     # Relationships
     user_from = relationship('User', foreign_keys=[transfer_from], back_populates='transfers_from')
     user_to = relationship('User', foreign_keys=[transfer_to], back_populates='transfers_to')
@@ -6,6 +6,10 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import Base
 
 
+# Source of account numbers; see lib.utils.account_number.
+NOC_TRANSFER_SEQ = Sequence("noc_transfer_seq", metadata=Base.metadata)
+
+
 class User(Base):
     __tablename__ = 'users'
     user_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
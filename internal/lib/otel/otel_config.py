@@ -1,28 +1,107 @@
+import asyncio
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Union
+
 from opentelemetry import trace
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from opentelemetry.sdk.resources import Resource
-from opentelemetry.instrumentation.aiokafka import AIOKafkaInstrumentor
-from opentelemetry.trace import get_tracer_provider, set_tracer_provider
+from opentelemetry.trace import NoOpTracer, Span, get_tracer_provider, set_tracer_provider
+from opentelemetry.util.types import Attributes
+
+from lib.config.base import BaseAppSettings
+from lib.config.main import get_app_settings
+from lib.otel.sampling import TailAwareSampler, TailSamplingSpanProcessor
 
 
 class OpenTelemetryManager:
-    def __init__(self, service_name: str, endpoint: str = "http://localhost:4317"):
+    """
+    Sets up tracing for a service once per process and hands out its tracer.
+
+    Sampling and export are driven by the `otel_*` settings: root spans are
+    sampled at `otel_sample_ratio` and children follow their parent. When the
+    ratio leaves traces out, those that fail or run longer than
+    `otel_tail_slow_ms` are still exported. With `otel_enabled` off the tracer
+    is a no-op and nothing is recorded or exported.
+    """
+
+    def __init__(
+        self,
+        service_name: str,
+        endpoint: str = "http://localhost:4317",
+        settings: Optional[BaseAppSettings] = None,
+    ):
+        settings = settings or get_app_settings()
+
+        if not settings.otel_enabled:
+            self.tracer_provider = None
+            self.tracer = NoOpTracer()
+            return
+
         if not isinstance(get_tracer_provider(), TracerProvider):
-            self.tracer_provider = TracerProvider(
-                resource=Resource.create({"service.name": service_name})
-            )
+            self.tracer_provider = self._create_provider(service_name, endpoint, settings)
             set_tracer_provider(self.tracer_provider)
-            otlp_exporter = OTLPSpanExporter(endpoint=endpoint, insecure=True)
-            span_processor = BatchSpanProcessor(otlp_exporter)
-            self.tracer_provider.add_span_processor(span_processor)
         else:
             self.tracer_provider = get_tracer_provider()
 
         self.tracer = trace.get_tracer(service_name)
 
-    def start_trace(self, span_name: str):
+    @staticmethod
+    def _create_provider(service_name: str, endpoint: str, settings: BaseAppSettings) -> TracerProvider:
+        tail_sampling = settings.otel_sample_ratio < 1 and (
+            settings.otel_tail_keep_errors or settings.otel_tail_slow_ms > 0
+        )
+        tracer_provider = TracerProvider(
+            resource=Resource.create({"service.name": service_name}),
+            sampler=TailAwareSampler(settings.otel_sample_ratio, record_unsampled=tail_sampling),
+        )
+
+        # The gRPC exporter pulls in grpc and protobuf; only pay for that
+        # import when tracing is actually exported.
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+
+        otlp_exporter = OTLPSpanExporter(endpoint=endpoint, insecure=True)
+        span_processor = BatchSpanProcessor(
+            otlp_exporter,
+            max_queue_size=settings.otel_export_max_queue_size,
+            max_export_batch_size=settings.otel_export_max_batch_size,
+            schedule_delay_millis=settings.otel_export_schedule_delay_ms,
+            export_timeout_millis=settings.otel_export_timeout_ms,
+        )
+        if tail_sampling:
+            span_processor = TailSamplingSpanProcessor(
+                span_processor,
+                keep_errors=settings.otel_tail_keep_errors,
+                slow_threshold_ms=settings.otel_tail_slow_ms,
+                max_pending_traces=settings.otel_tail_max_pending_traces,
+            )
+        tracer_provider.add_span_processor(span_processor)
+        return tracer_provider
+
+    async def flush(self, timeout_millis: int = 30000) -> None:
+        """Export the spans still queued; the exporter itself is shut down at exit."""
+        if self.tracer_provider is not None:
+            await asyncio.to_thread(self.tracer_provider.force_flush, timeout_millis)
+
+    def start_trace(
+        self, span_name: str, attributes: Union[Attributes, Callable[[], Attributes]] = None
+    ):
+        """
+        Start a span as the current span. `attributes` may be a callable, which
+        is only called when the span is recorded, to keep attribute work off
+        the path of spans that are sampled out.
+        """
         if not span_name:
             raise ValueError("Span name must be provided")
-        return self.tracer.start_as_current_span(span_name)
+        if attributes is None:
+            return self.tracer.start_as_current_span(span_name)
+        return self._start_with_attributes(span_name, attributes)
+
+    @contextmanager
+    def _start_with_attributes(
+        self, span_name: str, attributes: Union[Attributes, Callable[[], Attributes]]
+    ) -> Iterator[Span]:
+        with self.tracer.start_as_current_span(span_name) as span:
+            if span.is_recording():
+                span.set_attributes(attributes() if callable(attributes) else attributes)
+            yield span
@@ -0,0 +1,149 @@
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.sdk.trace.sampling import Decision, Sampler, SamplingResult, TraceIdRatioBased
+from opentelemetry.trace import Link, SpanContext, SpanKind, StatusCode, TraceFlags, get_current_span
+from opentelemetry.trace.span import TraceState
+from opentelemetry.util.types import Attributes
+
+
+class TailAwareSampler(Sampler):
+    """
+    Parent-based ratio sampler. Root spans are sampled with probability `ratio`
+    and children follow their parent.
+
+    With `record_unsampled`, spans that are not sampled are still recorded
+    (RECORD_ONLY) instead of dropped, so `TailSamplingSpanProcessor` can look at
+    them when they end and export the traces that failed or were slow anyway.
+    Without it, unsampled spans are non-recording and cost next to nothing.
+    """
+
+    def __init__(self, ratio: float, record_unsampled: bool = False):
+        self._root = TraceIdRatioBased(ratio)
+        self._unsampled = Decision.RECORD_ONLY if record_unsampled else Decision.DROP
+
+    def should_sample(
+        self,
+        parent_context: Optional[Context],
+        trace_id: int,
+        name: str,
+        kind: Optional[SpanKind] = None,
+        attributes: Attributes = None,
+        links: Optional[Sequence[Link]] = None,
+        trace_state: Optional[TraceState] = None,
+    ) -> SamplingResult:
+        parent = get_current_span(parent_context).get_span_context()
+        if parent.is_valid:
+            sampled = parent.trace_flags.sampled
+        else:
+            sampled = self._root.should_sample(
+                parent_context, trace_id, name, kind, attributes, links
+            ).decision.is_sampled()
+
+        decision = Decision.RECORD_AND_SAMPLE if sampled else self._unsampled
+        return SamplingResult(
+            decision,
+            attributes if decision.is_recording() else None,
+            parent.trace_state if parent.is_valid else trace_state,
+        )
+
+    def get_description(self) -> str:
+        return f"TailAwareSampler{{{self._root.get_description()}}}"
+
+
+class TailSamplingSpanProcessor(SpanProcessor):
+    """
+    Passes sampled spans straight on to `processor` and holds back the recorded
+    but unsampled ones per trace. When the local root of a held trace ends, the
+    whole trace is exported if any of its spans failed (error status or a
+    recorded exception) or took at least `slow_threshold_ms`, and dropped
+    otherwise.
+
+    At most `max_pending_traces` traces are held; the oldest is dropped beyond
+    that, so a span that never ends cannot grow the buffer without bound.
+    """
+
+    def __init__(
+        self,
+        processor: SpanProcessor,
+        keep_errors: bool = True,
+        slow_threshold_ms: float = 0,
+        max_pending_traces: int = 4096,
+    ):
+        self._processor = processor
+        self._keep_errors = keep_errors
+        self._slow_threshold_ns = int(slow_threshold_ms * 1_000_000) if slow_threshold_ms > 0 else None
+        self._max_pending_traces = max_pending_traces
+        self._pending: "OrderedDict[int, List[ReadableSpan]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        self._processor.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if span.context.trace_flags.sampled:
+            self._processor.on_end(span)
+            return
+
+        trace_id = span.context.trace_id
+        with self._lock:
+            spans = self._pending.get(trace_id)
+            if spans is None:
+                spans = self._pending[trace_id] = []
+                if len(self._pending) > self._max_pending_traces:
+                    self._pending.popitem(last=False)
+            spans.append(span)
+
+            # Children end before their parent, so the local root ends last.
+            if span.parent is not None and not span.parent.is_remote:
+                return
+            del self._pending[trace_id]
+
+        if any(self._keep(held) for held in spans):
+            for held in spans:
+                self._processor.on_end(_as_sampled(held))
+
+    def _keep(self, span: ReadableSpan) -> bool:
+        if self._keep_errors and (
+            span.status.status_code is StatusCode.ERROR
+            or any(event.name == "exception" for event in span.events)
+        ):
+            return True
+        return (
+            self._slow_threshold_ns is not None
+            and span.end_time - span.start_time >= self._slow_threshold_ns
+        )
+
+    def shutdown(self) -> None:
+        self._processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._processor.force_flush(timeout_millis)
+
+
+def _as_sampled(span: ReadableSpan) -> ReadableSpan:
+    # Exporting processors skip spans without the sampled flag.
+    context = span.context
+    return ReadableSpan(
+        name=span.name,
+        context=SpanContext(
+            context.trace_id,
+            context.span_id,
+            context.is_remote,
+            TraceFlags(context.trace_flags | TraceFlags.SAMPLED),
+            context.trace_state,
+        ),
+        parent=span.parent,
+        resource=span.resource,
+        attributes=span.attributes,
+        events=span.events,
+        links=span.links,
+        kind=span.kind,
+        status=span.status,
+        start_time=span.start_time,
+        end_time=span.end_time,
+        instrumentation_scope=span.instrumentation_scope,
+    )
@@ -0,0 +1,43 @@
+import argparse
+import asyncio
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from lib.config.main import get_app_settings
+from lib.logging.logging_config import LoggerConfigurator
+from lib.partition.partition import PartitionManager
+
+
+def parse_args():
+    settings = get_app_settings()
+    parser = argparse.ArgumentParser(
+        description="Create upcoming and retire expired monthly partitions of the movement tables."
+    )
+    parser.add_argument("--premake-months", type=int, default=settings.partition_premake_months)
+    parser.add_argument("--retention-months", type=int, default=settings.partition_retention_months)
+    parser.add_argument("--archive-schema", default=settings.partition_archive_schema)
+    parser.add_argument("--drop", action="store_true", help="drop expired partitions instead of archiving them")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    settings = get_app_settings()
+
+    LoggerConfigurator(logger_name="partition-maintenance").configure_logger(json_logs=True)
+
+    engine = create_async_engine(**settings.sqlalchemy_engine_props, pool_size=1, max_overflow=0)
+    partition_manager = PartitionManager(
+        engine=engine,
+        premake_months=args.premake_months,
+        retention_months=args.retention_months,
+        archive_schema=args.archive_schema,
+    )
+    try:
+        await partition_manager.run(drop=args.drop)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,213 @@
+import re
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import ColumnElement, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from structlog import get_logger
+
+
+logger = get_logger()
+
+
+PARTITIONED_TABLES = ("topups", "transfers", "withdraws")
+
+# Net balance effect per user of the rows in one partition, for
+# archived_movement_totals. `{partition}` is substituted with the partition name.
+# Rows up to ledger_openings are left out: the ledger's opening balances
+# already include them, and later edits of them are reconciled from their
+# ledger entries, which are never detached.
+NET_AMOUNT_SQL: Dict[str, str] = {
+    "topups": """
+        SELECT user_id, sum(topup_amount)
+        FROM {partition}
+        WHERE topup_id > (SELECT last_movement_id FROM ledger_openings WHERE movement_table = 'topups')
+        GROUP BY user_id
+    """,
+    "transfers": """
+        SELECT user_id, sum(amount)
+        FROM (
+            SELECT transfer_from AS user_id, -transfer_amount AS amount, transfer_id FROM {partition}
+            UNION ALL
+            SELECT transfer_to AS user_id, transfer_amount AS amount, transfer_id FROM {partition}
+        ) AS legs
+        WHERE transfer_id > (SELECT last_movement_id FROM ledger_openings WHERE movement_table = 'transfers')
+        GROUP BY user_id
+    """,
+    "withdraws": """
+        SELECT user_id, -sum(withdraw_amount)
+        FROM {partition}
+        WHERE withdraw_id > (SELECT last_movement_id FROM ledger_openings WHERE movement_table = 'withdraws')
+        GROUP BY user_id
+    """,
+}
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def created_between(
+    column, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+) -> List[ColumnElement[bool]]:
+    """
+    Conditions bounding a partitioned table's `created_at` column to
+    [start_date, end_date). Postgres only scans the partitions they overlap.
+    """
+    conditions = []
+    if start_date is not None:
+        conditions.append(column >= start_date)
+    if end_date is not None:
+        conditions.append(column < end_date)
+    return conditions
+
+
+def partition_month(table: str, name: str) -> Optional[date]:
+    """Return the month a partition of `table` covers, or None for the default partition."""
+    match = re.fullmatch(rf"{table}_y(\d{{4}})m(\d{{2}})", name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+class PartitionManager:
+    """
+    Maintains the monthly range partitions of the movement tables: creates
+    partitions `premake_months` ahead of the current month and moves partitions
+    that fall entirely outside the last `retention_months` out of the live
+    tables, either into `archive_schema` or, with `drop=True`, away entirely.
+
+    Before a partition is detached its net effect per user is recorded in
+    `archived_movement_totals`, so balances can still be reconciled against the
+    movement tables afterwards.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        premake_months: int = 3,
+        retention_months: int = 24,
+        archive_schema: str = "archive",
+    ):
+        self.engine = engine
+        self.premake_months = premake_months
+        self.retention_months = retention_months
+        self.archive_schema = archive_schema
+
+    async def run(self, today: Optional[date] = None, drop: bool = False) -> dict:
+        today = today or date.today()
+        created = await self.create_ahead(today)
+        expired = await self.expire(today, drop=drop)
+        return {"created": created, "expired": expired}
+
+    async def create_ahead(self, today: Optional[date] = None) -> List[str]:
+        """Create every missing partition from the current month up to the premake horizon."""
+        this_month = (today or date.today()).replace(day=1)
+        created = []
+        for table in PARTITIONED_TABLES:
+            for offset in range(self.premake_months + 1):
+                month = add_months(this_month, offset)
+                async with self.engine.begin() as conn:
+                    if await self._create_partition(conn, table, month):
+                        created.append(partition_name(table, month))
+        return created
+
+    async def expire(self, today: Optional[date] = None, drop: bool = False) -> List[str]:
+        """Detach every partition whose whole month lies before the retention window."""
+        cutoff = add_months((today or date.today()).replace(day=1), -self.retention_months)
+        expired = []
+        for table in PARTITIONED_TABLES:
+            async with self.engine.connect() as conn:
+                names = await self._partitions(conn, table)
+
+            for name in names:
+                month = partition_month(table, name)
+                if month is None or add_months(month, 1) > cutoff:
+                    continue
+                async with self.engine.begin() as conn:
+                    await self._detach_partition(conn, table, name, drop)
+                expired.append(name)
+        return expired
+
+    async def _create_partition(self, conn: AsyncConnection, table: str, month: date) -> bool:
+        name = partition_name(table, month)
+        exists = await conn.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+        if exists:
+            return False
+
+        start, end = month, add_months(month, 1)
+        bounds = f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        params = {
+            "start": datetime(start.year, start.month, 1),
+            "end": datetime(end.year, end.month, 1),
+        }
+
+        # Rows that landed in the default partition because their month did not
+        # exist yet have to move into the new partition, or Postgres refuses to
+        # add it. Done in one transaction so no row is visible twice or missing.
+        stray = await conn.scalar(
+            text(
+                f"SELECT EXISTS (SELECT 1 FROM {table}_default "
+                "WHERE created_at >= :start AND created_at < :end)"
+            ),
+            params,
+        )
+        if stray:
+            await conn.execute(
+                text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+            )
+            await conn.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM {table}_default "
+                    "WHERE created_at >= :start AND created_at < :end RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                ),
+                params,
+            )
+            await conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES {bounds}"))
+        else:
+            await conn.execute(text(f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES {bounds}"))
+
+        logger.info("Created partition", table=table, partition=name, moved_from_default=bool(stray))
+        return True
+
+    async def _partitions(self, conn: AsyncConnection, table: str) -> List[str]:
+        result = await conn.execute(
+            text(
+                """
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = :table
+                ORDER BY child.relname
+                """
+            ),
+            {"table": table},
+        )
+        return list(result.scalars())
+
+    async def _detach_partition(
+        self, conn: AsyncConnection, table: str, name: str, drop: bool
+    ) -> None:
+        await conn.execute(
+            text(
+                "INSERT INTO archived_movement_totals (partition_name, user_id, amount) "
+                f"SELECT :name, totals.* FROM ({NET_AMOUNT_SQL[table].format(partition=name)}) AS totals "
+                "ON CONFLICT (partition_name, user_id) DO NOTHING"
+            ),
+            {"name": name},
+        )
+        await conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        if drop:
+            await conn.execute(text(f"DROP TABLE {name}"))
+        else:
+            await conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {self.archive_schema}"))
+            await conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {self.archive_schema}"))
+
+        logger.info("Detached partition", table=table, partition=name, dropped=drop)
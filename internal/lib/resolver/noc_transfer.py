@@ -0,0 +1,88 @@
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+
+from lib.events.events import UserChanged
+
+
+NOC_RESOLVER_LOOKUPS = Counter(
+    "noc_resolver_lookup_count", "noc_transfer lookups, by whether the cache answered them", ["result"]
+)
+NOC_RESOLVER_INVALIDATIONS = Counter(
+    "noc_resolver_invalidation_count", "Users dropped from the noc_transfer cache after a change"
+)
+NOC_RESOLVER_SIZE = Gauge("noc_resolver_size", "noc_transfer entries cached by this process")
+
+Lookup = Callable[[str], Awaitable[Optional[int]]]
+
+
+class NocTransferResolver:
+    """
+    Resolves a noc_transfer to its user id, keeping the last `size` answers
+    in process (least recently used first out) for `ttl` seconds. Misses go
+    to `lookup`, which queries the unique index on users.noc_transfer;
+    unknown numbers are not cached, so a new user resolves at once.
+
+    Entries are dropped when the user changes (see
+    `lib.events.user_changes.UserChangeFollower`). The ttl only bounds how
+    stale an entry can get while those events are not arriving.
+    """
+
+    def __init__(self, size: int = 10000, ttl: float = 300.0):
+        self.size = size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._by_user: Dict[int, str] = {}
+        # Bumped by every invalidation, so that a lookup that was in flight
+        # meanwhile does not cache what it read before the change.
+        self._generation = 0
+
+    async def resolve(self, noc_transfer: str, lookup: Lookup) -> Optional[int]:
+        entry = self._entries.get(noc_transfer)
+        if entry is not None:
+            user_id, expires_at = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(noc_transfer)
+                NOC_RESOLVER_LOOKUPS.labels("hit").inc()
+                return user_id
+            self._drop(noc_transfer)
+
+        NOC_RESOLVER_LOOKUPS.labels("miss").inc()
+        generation = self._generation
+        user_id = await lookup(noc_transfer)
+        if user_id is not None and generation == self._generation:
+            self._put(noc_transfer, user_id)
+        return user_id
+
+    def invalidate(self, user_id: int, noc_transfer: Optional[str] = None) -> None:
+        """Forget a user, by id and by the noc_transfer it had."""
+        self._generation += 1
+        NOC_RESOLVER_INVALIDATIONS.inc()
+        for key in {self._by_user.get(user_id), noc_transfer}:
+            if key is not None:
+                self._drop(key)
+
+    def user_changed(self, event: UserChanged) -> None:
+        self.invalidate(event.user_id, event.noc_transfer)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        self._by_user.clear()
+        NOC_RESOLVER_SIZE.set(0)
+
+    def _put(self, noc_transfer: str, user_id: int) -> None:
+        self._entries[noc_transfer] = (user_id, time.monotonic() + self.ttl)
+        self._entries.move_to_end(noc_transfer)
+        self._by_user[user_id] = noc_transfer
+        while len(self._entries) > self.size:
+            self._drop(next(iter(self._entries)))
+        NOC_RESOLVER_SIZE.set(len(self._entries))
+
+    def _drop(self, noc_transfer: str) -> None:
+        entry = self._entries.pop(noc_transfer, None)
+        if entry is not None and self._by_user.get(entry[0]) == noc_transfer:
+            del self._by_user[entry[0]]
+        NOC_RESOLVER_SIZE.set(len(self._entries))
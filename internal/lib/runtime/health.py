@@ -0,0 +1,116 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Mapping, Optional
+
+from fastapi import APIRouter
+from prometheus_client import Gauge
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from lib.config.app import AppSettings
+from lib.config.main import get_app_settings
+from lib.http.response import ORJSONResponse
+from lib.runtime.startup import startup
+
+
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests being handled, probes and metrics excluded",
+    multiprocess_mode="livesum",
+)
+
+# Probes and scrapes are not traffic: they neither count as in flight nor wait for a drain.
+PROBE_PATHS = frozenset({"/healthz", "/readyz", "/metrics"})
+
+HealthCheck = Callable[[], Awaitable[object]]
+
+
+class TrafficState:
+    """Requests in flight in this process, and whether it is draining for shutdown."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.draining = False
+
+    async def wait_idle(self, timeout: float) -> bool:
+        """Wait until no request is in flight, for at most `timeout` seconds."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.in_flight and loop.time() < deadline:
+            await asyncio.sleep(0.05)
+        return self.in_flight == 0
+
+
+traffic = TrafficState()
+
+
+class InFlightMiddleware:
+    """Counts the HTTP requests being handled, for readiness and the drain on shutdown."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in PROBE_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        traffic.in_flight += 1
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            traffic.in_flight -= 1
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+
+
+async def _run_check(check: HealthCheck, timeout: float) -> Optional[str]:
+    try:
+        await asyncio.wait_for(check(), timeout)
+    except asyncio.TimeoutError:
+        return f"timed out after {timeout}s"
+    except Exception as e:
+        return str(e) or type(e).__name__
+    return None
+
+
+def health_router(
+    checks: Optional[Mapping[str, HealthCheck]] = None,
+    settings: Optional[AppSettings] = None,
+) -> APIRouter:
+    """
+    `/healthz` answers as long as the process serves requests at all.
+
+    `/readyz` answers 200 only when the service should get traffic: it has
+    finished warming up, is not draining, has fewer than
+    `max_in_flight_requests` requests in flight (when set), and every one of
+    `checks` (database, Kafka producer, ...) passes within
+    `health_check_timeout_seconds`. Otherwise it answers 503 with the reason.
+    """
+    settings = settings or get_app_settings()
+    checks = dict(checks or {})
+    router = APIRouter()
+
+    @router.get("/healthz", include_in_schema=False)
+    async def healthz() -> ORJSONResponse:
+        return ORJSONResponse({"status": "ok"})
+
+    @router.get("/readyz", include_in_schema=False)
+    async def readyz() -> ORJSONResponse:
+        body: Dict[str, object] = {"status": "ready", "in_flight": traffic.in_flight}
+
+        if not startup.ready:
+            body["status"] = "starting"
+        elif traffic.draining:
+            body["status"] = "draining"
+        else:
+            if settings.max_in_flight_requests and traffic.in_flight >= settings.max_in_flight_requests:
+                body["status"] = "saturated"
+            errors = await asyncio.gather(
+                *(_run_check(check, settings.health_check_timeout_seconds) for check in checks.values())
+            )
+            body["checks"] = {name: error or "ok" for name, error in zip(checks, errors)}
+            if any(errors) and body["status"] == "ready":
+                body["status"] = "unhealthy"
+
+        return ORJSONResponse(body, status_code=200 if body["status"] == "ready" else 503)
+
+    return router
@@ -0,0 +1,110 @@
+"""
+Import-time breakdown of a service's `main` module, from `python -X importtime`.
+
+Importing `main` also builds the app, so this is what a fresh process spends
+before it can start serving. The report lists the total, the cost per
+top-level package (self time, so nothing is counted twice) and the slowest
+imports made directly by the service's own modules.
+
+Usage:
+    python -m lib.runtime.import_profile transfer_service [--top 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Sequence
+
+INTERNAL_DIR = Path(__file__).resolve().parents[2]
+SERVICES_DIR = INTERNAL_DIR / "services"
+
+
+class ImportTime(NamedTuple):
+    module: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str) -> List[ImportTime]:
+    """Parse the `import time:` lines written to stderr by `-X importtime`."""
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        # One space after the bar, then two per level of nesting.
+        depth = (len(name) - len(stripped) - 1) // 2
+        entries.append(ImportTime(stripped, depth, int(fields[0]), int(fields[1])))
+    return entries
+
+
+def profile(service: str) -> List[ImportTime]:
+    root = SERVICES_DIR / service
+    if not (root / "main.py").exists():
+        raise SystemExit(f"no main.py in {root}")
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(root), str(INTERNAL_DIR)]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=root,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr[-4000:])
+        raise SystemExit(f"importing {service}/main.py failed")
+    return parse_importtime(result.stderr)
+
+
+def report(entries: Sequence[ImportTime], local: set, top: int) -> None:
+    total = next((entry.cumulative_us for entry in entries if entry.module == "main"), 0)
+    print(f"import main: {total / 1000:.1f} ms\n")
+
+    by_package: Dict[str, int] = defaultdict(int)
+    for entry in entries:
+        by_package[entry.module.split(".")[0]] += entry.self_us
+
+    print(f"{'package':<40} {'self ms':>10} {'share':>7}")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        share = self_us / total if total else 0
+        print(f"{package:<40} {self_us / 1000:10.1f} {share:7.1%}")
+
+    # Entries are written when an import finishes, so a module's own imports
+    # come before it, one level deeper.
+    direct: Dict[str, int] = {}
+    pending: List[ImportTime] = []
+    for entry in entries:
+        children = [child for child in pending if child.depth > entry.depth]
+        pending = [child for child in pending if child.depth <= entry.depth]
+        if entry.module.split(".")[0] in local:
+            for child in children:
+                if child.depth == entry.depth + 1 and child.module.split(".")[0] not in local:
+                    direct[child.module] = max(direct.get(child.module, 0), child.cumulative_us)
+        pending.append(entry)
+
+    print(f"\n{'slowest imports made by the service':<40} {'cumul. ms':>10}")
+    for module, cumulative_us in sorted(direct.items(), key=lambda item: -item[1])[:top]:
+        print(f"{module:<40} {cumulative_us / 1000:10.1f}")
+
+
+def main(argv: Sequence[str]) -> None:
+    services = sorted(path.name for path in SERVICES_DIR.iterdir() if (path / "main.py").exists())
+    parser = argparse.ArgumentParser(description="Import-time breakdown of a service.")
+    parser.add_argument("service", choices=services)
+    parser.add_argument("--top", type=int, default=15, help="Rows per table.")
+    args = parser.parse_args(argv)
+
+    local = {path.stem for path in (SERVICES_DIR / args.service).iterdir()} | {"lib"}
+    report(profile(args.service), local, args.top)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
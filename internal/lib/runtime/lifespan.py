@@ -0,0 +1,146 @@
+import asyncio
+import inspect
+import os
+import signal
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Mapping, Optional, Sequence, Union
+
+import structlog
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from lib.config.app import AppSettings
+from lib.config.main import get_app_settings
+from lib.runtime.health import traffic
+from lib.runtime.metrics import mark_worker_stopped
+from lib.runtime.startup import SERVICE_READY, startup
+
+
+logger = structlog.get_logger(__name__)
+
+WarmupStep = Callable[[], Union[None, object, Awaitable[object]]]
+
+
+async def _run_step(step: WarmupStep) -> None:
+    result = step()
+    if inspect.isawaitable(result):
+        await result
+
+
+async def open_pool(engine: AsyncEngine, connections: int) -> None:
+    """
+    Connect `connections` pooled connections at once, so the first requests
+    do not pay for the connection handshakes. They are returned to the pool
+    idle.
+    """
+
+    async def check() -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(check() for _ in range(connections)))
+
+
+class _Drain:
+    """
+    Takes over SIGTERM from the server. The first SIGTERM only fails
+    readiness; the server's own handler is called once the load balancer has
+    had `delay` seconds to stop routing here and the requests in flight are
+    done (or `timeout` has passed). A second SIGTERM stops the server at once.
+    """
+
+    def __init__(self, delay: float, timeout: float):
+        self.delay = delay
+        self.timeout = timeout
+        self._previous = None
+        self._task: Optional[asyncio.Task] = None
+
+    def install(self) -> None:
+        # Signal handlers can only be set from the main thread; test clients
+        # run the lifespan elsewhere.
+        if threading.current_thread() is not threading.main_thread():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._previous = signal.signal(signal.SIGTERM, self._on_sigterm)
+
+    def _on_sigterm(self, signum: int, frame) -> None:
+        if traffic.draining:
+            self._stop_server(signum, frame)
+            return
+        traffic.draining = True
+        SERVICE_READY.set(0)
+        self._loop.call_soon_threadsafe(self._start, signum)
+
+    def _start(self, signum: int) -> None:
+        self._task = self._loop.create_task(self._drain(signum))
+
+    async def _drain(self, signum: int) -> None:
+        logger.info("Draining", delay_seconds=self.delay, in_flight=traffic.in_flight)
+        await asyncio.sleep(self.delay)
+        idle = await traffic.wait_idle(self.timeout)
+        if not idle:
+            logger.warning("Drain timed out", in_flight=traffic.in_flight)
+        self._stop_server(signum, None)
+
+    def _stop_server(self, signum: int, frame) -> None:
+        previous = self._previous
+        if callable(previous):
+            previous(signum, frame)
+        else:
+            signal.signal(signal.SIGTERM, previous or signal.SIG_DFL)
+            os.kill(os.getpid(), signum)
+
+
+def warmup_lifespan(
+    warmups: Optional[Mapping[str, WarmupStep]] = None,
+    shutdown: Sequence[WarmupStep] = (),
+    settings: Optional[AppSettings] = None,
+):
+    """
+    FastAPI lifespan that runs the named `warmups` (opening the database pool,
+    starting the Kafka producer, ...) and builds the OpenAPI schema, which
+    compiles the JSON schema of every request and response model, before the
+    service reports itself ready. Each step is timed as its own startup phase.
+
+    A failing step is logged and skipped, so a dependency that is down at boot
+    only leaves that path cold instead of keeping the service from starting.
+
+    SIGTERM drains the service (see `drain_delay_seconds` and
+    `drain_timeout_seconds`) before the server stops; the `shutdown` steps,
+    which flush the Kafka producer and the span exporter, then run in order.
+    """
+    settings = settings or get_app_settings()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        for name, step in (warmups or {}).items():
+            try:
+                await _run_step(step)
+            except Exception as e:
+                logger.warning("Warmup step failed", step=name, error=str(e))
+            startup.mark(f"warmup_{name}")
+
+        app.openapi()
+        startup.mark("warmup_schemas")
+        _Drain(settings.drain_delay_seconds, settings.drain_timeout_seconds).install()
+        startup.finish()
+        logger.info(
+            "Service ready",
+            startup_seconds=round(startup.total, 3),
+            phases={phase: round(seconds, 3) for phase, seconds in startup.phases.items()},
+        )
+
+        try:
+            yield
+        finally:
+            startup.stopping()
+            for step in shutdown:
+                try:
+                    await _run_step(step)
+                except Exception as e:
+                    logger.warning("Shutdown step failed", error=str(e))
+            mark_worker_stopped()
+
+    return lifespan
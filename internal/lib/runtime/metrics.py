@@ -0,0 +1,29 @@
+import os
+
+from fastapi import Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess
+
+
+def multiprocess_enabled() -> bool:
+    """Whether this process writes its metrics to the directory shared by the workers."""
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def metrics_response() -> Response:
+    """
+    The Prometheus exposition of this service. Under several workers every
+    worker keeps its metrics in the shared directory, so whichever worker
+    answers the scrape reports the sum over all of them.
+    """
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def mark_worker_stopped() -> None:
+    """Drop this worker's live gauges (in-flight, ready) from the shared directory."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,59 @@
+import os
+import shutil
+from typing import Optional
+
+import uvicorn
+
+from lib.config.app import AppSettings
+from lib.config.main import get_app_settings
+
+
+def worker_count(configured: int) -> int:
+    """`configured` workers, or one per CPU this process may run on when it is 0."""
+    if configured > 0:
+        return configured
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _share_metrics(directory: str) -> None:
+    # Files left by an earlier run would be added to this run's counters.
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+    # Read by prometheus_client when the workers import it.
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = directory
+
+
+def _split_pool(settings: AppSettings, workers: int) -> None:
+    if not settings.db_max_connections:
+        return
+    per_worker = max(1, settings.db_max_connections // workers)
+    pool_size = min(settings.db_pool_size, per_worker)
+    # The workers load their settings from the environment they inherit.
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(per_worker - pool_size)
+
+
+def serve(app: str, port: int, host: str = "0.0.0.0", settings: Optional[AppSettings] = None) -> None:
+    """
+    Run a service's ASGI app (`"main:app"`) the way its settings ask for.
+
+    With `server_reload` (the default in development) this is a single
+    reloading process. Otherwise `server_workers` processes share the port;
+    with more than one, Prometheus runs in multiprocess mode so `/metrics`
+    adds up all workers, and `db_max_connections`, when set, is split between
+    the workers' pools.
+    """
+    settings = settings or get_app_settings()
+
+    if settings.server_reload:
+        uvicorn.run(app, host=host, port=port, reload=True)
+        return
+
+    workers = worker_count(settings.server_workers)
+    if workers > 1:
+        _share_metrics(settings.prometheus_multiproc_dir)
+        _split_pool(settings, workers)
+    uvicorn.run(app, host=host, port=port, workers=workers)
@@ -0,0 +1,77 @@
+import os
+import time
+from typing import Dict, Optional
+
+# Kept to cheap imports: a service's `main.py` imports this module first, and
+# everything it pulls in is counted before the clock's first mark.
+from prometheus_client import Gauge
+
+
+STARTUP_PHASE_SECONDS = Gauge(
+    "service_startup_phase_seconds",
+    "Time spent in each startup phase",
+    ["phase"],
+    multiprocess_mode="max",
+)
+STARTUP_SECONDS = Gauge(
+    "service_startup_seconds",
+    "Time from process start to the service being ready",
+    multiprocess_mode="max",
+)
+# 1 per worker, so under several workers this counts the ready ones.
+SERVICE_READY = Gauge(
+    "service_ready", "Workers that have finished warming up", multiprocess_mode="livesum"
+)
+
+
+def _process_started() -> float:
+    """The `perf_counter()` reading at process start, or now where /proc is unavailable."""
+    try:
+        with open("/proc/self/stat") as stat:
+            # Field 22, counted after the parenthesised command name.
+            start_ticks = int(stat.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as uptime:
+            booted_for = float(uptime.read().split()[0])
+        age = booted_for - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return time.perf_counter()
+    return time.perf_counter() - max(age, 0.0)
+
+
+class StartupTimer:
+    """
+    Times the startup of a service process in phases, from process start to
+    the service reporting ready. The first phase, `interpreter`, runs up to
+    the import of this module; `main.py` imports it before anything else and
+    marks the following phases (`import`, `app`, then the warmup steps).
+    """
+
+    def __init__(self) -> None:
+        self._started = _process_started()
+        self._last = self._started
+        self.phases: Dict[str, float] = {}
+        self.total: Optional[float] = None
+        self.ready = False
+        self.mark("interpreter")
+
+    def mark(self, phase: str) -> float:
+        """Close `phase` at the current time and return how long it took."""
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self._last = now
+        self.phases[phase] = elapsed
+        STARTUP_PHASE_SECONDS.labels(phase).set(elapsed)
+        return elapsed
+
+    def finish(self) -> None:
+        self.total = time.perf_counter() - self._started
+        self.ready = True
+        STARTUP_SECONDS.set(self.total)
+        SERVICE_READY.set(1)
+
+    def stopping(self) -> None:
+        self.ready = False
+        SERVICE_READY.set(0)
+
+
+startup = StartupTimer()
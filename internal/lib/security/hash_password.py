@@ -1,22 +1,29 @@
+import asyncio
+
 import bcrypt
 from typing import Union
 from lib.utils.errors import BcryptError, HashingError
 
 
+# A hash of no one's password, at the cost `bcrypt.gensalt()` uses for real ones.
+_DUMMY_HASH = b"$2b$12$iFVFocRMPzhMX0Rt2LhMp.vL.71ZInFfHWN0XlNV7Jlf/bgSxWSGG"
+
+
 class Hashing:
     """
     A utility class for password hashing and verification using bcrypt.
     """
     async def hash_password(self, password: str) -> str:
         """
-        Hashes a plain-text password.
+        Hashes a plain-text password, in a worker thread so the event loop
+        keeps serving other requests meanwhile.
 
         :param password: The plain-text password to be hashed.
         :return: The hashed password as a string.
         :raises HashingError: If the password cannot be hashed.
         """
         try:
-            hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+            hashed = await asyncio.to_thread(bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt())
             return hashed.decode("utf-8")
         except Exception as e:
             raise HashingError(f"Error hashing password: {str(e)}")
@@ -36,3 +43,30 @@ class Hashing:
                 raise BcryptError("Passwords do not match.")
         except Exception as e:
             raise BcryptError(f"Error verifying password: {str(e)}")
+
+    async def verify_password(self, hashed_password: str, password: str) -> bool:
+        """
+        Checks a plain-text password against a hashed password, in a worker
+        thread so the event loop keeps serving other requests meanwhile.
+
+        :param hashed_password: The hashed password.
+        :param password: The plain-text password to be verified.
+        :return: Whether the password matches.
+        :raises BcryptError: If the hashed password cannot be checked against.
+        """
+        try:
+            return await asyncio.to_thread(
+                bcrypt.checkpw, password.encode("utf-8"), hashed_password.encode("utf-8")
+            )
+        except Exception as e:
+            raise BcryptError(f"Error verifying password: {str(e)}")
+
+    async def verify_dummy(self, password: str) -> None:
+        """
+        Spends the time of `verify_password` when there is no user to check
+        against, so a login for an unknown email takes as long as one with a
+        wrong password.
+
+        :param password: The plain-text password that was given.
+        """
+        await asyncio.to_thread(bcrypt.checkpw, password.encode("utf-8"), _DUMMY_HASH)
@@ -1,67 +1,207 @@
-from jose import jwt
-from datetime import datetime, timedelta, timezone
-from typing import Optional
-from lib.utils.errors import TokenGenerationError, TokenExpiredError, TokenValidationError
-from pydantic import BaseModel
-from typing import Optional
+import time
+import uuid
 
+import jwt
+from typing import Any, Dict, Optional, Tuple
+from lib.config.base import BaseAppSettings
+from lib.security.keys import ASYMMETRIC_ALGORITHMS, KeySet, RemoteKeySet, SigningKey, load_public_jwk
+from lib.security.revocation import RevocationSet
+from lib.utils.errors import (
+    TokenGenerationError,
+    TokenExpiredError,
+    TokenRevokedError,
+    TokenValidationError,
+    UnknownSigningKeyError,
+)
+from pydantic import BaseModel
 
 
 class Claims(BaseModel):
     user_id: int
     exp: float
     iat: float
+    # Names the token in the revocation list.
+    jti: str
 
     @staticmethod
     def create(user_id: int, exp: float, iat: float) -> 'Claims':
-        return Claims(user_id=user_id, exp=exp, iat=iat)
+        return Claims(user_id=user_id, exp=exp, iat=iat, jti=uuid.uuid4().hex)
 
 
 class JwtConfig:
-    def __init__(self, jwt_secret: str, jwt_expired: int):
+    """
+    Issues and checks access tokens. With HS256 both use `jwt_secret`. With
+    ES256 or EdDSA tokens are signed with `signing_key` (the auth service
+    only) and checked against the public keys in `keys`, by the `kid` in the
+    token header; only `algorithm` is accepted either way.
+    """
+
+    def __init__(
+        self,
+        jwt_secret: str,
+        jwt_expired: int,
+        revocations: Optional[RevocationSet] = None,
+        algorithm: str = "HS256",
+        signing_key: Optional[SigningKey] = None,
+        keys: Optional[KeySet] = None,
+    ):
         self.jwt_secret = jwt_secret
         self.jwt_token_expiration_minutes = jwt_expired
+        # Kept current by a RevocationPoller; without one nothing is revoked.
+        self.revocations = revocations if revocations is not None else RevocationSet()
+        self.algorithm = algorithm
+        self.signing_key = signing_key
+        self.keys = keys if keys is not None else KeySet()
 
-    def generate_token(self, user_id: int) -> str:
+    @classmethod
+    def for_issuer(cls, settings: BaseAppSettings, revocations: Optional[RevocationSet] = None) -> 'JwtConfig':
+        """The auth service's: signs with the configured secret or private key."""
+        if settings.jwt_algorithm not in ASYMMETRIC_ALGORITHMS:
+            return cls.for_verifier(settings, revocations)
+        if not settings.jwt_private_key_path:
+            raise ValueError(f"{settings.jwt_algorithm} needs jwt_private_key_path")
+        signing_key = SigningKey.load(settings.jwt_algorithm, settings.jwt_private_key_path)
+        retired = [
+            load_public_jwk(settings.jwt_algorithm, path) for path in settings.jwt_retired_public_key_paths
+        ]
+        return cls(
+            settings.jwt_secret_key,
+            settings.jwt_token_expiration_minutes,
+            revocations,
+            algorithm=settings.jwt_algorithm,
+            signing_key=signing_key,
+            keys=KeySet([signing_key.public_jwk, *retired]),
+        )
+
+    @classmethod
+    def for_verifier(cls, settings: BaseAppSettings, revocations: Optional[RevocationSet] = None) -> 'JwtConfig':
+        """Every other service's: checks tokens with the secret or the auth service's JWKS."""
+        if settings.jwt_algorithm in ASYMMETRIC_ALGORITHMS:
+            keys = RemoteKeySet(settings.jwt_jwks_url, settings.jwt_jwks_min_refresh_seconds)
+        elif not settings.jwt_secret_key:
+            raise ValueError(f"{settings.jwt_algorithm} needs jwt_secret_key")
+        else:
+            keys = None
+        return cls(
+            settings.jwt_secret_key,
+            settings.jwt_token_expiration_minutes,
+            revocations,
+            algorithm=settings.jwt_algorithm,
+            keys=keys,
+        )
+
+    def jwks(self) -> Dict[str, Any]:
+        """The public keys tokens are checked with; none for HS256."""
+        return self.keys.jwks()
+
+    async def warm(self) -> None:
+        """Fetch the auth service's public keys before the first request needs them."""
+        await self.keys.refresh()
+
+    async def close(self) -> None:
+        await self.keys.close()
+
+    def issue_token(self, user_id: int) -> Tuple[str, Claims]:
         """
-        Generates a JWT token for a given user ID.
+        Generates an access token for a given user ID.
 
         :param user_id: ID of the user
-        :return: Encoded JWT token
+        :return: Encoded JWT token and its claims
         :raises TokenGenerationError: If token generation fails
         """
         try:
-            # Set the expiration time based on the provided expiration duration
-            exp_time = datetime.utcnow() + timedelta(minutes=self.jwt_token_expiration_minutes)
-            claims = Claims(
-                user_id=user_id, 
-                exp=exp_time.timestamp(),  # Set the expiration as a Unix timestamp
-                iat=datetime.utcnow().timestamp()
+            now = time.time()
+            claims = Claims.create(
+                user_id=user_id,
+                exp=now + self.jwt_token_expiration_minutes * 60,
+                iat=now,
             )
-            # Encode the token
-            token = jwt.encode(claims.dict(), self.jwt_secret, algorithm="HS256")
-           
-            return token
+            if self.signing_key is not None:
+                token = jwt.encode(
+                    claims.model_dump(),
+                    self.signing_key.private_key,
+                    algorithm=self.algorithm,
+                    headers={"kid": self.signing_key.kid},
+                )
+            else:
+                token = jwt.encode(claims.model_dump(), self.jwt_secret, algorithm=self.algorithm)
+            return token, claims
         except Exception as e:
             raise TokenGenerationError(f"Failed to generate token: {str(e)}")
 
-    def verify_token(self, token: str) -> Optional[int]:
+    def generate_token(self, user_id: int) -> str:
+        """
+        Generates a JWT token for a given user ID.
+
+        :param user_id: ID of the user
+        :return: Encoded JWT token
+        :raises TokenGenerationError: If token generation fails
+        """
+        return self.issue_token(user_id)[0]
+
+    def decode_token(self, token: str) -> Claims:
+        """
+        Checks a token's signature and expiry, not whether it was revoked.
+
+        :raises TokenExpiredError: If the token has expired
+        :raises TokenValidationError: If the token is not one of ours
+        :raises UnknownSigningKeyError: If the token names a key not known yet
+        """
         try:
+            key = self._verification_key(token)
             # Decode the token and verify its signature and claims
-            decoded_token = jwt.decode(token, self.jwt_secret, algorithms="HS256")
+            decoded_token = jwt.decode(token, key, algorithms=[self.algorithm])
             claims = Claims(**decoded_token)
-
-            # Use UTC time for comparison
-            current_time = datetime.utcnow().timestamp()
-            
-            # Check if the current time is before the expiration time
-            if claims.exp > current_time:
-                return claims.user_id
-            else:
-                raise TokenExpiredError("Token has expired")
+        except UnknownSigningKeyError:
+            raise
         except jwt.ExpiredSignatureError:
             raise TokenExpiredError("Token has expired")
-        except jwt.JWTError as e:
+        except jwt.InvalidTokenError as e:
             raise TokenValidationError(f"Invalid token: {str(e)}")
         except Exception as e:
             raise TokenValidationError(f"Token validation failed: {str(e)}")
+
+        if claims.exp <= time.time():
+            raise TokenExpiredError("Token has expired")
+        return claims
+
+    def verify_token(self, token: str) -> int:
+        """
+        Returns the user ID of a valid, unrevoked token. Needs no network
+        call: revocations are looked up in memory.
+
+        :raises TokenExpiredError: If the token has expired
+        :raises TokenRevokedError: If the token was revoked
+        :raises TokenValidationError: If the token is not one of ours
+        """
+        claims = self.decode_token(token)
+        if claims.jti in self.revocations:
+            raise TokenRevokedError()
+        return claims.user_id
+
+    async def authenticate(self, token: str) -> int:
+        """
+        `verify_token`, refetching the public keys first if the token was
+        signed with one not seen yet (after the auth service rotated keys).
+
+        :raises TokenExpiredError: If the token has expired
+        :raises TokenRevokedError: If the token was revoked
+        :raises TokenValidationError: If the token is not one of ours
+        """
+        try:
+            return self.verify_token(token)
+        except UnknownSigningKeyError:
+            await self.keys.refresh()
+        try:
+            return self.verify_token(token)
+        except UnknownSigningKeyError as e:
+            raise TokenValidationError(f"Invalid token: {str(e)}")
+
+    def _verification_key(self, token: str):
+        if self.algorithm not in ASYMMETRIC_ALGORITHMS:
+            return self.jwt_secret
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.keys.get(kid)
+        if key is None:
+            raise UnknownSigningKeyError(kid)
+        return key
@@ -0,0 +1,181 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import httpx
+import structlog
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from jwt import PyJWK
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm
+from prometheus_client import Counter
+
+
+logger = structlog.get_logger(__name__)
+
+JWKS_FETCHES = Counter("jwks_fetch_count", "Fetches of the auth service's JWKS, by outcome", ["result"])
+
+# Algorithms signed with a private key, whose public half is published as a JWK.
+ASYMMETRIC_ALGORITHMS = ("ES256", "EdDSA")
+
+# RFC 7638: the members a JWK thumbprint is computed over, per key type.
+_THUMBPRINT_MEMBERS = {"EC": ("crv", "kty", "x", "y"), "OKP": ("crv", "kty", "x")}
+
+
+def thumbprint(jwk: Dict[str, Any]) -> str:
+    """RFC 7638 thumbprint of a public JWK, used as its `kid`."""
+    members = {name: jwk[name] for name in _THUMBPRINT_MEMBERS[jwk["kty"]]}
+    digest = hashlib.sha256(json.dumps(members, separators=(",", ":"), sort_keys=True).encode("utf-8")).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+def public_jwk(public_key, algorithm: str) -> Dict[str, Any]:
+    """The JWK of an ES256 or EdDSA public key, with its `kid`, `alg` and `use`."""
+    if algorithm == "ES256":
+        if not isinstance(public_key, ec.EllipticCurvePublicKey) or public_key.curve.name != "secp256r1":
+            raise ValueError("ES256 needs a P-256 key")
+        jwk = ECAlgorithm.to_jwk(public_key, as_dict=True)
+    elif algorithm == "EdDSA":
+        if not isinstance(public_key, ed25519.Ed25519PublicKey):
+            raise ValueError("EdDSA needs an Ed25519 key")
+        jwk = OKPAlgorithm.to_jwk(public_key, as_dict=True)
+    else:
+        raise ValueError(f"{algorithm} is not an asymmetric algorithm")
+    jwk.update(kid=thumbprint(jwk), alg=algorithm, use="sig")
+    return jwk
+
+
+class SigningKey:
+    """The private key the auth service signs access tokens with."""
+
+    def __init__(self, algorithm: str, private_key):
+        self.algorithm = algorithm
+        self.private_key = private_key
+        self.public_jwk = public_jwk(private_key.public_key(), algorithm)
+        self.kid: str = self.public_jwk["kid"]
+
+    @classmethod
+    def load(cls, algorithm: str, path: str) -> "SigningKey":
+        """Read a PEM private key, unencrypted."""
+        private_key = serialization.load_pem_private_key(Path(path).read_bytes(), password=None)
+        return cls(algorithm, private_key)
+
+    @classmethod
+    def generate(cls, algorithm: str) -> "SigningKey":
+        if algorithm == "ES256":
+            return cls(algorithm, ec.generate_private_key(ec.SECP256R1()))
+        if algorithm == "EdDSA":
+            return cls(algorithm, ed25519.Ed25519PrivateKey.generate())
+        raise ValueError(f"{algorithm} is not an asymmetric algorithm")
+
+    def private_pem(self) -> bytes:
+        return self.private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+
+
+def load_public_jwk(algorithm: str, path: str) -> Dict[str, Any]:
+    """The JWK of a PEM public key, such as one retired by a key rotation."""
+    return public_jwk(serialization.load_pem_public_key(Path(path).read_bytes()), algorithm)
+
+
+class KeySet:
+    """
+    Public keys that access tokens may be signed with, by `kid`. This one
+    is fixed: the auth service's own keys.
+    """
+
+    def __init__(self, jwks: Iterable[Dict[str, Any]] = ()):
+        self._jwks: Dict[str, Dict[str, Any]] = {}
+        self._keys: Dict[str, Any] = {}
+        self._replace(jwks)
+
+    def get(self, kid: Optional[str]) -> Optional[Any]:
+        return self._keys.get(kid)
+
+    def jwks(self) -> Dict[str, Any]:
+        """The JWKS document: the public keys, for services to verify with."""
+        return {"keys": list(self._jwks.values())}
+
+    async def refresh(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    def _replace(self, jwks: Iterable[Dict[str, Any]]) -> None:
+        jwks = {jwk["kid"]: jwk for jwk in jwks}
+        self._keys = {kid: PyJWK(jwk).key for kid, jwk in jwks.items()}
+        self._jwks = jwks
+
+
+class RemoteKeySet(KeySet):
+    """
+    The auth service's public keys, fetched from its JWKS document at `url`
+    and kept in process. A token signed with a `kid` not seen yet triggers
+    a refetch, so a new signing key is picked up on first use; refetches are
+    at most `min_refresh_seconds` apart, so tokens with made-up kids cannot
+    turn into a flood of requests to the auth service. After a failed fetch
+    (the auth service is not up yet at boot) the next one may come after
+    `retry_seconds` already.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        min_refresh_seconds: float = 30.0,
+        timeout: float = 5.0,
+        retry_seconds: float = 1.0,
+    ):
+        super().__init__()
+        self.url = url
+        self.min_refresh_seconds = min_refresh_seconds
+        self.retry_seconds = retry_seconds
+        self._client = httpx.AsyncClient(timeout=timeout)
+        self._lock = asyncio.Lock()
+        self._next_fetch_at: Optional[float] = None
+
+    async def refresh(self) -> None:
+        async with self._lock:
+            # Requests that waited for a fetch in flight use its result.
+            if self._next_fetch_at is not None and time.monotonic() < self._next_fetch_at:
+                return
+            try:
+                response = await self._client.get(self.url)
+                response.raise_for_status()
+                self._replace(response.json()["keys"])
+            except Exception as e:
+                self._next_fetch_at = time.monotonic() + self.retry_seconds
+                JWKS_FETCHES.labels("error").inc()
+                logger.warning("Could not fetch JWKS", url=self.url, error=str(e))
+                return
+            self._next_fetch_at = time.monotonic() + self.min_refresh_seconds
+            JWKS_FETCHES.labels("success").inc()
+            logger.info("Fetched JWKS", url=self.url, kids=list(self._keys))
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a private key for signing access tokens.")
+    parser.add_argument("algorithm", choices=ASYMMETRIC_ALGORITHMS)
+    parser.add_argument("path", help="Where to write the PEM private key (JWT_PRIVATE_KEY_PATH).")
+    args = parser.parse_args()
+
+    key = SigningKey.generate(args.algorithm)
+    path = Path(args.path)
+    path.write_bytes(key.private_pem())
+    path.chmod(0o600)
+    print(f"Wrote {args.algorithm} key {key.kid} to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+import structlog
+from prometheus_client import Counter, Gauge
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from lib.model.token import RevokedToken
+
+
+logger = structlog.get_logger(__name__)
+
+REVOKED_TOKENS = Gauge("revoked_token_count", "Unexpired revoked access tokens known to this process")
+REVOCATION_POLL_ERRORS = Counter("revocation_poll_error_count", "Failed polls of the revoked tokens table")
+
+
+def to_timestamp(value: datetime) -> float:
+    """Unix time of a naive UTC datetime, the way the tables store them."""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class RevocationSet:
+    """
+    The `jti`s of revoked access tokens that have not expired yet, each with
+    its token's expiry. Looking one up is a dict lookup; expired entries are
+    dropped at most every `prune_seconds`, as the token would be refused for
+    its expiry anyway.
+    """
+
+    def __init__(self, prune_seconds: float = 60.0):
+        self.prune_seconds = prune_seconds
+        self._expiries: Dict[str, float] = {}
+        self._pruned_at = time.monotonic()
+
+    def __contains__(self, jti: str) -> bool:
+        return jti in self._expiries
+
+    def __len__(self) -> int:
+        return len(self._expiries)
+
+    def add(self, jti: str, expires_at: float) -> None:
+        if expires_at > time.time():
+            self._expiries[jti] = expires_at
+        if time.monotonic() - self._pruned_at >= self.prune_seconds:
+            self.prune()
+        REVOKED_TOKENS.set(len(self._expiries))
+
+    def prune(self) -> None:
+        now = time.time()
+        self._expiries = {jti: exp for jti, exp in self._expiries.items() if exp > now}
+        self._pruned_at = time.monotonic()
+        REVOKED_TOKENS.set(len(self._expiries))
+
+
+class RevocationPoller:
+    """
+    Keeps `revocations` in step with the revoked_tokens table: loads the
+    unexpired rows on start, then every `interval` seconds the rows revoked
+    since the last poll. Requests then check tokens against memory only; a
+    revocation reaches every process within about `interval`.
+
+    Each poll reaches back `overlap` seconds before the newest row seen, so
+    rows committed late with an earlier revoked_at are not missed; adding a
+    jti twice is harmless. With `purge` set, rows of expired tokens are
+    deleted as they are polled past; one service doing so is enough.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        revocations: RevocationSet,
+        interval: float = 2.0,
+        overlap: float = 30.0,
+        purge: bool = False,
+    ):
+        self.engine = engine
+        self.revocations = revocations
+        self.interval = interval
+        self.overlap = timedelta(seconds=overlap)
+        self.purge = purge
+        self._cursor: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Load what is revoked now, then follow new revocations in the background."""
+        if self._task is None:
+            try:
+                await self.poll()
+            finally:
+                # Polled again shortly even if the database is down at boot.
+                self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.poll()
+            except Exception as e:
+                REVOCATION_POLL_ERRORS.inc()
+                logger.warning("Could not poll revoked tokens", error=str(e))
+
+    async def poll(self) -> None:
+        query = select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at)
+        if self._cursor is None:
+            query = query.where(RevokedToken.expires_at > datetime.utcnow())
+        else:
+            query = query.where(RevokedToken.revoked_at > self._cursor - self.overlap)
+
+        async with self.engine.begin() as connection:
+            rows = (await connection.execute(query)).all()
+            if self.purge:
+                await connection.execute(
+                    delete(RevokedToken).where(RevokedToken.expires_at < datetime.utcnow())
+                )
+
+        for jti, expires_at, revoked_at in rows:
+            self.revocations.add(jti, to_timestamp(expires_at))
+            if self._cursor is None or revoked_at > self._cursor:
+                self._cursor = revoked_at
+        if self._cursor is None:
+            # Nothing revoked yet: start from the earliest a row could have now.
+            self._cursor = datetime.min + self.overlap
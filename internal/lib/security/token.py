@@ -1,8 +1,11 @@
-from typing import Any, Union
+from typing import Any, Optional, Union
 from fastapi.security import APIKeyHeader
 from starlette.exceptions import HTTPException
 from starlette.requests import Request
-from starlette.status import HTTP_403_FORBIDDEN
+from starlette.status import HTTP_401_UNAUTHORIZED, HTTP_403_FORBIDDEN
+
+from lib.security.jwt import JwtConfig
+from lib.utils.errors import AppError
 
 class HTTPTokenHeader(APIKeyHeader):
     def __init__(self, raise_error: bool = True, *args: Any, **kwargs: Any):
@@ -34,4 +37,15 @@ class HTTPTokenHeader(APIKeyHeader):
                 status_code=HTTP_403_FORBIDDEN, detail="Invalid token schema"
             )
 
+        # Each app sets its own JwtConfig as `app.state.jwt_config`, so apps
+        # sharing a process (the load test stack) each check tokens their own
+        # way. Tokens it does not accept (bad signature, expired or revoked)
+        # are refused here, in process; without one they pass through.
+        jwt_config: Optional[JwtConfig] = getattr(request.app.state, "jwt_config", None)
+        if jwt_config is not None:
+            try:
+                await jwt_config.authenticate(token)
+            except AppError as e:
+                raise HTTPException(status_code=HTTP_401_UNAUTHORIZED, detail=str(e))
+
         return token
@@ -0,0 +1,80 @@
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from prometheus_client import Counter, Gauge
+
+from lib.events.events import UserChanged
+
+
+UNKNOWN_EMAIL_LOOKUPS = Counter(
+    "unknown_email_lookup_count", "Login email lookups, by whether the unknown-email cache answered them", ["result"]
+)
+UNKNOWN_EMAIL_SIZE = Gauge("unknown_email_size", "Unknown emails cached by this process")
+
+T = TypeVar("T")
+
+
+class UnknownEmailCache:
+    """
+    Remembers the last `size` emails that no user has (least recently used
+    first out), for `ttl` seconds, so logins with them are refused without
+    querying the database. Credential-stuffing lists mostly hold emails that
+    are not registered here, and try each of them many times.
+
+    Only misses are kept: an email with a user always goes to the database.
+    An email is forgotten as soon as a user takes it, from this process
+    (`discard`) or another one (`user_changed`, fed by
+    `lib.events.user_changes.UserChangeFollower`); the ttl bounds how long a
+    new user can be refused while those events are not arriving.
+    """
+
+    def __init__(self, size: int = 50000, ttl: float = 600.0):
+        self.size = size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        # Bumped whenever an email is taken, so that a lookup that was in
+        # flight meanwhile does not cache the miss it read before.
+        self._generation = 0
+
+    async def find(self, email: str, lookup: Callable[[str], Awaitable[Optional[T]]]) -> Optional[T]:
+        """None when the email is known to have no user, else what `lookup` finds."""
+        expires_at = self._entries.get(email)
+        if expires_at is not None:
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(email)
+                UNKNOWN_EMAIL_LOOKUPS.labels("hit").inc()
+                return None
+            self._drop(email)
+
+        UNKNOWN_EMAIL_LOOKUPS.labels("miss").inc()
+        generation = self._generation
+        found = await lookup(email)
+        if found is None and generation == self._generation:
+            self._put(email)
+        return found
+
+    def discard(self, email: str) -> None:
+        """Forget an email that a user has just taken."""
+        self._generation += 1
+        self._drop(email)
+
+    def user_changed(self, event: UserChanged) -> None:
+        if event.email and not event.deleted:
+            self.discard(event.email)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        UNKNOWN_EMAIL_SIZE.set(0)
+
+    def _put(self, email: str) -> None:
+        self._entries[email] = time.monotonic() + self.ttl
+        self._entries.move_to_end(email)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+        UNKNOWN_EMAIL_SIZE.set(len(self._entries))
+
+    def _drop(self, email: str) -> None:
+        if self._entries.pop(email, None) is not None:
+            UNKNOWN_EMAIL_SIZE.set(len(self._entries))
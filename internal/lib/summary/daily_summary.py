@@ -0,0 +1,140 @@
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from lib.model.summary import DailyTransactionSummary
+from lib.model.topup import Topup
+from lib.model.transfer import Transfer
+from lib.model.withdraw import Withdraw
+
+
+TOPUP = "topup"
+WITHDRAW = "withdraw"
+TRANSFER_OUT = "transfer_out"
+TRANSFER_IN = "transfer_in"
+
+# transaction type -> (movement table, user column, amount column)
+SOURCES = {
+    TOPUP: (Topup, Topup.user_id, Topup.topup_amount),
+    WITHDRAW: (Withdraw, Withdraw.user_id, Withdraw.withdraw_amount),
+    TRANSFER_OUT: (Transfer, Transfer.transfer_from, Transfer.transfer_amount),
+    TRANSFER_IN: (Transfer, Transfer.transfer_to, Transfer.transfer_amount),
+}
+
+
+def _day(created_at: datetime) -> date:
+    return created_at.date() if isinstance(created_at, datetime) else created_at
+
+
+class DailySummaryManager:
+    """
+    Keeps `daily_transaction_summaries` in step with the movement tables.
+
+    Like `LedgerManager.post`, both methods run inside the caller's session and
+    never commit, so a movement and its rollup land in one transaction. New
+    movements are folded in incrementally; updates and deletes recompute the
+    affected buckets, since min and max cannot be taken back incrementally.
+    """
+
+    async def add(
+        self,
+        session: AsyncSession,
+        transaction_type: str,
+        user_id: int,
+        created_at: datetime,
+        amount: int,
+    ) -> None:
+        """Fold one new movement into its user's bucket for that day."""
+        stmt = insert(DailyTransactionSummary).values(
+            user_id=user_id,
+            day=_day(created_at),
+            transaction_type=transaction_type,
+            transaction_count=1,
+            total_amount=amount,
+            min_amount=amount,
+            max_amount=amount,
+            updated_at=datetime.utcnow(),
+        )
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    DailyTransactionSummary.user_id,
+                    DailyTransactionSummary.day,
+                    DailyTransactionSummary.transaction_type,
+                ],
+                set_={
+                    "transaction_count": DailyTransactionSummary.transaction_count + 1,
+                    "total_amount": DailyTransactionSummary.total_amount + amount,
+                    "min_amount": func.least(DailyTransactionSummary.min_amount, amount),
+                    "max_amount": func.greatest(DailyTransactionSummary.max_amount, amount),
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+        )
+
+    async def refresh(
+        self,
+        session: AsyncSession,
+        transaction_type: str,
+        user_ids: Iterable[Optional[int]],
+        created_at: datetime,
+    ) -> None:
+        """
+        Recompute the buckets of `user_ids` for the day of `created_at` from the
+        movement table, after a movement in them was changed or deleted.
+        """
+        day = _day(created_at)
+        start = datetime.combine(day, time.min)
+        model, user_column, amount_column = SOURCES[transaction_type]
+
+        for user_id in sorted({user_id for user_id in user_ids if user_id is not None}):
+            key = (
+                DailyTransactionSummary.user_id == user_id,
+                DailyTransactionSummary.day == day,
+                DailyTransactionSummary.transaction_type == transaction_type,
+            )
+
+            # Lock the bucket before aggregating: a concurrent `add` to it either
+            # committed already and is counted, or waits for this transaction and
+            # lands on top of the recomputed values.
+            await session.execute(
+                insert(DailyTransactionSummary)
+                .values(user_id=user_id, day=day, transaction_type=transaction_type)
+                .on_conflict_do_nothing()
+            )
+            await session.execute(
+                select(DailyTransactionSummary.user_id).where(*key).with_for_update()
+            )
+
+            result = await session.execute(
+                select(
+                    func.count(),
+                    func.coalesce(func.sum(amount_column), 0),
+                    func.min(amount_column),
+                    func.max(amount_column),
+                ).where(
+                    user_column == user_id,
+                    model.created_at >= start,
+                    model.created_at < start + timedelta(days=1),
+                )
+            )
+            count, total, smallest, largest = result.one()
+
+            if count == 0:
+                await session.execute(delete(DailyTransactionSummary).where(*key))
+                continue
+
+            await session.execute(
+                update(DailyTransactionSummary)
+                .where(*key)
+                .values(
+                    transaction_count=count,
+                    total_amount=total,
+                    min_amount=smallest,
+                    max_amount=largest,
+                    updated_at=datetime.utcnow(),
+                )
+            )
@@ -0,0 +1,99 @@
+import asyncio
+from collections import deque
+from typing import Deque, List
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from lib.model.user import NOC_TRANSFER_SEQ
+
+
+PREFIX = "4"  # Visa-like
+BODY_DIGITS = 14  # Between the prefix and the check digit: 16 digits in all.
+_HALF = 10 ** (BODY_DIGITS // 2)
+
+# Round keys of the permutation. Changing them maps sequence values onto
+# numbers already handed out, so they must stay as they are.
+_ROUND_KEYS = (0x5BD1E995, 0x1B873593, 0x7FEB352D, 0x68E31DA4)
+
+# Luhn: the digit sum of 2 * d, for every digit d.
+_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+
+
+def calculate_check_digit(number: str) -> int:
+    """
+    Calculate the Luhn check digit for a given number.
+    Args:
+        number (str): The partial card number (excluding the check digit).
+    Returns:
+        int: The Luhn check digit.
+    """
+    digits = [ord(c) - 48 for c in reversed(number)]
+    # From the right, every other digit is doubled, starting with the first.
+    total = sum(_DOUBLED[d] for d in digits[::2]) + sum(digits[1::2])
+    return (10 - total % 10) % 10
+
+
+def _round(value: int, key: int) -> int:
+    value = ((value ^ key) * 0x45D9F3B) & 0xFFFFFFFF
+    return (value ^ (value >> 16)) % _HALF
+
+
+def permute(value: int) -> int:
+    """
+    Map `value` in [0, 10**BODY_DIGITS) onto the same range, one to one: a
+    Feistel network over its two halves of decimal digits. Consecutive
+    values land far apart, so account numbers do not reveal how many were
+    issued or the neighbouring ones.
+    """
+    left, right = divmod(value, _HALF)
+    for key in _ROUND_KEYS:
+        left, right = right, (left + _round(right, key)) % _HALF
+    return left * _HALF + right
+
+
+def account_number(value: int) -> str:
+    """The Luhn-valid 16-digit account number for a sequence value."""
+    partial = f"{PREFIX}{permute(value % 10 ** BODY_DIGITS):0{BODY_DIGITS}d}"
+    return f"{partial}{calculate_check_digit(partial)}"
+
+
+class AccountNumberAllocator:
+    """
+    Hands out noc_transfer numbers for new users. Values of the
+    `noc_transfer_seq` sequence are reserved `block_size` at a time in one
+    query, and turned into account numbers in memory as they are handed
+    out. Sequence values never repeat and `account_number` is one to one,
+    so the numbers need neither a uniqueness check nor a retry; values left
+    in a block when the process stops are skipped for good. A number that
+    ended up unused (the email was taken) is handed back with `release` and
+    given to the next caller.
+    """
+
+    def __init__(self, engine: AsyncEngine, block_size: int = 100):
+        self._engine = engine
+        self.block_size = block_size
+        self._reserved: Deque[int] = deque()
+        self._released: List[str] = []
+        self._lock = asyncio.Lock()
+
+    async def allocate(self) -> str:
+        if self._released:
+            return self._released.pop()
+        while not self._reserved:
+            async with self._lock:
+                # Another caller may have reserved a block meanwhile.
+                if not self._reserved:
+                    self._reserved.extend(await self._reserve(self.block_size))
+        return account_number(self._reserved.popleft())
+
+    def release(self, number: str) -> None:
+        """Take back a number from `allocate` that was not stored anywhere."""
+        self._released.append(number)
+
+    async def _reserve(self, count: int) -> List[int]:
+        async with self._engine.connect() as connection:
+            result = await connection.execute(
+                select(NOC_TRANSFER_SEQ.next_value()).select_from(func.generate_series(1, count))
+            )
+            return list(result.scalars())
@@ -43,6 +43,21 @@ class TokenValidationError(AppError):
         super().__init__(message)
 
 
+class TokenRevokedError(AppError):
+    def __init__(self):
+        super().__init__("Token has been revoked")
+
+
+class UnknownSigningKeyError(AppError):
+    def __init__(self, kid):
+        super().__init__(f"Unknown signing key {kid}")
+
+
+class InvalidRefreshTokenError(AppError):
+    def __init__(self):
+        super().__init__("Invalid refresh token")
+
+
 class TokenGenerationError(AppError):
     def __init__(self, jwt_error: str):
         super().__init__(f"Token generation error: {jwt_error}")
@@ -61,3 +76,8 @@ class InvalidCredentialsError(AppError):
 class EmailAlreadyExistsError(AppError):
     def __init__(self):
         super().__init__("Email already exists")
+
+
+class InsufficientBalanceError(AppError):
+    def __init__(self, user_id: int):
+        super().__init__(f"Insufficient balance for user {user_id}")
@@ -0,0 +1,138 @@
+"""
+Open-loop load generator for the API gateway.
+
+Against a running stack (docker-compose up):
+    python -m loadtest --base-url http://localhost:8080 --rps 50 --duration 60
+
+Against the gateway and services loaded in this process, talking over ASGI.
+The services read their settings from the environment as usual; pass
+--database-url to point them at a scratch database instead:
+    python -m loadtest --in-process --database-url postgresql+asyncpg://... --rps 20
+
+Replay recorded requests instead of the synthetic mix (see ReplayWorkload):
+    python -m loadtest --replay requests.jsonl --rps 20
+
+Run from `internal/`, or with it on PYTHONPATH (see `make load-test`).
+"""
+import argparse
+import asyncio
+import contextlib
+import logging
+import platform
+import random
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator
+
+import httpx
+import orjson
+
+from loadtest.runner import OpenLoopRunner
+from loadtest.scenario import (
+    DEFAULT_MIX,
+    ReplayWorkload,
+    SetupError,
+    SyntheticWorkload,
+    create_users,
+    parse_mix,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="Drive open-loop load through the API gateway.")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--base-url", default="http://localhost:8080", help="Gateway to send requests to.")
+    target.add_argument("--in-process", action="store_true", help="Load the gateway and services into this process.")
+    parser.add_argument("--database-url", help="With --in-process, the async SQLAlchemy URL the services use.")
+    parser.add_argument("--rps", type=float, default=20.0, help="Mean arrival rate, requests per second.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds of load.")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Seconds of load sent before measuring.")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Operation weights (default: {DEFAULT_MIX}).")
+    parser.add_argument("--replay", type=Path, help="JSONL file of requests to replay instead of the mix.")
+    parser.add_argument("--users", type=int, default=20, help="Users to register and fund before the run.")
+    parser.add_argument("--initial-balance", type=int, default=100_000_000, help="Saldo given to each user.")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Arrivals beyond this many outstanding requests are dropped.")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--seed", type=int, help="Seed for arrivals and the mix, for repeatable runs.")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON here (default: loadtest-results/<run id>.json).")
+    return parser.parse_args()
+
+
+@contextlib.asynccontextmanager
+async def open_client(args: argparse.Namespace) -> AsyncIterator[httpx.AsyncClient]:
+    if not args.in_process:
+        limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+            yield client
+        return
+
+    from loadtest.stack import asgi_client, gateway_stack
+
+    async with gateway_stack(args.database_url) as app:
+        # Per-request service logs would dominate the run; keep warnings and errors.
+        logging.getLogger().setLevel(logging.WARNING)
+        async with asgi_client(app, "http://api-gateway", timeout=args.timeout) as client:
+            yield client
+
+
+async def main(args: argparse.Namespace) -> int:
+    run_id = datetime.utcnow().strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:6]
+    rng = random.Random(args.seed)
+
+    async with open_client(args) as client:
+        try:
+            users = await create_users(client, args.users, run_id, args.initial_balance) if args.users else []
+        except SetupError as e:
+            print(e, file=sys.stderr)
+            return 1
+
+        if args.replay:
+            workload = ReplayWorkload(ReplayWorkload.load(args.replay), users, rng)
+        else:
+            workload = SyntheticWorkload(users, parse_mix(args.mix), run_id, rng)
+
+        runner = OpenLoopRunner(
+            client,
+            workload,
+            rps=args.rps,
+            duration=args.duration,
+            warmup=args.warmup,
+            max_in_flight=args.max_in_flight,
+            seed=args.seed,
+        )
+        stats = await runner.run()
+
+    for line in stats.summary_lines(args.duration):
+        print(line)
+    if runner.max_send_lag > 0.01:
+        print(f"warning: the generator fell up to {runner.max_send_lag * 1000:.1f} ms behind schedule", file=sys.stderr)
+
+    output = args.output or Path("loadtest-results") / f"{run_id}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    result = {
+        "run_id": run_id,
+        "started_at": run_id.split("-")[0],
+        "target": "in-process" if args.in_process else args.base_url,
+        "workload": {"replay": str(args.replay)} if args.replay else {"mix": parse_mix(args.mix)},
+        "config": {
+            "rps": args.rps,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "users": args.users,
+            "max_in_flight": args.max_in_flight,
+            "seed": args.seed,
+        },
+        "host": {"python": platform.python_version(), "machine": platform.machine()},
+        "sent": runner.sent,
+        "max_send_lag_seconds": runner.max_send_lag,
+        **stats.to_dict(args.duration),
+    }
+    output.write_bytes(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+    print(f"results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,97 @@
+import asyncio
+import random
+import time
+from typing import Optional, Protocol, Set
+
+import httpx
+
+from loadtest.scenario import LoadRequest
+from loadtest.stats import RunStats
+
+
+class Workload(Protocol):
+    def next(self) -> LoadRequest: ...
+
+
+class OpenLoopRunner:
+    """
+    Sends requests with Poisson arrivals at `rps`, regardless of how fast the
+    target answers: a slow response never delays the next arrival, so queueing
+    in the target shows up as latency instead of as a lower offered load.
+
+    Latency is measured from the moment a request was scheduled to arrive, not
+    from when it was actually sent, so a generator falling behind is counted
+    against the target rather than hidden (coordinated omission). Requests
+    scheduled during the first `warmup` seconds are sent but not recorded.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        workload: Workload,
+        rps: float,
+        duration: float,
+        warmup: float = 0.0,
+        max_in_flight: int = 1000,
+        seed: Optional[int] = None,
+    ):
+        self.client = client
+        self.workload = workload
+        self.rps = rps
+        self.duration = duration
+        self.warmup = warmup
+        self.max_in_flight = max_in_flight
+        self.rng = random.Random(seed)
+        self.stats = RunStats()
+        self.sent = 0
+        self.max_send_lag = 0.0
+
+    async def run(self) -> RunStats:
+        in_flight: Set[asyncio.Task] = set()
+        start = time.perf_counter()
+        measured_from = start + self.warmup
+        end = measured_from + self.duration
+        scheduled = start
+
+        while True:
+            scheduled += self.rng.expovariate(self.rps)
+            if scheduled >= end:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                self.max_send_lag = max(self.max_send_lag, -delay)
+
+            request = self.workload.next()
+            measured = scheduled >= measured_from
+            if len(in_flight) >= self.max_in_flight:
+                if measured:
+                    self.stats.drop(request.endpoint)
+                continue
+
+            task = asyncio.create_task(self._send(request, scheduled, measured))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+            self.sent += 1
+
+        if in_flight:
+            await asyncio.gather(*in_flight)
+        return self.stats
+
+    async def _send(self, request: LoadRequest, scheduled: float, measured: bool) -> None:
+        headers = {"Authorization": f"Bearer {request.token}"} if request.token else None
+        error = None
+        try:
+            response = await self.client.request(
+                request.method, request.path, json=request.json, headers=headers
+            )
+            if response.status_code >= 400:
+                error = f"HTTP {response.status_code}"
+        except httpx.TimeoutException:
+            error = "timeout"
+        except httpx.HTTPError as e:
+            error = type(e).__name__
+
+        if measured:
+            self.stats.record(request.endpoint, time.perf_counter() - scheduled, error)
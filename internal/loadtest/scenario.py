@@ -0,0 +1,280 @@
+import asyncio
+import random
+import re
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+import orjson
+
+
+OPERATIONS = ("register", "login", "topup", "transfer", "withdraw", "saldo")
+
+DEFAULT_MIX = "topup=35,transfer=30,withdraw=10,login=10,saldo=10,register=5"
+
+TOPUP_METHODS = ("bca", "bri", "mandiri", "dana", "ovo", "gopay")
+
+PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+class SetupError(Exception):
+    """Raised when the users a run needs cannot be created on the target."""
+
+
+@dataclass
+class LoadRequest:
+    endpoint: str
+    method: str
+    path: str
+    json: Optional[Dict[str, Any]] = None
+    token: Optional[str] = None
+
+
+@dataclass
+class VirtualUser:
+    user_id: int
+    email: str
+    password: str
+    token: str
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse `topup=35,transfer=30,...` into operation weights."""
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}, expected one of {', '.join(OPERATIONS)}")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("The mix needs at least one operation with a positive weight")
+    return mix
+
+
+def _data(response: httpx.Response) -> Any:
+    response.raise_for_status()
+    return response.json()["data"]
+
+
+async def create_users(
+    client: httpx.AsyncClient,
+    count: int,
+    run_id: str,
+    initial_balance: int,
+    password: str = "loadtest123",
+    concurrency: int = 16,
+) -> List[VirtualUser]:
+    """
+    Register `count` users through the gateway, log each one in and give it a
+    saldo of `initial_balance`, so transfers and withdraws have funds to move.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def create(index: int) -> VirtualUser:
+        email = f"loadtest-{run_id}-{index}@example.com"
+        async with semaphore:
+            try:
+                user = _data(
+                    await client.post(
+                        "/api/auth/register",
+                        json={
+                            "firstname": "Load",
+                            "lastname": f"Test{index}",
+                            "email": email,
+                            "password": password,
+                            "confirm_password": password,
+                        },
+                    )
+                )
+                token = _data(
+                    await client.post("/api/auth/login", json={"email": email, "password": password})
+                )
+                _data(
+                    await client.post(
+                        "/api/saldo/",
+                        json={"user_id": user["user_id"], "total_balance": initial_balance},
+                        headers={"Authorization": f"Bearer {token}"},
+                    )
+                )
+            except (httpx.HTTPError, KeyError, TypeError, ValueError) as e:
+                raise SetupError(f"Failed to set up {email}: {e!r}") from e
+        return VirtualUser(user_id=user["user_id"], email=email, password=password, token=token)
+
+    return list(await asyncio.gather(*(create(index) for index in range(count))))
+
+
+class SyntheticWorkload:
+    """
+    Draws operations from a weighted mix over a pool of prepared users. Amounts
+    stay inside what the request validators accept.
+    """
+
+    def __init__(self, users: List[VirtualUser], mix: Dict[str, float], run_id: str, rng: random.Random):
+        if len(users) < 2:
+            raise ValueError("A synthetic workload needs at least two users for transfers")
+        self.users = users
+        self.operations = list(mix)
+        self.weights = [mix[name] for name in self.operations]
+        self.run_id = run_id
+        self.rng = rng
+        self.registered = 0
+
+    def next(self) -> LoadRequest:
+        operation = self.rng.choices(self.operations, self.weights)[0]
+        return getattr(self, f"_{operation}")()
+
+    def _register(self) -> LoadRequest:
+        self.registered += 1
+        password = "loadtest123"
+        return LoadRequest(
+            endpoint="register",
+            method="POST",
+            path="/api/auth/register",
+            json={
+                "firstname": "Load",
+                "lastname": "Register",
+                "email": f"loadtest-{self.run_id}-r{self.registered}@example.com",
+                "password": password,
+                "confirm_password": password,
+            },
+        )
+
+    def _login(self) -> LoadRequest:
+        user = self.rng.choice(self.users)
+        return LoadRequest(
+            endpoint="login",
+            method="POST",
+            path="/api/auth/login",
+            json={"email": user.email, "password": user.password},
+        )
+
+    def _topup(self) -> LoadRequest:
+        user = self.rng.choice(self.users)
+        return LoadRequest(
+            endpoint="topup",
+            method="POST",
+            path="/api/topup/",
+            json={
+                "user_id": user.user_id,
+                "topup_no": uuid.uuid4().hex,
+                "topup_amount": self.rng.randint(10000, 50000),
+                "topup_method": self.rng.choice(TOPUP_METHODS),
+            },
+            token=user.token,
+        )
+
+    def _transfer(self) -> LoadRequest:
+        sender, receiver = self.rng.sample(self.users, 2)
+        return LoadRequest(
+            endpoint="transfer",
+            method="POST",
+            path="/api/transfer/",
+            json={
+                "transfer_from": sender.user_id,
+                "transfer_to": receiver.user_id,
+                "transfer_amount": self.rng.randint(50000, 100000),
+            },
+            token=sender.token,
+        )
+
+    def _withdraw(self) -> LoadRequest:
+        user = self.rng.choice(self.users)
+        return LoadRequest(
+            endpoint="withdraw",
+            method="POST",
+            path="/api/withdraw/",
+            json={
+                "user_id": user.user_id,
+                "withdraw_amount": self.rng.randint(50000, 100000),
+                "withdraw_time": datetime.utcnow().isoformat(),
+            },
+            token=user.token,
+        )
+
+    def _saldo(self) -> LoadRequest:
+        user = self.rng.choice(self.users)
+        return LoadRequest(
+            endpoint="saldo",
+            method="GET",
+            path=f"/api/saldo/user/{user.user_id}",
+            token=user.token,
+        )
+
+
+class ReplayWorkload:
+    """
+    Replays recorded requests in order, starting over at the end. Each line of
+    the file is a JSON object:
+
+        {"name": "topup", "method": "POST", "path": "/api/topup/",
+         "json": {"user_id": "{user_id}", "topup_no": "{uuid}", ...}}
+
+    `{user_id}`, `{other_user_id}`, `{email}`, `{uuid}` and `{now}` in the path
+    or body are filled in per request from a random prepared user; a value that
+    is nothing but a placeholder keeps the placeholder's type. Requests carry
+    that user's token unless the line sets `"auth": false`. `name` defaults to
+    the method and path.
+    """
+
+    def __init__(self, lines: List[Dict[str, Any]], users: List[VirtualUser], rng: random.Random):
+        if not lines:
+            raise ValueError("The replay file has no requests")
+        self.lines = lines
+        self.users = users
+        self.rng = rng
+        self.position = 0
+
+    @staticmethod
+    def load(path: Path) -> List[Dict[str, Any]]:
+        lines = []
+        with open(path, "rb") as f:
+            for number, raw in enumerate(f, start=1):
+                if not raw.strip():
+                    continue
+                line = orjson.loads(raw)
+                if not isinstance(line, dict) or "method" not in line or "path" not in line:
+                    raise ValueError(f"{path}:{number}: expected an object with 'method' and 'path'")
+                lines.append(line)
+        return lines
+
+    def next(self) -> LoadRequest:
+        line = self.lines[self.position]
+        self.position = (self.position + 1) % len(self.lines)
+
+        context: Dict[str, Any] = {"uuid": uuid.uuid4().hex, "now": datetime.utcnow().isoformat()}
+        token = None
+        if self.users:
+            user = self.rng.choice(self.users)
+            other = self.rng.choice([candidate for candidate in self.users if candidate is not user] or [user])
+            context.update(user_id=user.user_id, other_user_id=other.user_id, email=user.email)
+            if line.get("auth", True):
+                token = user.token
+
+        return LoadRequest(
+            endpoint=line.get("name") or f"{line['method'].upper()} {line['path']}",
+            method=line["method"].upper(),
+            path=_render(line["path"], context),
+            json=_render(line.get("json"), context),
+            token=token,
+        )
+
+
+def _render(value: Any, context: Dict[str, Any]) -> Any:
+    if isinstance(value, dict):
+        return {key: _render(item, context) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_render(item, context) for item in value]
+    if not isinstance(value, str):
+        return value
+
+    whole = PLACEHOLDER.fullmatch(value)
+    if whole and whole.group(1) in context:
+        return context[whole.group(1)]
+    return PLACEHOLDER.sub(
+        lambda match: str(context[match.group(1)]) if match.group(1) in context else match.group(0),
+        value,
+    )
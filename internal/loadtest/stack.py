@@ -0,0 +1,119 @@
+import importlib
+import os
+import sys
+from contextlib import AsyncExitStack, asynccontextmanager
+from pathlib import Path
+from types import ModuleType
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.engine import make_url
+
+from lib.config.main import get_app_settings
+
+
+INTERNAL_DIR = Path(__file__).resolve().parent.parent
+SERVICES_DIR = INTERNAL_DIR / "services"
+
+# gateway route module -> (its HttpClient attribute, the service behind it)
+GATEWAY_CLIENTS = {
+    "routes.auth_routes": ("auth_client", "auth_service"),
+    "routes.user_routes": ("user_client", "user_service"),
+    "routes.saldo_routes": ("saldo_client", "saldo_service"),
+    "routes.topup_routes": ("topup_client", "topup_service"),
+    "routes.transfer_routes": ("transfer_client", "transfer_service"),
+    "routes.withdraw_routes": ("withdraw_client", "withdraw_service"),
+}
+
+
+def _import_isolated(service: str) -> Dict[str, ModuleType]:
+    """
+    Import a service's `main` with the service directory as its import root, the
+    way its Dockerfile runs it, and return the modules that brought in.
+
+    Every service has its own top-level `domain`, `infrastructure`, `api` and
+    `main`, so those are taken back out of `sys.modules` afterwards; the loaded
+    app keeps its own references and the next service can import its namesakes.
+    `lib` is shared and stays loaded.
+    """
+    root = SERVICES_DIR / service
+    local = {path.stem for path in root.iterdir() if path.suffix == ".py" or path.is_dir()}
+    before = set(sys.modules)
+
+    sys.path.insert(0, str(root))
+    try:
+        importlib.import_module("main")
+        loaded = {name: sys.modules[name] for name in set(sys.modules) - before}
+    finally:
+        sys.path.remove(str(root))
+        for name in set(sys.modules) - before:
+            if name.split(".")[0] in local:
+                del sys.modules[name]
+    return loaded
+
+
+def asgi_client(app: FastAPI, base_url: str, timeout: float = 5.0) -> httpx.AsyncClient:
+    # Errors raised inside the app come back as 500s, as they would over the network.
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+        base_url=base_url,
+        timeout=timeout,
+    )
+
+
+def use_database(database_url: str) -> None:
+    """
+    Point the settings of every service loaded from now on at `database_url`.
+    The containers are built from the settings on import, so everything they
+    wire up (sessions, revocation poller, account numbers, ...) shares the
+    one engine on that database.
+    """
+    url = make_url(database_url)
+    os.environ.update(
+        POSTGRES_HOST=url.host or "",
+        POSTGRES_PORT=str(url.port or 5432),
+        POSTGRES_USER=url.username or "",
+        POSTGRES_PASSWORD=url.password or "",
+        POSTGRES_DB=url.database or "",
+    )
+    get_app_settings.cache_clear()
+
+
+def service_app(service: str) -> FastAPI:
+    """Load one service's app."""
+    return _import_isolated(service)["main"].app
+
+
+@asynccontextmanager
+async def serving(app: FastAPI) -> AsyncIterator[FastAPI]:
+    """
+    Run `app`'s lifespan around the block, as the server would: warmups,
+    pollers and the JWKS fetch on entry, the shutdown steps on exit.
+    ASGITransport sends no lifespan events itself.
+    """
+    async with app.router.lifespan_context(app):
+        yield app
+
+
+@asynccontextmanager
+async def gateway_stack(database_url: Optional[str] = None) -> AsyncIterator[FastAPI]:
+    """
+    Load the gateway and every service it calls into this process, with the
+    gateway's clients talking to the service apps over ASGI instead of HTTP,
+    and run all their lifespans. The services use `database_url` if given;
+    Kafka and the OTel collector are still reached at the addresses the
+    services are configured with.
+    """
+    if database_url:
+        use_database(database_url)
+    async with AsyncExitStack() as stack:
+        modules = _import_isolated("api_gateway")
+        # Services first, so the gateway's JWKS fetch finds the auth service
+        # up; on exit the gateway stops first.
+        for module_name, (attribute, service) in GATEWAY_CLIENTS.items():
+            app = await stack.enter_async_context(serving(service_app(service)))
+            client = getattr(modules[module_name], attribute)
+            client.client = asgi_client(app, str(client.client.base_url))
+        yield await stack.enter_async_context(serving(modules["main"].app))
+
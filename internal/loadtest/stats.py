@@ -0,0 +1,139 @@
+from collections import Counter
+from typing import Dict, List, Optional
+
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram in microseconds, in the spirit of HdrHistogram:
+    every power of two is split into `2 ** precision_bits` equal buckets, so any
+    recorded value is reported within 1 / 2 ** precision_bits of itself (under 1%
+    with the default of 7 bits) whatever its magnitude.
+    """
+
+    def __init__(self, precision_bits: int = 7):
+        self.precision_bits = precision_bits
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def _bucket(self, micros: int) -> int:
+        shift = max(0, micros.bit_length() - self.precision_bits - 1)
+        return (micros >> shift) << shift
+
+    def _bucket_width(self, bucket: int) -> int:
+        return 1 << max(0, bucket.bit_length() - self.precision_bits - 1)
+
+    def record(self, seconds: float) -> None:
+        micros = max(0, int(seconds * 1_000_000))
+        bucket = self._bucket(micros)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += micros
+        self.min = micros if self.min is None else min(self.min, micros)
+        self.max = micros if self.max is None else max(self.max, micros)
+
+    def percentile(self, percent: float) -> Optional[int]:
+        """Value at `percent` in microseconds: the upper end of the bucket it falls in."""
+        if not self.count:
+            return None
+        rank = max(1, round(self.count * percent / 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(bucket + self._bucket_width(bucket) - 1, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "min_us": self.min,
+            "max_us": self.max,
+            "mean_us": self.total // self.count if self.count else None,
+            **{f"p{percent:g}_us": self.percentile(percent) for percent in PERCENTILES},
+            # [bucket lower bound in microseconds, count], for re-plotting runs later
+            "buckets": [[bucket, self.counts[bucket]] for bucket in sorted(self.counts)],
+        }
+
+
+class EndpointStats:
+    """Latencies and outcomes of one endpoint over the measured part of a run."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latency = LatencyHistogram()
+        self.succeeded = 0
+        self.errors: Counter = Counter()
+
+    def record(self, seconds: float, error: Optional[str] = None) -> None:
+        self.latency.record(seconds)
+        if error is None:
+            self.succeeded += 1
+        else:
+            self.errors[error] += 1
+
+    def to_dict(self, elapsed: float) -> dict:
+        completed = self.succeeded + sum(self.errors.values())
+        return {
+            "completed": completed,
+            "succeeded": self.succeeded,
+            "throughput_rps": completed / elapsed if elapsed else 0.0,
+            "errors": dict(self.errors.most_common()),
+            "latency": self.latency.to_dict(),
+        }
+
+
+class RunStats:
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self.total = EndpointStats("total")
+        # Arrivals that were not sent because `max_in_flight` requests were
+        # already outstanding. Open-loop load never waits for the target, so
+        # these are the requests a closed-loop client would have silently delayed.
+        self.dropped: Counter = Counter()
+
+    def record(self, endpoint: str, seconds: float, error: Optional[str] = None) -> None:
+        if endpoint not in self.endpoints:
+            self.endpoints[endpoint] = EndpointStats(endpoint)
+        self.endpoints[endpoint].record(seconds, error)
+        self.total.record(seconds, error)
+
+    def drop(self, endpoint: str) -> None:
+        self.dropped[endpoint] += 1
+
+    def to_dict(self, elapsed: float) -> dict:
+        return {
+            "elapsed_seconds": elapsed,
+            "total": self.total.to_dict(elapsed),
+            "dropped": dict(self.dropped),
+            "endpoints": {
+                name: self.endpoints[name].to_dict(elapsed) for name in sorted(self.endpoints)
+            },
+        }
+
+    def summary_lines(self, elapsed: float) -> List[str]:
+        header = f"{'endpoint':<20} {'count':>8} {'rps':>9} {'p50 ms':>9} {'p99 ms':>9} {'p99.9 ms':>9} {'errors':>7}"
+        lines = [header, "-" * len(header)]
+        for stats in [*(self.endpoints[name] for name in sorted(self.endpoints)), self.total]:
+            latency = stats.latency
+            errors = sum(stats.errors.values())
+            lines.append(
+                f"{stats.name:<20} {latency.count:>8} {latency.count / elapsed if elapsed else 0:>9.1f} "
+                f"{_millis(latency.percentile(50)):>9} {_millis(latency.percentile(99)):>9} "
+                f"{_millis(latency.percentile(99.9)):>9} {errors:>7}"
+            )
+        for name in sorted(self.endpoints):
+            for error, count in self.endpoints[name].errors.most_common():
+                lines.append(f"  {name}: {error} x{count}")
+        for endpoint, count in sorted(self.dropped.items()):
+            lines.append(f"  {endpoint}: dropped x{count} (max in-flight reached)")
+        return lines
+
+
+def _millis(micros: Optional[int]) -> str:
+    return "-" if micros is None else f"{micros / 1000:.2f}"
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field, model_validator, EmailStr
 
 class RegisterRequest(BaseModel):
@@ -20,4 +22,13 @@ class RegisterRequest(BaseModel):
 
 class LoginRequest(BaseModel):
     email: EmailStr = Field(..., max_length=50)
-    password: str = Field(..., min_length=6)
\ No newline at end of file
+    password: str = Field(..., min_length=6)
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str = Field(..., min_length=1)
+
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+    everywhere: bool = False
@@ -1,8 +1,10 @@
-from pydantic import BaseModel, Field, validator, ValidationError
-from typing import Union
+from pydantic import BaseModel, Field, model_validator, validator, ValidationError
+from typing import Optional, Union
 
 class CreateTopupRequest(BaseModel):
-    user_id: int
+    # The account topped up, by user id or by its noc_transfer.
+    user_id: Optional[int] = None
+    noc_transfer: Optional[str] = None
     topup_no: str
     topup_amount: int
     topup_method: str
@@ -24,6 +26,12 @@ class CreateTopupRequest(BaseModel):
             raise ValueError(f'Invalid payment method: {value}')
         return value
 
+    @model_validator(mode="after")
+    def validate_account(self):
+        if (self.user_id is None) == (self.noc_transfer is None):
+            raise ValueError('Exactly one of user_id and noc_transfer is required')
+        return self
+
 class UpdateTopupRequest(BaseModel):
     user_id: int
     topup_id: int
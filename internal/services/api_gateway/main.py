@@ -1,20 +1,51 @@
-import uvicorn
+# Imported first, so the startup clock covers every import below.
+from lib.runtime.startup import startup
 
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
 from routes.main import router as api_router
+from routes import auth_routes, saldo_routes, topup_routes, transfer_routes, withdraw_routes, user_routes
 from lib.logging.logging_config import LoggerConfigurator
+from lib.logging.sampling import LogSamplingMiddleware
 from lib.config.main import get_app_settings
+from lib.http.response import ORJSONResponse
+from lib.runtime.health import InFlightMiddleware, health_router
+from lib.runtime.lifespan import warmup_lifespan
+from lib.runtime.metrics import metrics_response
+from lib.runtime.server import serve
+from lib.security.jwt import JwtConfig
+
 
 
 
 
 def create_app() -> FastAPI:
+    startup.mark("import")
     settings = get_app_settings()
+    # Bad and expired tokens are refused here, before a hop to a service.
+    # The gateway has no database, so revocations are left to the services.
+    jwt = JwtConfig.for_verifier(settings)
+
+    application = FastAPI(
+        **settings.fastapi_kwargs,
+        default_response_class=ORJSONResponse,
+        lifespan=warmup_lifespan(
+            warmups={"jwks": jwt.warm},
+            shutdown=[
+                jwt.close,
+                auth_routes.auth_client.close,
+                user_routes.user_client.close,
+                saldo_routes.saldo_client.close,
+                topup_routes.topup_client.close,
+                transfer_routes.transfer_client.close,
+                withdraw_routes.withdraw_client.close,
+            ],
+        ),
+    )
 
-    application = FastAPI(**settings.fastapi_kwargs)
 
+    application.state.jwt_config = jwt
 
     application.add_middleware(
         CORSMiddleware,
@@ -23,19 +54,27 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    application.add_middleware(LogSamplingMiddleware)
+    application.add_middleware(InFlightMiddleware)
 
     application.include_router(api_router, prefix="/api")
+    application.include_router(health_router())
 
 
     logger_configurator = LoggerConfigurator(logger_name="api-gateway")
     logger_configurator.configure_logger(json_logs=True)
 
-
+    startup.mark("app")
     return application
 
 
 app = create_app()
 
 
+@app.get("/metrics")
+async def metrics():
+    return metrics_response()
+
+
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8080, reload=True)
\ No newline at end of file
+    serve("main:app", port=8080)
\ No newline at end of file
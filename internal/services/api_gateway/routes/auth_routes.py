@@ -1,6 +1,8 @@
 from fastapi import HTTPException, APIRouter, Depends
 from lib.http.http_config import HttpClient, HttpClientError
-from domain.request.auth import RegisterRequest, LoginRequest
+from lib.http.response import ORJSONResponse
+from lib.security.header import token_security
+from domain.request.auth import RegisterRequest, LoginRequest, LogoutRequest, RefreshTokenRequest
 
 
 router = APIRouter()
@@ -12,7 +14,7 @@ auth_client = HttpClient(base_url="http://auth-service:8001/api")
 async def register_user(request: RegisterRequest):
     try:
         response = await auth_client.post("/auth/register", json=request.model_dump())
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -28,7 +30,7 @@ async def register_user(request: RegisterRequest):
 async def login_user(request: LoginRequest):
     try:
         response = await auth_client.post("/auth/login", json=request.model_dump())
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -40,3 +42,38 @@ async def login_user(request: LoginRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail="An unexpected error occurred")
 
+
+@router.post("/refresh")
+async def refresh_token(request: RefreshTokenRequest):
+    try:
+        response = await auth_client.post("/auth/refresh", json=request.model_dump())
+        return ORJSONResponse(response)
+    except HttpClientError as e:
+        raise HTTPException(
+            status_code=e.status_code or 500,
+            detail={
+                "message": e.message,
+                "details": e.details
+            }
+        )
+    except Exception:
+        raise HTTPException(status_code=500, detail="An unexpected error occurred")
+
+
+@router.post("/logout")
+async def logout_user(request: LogoutRequest, token: str = Depends(token_security)):
+    try:
+        response = await auth_client.post(
+            "/auth/logout", json=request.model_dump(), headers={"Authorization": f"Bearer {token}"}
+        )
+        return ORJSONResponse(response)
+    except HttpClientError as e:
+        raise HTTPException(
+            status_code=e.status_code or 500,
+            detail={
+                "message": e.message,
+                "details": e.details
+            }
+        )
+    except Exception:
+        raise HTTPException(status_code=500, detail="An unexpected error occurred")
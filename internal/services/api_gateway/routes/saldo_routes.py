@@ -1,6 +1,7 @@
 from fastapi import HTTPException, APIRouter, Depends
 from lib.http.http_config import HttpClient, HttpClientError
 from lib.security.header import token_security
+from lib.http.response import ORJSONResponse
 
 from domain.request.saldo import CreateSaldoRequest, UpdateSaldoRequest
 
@@ -18,7 +19,7 @@ async def get_saldos(
         response = await saldo_client.get(
             "/saldo", headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         print("error : {}".format(e))
         raise HTTPException(
@@ -36,7 +37,7 @@ async def get_saldo(
         response = await saldo_client.get(
             f"/saldo/{id}", headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -53,7 +54,7 @@ async def get_saldo_user(
         response = await saldo_client.get(
             f"/saldo/user/{user_id}", headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -70,7 +71,7 @@ async def get_saldo_users(
         response = await saldo_client.get(
             f"/saldo/users/{user_id}", headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -90,7 +91,7 @@ async def create_saldo(
             json=input.model_dump(),
             headers={"Authorization": f"Bearer {token}"},
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -110,7 +111,7 @@ async def update_saldo(
             json=input.model_dump(),
             headers={"Authorization": f"Bearer {token}"},
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -127,7 +128,7 @@ async def delete_saldo(
         response = await saldo_client.delete(
             f"/saldo/{id}", headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -1,6 +1,10 @@
+from datetime import date, datetime
+from typing import Optional
+
 from fastapi import HTTPException, APIRouter, Depends
 from lib.http.http_config import HttpClient, HttpClientError
 from lib.security.header import token_security
+from lib.http.response import ORJSONResponse
 from domain.request.topup import CreateTopupRequest, UpdateTopupRequest
 
 
@@ -11,13 +15,17 @@ topup_client = HttpClient(base_url="http://topup-service:8003/api")
 
 @router.get("/")
 async def get_topups(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     token: str = Depends(token_security),
 ):
     try:
         response = await topup_client.get(
-            "/topup", headers={"Authorization": f"Bearer {token}"}
+            "/topup",
+            params={"start_date": start_date, "end_date": end_date},
+            headers={"Authorization": f"Bearer {token}"},
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         print("e : {}".format(e))
         raise HTTPException(
@@ -26,6 +34,30 @@ async def get_topups(
         )
 
 
+@router.get("/stats")
+async def get_topup_stats(
+    user_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    token: str = Depends(token_security),
+):
+    try:
+        response = await topup_client.get(
+            "/topup/stats",
+            params={"user_id": user_id, "start_date": start_date, "end_date": end_date},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        return ORJSONResponse(response)
+    except HttpClientError as e:
+        raise HTTPException(
+            status_code=e.status_code or 500,
+            detail={
+                "message": e.message,
+                "details": e.details
+            }
+        )
+
+
 @router.get("/{id}")
 async def get_topup(
     id: int,
@@ -35,7 +67,7 @@ async def get_topup(
         response = await topup_client.get(
             f"/topup/{id}", headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -52,7 +84,7 @@ async def get_topup_user(
         response = await topup_client.get(
             f"/topup/user/{user_id}", headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -63,13 +95,17 @@ async def get_topup_user(
 @router.get("/users/{user_id}")
 async def get_topup_users(
     user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     token: str = Depends(token_security),
 ):
     try:
         response = await topup_client.get(
-            f"/topup/users/{user_id}", headers={"Authorization": f"Bearer {token}"}
+            f"/topup/users/{user_id}",
+            params={"start_date": start_date, "end_date": end_date},
+            headers={"Authorization": f"Bearer {token}"},
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -86,7 +122,7 @@ async def create_topup(
         response = await topup_client.post(
             "/topup", json=input.model_dump(), headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -104,7 +140,7 @@ async def update_topup(
         response = await topup_client.put(
             f"/topup/{id}", json=input.model_dump(), headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -121,7 +157,7 @@ async def delete_topup(
         response = await topup_client.delete(
             f"/topup/{id}", headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
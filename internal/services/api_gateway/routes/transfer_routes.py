@@ -1,6 +1,10 @@
+from datetime import date, datetime
+from typing import Optional
+
 from fastapi import HTTPException, APIRouter, Depends
 from lib.http.http_config import HttpClient, HttpClientError
 from lib.security.header import token_security
+from lib.http.response import ORJSONResponse
 from domain.request.transfer import CreateTransferRequest, UpdateTransferRequest
 
 
@@ -11,13 +15,17 @@ transfer_client = HttpClient(base_url="http://transfer-service:8004/api")
 
 @router.get("/")
 async def get_transfers(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     token: str = Depends(token_security),
 ):
     try:
         response = await transfer_client.get(
-            "/transfer", headers={"Authorization": f"Bearer {token}"}
+            "/transfer",
+            params={"start_date": start_date, "end_date": end_date},
+            headers={"Authorization": f"Bearer {token}"},
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -25,6 +33,30 @@ async def get_transfers(
         )
 
 
+@router.get("/stats")
+async def get_transfer_stats(
+    user_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    token: str = Depends(token_security),
+):
+    try:
+        response = await transfer_client.get(
+            "/transfer/stats",
+            params={"user_id": user_id, "start_date": start_date, "end_date": end_date},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        return ORJSONResponse(response)
+    except HttpClientError as e:
+        raise HTTPException(
+            status_code=e.status_code or 500,
+            detail={
+                "message": e.message,
+                "details": e.details
+            }
+        )
+
+
 @router.get("/{id}")
 async def get_transfer(
     id: int,
@@ -34,7 +66,7 @@ async def get_transfer(
         response = await transfer_client.get(
             f"/transfer/{id}", headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -51,7 +83,7 @@ async def get_transfer_user(
         response = await transfer_client.get(
             f"/transfer/user/{user_id}", headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -62,13 +94,17 @@ async def get_transfer_user(
 @router.get("/transfer/{user_id}")
 async def get_transfer_users(
     user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     token: str = Depends(token_security),
 ):
     try:
         response = await transfer_client.get(
-            f"/transfer/users/{user_id}", headers={"Authorization": f"Bearer {token}"}
+            f"/transfer/users/{user_id}",
+            params={"start_date": start_date, "end_date": end_date},
+            headers={"Authorization": f"Bearer {token}"},
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -85,7 +121,7 @@ async def create_transfer(
         response = await transfer_client.post(
             "/transfer", json=input.model_dump(), headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -103,7 +139,7 @@ async def update_transfer(
         response = await transfer_client.put(
             f"/transfer/{id}", json=input.model_dump(), headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -120,7 +156,7 @@ async def delete_transfer(
         response = await transfer_client.delete(
             f"/transfer/{id}", headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -1,6 +1,7 @@
 from fastapi import HTTPException, APIRouter, Depends
 from lib.http.http_config import HttpClient, HttpClientError
 from lib.security.header import token_security
+from lib.http.response import ORJSONResponse
 from domain.request.user import CreateUserRequest, UpdateUserRequest
 
 router = APIRouter()
@@ -16,7 +17,7 @@ async def get_users(
         response = await user_client.get(
             "/users", headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -33,7 +34,7 @@ async def get_user_by_id(
         response = await user_client.get(
             f"/users/{user_id}", headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -50,7 +51,7 @@ async def create_user(
         response = await user_client.post(
             "/users", json=user_request.model_dump(), headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -70,7 +71,7 @@ async def update_user(
             json=user_request.model_dump(),
             headers={"Authorization": f"Bearer {token}"},
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -87,7 +88,7 @@ async def delete_user(
         response = await user_client.delete(
             f"/users/{user_id}", headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
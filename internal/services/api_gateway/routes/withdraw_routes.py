@@ -1,6 +1,10 @@
+from datetime import date, datetime
+from typing import Optional
+
 from fastapi import HTTPException, APIRouter, Depends
 from lib.http.http_config import HttpClient, HttpClientError
 from lib.security.header import token_security
+from lib.http.response import ORJSONResponse
 
 from domain.request.withdraw import CreateWithdrawRequest, UpdateWithdrawRequest
 
@@ -12,13 +16,17 @@ withdraw_client = HttpClient(base_url="http://withdraw-service:8006/api")
 
 @router.get("/")
 async def get_withdraws(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     token: str = Depends(token_security),
 ):
     try:
         response = await withdraw_client.get(
-            "/withdraw", headers={"Authorization": f"Bearer {token}"}
+            "/withdraw",
+            params={"start_date": start_date, "end_date": end_date},
+            headers={"Authorization": f"Bearer {token}"},
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -26,6 +34,30 @@ async def get_withdraws(
         )
 
 
+@router.get("/stats")
+async def get_withdraw_stats(
+    user_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    token: str = Depends(token_security),
+):
+    try:
+        response = await withdraw_client.get(
+            "/withdraw/stats",
+            params={"user_id": user_id, "start_date": start_date, "end_date": end_date},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        return ORJSONResponse(response)
+    except HttpClientError as e:
+        raise HTTPException(
+            status_code=e.status_code or 500,
+            detail={
+                "message": e.message,
+                "details": e.details
+            }
+        )
+
+
 @router.get("/{id}")
 async def get_withdraw(
     id: int,
@@ -35,7 +67,7 @@ async def get_withdraw(
         response = await withdraw_client.get(
             f"/withdraw/{id}", headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -52,7 +84,7 @@ async def get_withdraw_user(
         response = await withdraw_client.get(
             f"/withdraw/user/{user_id}", headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -63,13 +95,17 @@ async def get_withdraw_user(
 @router.get("/users/{user_id}")
 async def get_withdraw_users(
     user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     token: str = Depends(token_security),
 ):
     try:
         response = await withdraw_client.get(
-            f"/withdraw/users/{user_id}", headers={"Authorization": f"Bearer {token}"}
+            f"/withdraw/users/{user_id}",
+            params={"start_date": start_date, "end_date": end_date},
+            headers={"Authorization": f"Bearer {token}"},
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -86,7 +122,7 @@ async def create_withdraw(
         response = await withdraw_client.post(
             "/withdraw", json=input.model_dump(), headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -104,7 +140,7 @@ async def update_withdraw(
         response = await withdraw_client.put(
             f"/withdraw/{id}", json=input.model_dump(), headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -121,7 +157,7 @@ async def delete_withdraw(
         response = await withdraw_client.delete(
             f"/transfer/{id}", headers={"Authorization": f"Bearer {token}"}
         )
-        return response
+        return ORJSONResponse(response)
     except HttpClientError as e:
         raise HTTPException(
             status_code=e.status_code or 500,
@@ -1,12 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException
 from typing import Union
-from domain.dtos.request.auth import RegisterRequest, LoginRequest
+from domain.dtos.request.auth import RegisterRequest, LoginRequest, LogoutRequest, RefreshTokenRequest
 from domain.dtos.response.api import ApiResponse, ErrorResponse
+from domain.dtos.response.auth import TokenResponse
 from domain.dtos.response.user import UserResponse
 from infrastructure.service.auth import AuthService
 
 from infrastructure.di import get_auth_service
 from prometheus_client import Counter, Summary
+from lib.http.response import ORJSONResponse
+from lib.security.header import token_security
 
 router = APIRouter()
 
@@ -16,6 +19,12 @@ REGISTER_REQUEST_DURATION = Summary('register_request_duration', 'Time taken for
 LOGIN_REQUEST_COUNT = Counter('login_request_count', 'Number of user login requests')
 LOGIN_REQUEST_DURATION = Summary('login_request_duration', 'Time taken for user login')
 
+REFRESH_REQUEST_COUNT = Counter('refresh_request_count', 'Number of token refresh requests')
+REFRESH_REQUEST_DURATION = Summary('refresh_request_duration', 'Time taken for token refresh')
+
+LOGOUT_REQUEST_COUNT = Counter('logout_request_count', 'Number of user logout requests')
+LOGOUT_REQUEST_DURATION = Summary('logout_request_duration', 'Time taken for user logout')
+
 
 
 @router.post("/register", response_model=ApiResponse[UserResponse])
@@ -31,11 +40,11 @@ async def register_user(
             if isinstance(user, ErrorResponse):
                 raise HTTPException(status_code=400, detail="Failed to create user")
 
-            return user
+            return ORJSONResponse(user)
         except Exception as e:
             raise HTTPException(status_code=500, detail="An error occurred while registering the user")
 
-@router.post("/login", response_model=ApiResponse[str])
+@router.post("/login", response_model=ApiResponse[TokenResponse])
 async def login_user(
     request: LoginRequest, auth_service: AuthService = Depends(get_auth_service)
 ):
@@ -48,6 +57,40 @@ async def login_user(
             if isinstance(user, ErrorResponse):
                 raise HTTPException(status_code=404, detail="User not found or login failed")
             
-            return user
+            return ORJSONResponse(user)
         except Exception as e:
             raise HTTPException(status_code=500, detail="An error occurred during login")
+
+
+@router.post("/refresh", response_model=ApiResponse[TokenResponse])
+async def refresh_token(
+    request: RefreshTokenRequest, auth_service: AuthService = Depends(get_auth_service)
+):
+    REFRESH_REQUEST_COUNT.inc()
+
+    with REFRESH_REQUEST_DURATION.time():
+        response = await auth_service.refresh_token(request)
+
+        if isinstance(response, ErrorResponse):
+            status_code = 500 if response.message == "Internal Server Error." else 401
+            raise HTTPException(status_code=status_code, detail=response.message)
+
+        return ORJSONResponse(response)
+
+
+@router.post("/logout", response_model=ApiResponse[None])
+async def logout_user(
+    request: LogoutRequest,
+    token: str = Depends(token_security),
+    auth_service: AuthService = Depends(get_auth_service),
+):
+    LOGOUT_REQUEST_COUNT.inc()
+
+    with LOGOUT_REQUEST_DURATION.time():
+        response = await auth_service.logout_user(token, request)
+
+        if isinstance(response, ErrorResponse):
+            status_code = 500 if response.message == "Internal Server Error." else 401
+            raise HTTPException(status_code=status_code, detail=response.message)
+
+        return ORJSONResponse(response)
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+
+class RefreshTokenRecordDTO(BaseModel):
+    token_hash: str
+    user_id: int
+    family_id: str
+    access_jti: str
+    access_expires_at: datetime
+    expires_at: datetime
+    used_at: Optional[datetime] = None
+    revoked_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class RevokedTokenRecordDTO(BaseModel):
+    jti: str
+    expires_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -14,4 +14,14 @@ class UserRecordDTO(BaseModel):
 
     class Config:
         orm_mode = True
+        from_attributes = True
+
+
+class UserCredentialsDTO(BaseModel):
+    """What a login checks: the user's id and password hash."""
+
+    user_id: int
+    password: str
+
+    class Config:
         from_attributes = True
\ No newline at end of file
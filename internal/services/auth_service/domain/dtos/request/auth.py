@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field, model_validator, EmailStr
 
 class RegisterRequest(BaseModel):
@@ -20,4 +22,14 @@ class RegisterRequest(BaseModel):
 
 class LoginRequest(BaseModel):
     email: EmailStr = Field(..., max_length=50)
-    password: str = Field(..., min_length=6)
\ No newline at end of file
+    password: str = Field(..., min_length=6)
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str = Field(..., min_length=1)
+
+
+class LogoutRequest(BaseModel):
+    # The refresh token to end along with the access token, if the client has one.
+    refresh_token: Optional[str] = None
+    # End every session of the user, not only this one.
+    everywhere: bool = False
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class TokenResponse(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    # Seconds until the access token expires.
+    expires_in: int
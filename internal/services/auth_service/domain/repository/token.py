@@ -0,0 +1,55 @@
+import abc
+from typing import List, Optional
+from domain.dtos.record.token import RefreshTokenRecordDTO, RevokedTokenRecordDTO
+
+
+class ITokenRepository(abc.ABC):
+    """
+    Token Repository interface for refresh tokens and revoked access tokens.
+    """
+
+    @abc.abstractmethod
+    async def create_refresh_token(self, token: RefreshTokenRecordDTO) -> None:
+        """
+        Store a newly issued refresh token.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def use_refresh_token(self, token_hash: str) -> Optional[RefreshTokenRecordDTO]:
+        """
+        Mark a refresh token used, if it is unused, unrevoked and unexpired,
+        and return it; None otherwise. Of concurrent calls with one token,
+        only one gets it.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def find_refresh_token(self, token_hash: str) -> Optional[RefreshTokenRecordDTO]:
+        """
+        Find a refresh token in any state.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def revoke_family(self, family_id: str) -> List[RevokedTokenRecordDTO]:
+        """
+        Revoke every refresh token of a family and the unexpired access
+        tokens issued with them, and return those access tokens.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def revoke_user(self, user_id: int) -> List[RevokedTokenRecordDTO]:
+        """
+        Revoke every refresh token of a user and the unexpired access tokens
+        issued with them, and return those access tokens.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def revoke_access_token(self, token: RevokedTokenRecordDTO) -> None:
+        """
+        Add an access token to the revocation list.
+        """
+        pass
@@ -1,6 +1,6 @@
 import abc
 from typing import List, Optional, Any
-from domain.dtos.record.user import UserRecordDTO
+from domain.dtos.record.user import UserCredentialsDTO, UserRecordDTO
 from domain.dtos.request.user import CreateUserRequest, UpdateUserRequest
 
 
@@ -12,7 +12,8 @@ class IUserRepository(abc.ABC):
     @abc.abstractmethod
     async def create_user(self, user: CreateUserRequest) -> UserRecordDTO:
         """
-        Add a new user record to the repository.
+        Add a new user record to the repository. Raises
+        EmailAlreadyExistsError if the email is already registered.
         """
         pass
 
@@ -29,4 +30,11 @@ class IUserRepository(abc.ABC):
         """
         Find a user by their email.
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abc.abstractmethod
+    async def find_credentials_by_email(self, email: str) -> Optional[UserCredentialsDTO]:
+        """
+        Find the id and password hash of the user with the given email.
+        """
+        pass
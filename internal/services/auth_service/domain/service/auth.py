@@ -1,8 +1,9 @@
 import abc
 from typing import List, Optional, Any, Union
 from domain.dtos.response.api import ApiResponse, ErrorResponse
+from domain.dtos.response.auth import TokenResponse
 from domain.dtos.response.user import UserResponse
-from domain.dtos.request.auth import RegisterRequest, LoginRequest
+from domain.dtos.request.auth import RegisterRequest, LoginRequest, LogoutRequest, RefreshTokenRequest
 
 
 class IAuthService(abc.ABC):
@@ -10,4 +11,10 @@ class IAuthService(abc.ABC):
     async def register_user(self, request: RegisterRequest) -> Union[ApiResponse[UserResponse], ErrorResponse]: ...
 
     @staticmethod
-    async def login_user(self, request: LoginRequest) -> Union[ApiResponse[str], ErrorResponse]: ...
+    async def login_user(self, request: LoginRequest) -> Union[ApiResponse[TokenResponse], ErrorResponse]: ...
+
+    @staticmethod
+    async def refresh_token(self, request: RefreshTokenRequest) -> Union[ApiResponse[TokenResponse], ErrorResponse]: ...
+
+    @staticmethod
+    async def logout_user(self, access_token: str, request: LogoutRequest) -> Union[ApiResponse[None], ErrorResponse]: ...
@@ -1,6 +1,8 @@
 import contextlib
 from collections.abc import AsyncIterator
+from typing import Optional
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from lib.config.main import get_app_settings
@@ -8,8 +10,10 @@ from lib.config.main import get_app_settings
 from lib.config.base import BaseAppSettings
 
 from domain.repository.user import IUserRepository
+from domain.repository.token import ITokenRepository
 
 from infrastructure.repository.user import UserRepository
+from infrastructure.repository.token import TokenRepository
 
 
 from domain.service.auth import IAuthService
@@ -17,8 +21,15 @@ from domain.service.auth import IAuthService
 from infrastructure.service.auth import AuthService
 
 from lib.security.jwt import JwtConfig
+from lib.security.revocation import RevocationPoller, RevocationSet
 from lib.security.hash_password import Hashing
+from lib.security.unknown_emails import UnknownEmailCache
+from lib.events.events import UserChanged
+from lib.events.user_changes import UserChangeFollower
+from lib.kafka.kafka_config import KafkaManager
 from lib.otel.otel_config import OpenTelemetryManager
+from lib.runtime.lifespan import open_pool
+from lib.utils.account_number import AccountNumberAllocator
 
 
 class Container:
@@ -26,35 +37,107 @@ class Container:
         self._settings = settings
         self._engine = create_async_engine(
             **settings.sqlalchemy_engine_props,
-            pool_size=10, 
-            max_overflow=20,  
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
             pool_timeout=30,  
             pool_recycle=1800,  
             pool_pre_ping=True 
         )
         self._session = async_sessionmaker(bind=self._engine, expire_on_commit=False)
+        self._kafka: Optional[KafkaManager] = None
+        self._otel: Optional[OpenTelemetryManager] = None
+        self._jwt = JwtConfig.for_issuer(settings, RevocationSet())
+        self._revocations = RevocationPoller(
+            self._engine,
+            self._jwt.revocations,
+            interval=settings.token_revocation_poll_seconds,
+            # Also deletes the rows of expired tokens; one service is enough.
+            purge=True,
+        )
+        self._account_numbers = AccountNumberAllocator(self._engine, settings.noc_block_size)
+        self._unknown_emails = UnknownEmailCache(
+            size=settings.login_unknown_email_cache_size,
+            ttl=settings.login_unknown_email_ttl_seconds,
+        )
+        self._user_changes: Optional[UserChangeFollower] = None
 
     def get_jwt(self) -> JwtConfig:
-        return JwtConfig(
-            self._settings.jwt_secret_key, self._settings.jwt_token_expiration_minutes
-        )
+        return self._jwt
+
+    def get_kafka(self) -> KafkaManager:
+        if self._kafka is None:
+            self._kafka = KafkaManager(bootstrap_servers="kafka:9092")
+        return self._kafka
 
     def get_otel(self) -> OpenTelemetryManager:
-        return OpenTelemetryManager(
-            service_name="auth-service", endpoint="http://jaeger:4317"
+        if self._otel is None:
+            self._otel = OpenTelemetryManager(
+                service_name="auth-service", endpoint="http://jaeger:4317"
+            )
+        return self._otel
+
+    async def warm_database(self) -> None:
+        await open_pool(
+            self._engine,
+            min(self._settings.startup_db_connections, self._settings.db_pool_size),
         )
 
+    async def warm_kafka(self) -> None:
+        kafka = self.get_kafka()
+        await kafka.producer()
+        await kafka.ensure_topics(
+            [UserChanged.topic],
+            self._settings.kafka_topic_partitions,
+            self._settings.kafka_topic_replication_factor,
+        )
+
+    def follow_user_changes(self) -> None:
+        if self._user_changes is None:
+            self._user_changes = UserChangeFollower(self.get_kafka(), [self._unknown_emails])
+        self._user_changes.start()
+
+    async def follow_revocations(self) -> None:
+        await self._revocations.start()
+
+    async def check_database(self) -> None:
+        async with self._engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    async def check_kafka(self) -> None:
+        await self.get_kafka().check()
+
+    async def close(self) -> None:
+        await self._revocations.stop()
+        await self._jwt.close()
+        if self._user_changes is not None:
+            await self._user_changes.stop()
+        if self._kafka is not None:
+            await self._kafka.close()
+        if self._otel is not None:
+            await self._otel.flush()
+        await self._engine.dispose()
+
     async def user_repository(self) -> IUserRepository:
         session = self._session()
         return UserRepository(session)
 
+    async def token_repository(self) -> ITokenRepository:
+        session = self._session()
+        return TokenRepository(session)
+
     async def auth_service(self) -> IAuthService:
         user_repo = await self.user_repository()
+        token_repo = await self.token_repository()
         return AuthService(
             repository=user_repo,
             hashing=Hashing(),
             jwt_config=self.get_jwt(),
             otel_manager=self.get_otel(),
+            account_numbers=self._account_numbers,
+            kafka_manager=self.get_kafka(),
+            unknown_emails=self._unknown_emails,
+            token_repository=token_repo,
+            refresh_token_expiration_minutes=self._settings.jwt_refresh_token_expiration_minutes,
         )
 
 
@@ -0,0 +1,83 @@
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List, Optional
+
+from domain.dtos.record.token import RefreshTokenRecordDTO, RevokedTokenRecordDTO
+from domain.repository.token import ITokenRepository
+
+from lib.model.token import RefreshToken, RevokedToken
+
+
+class TokenRepository(ITokenRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_refresh_token(self, token: RefreshTokenRecordDTO) -> None:
+        await self.session.execute(
+            insert(RefreshToken).values(**token.model_dump(exclude={"used_at", "revoked_at"}))
+        )
+        await self.session.commit()
+
+    async def use_refresh_token(self, token_hash: str) -> Optional[RefreshTokenRecordDTO]:
+        # The conditions and the update are one statement, so a token
+        # presented twice at once is only accepted once.
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.used_at.is_(None),
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+            )
+            .values(used_at=now)
+            .returning(*RefreshToken.__table__.columns)
+        )
+        used = result.first()
+        await self.session.commit()
+        return RefreshTokenRecordDTO.model_validate(used) if used else None
+
+    async def find_refresh_token(self, token_hash: str) -> Optional[RefreshTokenRecordDTO]:
+        result = await self.session.execute(
+            select(RefreshToken).where(RefreshToken.token_hash == token_hash)
+        )
+        token = result.scalars().first()
+        return RefreshTokenRecordDTO.model_validate(token) if token else None
+
+    async def revoke_family(self, family_id: str) -> List[RevokedTokenRecordDTO]:
+        return await self._revoke(RefreshToken.family_id == family_id)
+
+    async def revoke_user(self, user_id: int) -> List[RevokedTokenRecordDTO]:
+        return await self._revoke(RefreshToken.user_id == user_id)
+
+    async def revoke_access_token(self, token: RevokedTokenRecordDTO) -> None:
+        await self.session.execute(
+            insert(RevokedToken)
+            .values(jti=token.jti, expires_at=token.expires_at)
+            .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+        )
+        await self.session.commit()
+
+    async def _revoke(self, condition) -> List[RevokedTokenRecordDTO]:
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            update(RefreshToken)
+            .where(condition, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+            .returning(RefreshToken.access_jti, RefreshToken.access_expires_at)
+        )
+        revoked = [
+            RevokedTokenRecordDTO(jti=jti, expires_at=expires_at)
+            for jti, expires_at in result.all()
+            if expires_at > now
+        ]
+        if revoked:
+            await self.session.execute(
+                insert(RevokedToken)
+                .values([{"jti": token.jti, "expires_at": token.expires_at} for token in revoked])
+                .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+            )
+        await self.session.commit()
+        return revoked
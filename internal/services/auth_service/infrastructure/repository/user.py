@@ -1,13 +1,15 @@
-from sqlalchemy import select, update, delete
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from typing import List, Optional
 
 from domain.dtos.request.user import CreateUserRequest, UpdateUserRequest
-from domain.dtos.record.user import UserRecordDTO
+from domain.dtos.record.user import UserCredentialsDTO, UserRecordDTO
 from domain.repository.user import IUserRepository
 
 from lib.model.user import User
+from lib.utils.errors import EmailAlreadyExistsError
 
 
 class UserRepository(IUserRepository):
@@ -15,26 +17,41 @@ class UserRepository(IUserRepository):
         self.session = session
 
     async def create_user(self, user: CreateUserRequest) -> UserRecordDTO:
-        new_user = User(
-            firstname=user.firstname,
-            lastname=user.lastname,
-            email=user.email,
-            password=user.password,
-            noc_transfer=user.noc_transfer,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+        # A single statement: the unique index on email decides whether the
+        # user is new, so concurrent sign-ups with one email cannot both pass
+        # a check and race to insert.
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            insert(User)
+            .values(
+                firstname=user.firstname,
+                lastname=user.lastname,
+                email=user.email,
+                password=user.password,
+                noc_transfer=user.noc_transfer,
+                created_at=now,
+                updated_at=now,
+            )
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(*User.__table__.columns)
         )
-        self.session.add(new_user)
+        created = result.first()
         await self.session.commit()
-        await self.session.refresh(new_user)
-        return UserRecordDTO.from_orm(new_user)
+        if created is None:
+            raise EmailAlreadyExistsError()
+        return UserRecordDTO.from_orm(created)
 
     async def find_by_email_exists(self, email: str) -> bool:
-        result = await self.session.execute(select(User).filter(User.email == email))
-        user = result.scalars().first()
-        return user is not None
+        return await self.session.scalar(select(exists().where(User.email == email)))
 
     async def find_by_email(self, email: str) -> Optional[UserRecordDTO]:
         result = await self.session.execute(select(User).filter(User.email == email))
         user = result.scalars().first()
         return UserRecordDTO.from_orm(user) if user else None
+
+    async def find_credentials_by_email(self, email: str) -> Optional[UserCredentialsDTO]:
+        result = await self.session.execute(
+            select(User.user_id, User.password).where(User.email == email)
+        )
+        row = result.first()
+        return UserCredentialsDTO.model_validate(row) if row else None
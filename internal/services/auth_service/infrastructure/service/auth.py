@@ -1,30 +1,120 @@
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from structlog import get_logger
-from typing import Union
+from typing import List, Optional, Union
 
+from domain.repository.token import ITokenRepository
 from domain.repository.user import IUserRepository
 from domain.service.auth import IAuthService
 
 from lib.security.hash_password import Hashing
 from lib.security.jwt import JwtConfig
 
-from domain.dtos.request.auth import RegisterRequest, LoginRequest
+from domain.dtos.record.token import RefreshTokenRecordDTO, RevokedTokenRecordDTO
+from domain.dtos.record.user import UserRecordDTO
+from domain.dtos.request.auth import RegisterRequest, LoginRequest, LogoutRequest, RefreshTokenRequest
 from domain.dtos.request.user import CreateUserRequest
 from domain.dtos.response.api import ApiResponse, ErrorResponse
+from domain.dtos.response.auth import TokenResponse
 from domain.dtos.response.user import UserResponse
-from lib.utils.random_vcc import random_vcc
-from lib.utils.errors import InvalidCredentialsError
+from lib.utils.account_number import AccountNumberAllocator
+from lib.utils.errors import (
+    EmailAlreadyExistsError,
+    InvalidCredentialsError,
+    InvalidRefreshTokenError,
+    TokenExpiredError,
+    TokenValidationError,
+)
+from lib.events.codec import publish
+from lib.events.events import UserChanged
+from lib.kafka.kafka_config import KafkaManager
 from lib.otel.otel_config import OpenTelemetryManager
+from lib.security.revocation import to_timestamp
+from lib.security.unknown_emails import UnknownEmailCache
 
 logger = get_logger()
 
 
+def hash_refresh_token(refresh_token: str) -> str:
+    # Refresh tokens are random, so a plain digest is enough to keep the
+    # stored ones useless to whoever reads the table.
+    return hashlib.sha256(refresh_token.encode("utf-8")).hexdigest()
+
+
 class AuthService(IAuthService):
-    def __init__(self, repository: IUserRepository, hashing: Hashing, jwt_config: JwtConfig, otel_manager: OpenTelemetryManager):
+    def __init__(
+        self,
+        repository: IUserRepository,
+        hashing: Hashing,
+        jwt_config: JwtConfig,
+        otel_manager: OpenTelemetryManager,
+        account_numbers: AccountNumberAllocator,
+        kafka_manager: KafkaManager,
+        unknown_emails: UnknownEmailCache,
+        token_repository: ITokenRepository,
+        refresh_token_expiration_minutes: int,
+    ):
         self.repository = repository
         self.hashing = hashing
         self.jwt_config = jwt_config
         self.otel_manager = otel_manager
+        self.account_numbers = account_numbers
+        self.kafka_manager = kafka_manager
+        self.unknown_emails = unknown_emails
+        self.token_repository = token_repository
+        self.refresh_token_expiration_minutes = refresh_token_expiration_minutes
+
+    async def issue_tokens(self, user_id: int, family_id: Optional[str] = None) -> TokenResponse:
+        """
+        A new access token, and the refresh token that renews it. A login
+        starts a family of refresh tokens; each refresh passes it on, so
+        that a reused token can revoke the whole session.
+        """
+        access_token, claims = self.jwt_config.issue_token(user_id)
+        refresh_token = secrets.token_urlsafe(32)
+        await self.token_repository.create_refresh_token(
+            RefreshTokenRecordDTO(
+                token_hash=hash_refresh_token(refresh_token),
+                user_id=user_id,
+                family_id=family_id or uuid.uuid4().hex,
+                access_jti=claims.jti,
+                access_expires_at=datetime.utcfromtimestamp(claims.exp),
+                expires_at=datetime.utcnow() + timedelta(minutes=self.refresh_token_expiration_minutes),
+            )
+        )
+        return TokenResponse(
+            access_token=access_token,
+            refresh_token=refresh_token,
+            expires_in=int(claims.exp - claims.iat),
+        )
+
+    def revoke_locally(self, tokens: List[RevokedTokenRecordDTO]) -> None:
+        # Refused by this process at once; the others read the revocations
+        # on their next poll.
+        for token in tokens:
+            self.jwt_config.revocations.add(token.jti, to_timestamp(token.expires_at))
+
+    async def publish_registered(self, user: UserRecordDTO) -> None:
+        """
+        Tell the other auth processes that the email is taken now, in case
+        they remember it as unknown. The user is already committed, so a
+        failure is only logged: those caches then catch up when their entries
+        expire.
+        """
+        try:
+            producer = await self.kafka_manager.producer()
+            await publish(
+                producer,
+                UserChanged(
+                    user_id=user.user_id, noc_transfer=user.noc_transfer, deleted=False, email=user.email
+                ),
+            )
+        except Exception as e:
+            logger.error("Failed to publish user change", user_id=user.user_id, error=str(e))
 
     async def register_user(self, input: RegisterRequest) -> Union[ApiResponse[UserResponse], ErrorResponse]:
         with self.otel_manager.start_trace("Register User") as span:
@@ -32,33 +122,34 @@ class AuthService(IAuthService):
             logger.info("Attempting to register user", email=input.email)
 
             try:
-                with self.otel_manager.start_trace("Check Email Existence"):
-                    exists = await self.repository.find_by_email_exists(email=input.email)
-                    if exists:
-                        logger.error("Email already exists", email=input.email)
-                        return ErrorResponse(
-                            status="error",
-                            message="Email already exists.",
-                        )
-
                 # Hash password
                 with self.otel_manager.start_trace("Hash Password"):
                     hashed_password = await self.hashing.hash_password(input.password)
 
+                # Drawn only once the hash is done; handed back if the email is taken
+                noc_transfer = await self.account_numbers.allocate()
+
                 # Create user request object
                 request = CreateUserRequest(
                     firstname=input.firstname,
                     lastname=input.lastname,
                     email=input.email,
                     password=hashed_password,
-                    noc_transfer=random_vcc(),
+                    noc_transfer=noc_transfer,
                     confirm_password=input.confirm_password,
                 )
 
+                # Inserted unless the email is taken, in the same statement
                 with self.otel_manager.start_trace("Create User in Repository"):
                     logger.info("Creating user", email=input.email)
-                    create_user = await self.repository.create_user(user=request)
+                    try:
+                        create_user = await self.repository.create_user(user=request)
+                    except EmailAlreadyExistsError:
+                        self.account_numbers.release(noc_transfer)
+                        raise
 
+                self.unknown_emails.discard(input.email)
+                await self.publish_registered(create_user)
                 logger.info("User registered successfully", email=input.email)
 
                 return ApiResponse(
@@ -66,6 +157,13 @@ class AuthService(IAuthService):
                     message="User registered successfully.",
                     data=UserResponse.from_dto(create_user),
                 )
+            except EmailAlreadyExistsError:
+                logger.error("Email already exists", email=input.email)
+                span.set_attribute("error", "Email already exists")
+                return ErrorResponse(
+                    status="error",
+                    message="Email already exists.",
+                )
             except Exception as e:
                 span.record_exception(e)
                 logger.error("Unexpected error during registration", error=str(e))
@@ -74,34 +172,40 @@ class AuthService(IAuthService):
                     message="Internal Server Error.",
                 )
 
-    async def login_user(self, input: LoginRequest) -> Union[ApiResponse[str], ErrorResponse]:
+    async def login_user(self, input: LoginRequest) -> Union[ApiResponse[TokenResponse], ErrorResponse]:
         with self.otel_manager.start_trace("Login User") as span:
             span.set_attribute("email", input.email)
             logger.info("Attempting to login user", email=input.email)
 
             try:
+                # Emails known to have no user are answered from memory; the
+                # rest costs one query for the id and password hash.
                 with self.otel_manager.start_trace("Find User by Email"):
-                    user = await self.repository.find_by_email(email=input.email)
-
-                if not user:
-                    logger.error("User not found", email=input.email)
-                    return ErrorResponse(
-                        status="error",
-                        message="Invalid credentials.",
+                    user = await self.unknown_emails.find(
+                        input.email, self.repository.find_credentials_by_email
                     )
 
+                # A bcrypt check either way, so that an unknown email cannot be
+                # told from a wrong password by the response time.
                 with self.otel_manager.start_trace("Compare Passwords"):
-                    await self.hashing.compare_password(user.password, input.password)
+                    if user is None:
+                        await self.hashing.verify_dummy(input.password)
+                        matches = False
+                    else:
+                        matches = await self.hashing.verify_password(user.password, input.password)
+
+                if not matches:
+                    raise InvalidCredentialsError()
 
                 with self.otel_manager.start_trace("Generate JWT Token"):
-                    token = self.jwt_config.generate_token(user.user_id)
+                    tokens = await self.issue_tokens(user.user_id)
 
                 logger.info("User logged in successfully", email=input.email)
 
                 return ApiResponse(
                     status="success",
                     message="Login successful.",
-                    data=token,
+                    data=tokens,
                 )
             except InvalidCredentialsError as e:
                 span.record_exception(e)
@@ -116,4 +220,88 @@ class AuthService(IAuthService):
                 return ErrorResponse(
                     status="error",
                     message="Internal Server Error.",
-                )
\ No newline at end of file
+                )
+
+    async def refresh_token(self, input: RefreshTokenRequest) -> Union[ApiResponse[TokenResponse], ErrorResponse]:
+        with self.otel_manager.start_trace("Refresh Token") as span:
+            try:
+                token_hash = hash_refresh_token(input.refresh_token)
+                with self.otel_manager.start_trace("Use Refresh Token"):
+                    used = await self.token_repository.use_refresh_token(token_hash)
+
+                if used is None:
+                    known = await self.token_repository.find_refresh_token(token_hash)
+                    if known is not None and known.used_at is not None and known.revoked_at is None:
+                        # Someone else holds a copy of this token, or of its
+                        # successor: end the session for both.
+                        logger.warning("Refresh token reused", user_id=known.user_id)
+                        span.set_attribute("error", "Refresh token reused")
+                        self.revoke_locally(await self.token_repository.revoke_family(known.family_id))
+                    raise InvalidRefreshTokenError()
+
+                span.set_attribute("user_id", used.user_id)
+                with self.otel_manager.start_trace("Generate JWT Token"):
+                    tokens = await self.issue_tokens(used.user_id, used.family_id)
+
+                return ApiResponse(
+                    status="success",
+                    message="Token refreshed.",
+                    data=tokens,
+                )
+            except InvalidRefreshTokenError as e:
+                span.record_exception(e)
+                logger.error("Invalid refresh token")
+                return ErrorResponse(
+                    status="error",
+                    message="Invalid refresh token.",
+                )
+            except Exception as e:
+                span.record_exception(e)
+                logger.error("Unexpected error during token refresh", error=str(e))
+                return ErrorResponse(
+                    status="error",
+                    message="Internal Server Error.",
+                )
+
+    async def logout_user(self, access_token: str, input: LogoutRequest) -> Union[ApiResponse[None], ErrorResponse]:
+        with self.otel_manager.start_trace("Logout User") as span:
+            try:
+                claims = self.jwt_config.decode_token(access_token)
+                span.set_attribute("user_id", claims.user_id)
+
+                revoked = [
+                    RevokedTokenRecordDTO(jti=claims.jti, expires_at=datetime.utcfromtimestamp(claims.exp))
+                ]
+                with self.otel_manager.start_trace("Revoke Tokens"):
+                    await self.token_repository.revoke_access_token(revoked[0])
+                    if input.everywhere:
+                        revoked += await self.token_repository.revoke_user(claims.user_id)
+                    elif input.refresh_token:
+                        known = await self.token_repository.find_refresh_token(
+                            hash_refresh_token(input.refresh_token)
+                        )
+                        if known is not None and known.user_id == claims.user_id:
+                            revoked += await self.token_repository.revoke_family(known.family_id)
+                self.revoke_locally(revoked)
+
+                logger.info("User logged out", user_id=claims.user_id, everywhere=input.everywhere)
+
+                return ApiResponse(
+                    status="success",
+                    message="Logout successful.",
+                    data=None,
+                )
+            except (TokenExpiredError, TokenValidationError) as e:
+                span.record_exception(e)
+                logger.error("Invalid token on logout", error=str(e))
+                return ErrorResponse(
+                    status="error",
+                    message="Invalid token.",
+                )
+            except Exception as e:
+                span.record_exception(e)
+                logger.error("Unexpected error during logout", error=str(e))
+                return ErrorResponse(
+                    status="error",
+                    message="Internal Server Error.",
+                )
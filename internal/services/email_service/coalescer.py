@@ -0,0 +1,166 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import structlog
+from prometheus_client import Counter, Gauge, Histogram
+
+
+logger = structlog.get_logger(__name__)
+
+EMAIL_COALESCED = Counter(
+    "email_coalesced_count", "Notifications merged into another email instead of sent on their own"
+)
+EMAIL_DIGEST_SIZE = Histogram(
+    "email_digest_size",
+    "Notifications per email sent by the coalescer",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250),
+)
+EMAIL_PENDING_RECIPIENTS = Gauge(
+    "email_coalescer_pending_recipients", "Recipients with notifications waiting in the coalescer"
+)
+EMAIL_END_TO_END = Histogram(
+    "email_end_to_end_seconds",
+    "Time from publish of the event to its email being handed to the transport",
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900),
+)
+
+# (recipient, subject, text body, html body or None)
+SendEmail = Callable[[str, str, str, Optional[str]], Awaitable[None]]
+
+
+class _Batch:
+    __slots__ = ("first_at", "items", "produced_at", "sent", "timer")
+
+    def __init__(self, first_at: float):
+        self.first_at = first_at
+        self.items: List[Tuple[str, str, Optional[str]]] = []
+        # Wall-clock publish time of each item, when known.
+        self.produced_at: List[float] = []
+        # Resolved once the batch has been handed to the transport.
+        self.sent: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class EmailCoalescer:
+    """
+    Merges the notifications for one recipient that arrive close together
+    into a single digest email.
+
+    A recipient's batch is sent once no new notification has arrived for
+    `window` seconds, but never later than `max_delay` seconds after its
+    first one, and at once when it reaches `max_batch` notifications. A
+    batch of one is sent as it came. A `window` of 0 sends everything
+    straight away.
+
+    `add` returns a future that is done once the notification went out
+    (or failed to), so the consumer commits its message only then. Batches
+    still waiting when the service stops, or when partitions move to
+    another consumer, are sent by `close` and `flush`.
+    """
+
+    def __init__(
+        self,
+        send: SendEmail,
+        window: float = 2.0,
+        max_delay: float = 30.0,
+        max_batch: int = 100,
+    ):
+        self.send = send
+        self.window = window
+        self.max_delay = max(max_delay, window)
+        self.max_batch = max_batch
+
+        self._batches: Dict[str, _Batch] = {}
+        self._flushing: Set[asyncio.Task] = set()
+
+    async def add(
+        self,
+        to_email: str,
+        subject: str,
+        body: str,
+        html: Optional[str] = None,
+        produced_at: Optional[float] = None,
+    ) -> asyncio.Future:
+        if self.window <= 0:
+            await self.send(to_email, subject, body, html)
+            if produced_at is not None:
+                EMAIL_END_TO_END.observe(time.time() - produced_at)
+            sent = asyncio.get_running_loop().create_future()
+            sent.set_result(None)
+            return sent
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        batch = self._batches.get(to_email)
+        if batch is None:
+            batch = self._batches[to_email] = _Batch(now)
+            EMAIL_PENDING_RECIPIENTS.set(len(self._batches))
+        else:
+            batch.timer.cancel()
+            EMAIL_COALESCED.inc()
+        batch.items.append((subject, body, html))
+        if produced_at is not None:
+            batch.produced_at.append(produced_at)
+
+        if len(batch.items) >= self.max_batch:
+            self._flush(to_email)
+            return batch.sent
+        due = min(now + self.window, batch.first_at + self.max_delay)
+        batch.timer = loop.call_at(due, self._flush, to_email)
+        return batch.sent
+
+    def _flush(self, to_email: str) -> None:
+        batch = self._batches.pop(to_email, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        EMAIL_PENDING_RECIPIENTS.set(len(self._batches))
+        task = asyncio.create_task(self._send_batch(to_email, batch))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def _send_batch(self, to_email: str, batch: _Batch) -> None:
+        EMAIL_DIGEST_SIZE.observe(len(batch.items))
+        try:
+            await self.send(to_email, *digest(batch.items))
+        except Exception as e:
+            logger.error("Failed to send digest", to=to_email, notifications=len(batch.items), error=str(e))
+            return
+        finally:
+            # A failed send is not retried either way; it is logged above.
+            if not batch.sent.done():
+                batch.sent.set_result(None)
+        now = time.time()
+        for published in batch.produced_at:
+            EMAIL_END_TO_END.observe(now - published)
+
+    async def flush(self) -> None:
+        """Send every waiting batch now and wait for the sends to finish."""
+        for to_email in list(self._batches):
+            self._flush(to_email)
+        if self._flushing:
+            await asyncio.gather(*self._flushing, return_exceptions=True)
+
+    async def close(self) -> None:
+        await self.flush()
+
+
+def digest(items: List[Tuple[str, str, Optional[str]]]) -> Tuple[str, str, Optional[str]]:
+    """
+    Subject, text and html body of one email standing for `items`, a list of
+    (subject, text, html). A digest is text only: the html bodies are whole
+    documents, each in its own layout.
+    """
+    if len(items) == 1:
+        return items[0]
+
+    subjects = {subject for subject, _, _ in items}
+    subject = f"{len(items)} notifications"
+    if len(subjects) == 1:
+        subject = f"{next(iter(subjects))} ({len(items)} notifications)"
+
+    sections = [f"{number}. {title}\n{text}" for number, (title, text, _) in enumerate(items, 1)]
+    body = f"You have {len(items)} new notifications.\n\n" + "\n\n".join(sections)
+    return subject, body, None
@@ -0,0 +1,98 @@
+import asyncio
+from typing import Iterable, Optional
+
+import structlog
+from aiokafka import AIOKafkaConsumer, ConsumerRebalanceListener, TopicPartition
+from prometheus_client import Counter, Gauge, Histogram
+
+from offsets import OffsetTracker
+
+
+logger = structlog.get_logger(__name__)
+
+CONSUMER_LAG = Gauge(
+    "email_consumer_lag",
+    "Messages not yet handled, per assigned partition (highwater minus the first offset not handled)",
+    ["topic", "partition"],
+)
+CONSUMER_ASSIGNED_PARTITIONS = Gauge(
+    "email_consumer_assigned_partitions", "Partitions assigned to this consumer"
+)
+CONSUMER_REBALANCES = Counter(
+    "email_consumer_rebalance_count", "Consumer group rebalances seen by this consumer", ["event"]
+)
+CONSUMER_BATCH_SIZE = Histogram(
+    "email_consumer_batch_size",
+    "Messages returned by one poll of the consumer",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+EVENT_AGE = Histogram(
+    "email_event_age_seconds",
+    "Time from publish (the Kafka message timestamp) until the email service picks the message up",
+    ["topic"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900),
+)
+HANDLER_DURATION = Histogram(
+    "email_handler_duration_seconds",
+    "Time to handle one message, not counting the wait for earlier messages with its key",
+    ["topic"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+
+
+def _forget_partitions(partitions: Iterable[TopicPartition]) -> None:
+    for tp in partitions:
+        try:
+            CONSUMER_LAG.remove(tp.topic, str(tp.partition))
+        except KeyError:
+            pass
+
+
+class RebalanceMetrics(ConsumerRebalanceListener):
+    """Counts rebalances, and drops the lag of partitions that moved to another consumer."""
+
+    async def on_partitions_revoked(self, revoked) -> None:
+        CONSUMER_REBALANCES.labels("revoked").inc()
+        _forget_partitions(revoked)
+
+    async def on_partitions_assigned(self, assigned) -> None:
+        CONSUMER_REBALANCES.labels("assigned").inc()
+        CONSUMER_ASSIGNED_PARTITIONS.set(len(assigned))
+
+
+class LagMonitor:
+    """
+    Updates `email_consumer_lag` for the assigned partitions every
+    `interval` seconds. The highwater comes with every fetch. How far a
+    partition is handled comes from `offsets` (the offsets whose emails went
+    out); before this consumer started on a partition, from the group's
+    committed offset, which needs a request to the group coordinator, hence
+    the interval. Messages waiting for a slot, for earlier messages of their
+    key or in the coalescer all count as lag.
+    """
+
+    def __init__(self, consumer: AIOKafkaConsumer, interval: float = 15.0, offsets: Optional[OffsetTracker] = None):
+        self.consumer = consumer
+        self.interval = interval
+        self.offsets = offsets
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.update()
+            except Exception as e:
+                logger.warning("Could not read consumer lag", error=str(e))
+            await asyncio.sleep(self.interval)
+
+    async def update(self) -> None:
+        for tp in self.consumer.assignment():
+            highwater = self.consumer.highwater(tp)
+            if highwater is None:
+                continue  # Nothing fetched from it yet.
+            handled = self.offsets.position(tp) if self.offsets is not None else None
+            if handled is None:
+                handled = await self.consumer.committed(tp)
+            if handled is None:
+                # The group never committed here: everything in the log is lag.
+                handled = (await self.consumer.beginning_offsets([tp]))[tp]
+            CONSUMER_LAG.labels(tp.topic, str(tp.partition)).set(max(highwater - handled, 0))
@@ -0,0 +1,153 @@
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+import structlog
+from mako.template import Template
+
+
+logger = structlog.get_logger(__name__)
+
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+
+# File suffix of each part of an email template; the html part is optional.
+PARTS = {"subject": ".subject.mako", "text": ".txt.mako", "html": ".html.mako"}
+# Wraps the html part of every template in its locale, given `content` and `subject`.
+LAYOUT = "layout.html.mako"
+
+
+class TemplateNotFound(LookupError):
+    pass
+
+
+class RenderedEmail(NamedTuple):
+    subject: str
+    text: str
+    html: Optional[str]
+
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _compile(path: Path, html: bool) -> Template:
+    return Template(
+        filename=str(path),
+        strict_undefined=True,
+        # Event fields are escaped in html, and only there.
+        default_filters=["h"] if html else ["str"],
+    )
+
+
+class _Compiled:
+    __slots__ = ("subject", "text", "html", "layout", "watched")
+
+    def __init__(self) -> None:
+        self.subject: Template = None
+        self.text: Template = None
+        self.html: Optional[Template] = None
+        self.layout: Optional[Template] = None
+        # Every file whose change, appearance or removal invalidates this entry.
+        self.watched: List[Tuple[Path, Optional[int]]] = []
+
+    def watch(self, path: Path) -> Optional[int]:
+        mtime = _mtime(path)
+        self.watched.append((path, mtime))
+        return mtime
+
+
+class EmailTemplates:
+    """
+    Mako email templates under `directory/<version>/<locale>/`, one file per
+    part: `<name>.subject.mako`, `<name>.txt.mako` and optionally
+    `<name>.html.mako`, which `layout.html.mako` wraps when there is one. A
+    template missing in a locale falls back to `default_locale`.
+
+    Templates are compiled on first use and kept per (locale, name), so a
+    render from cache is only the template calls. Every `reload_seconds`
+    (0 turns it off) the next render stats the files behind the cache and
+    compiles again the entries whose files changed, appeared or disappeared,
+    so template edits go live without restarting the consumer. An edit that
+    does not compile is logged and the previous version stays in use.
+    """
+
+    def __init__(
+        self,
+        directory: Path = TEMPLATE_DIR,
+        version: str = "v1",
+        default_locale: str = "en",
+        reload_seconds: float = 2.0,
+    ):
+        self.root = Path(directory) / version
+        self.version = version
+        self.default_locale = default_locale
+        self.reload_seconds = reload_seconds
+        self._cache: Dict[Tuple[str, str], _Compiled] = {}
+        self._checked = time.monotonic()
+
+    def render(self, name: str, fields: Mapping[str, object], locale: Optional[str] = None) -> RenderedEmail:
+        compiled = self._get(name, locale or self.default_locale)
+        subject = compiled.subject.render(**fields).strip()
+        html = None
+        if compiled.html is not None:
+            html = compiled.html.render(**fields)
+            if compiled.layout is not None:
+                html = compiled.layout.render(content=html, subject=subject)
+        return RenderedEmail(subject, compiled.text.render(**fields), html)
+
+    def _get(self, name: str, locale: str) -> _Compiled:
+        if self.reload_seconds and time.monotonic() - self._checked >= self.reload_seconds:
+            self.reload_changed()
+        compiled = self._cache.get((locale, name))
+        if compiled is None:
+            compiled = self._cache[(locale, name)] = self._load(name, locale)
+        return compiled
+
+    def _load(self, name: str, locale: str) -> _Compiled:
+        compiled = _Compiled()
+        locales = list(dict.fromkeys((locale, self.default_locale)))
+
+        found = None
+        for candidate in locales:
+            directory = self.root / candidate
+            paths = {part: directory / f"{name}{suffix}" for part, suffix in PARTS.items()}
+            mtimes = {part: compiled.watch(path) for part, path in paths.items()}
+            if mtimes["subject"] is not None and mtimes["text"] is not None:
+                found = candidate
+                break
+        if found is None:
+            raise TemplateNotFound(f"No email template {name!r} for locale {locale!r} in {self.root}")
+
+        compiled.subject = _compile(paths["subject"], html=False)
+        compiled.text = _compile(paths["text"], html=False)
+        if mtimes["html"] is not None:
+            compiled.html = _compile(paths["html"], html=True)
+            for candidate in locales[locales.index(found):]:
+                layout = self.root / candidate / LAYOUT
+                if compiled.watch(layout) is not None:
+                    compiled.layout = _compile(layout, html=True)
+                    break
+        return compiled
+
+    def reload_changed(self) -> List[Tuple[str, str]]:
+        """Compile again the cached templates whose files changed; returns their (locale, name)."""
+        self._checked = time.monotonic()
+        stale = [
+            key
+            for key, compiled in self._cache.items()
+            if any(_mtime(path) != mtime for path, mtime in compiled.watched)
+        ]
+        for locale, name in stale:
+            try:
+                self._cache[(locale, name)] = self._load(name, locale)
+            except Exception as e:
+                logger.warning("Email template reload failed, keeping the previous one", template=name, locale=locale, error=str(e))
+                # Not retried until the files change again.
+                previous = self._cache[(locale, name)]
+                previous.watched = [(path, _mtime(path)) for path, _ in previous.watched]
+        return stale
@@ -1,30 +1,61 @@
+from email_templates import EmailTemplates
 from service import EmailService
+from transport import create_transport
 
+from lib.events.events import NOTIFICATION_TOPICS
 from lib.kafka.kafka_config import KafkaManager 
+from lib.logging.logging_config import LoggerConfigurator
 from lib.otel.otel_config import OpenTelemetryManager
 from lib.config.main import get_app_settings
 from prometheus_client import start_http_server
 
 import asyncio
+import structlog
+
+
+logger = structlog.get_logger(__name__)
 
 async def main():   
     settings = get_app_settings()
 
+    LoggerConfigurator(logger_name="email-service").configure_logger(json_logs=True)
+
     kafka_manager = KafkaManager(bootstrap_servers="kafka:9092")
     otel_manager = OpenTelemetryManager(service_name="email-service", endpoint="http://jaeger:4317")
 
+    transport = create_transport(settings)
+
     email_service = EmailService(
         kafka_manager=kafka_manager,
-        smtp_server="smtp.ethereal.email",
-        smtp_port=587,
-        smtp_user=settings.smtp_user,
-        smtp_password=settings.smtp_password,
-        otel_manager=otel_manager
+        transport=transport,
+        sender=settings.smtp_user,
+        otel_manager=otel_manager,
+        concurrency=settings.smtp_pool_size,
+        coalesce_window=settings.email_coalesce_window_seconds,
+        coalesce_max_delay=settings.email_coalesce_max_delay_seconds,
+        coalesce_max_batch=settings.email_coalesce_max_batch,
+        lag_interval=settings.email_lag_interval_seconds,
+        templates=EmailTemplates(
+            version=settings.email_template_version,
+            default_locale=settings.email_default_locale,
+            reload_seconds=settings.email_template_reload_seconds,
+        ),
     )
 
     start_http_server(8008)  
 
-    await email_service.start()
+    try:
+        await kafka_manager.ensure_topics(
+            NOTIFICATION_TOPICS, settings.kafka_topic_partitions, settings.kafka_topic_replication_factor
+        )
+    except Exception as e:
+        # Consuming still works on topics as they are; only the partition count is not ensured.
+        logger.warning("Could not ensure Kafka topics", error=str(e))
+
+    try:
+        await email_service.start()
+    finally:
+        await transport.close()
 
 
 
@@ -0,0 +1,70 @@
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Set
+
+from aiokafka import TopicPartition
+
+
+class _Partition:
+    __slots__ = ("started", "done", "position")
+
+    def __init__(self):
+        # Offsets handed out and not yet contiguous with `position`, in order.
+        self.started: Deque[int] = deque()
+        self.done: Set[int] = set()
+        # Offset of the first message not yet handled.
+        self.position: Optional[int] = None
+
+
+class OffsetTracker:
+    """
+    Which offsets of each partition are safe to commit. Messages of one
+    partition are handled concurrently and finish out of order; a partition
+    is only committed up to the first message whose notifications have not
+    all been sent yet, so a crash resends rather than loses them.
+    """
+
+    def __init__(self):
+        self._partitions: Dict[TopicPartition, _Partition] = {}
+        self._committed: Dict[TopicPartition, int] = {}
+
+    def start(self, tp: TopicPartition, offset: int) -> None:
+        partition = self._partitions.get(tp)
+        if partition is None:
+            partition = self._partitions[tp] = _Partition()
+        if partition.position is None:
+            # Where the group's committed offset had the consumer start.
+            partition.position = offset
+            self._committed.setdefault(tp, offset)
+        partition.started.append(offset)
+
+    def done(self, tp: TopicPartition, offset: int) -> None:
+        partition = self._partitions.get(tp)
+        if partition is None:
+            return  # Revoked meanwhile; the new owner handles it again.
+        partition.done.add(offset)
+        while partition.started and partition.started[0] in partition.done:
+            finished = partition.started.popleft()
+            partition.done.discard(finished)
+            partition.position = finished + 1
+
+    def position(self, tp: TopicPartition) -> Optional[int]:
+        """Offset of the first message of `tp` not handled yet, if any was started."""
+        partition = self._partitions.get(tp)
+        return partition.position if partition is not None else None
+
+    def committable(self, partitions: Iterable[TopicPartition]) -> Dict[TopicPartition, int]:
+        """Positions of `partitions` that moved since they were last committed."""
+        offsets = {}
+        for tp in partitions:
+            position = self.position(tp)
+            if position is not None and position != self._committed.get(tp):
+                offsets[tp] = position
+        return offsets
+
+    def committed(self, offsets: Dict[TopicPartition, int]) -> None:
+        self._committed.update(offsets)
+
+    def forget(self, partitions: Iterable[TopicPartition]) -> None:
+        for tp in partitions:
+            self._partitions.pop(tp, None)
+            self._committed.pop(tp, None)
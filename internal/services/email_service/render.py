@@ -0,0 +1,26 @@
+from dataclasses import fields
+from typing import Dict, List, Optional, Tuple, Type
+
+from email_templates import EmailTemplates
+
+from lib.events.events import Event, SaldoCreated, TopupCreated, TransferCreated
+
+
+# (recipient, subject, text body, html body or None)
+Notification = Tuple[str, str, str, Optional[str]]
+
+# The emails each event results in: template name and the field holding its recipient.
+EMAILS: Dict[Type[Event], Tuple[Tuple[str, str], ...]] = {
+    SaldoCreated: (("saldo_created", "email"),),
+    TopupCreated: (("topup_created", "email"),),
+    TransferCreated: (("transfer_sent", "sender_email"), ("transfer_received", "receiver_email")),
+}
+
+
+def render(templates: EmailTemplates, event: Event, locale: Optional[str] = None) -> List[Notification]:
+    """The emails an event results in, rendered from its fields."""
+    values = {field.name: getattr(event, field.name) for field in fields(event)}
+    return [
+        (values[recipient], *templates.render(template, values, locale))
+        for template, recipient in EMAILS[type(event)]
+    ]
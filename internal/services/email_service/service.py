@@ -1,17 +1,78 @@
+import asyncio
+import contextvars
 import json
-import smtplib
-from email.mime.text import MIMEText
-from aiokafka import AIOKafkaConsumer
+import time
+from email.message import EmailMessage
+
+import structlog
+from aiokafka import AIOKafkaConsumer, TopicPartition
 from prometheus_client import Counter, Summary, Histogram
 
+from coalescer import EmailCoalescer
+from email_templates import EmailTemplates
+from consumer_metrics import CONSUMER_BATCH_SIZE, EVENT_AGE, HANDLER_DURATION, LagMonitor, RebalanceMetrics
+from offsets import OffsetTracker
+from render import render
+from transport import MailTransport
+
+from lib.events.codec import decode_event, is_event
+
+
+logger = structlog.get_logger(__name__)
+
+# The sends queued while handling the current message, collected by `notify`.
+_queued_sends: contextvars.ContextVar = contextvars.ContextVar("queued_sends")
+
+
+class _CommitOnRevoke(RebalanceMetrics):
+    """Sends what is waiting for partitions moving away, and commits them, before they go."""
+
+    def __init__(self, service: "EmailService"):
+        self.service = service
+
+    async def on_partitions_revoked(self, revoked) -> None:
+        await super().on_partitions_revoked(revoked)
+        await self.service.release(revoked)
+
+
 class EmailService:
-    def __init__(self, kafka_manager, smtp_server, smtp_port, smtp_user, smtp_password, otel_manager):
+    def __init__(
+        self,
+        kafka_manager,
+        transport: MailTransport,
+        sender,
+        otel_manager,
+        concurrency=8,
+        coalesce_window=0.0,
+        coalesce_max_delay=30.0,
+        coalesce_max_batch=100,
+        lag_interval=15.0,
+        templates: EmailTemplates = None,
+    ):
         self.kafka_manager = kafka_manager
-        self.smtp_server = smtp_server
-        self.smtp_port = smtp_port
-        self.smtp_user = smtp_user
-        self.smtp_password = smtp_password
+        self.transport = transport
+        self.sender = sender
         self.otel_manager = otel_manager
+        self.lag_interval = lag_interval
+        self.templates = templates or EmailTemplates()
+        # Notifications for the same recipient within the window go out as one digest.
+        self.coalescer = EmailCoalescer(
+            self.send_email,
+            window=coalesce_window,
+            max_delay=coalesce_max_delay,
+            max_batch=coalesce_max_batch,
+        )
+        # Messages handled at once; sends wait on each other only here and in the transport.
+        self._slots = asyncio.Semaphore(concurrency)
+        self._pending = set()
+        # Last task of each message key: messages with the same key (the same
+        # user) are handled one after the other, in partition order.
+        self._tails = {}
+        # Offsets are committed by hand, only once their emails went out.
+        self.offsets = OffsetTracker()
+        # Per message handled: done once the emails it queued were sent.
+        self._unsent = set()
+        self._consumer: AIOKafkaConsumer = None
 
         # Prometheus metrics
         self.email_processed_count = Counter('email_processed_count', 'Total number of emails processed')
@@ -20,80 +81,197 @@ class EmailService:
 
     async def start(self):
         """Start consuming messages from multiple topics."""
-        consumer = await self.kafka_manager.get_consumer(
+        consumer = self._consumer = await self.kafka_manager.get_consumer(
             topic=["email-service-topic-saldo", "email-service-topic-topup", "email-service-topic-transfer"],
             group_id="email-service-group",
+            listener=_CommitOnRevoke(self),
+            # A message is only done once the coalescer sent its emails,
+            # which can be long after the poll that returned it.
+            enable_auto_commit=False,
         )
+        lag_monitor = asyncio.create_task(LagMonitor(consumer, self.lag_interval, self.offsets).run())
         try:
-            async for msg in consumer:
-                topic = msg.topic
-                message = json.loads(msg.value.decode("utf-8"))
-                with self.otel_manager.start_trace(f"Process Kafka Message: {topic}"):
-                    await self.process_message(topic, message)
+            while True:
+                batches = await consumer.getmany(timeout_ms=1000)
+                await self.commit(consumer.assignment())
+                if not batches:
+                    continue
+                CONSUMER_BATCH_SIZE.observe(sum(len(messages) for messages in batches.values()))
+                for tp, messages in batches.items():
+                    for msg in messages:
+                        await self._slots.acquire()
+                        if tp not in consumer.assignment():
+                            # Revoked while waiting; the new owner reads it again.
+                            self._slots.release()
+                            break
+                        self._dispatch(tp, msg)
         finally:
+            lag_monitor.cancel()
+            await self._settle()
+            await self.commit(consumer.assignment())
             await consumer.stop()
 
-    async def process_message(self, topic, message):
+    async def commit(self, partitions) -> None:
+        """Commit how far `partitions` have been handled, where that moved."""
+        offsets = self.offsets.committable(partitions)
+        if not offsets:
+            return
+        try:
+            await self._consumer.commit(offsets)
+        except Exception as e:
+            # Committed again with the next poll; until then a restart resends.
+            logger.warning("Could not commit offsets", error=str(e))
+            return
+        self.offsets.committed(offsets)
+
+    async def release(self, partitions) -> None:
+        """
+        Finish what was taken from `partitions` and commit it, before they
+        are assigned elsewhere. Waiting digests are sent whole, early, as they
+        can hold notifications from other partitions too.
+        """
+        await self._settle()
+        await self.commit(partitions)
+        self.offsets.forget(partitions)
+
+    async def _settle(self) -> None:
+        """Finish the messages being handled and send every waiting email."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        await self.coalescer.flush()
+        if self._unsent:
+            await asyncio.gather(*self._unsent, return_exceptions=True)
+
+    def _dispatch(self, tp: TopicPartition, msg):
+        # Age at pick-up, from the producer's timestamp (messages carry their
+        # create time unless the topic is set to log append time).
+        EVENT_AGE.labels(msg.topic).observe(max(time.time() - msg.timestamp / 1000, 0))
+        self.offsets.start(tp, msg.offset)
+        previous = self._tails.get(msg.key) if msg.key is not None else None
+        task = asyncio.create_task(self._handle(msg, previous, tp))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        if msg.key is not None:
+            self._tails[msg.key] = task
+            task.add_done_callback(lambda done, key=msg.key: self._forget(key, done))
+
+    def _forget(self, key, task):
+        if self._tails.get(key) is task:
+            del self._tails[key]
+
+    async def _handle(self, msg, previous=None, tp: TopicPartition = None):
+        sends = []
+        _queued_sends.set(sends)
+        try:
+            if previous is not None:
+                # Only its completion matters; it reports its own errors.
+                await asyncio.wait([previous])
+            topic = msg.topic
+            produced_at = msg.timestamp / 1000
+            with HANDLER_DURATION.labels(topic).time(), self.otel_manager.start_trace(
+                "Process Kafka Message", attributes={"messaging.destination.name": topic}
+            ):
+                if is_event(msg.value):
+                    await self.process_event(decode_event(msg.value), topic, produced_at)
+                else:
+                    # JSON with the email already rendered, from producers that predate events.
+                    await self.process_message(topic, json.loads(msg.value.decode("utf-8")), produced_at)
+        except Exception as e:
+            logger.error("Failed to decode message", topic=msg.topic, error=str(e))
+        finally:
+            self._slots.release()
+            if tp is not None:
+                # Done once every email it queued went out; the slot and the
+                # next message of the key do not wait for that.
+                sent = asyncio.gather(*sends)
+                sent.add_done_callback(lambda _, offset=msg.offset: self.offsets.done(tp, offset))
+                self._unsent.add(sent)
+                sent.add_done_callback(self._unsent.discard)
+
+    async def process_event(self, event, topic=None, produced_at=None):
+        """Render the emails for an event and queue them."""
+        topic = topic or event.topic
+        try:
+            with self.otel_manager.start_trace(
+                "Handle Event", attributes={"messaging.destination.name": topic, "event.schema": event.schema}
+            ):
+                for to_email, subject, body, html in render(self.templates, event):
+                    await self.notify(to_email, subject, body, topic, produced_at, html)
+        except Exception as e:
+            logger.error("Failed to process event", schema=event.schema, error=str(e))
+
+    async def process_message(self, topic, message, produced_at=None):
         """Process messages from different topics."""
         try:
-            with self.otel_manager.start_trace(f"Handle Topic: {topic}"):
+            with self.otel_manager.start_trace(
+                "Handle Topic", attributes={"messaging.destination.name": topic}
+            ):
                 if topic == "email-service-topic-saldo":
-                    await self.handle_saldo_email(message)
+                    await self.handle_saldo_email(message, produced_at)
                 elif topic == "email-service-topic-topup":
-                    await self.handle_topup_email(message)
+                    await self.handle_topup_email(message, produced_at)
                 elif topic == "email-service-topic-transfer":
-                    await self.handle_transfer_email(message)
+                    await self.handle_transfer_email(message, produced_at)
         except Exception as e:
-            print(f"Failed to process message from topic {topic}: {e}")
+            logger.error("Failed to process message", topic=topic, error=str(e))
 
-    async def handle_saldo_email(self, message):
+    async def handle_saldo_email(self, message, produced_at=None):
         """Handle email notification for saldo creation."""
         email = message.get("email")
-        subject = "Saldo Created Successfully"
+        subject = message.get("subject", "Saldo Created Successfully")
         body = message.get("body", "Your saldo has been successfully created.")
-        with self.otel_manager.start_trace("Send Saldo Email"):
-            await self.send_email(email, subject, body)
+        await self.notify(email, subject, body, "email-service-topic-saldo", produced_at)
 
-    async def handle_topup_email(self, message):
+    async def handle_topup_email(self, message, produced_at=None):
         """Handle email notification for topup."""
         email = message.get("email")
-        subject = "Topup Successful"
+        subject = message.get("subject", "Top-Up Successful")
         body = message.get("body", "Your topup has been successfully processed.")
-        with self.otel_manager.start_trace("Send Topup Email"):
-            await self.send_email(email, subject, body)
+        await self.notify(email, subject, body, "email-service-topic-topup", produced_at)
 
-    async def handle_transfer_email(self, message):
+    async def handle_transfer_email(self, message, produced_at=None):
         """Handle email notification for transfer."""
         sender_email = message.get("sender_email")
         receiver_email = message.get("receiver_email")
         subject = message.get("subject")
+        # Older producers only send the combined body meant for both parties.
         body = message.get("body")
+        topic = "email-service-topic-transfer"
         if sender_email:
-            with self.otel_manager.start_trace("Send Transfer Email - Sender"):
-                await self.send_email(sender_email, subject, body)
+            await self.notify(sender_email, subject, message.get("sender_body", body), topic, produced_at)
         if receiver_email:
-            with self.otel_manager.start_trace("Send Transfer Email - Receiver"):
-                await self.send_email(receiver_email, subject, body)
+            await self.notify(receiver_email, subject, message.get("receiver_body", body), topic, produced_at)
+
+    async def notify(self, to_email, subject, body, topic=None, produced_at=None, html=None):
+        """Queue a notification; the coalescer decides when it is sent, and with what."""
+        if not to_email:
+            logger.warning("Email address is missing, skipping")
+            return
+        with self.otel_manager.start_trace("Queue Email", attributes={"messaging.destination.name": topic or ""}):
+            sent = await self.coalescer.add(to_email, subject, body, html, produced_at)
+        sends = _queued_sends.get(None)
+        if sends is not None:
+            sends.append(sent)
 
-    async def send_email(self, to_email, subject, body):
-        """Send email using SMTP."""
+    async def send_email(self, to_email, subject, body, html=None):
+        """Send one email through the configured mail transport, as text and html when there is html."""
         if not to_email:
-            print("Email address is missing, skipping.")
+            logger.warning("Email address is missing, skipping")
             return
         try:
             with self.email_send_duration.time():  # Measure the duration of sending the email
                 with self.otel_manager.start_trace("SMTP Email Send"):
-                    msg = MIMEText(body)
+                    msg = EmailMessage()
                     msg["Subject"] = subject
-                    msg["From"] = self.smtp_user
+                    msg["From"] = self.sender
                     msg["To"] = to_email
+                    msg.set_content(body)
+                    if html is not None:
+                        msg.add_alternative(html, subtype="html")
 
-                    with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                        server.starttls()
-                        server.login(self.smtp_user, self.smtp_password)
-                        server.sendmail(self.smtp_user, to_email, msg.as_string())
-                    print(f"Email sent to {to_email}")
+                    await self.transport.send(msg)
+                    logger.info("Email sent", to=to_email)
                     self.email_processed_count.inc()  # Increment the counter for successfully processed emails
         except Exception as e:
-            print(f"Failed to send email to {to_email}: {e}")
+            logger.error("Failed to send email", to=to_email, error=str(e))
             self.email_send_failure_count.inc()  # Increment the counter for failed email sends
@@ -0,0 +1,11 @@
+<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>${subject}</title>
+</head>
+<body style="font-family: Arial, sans-serif; color: #222222; line-height: 1.5;">
+${content | n}
+<p style="color: #888888; font-size: 12px;">This is an automated message from the payment gateway. Please do not reply.</p>
+</body>
+</html>
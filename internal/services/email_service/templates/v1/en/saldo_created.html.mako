@@ -0,0 +1,2 @@
+<p>Hi ${name},</p>
+<p>Your saldo has been successfully created with an amount of <strong>${total_balance}</strong>.</p>
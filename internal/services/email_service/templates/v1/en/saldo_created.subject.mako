@@ -0,0 +1 @@
+Saldo Created Successfully
@@ -0,0 +1 @@
+Hi ${name}, your saldo has been successfully created with an amount of ${total_balance}.
@@ -0,0 +1,3 @@
+<p>Hi ${name},</p>
+<p>Your top-up of <strong>${amount}</strong> has been successfully added.</p>
+<p>Your new balance is <strong>${balance}</strong>.</p>
@@ -0,0 +1 @@
+Hi ${name}, your top-up of ${amount} has been successfully added. Your new balance is ${balance}.
@@ -0,0 +1,3 @@
+<p>Hi ${receiver_name},</p>
+<p>You have received <strong>${amount}</strong> from ${sender_name}.</p>
+<p>Your new balance is <strong>${receiver_balance}</strong>.</p>
@@ -0,0 +1 @@
+Transfer Received
@@ -0,0 +1 @@
+Hi ${receiver_name}, you have received ${amount} from ${sender_name}. Your new balance is ${receiver_balance}.
@@ -0,0 +1,3 @@
+<p>Hi ${sender_name},</p>
+<p>You have successfully transferred <strong>${amount}</strong> to ${receiver_name}.</p>
+<p>Your new balance is <strong>${sender_balance}</strong>.</p>
@@ -0,0 +1 @@
+Hi ${sender_name}, you have successfully transferred ${amount} to ${receiver_name}. Your new balance is ${sender_balance}.
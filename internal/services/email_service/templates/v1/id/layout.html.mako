@@ -0,0 +1,11 @@
+<!DOCTYPE html>
+<html lang="id">
+<head>
+<meta charset="utf-8">
+<title>${subject}</title>
+</head>
+<body style="font-family: Arial, sans-serif; color: #222222; line-height: 1.5;">
+${content | n}
+<p style="color: #888888; font-size: 12px;">Pesan ini dikirim otomatis oleh payment gateway. Mohon tidak membalas.</p>
+</body>
+</html>
@@ -0,0 +1,2 @@
+<p>Hai ${name},</p>
+<p>Saldo Anda berhasil dibuat dengan jumlah <strong>${total_balance}</strong>.</p>
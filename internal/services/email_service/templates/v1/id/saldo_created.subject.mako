@@ -0,0 +1 @@
+Saldo Berhasil Dibuat
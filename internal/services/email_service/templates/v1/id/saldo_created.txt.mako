@@ -0,0 +1 @@
+Hai ${name}, saldo Anda berhasil dibuat dengan jumlah ${total_balance}.
@@ -0,0 +1,3 @@
+<p>Hai ${name},</p>
+<p>Top-up Anda sebesar <strong>${amount}</strong> berhasil ditambahkan.</p>
+<p>Saldo baru Anda adalah <strong>${balance}</strong>.</p>
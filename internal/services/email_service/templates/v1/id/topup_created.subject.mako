@@ -0,0 +1 @@
+Top-Up Berhasil
@@ -0,0 +1 @@
+Hai ${name}, top-up Anda sebesar ${amount} berhasil ditambahkan. Saldo baru Anda adalah ${balance}.
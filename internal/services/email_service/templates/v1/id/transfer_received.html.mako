@@ -0,0 +1,3 @@
+<p>Hai ${receiver_name},</p>
+<p>Anda menerima <strong>${amount}</strong> dari ${sender_name}.</p>
+<p>Saldo baru Anda adalah <strong>${receiver_balance}</strong>.</p>
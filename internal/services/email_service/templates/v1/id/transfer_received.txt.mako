@@ -0,0 +1 @@
+Hai ${receiver_name}, Anda menerima ${amount} dari ${sender_name}. Saldo baru Anda adalah ${receiver_balance}.
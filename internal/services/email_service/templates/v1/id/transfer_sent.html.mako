@@ -0,0 +1,3 @@
+<p>Hai ${sender_name},</p>
+<p>Anda berhasil mentransfer <strong>${amount}</strong> ke ${receiver_name}.</p>
+<p>Saldo baru Anda adalah <strong>${sender_balance}</strong>.</p>
@@ -0,0 +1 @@
+Hai ${sender_name}, Anda berhasil mentransfer ${amount} ke ${receiver_name}. Saldo baru Anda adalah ${sender_balance}.
@@ -0,0 +1,223 @@
+import asyncio
+import mailbox
+import time
+from abc import ABC, abstractmethod
+from email.message import EmailMessage
+from pathlib import Path
+from typing import List, Optional
+
+import aiosmtplib
+import structlog
+from prometheus_client import Counter, Gauge, Histogram
+
+from lib.config.base import BaseAppSettings
+
+
+logger = structlog.get_logger(__name__)
+
+MAIL_SEND_DURATION = Histogram(
+    "email_transport_send_duration_seconds",
+    "Time to hand one message to the mail transport, pool wait included",
+    ["transport"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 5),
+)
+SMTP_POOL_WAIT = Histogram(
+    "email_smtp_pool_wait_seconds",
+    "Time spent waiting for a free SMTP connection",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+SMTP_POOL_CONNECTIONS = Gauge(
+    "email_smtp_pool_connections", "Open SMTP connections in the pool", ["state"]
+)
+SMTP_CONNECTIONS_OPENED = Counter(
+    "email_smtp_connections_opened_count", "SMTP connections opened (connect, STARTTLS, login)"
+)
+
+
+class MailTransport(ABC):
+    """Delivers fully built messages; how is up to the implementation."""
+
+    name: str
+
+    @abstractmethod
+    async def send(self, message: EmailMessage) -> None:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class _PooledConnection:
+    __slots__ = ("client", "sent", "last_used")
+
+    def __init__(self, client: aiosmtplib.SMTP):
+        self.client = client
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+
+class SmtpPoolTransport(MailTransport):
+    """
+    Async SMTP with up to `pool_size` kept-alive connections, so messages
+    are not each paying for a connect, STARTTLS and login.
+
+    A connection is retired after `max_messages_per_connection` messages,
+    since servers limit that per session. One that has been idle for more
+    than `idle_check_seconds` is checked with NOOP before reuse. A message
+    whose connection turns out to be dead is retried once on a new one.
+    """
+
+    name = "smtp"
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        start_tls: bool = True,
+        pool_size: int = 8,
+        max_messages_per_connection: int = 100,
+        idle_check_seconds: float = 30.0,
+        timeout: float = 30.0,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username or None
+        self.password = password or None
+        self.start_tls = start_tls
+        self.pool_size = pool_size
+        self.max_messages_per_connection = max_messages_per_connection
+        self.idle_check_seconds = idle_check_seconds
+        self.timeout = timeout
+
+        self._idle: List[_PooledConnection] = []
+        self._slots = asyncio.Semaphore(pool_size)
+        self._open = 0
+
+    def _report(self) -> None:
+        SMTP_POOL_CONNECTIONS.labels("idle").set(len(self._idle))
+        SMTP_POOL_CONNECTIONS.labels("busy").set(self._open - len(self._idle))
+
+    async def _connect(self) -> _PooledConnection:
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        await client.connect()
+        SMTP_CONNECTIONS_OPENED.inc()
+        self._open += 1
+        return _PooledConnection(client)
+
+    async def _discard(self, connection: _PooledConnection, graceful: bool = True) -> None:
+        self._open -= 1
+        if graceful and connection.client.is_connected:
+            try:
+                await connection.client.quit()
+                return
+            except aiosmtplib.SMTPException:
+                pass
+        connection.client.close()
+
+    async def _acquire(self) -> _PooledConnection:
+        while self._idle:
+            connection = self._idle.pop()
+            if not connection.client.is_connected:
+                await self._discard(connection)
+                continue
+            if time.monotonic() - connection.last_used > self.idle_check_seconds:
+                try:
+                    await connection.client.noop()
+                except aiosmtplib.SMTPException:
+                    await self._discard(connection)
+                    continue
+            return connection
+        return await self._connect()
+
+    async def _release(self, connection: _PooledConnection) -> None:
+        connection.sent += 1
+        connection.last_used = time.monotonic()
+        if connection.sent >= self.max_messages_per_connection:
+            await self._discard(connection)
+        else:
+            self._idle.append(connection)
+
+    async def send(self, message: EmailMessage) -> None:
+        started = time.perf_counter()
+        async with self._slots:
+            SMTP_POOL_WAIT.observe(time.perf_counter() - started)
+            try:
+                for attempt in range(2):
+                    connection = await self._acquire()
+                    self._report()
+                    try:
+                        await connection.client.send_message(message)
+                    except aiosmtplib.SMTPServerDisconnected:
+                        await self._discard(connection, graceful=False)
+                        if attempt:
+                            raise
+                        logger.info("SMTP connection dropped, retrying on a new one")
+                        continue
+                    except (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused):
+                        # The server refused this message; the session itself is fine.
+                        await self._release(connection)
+                        raise
+                    except BaseException:
+                        await self._discard(connection, graceful=False)
+                        raise
+                    await self._release(connection)
+                    return
+            finally:
+                self._report()
+                MAIL_SEND_DURATION.labels(self.name).observe(time.perf_counter() - started)
+
+    async def close(self) -> None:
+        while self._idle:
+            await self._discard(self._idle.pop())
+        self._report()
+
+
+class MaildirTransport(MailTransport):
+    """
+    Stores messages in a local Maildir instead of sending them, for
+    development and tests; any mail client can open the directory.
+    """
+
+    name = "maildir"
+
+    def __init__(self, path: str):
+        # Maildir only lays out tmp/new/cur when it creates the directory itself.
+        for subdirectory in ("tmp", "new", "cur"):
+            (Path(path) / subdirectory).mkdir(parents=True, exist_ok=True)
+        self._maildir = mailbox.Maildir(Path(path), create=False)
+        # Unique file names come from a per-instance counter that is not thread-safe.
+        self._lock = asyncio.Lock()
+
+    async def send(self, message: EmailMessage) -> None:
+        started = time.perf_counter()
+        try:
+            async with self._lock:
+                await asyncio.to_thread(self._maildir.add, message)
+        finally:
+            MAIL_SEND_DURATION.labels(self.name).observe(time.perf_counter() - started)
+
+
+def create_transport(settings: BaseAppSettings) -> MailTransport:
+    if settings.email_transport == "maildir":
+        return MaildirTransport(settings.email_maildir_path)
+    if settings.email_transport == "smtp":
+        return SmtpPoolTransport(
+            hostname=settings.smtp_host,
+            port=settings.smtp_port,
+            username=settings.smtp_user,
+            password=settings.smtp_password,
+            start_tls=settings.smtp_start_tls,
+            pool_size=settings.smtp_pool_size,
+            max_messages_per_connection=settings.smtp_max_messages_per_connection,
+            timeout=settings.smtp_timeout_seconds,
+        )
+    raise ValueError(f"Unknown email transport: {settings.email_transport}")
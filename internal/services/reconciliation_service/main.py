@@ -0,0 +1,60 @@
+from service import ReconciliationService
+
+from lib.config.main import get_app_settings
+from lib.logging.logging_config import LoggerConfigurator
+from lib.otel.otel_config import OpenTelemetryManager
+from prometheus_client import start_http_server
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import argparse
+import asyncio
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Verify saldo against the topup, transfer and withdraw tables."
+    )
+    parser.add_argument("--once", action="store_true", help="run a single pass and exit")
+    parser.add_argument("--interval", type=float, default=3600, help="seconds between runs")
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="users per chunk query")
+    parser.add_argument("--concurrency", type=int, default=4, help="chunk queries in flight")
+    parser.add_argument("--report-dir", default="reports")
+    parser.add_argument("--metrics-port", type=int, default=8009)
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    settings = get_app_settings()
+
+    LoggerConfigurator(logger_name="reconciliation-service").configure_logger(json_logs=True)
+
+    engine = create_async_engine(
+        **settings.sqlalchemy_engine_props,
+        pool_size=args.concurrency + 1,
+        max_overflow=0,
+        pool_pre_ping=True,
+    )
+    otel_manager = OpenTelemetryManager(service_name="reconciliation-service", endpoint="http://jaeger:4317")
+
+    reconciliation_service = ReconciliationService(
+        engine=engine,
+        otel_manager=otel_manager,
+        chunk_size=args.chunk_size,
+        concurrency=args.concurrency,
+        report_dir=args.report_dir,
+    )
+
+    start_http_server(args.metrics_port)
+
+    try:
+        if args.once:
+            await reconciliation_service.run_once()
+        else:
+            await reconciliation_service.start(interval=args.interval)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,248 @@
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from structlog import get_logger
+
+
+logger = get_logger()
+
+
+# Upper bound of the next chunk of users, walking the primary key (keyset
+# pagination, no OFFSET).
+NEXT_CHUNK_SQL = text(
+    """
+    SELECT max(user_id) AS upper, count(*) AS users
+    FROM (
+        SELECT user_id FROM users
+        WHERE user_id > :lower
+        ORDER BY user_id
+        LIMIT :chunk_size
+    ) AS chunk
+    """
+)
+
+# Expected balance per user in (lower, upper], aggregated set-based over each
+# movement table, compared with saldo. Opening balances and manual adjustments
+# have no movement table and come from the ledger; movements in partitions the
+# retention policy detached come from archived_movement_totals. The opening
+# balances already include every movement up to ledger_openings, so only the
+# movements after it are added; edits and deletes of the ones before it are
+# counted from the ledger, where they are posted as reversing and new legs.
+# Runs as a single statement, so
+# every user in the chunk is checked against one consistent snapshot.
+DISCREPANCIES_SQL = text(
+    """
+    WITH opened (movement_type, last_movement_id) AS (
+        SELECT 'topup', last_movement_id FROM ledger_openings WHERE movement_table = 'topups'
+        UNION ALL
+        SELECT 'transfer', last_movement_id FROM ledger_openings WHERE movement_table = 'transfers'
+        UNION ALL
+        SELECT 'withdraw', last_movement_id FROM ledger_openings WHERE movement_table = 'withdraws'
+    ), ledger AS (
+        SELECT e.user_id, sum(e.credit - e.debit) AS amount
+        FROM ledger_entries e
+        LEFT JOIN opened o ON o.movement_type = e.movement_type
+        WHERE e.account = 'wallet'
+          AND (
+            e.movement_type IN ('opening', 'adjustment')
+            OR e.movement_id <= o.last_movement_id
+          )
+          AND e.user_id > :lower AND e.user_id <= :upper
+        GROUP BY e.user_id
+    ), archived AS (
+        SELECT user_id, sum(amount) AS amount
+        FROM archived_movement_totals
+        WHERE user_id > :lower AND user_id <= :upper
+        GROUP BY user_id
+    ), topups_in AS (
+        SELECT user_id, sum(topup_amount) AS amount
+        FROM topups
+        WHERE user_id > :lower AND user_id <= :upper
+          AND topup_id > (SELECT last_movement_id FROM ledger_openings WHERE movement_table = 'topups')
+        GROUP BY user_id
+    ), transfers_out AS (
+        SELECT transfer_from AS user_id, sum(transfer_amount) AS amount
+        FROM transfers
+        WHERE transfer_from > :lower AND transfer_from <= :upper
+          AND transfer_id > (SELECT last_movement_id FROM ledger_openings WHERE movement_table = 'transfers')
+        GROUP BY transfer_from
+    ), transfers_in AS (
+        SELECT transfer_to AS user_id, sum(transfer_amount) AS amount
+        FROM transfers
+        WHERE transfer_to > :lower AND transfer_to <= :upper
+          AND transfer_id > (SELECT last_movement_id FROM ledger_openings WHERE movement_table = 'transfers')
+        GROUP BY transfer_to
+    ), withdraws_out AS (
+        SELECT user_id, sum(withdraw_amount) AS amount
+        FROM withdraws
+        WHERE user_id > :lower AND user_id <= :upper
+          AND withdraw_id > (SELECT last_movement_id FROM ledger_openings WHERE movement_table = 'withdraws')
+        GROUP BY user_id
+    ), expected AS (
+        SELECT
+            u.user_id,
+            coalesce(l.amount, 0)
+              + coalesce(a.amount, 0)
+              + coalesce(t.amount, 0)
+              - coalesce(tout.amount, 0)
+              + coalesce(tin.amount, 0)
+              - coalesce(w.amount, 0) AS expected_balance,
+            s.total_balance AS actual_balance
+        FROM users u
+        LEFT JOIN saldo s ON s.user_id = u.user_id
+        LEFT JOIN ledger l ON l.user_id = u.user_id
+        LEFT JOIN archived a ON a.user_id = u.user_id
+        LEFT JOIN topups_in t ON t.user_id = u.user_id
+        LEFT JOIN transfers_out tout ON tout.user_id = u.user_id
+        LEFT JOIN transfers_in tin ON tin.user_id = u.user_id
+        LEFT JOIN withdraws_out w ON w.user_id = u.user_id
+        WHERE u.user_id > :lower AND u.user_id <= :upper
+    )
+    SELECT user_id, expected_balance, actual_balance
+    FROM expected
+    WHERE actual_balance IS DISTINCT FROM expected_balance
+      AND NOT (actual_balance IS NULL AND expected_balance = 0)
+    ORDER BY user_id
+    """
+)
+
+
+class ReconciliationService:
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        otel_manager,
+        chunk_size: int = 10_000,
+        concurrency: int = 4,
+        report_dir: str = "reports",
+        max_reported: int = 1_000,
+    ):
+        self.engine = engine
+        self.otel_manager = otel_manager
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.report_dir = report_dir
+        self.max_reported = max_reported
+
+        # Prometheus metrics
+        self.users_checked = Gauge('reconciliation_users_checked', 'Users checked in the last reconciliation run')
+        self.discrepancy_count = Gauge('reconciliation_discrepancies', 'Users whose saldo differs from the transaction tables in the last run')
+        self.discrepancy_amount = Gauge('reconciliation_discrepancy_amount', 'Sum of absolute balance differences found in the last run')
+        self.last_success = Gauge('reconciliation_last_success_timestamp', 'Unix time of the last completed reconciliation run')
+        self.run_duration = Histogram('reconciliation_run_duration_seconds', 'Duration of a full reconciliation run', buckets=(10, 30, 60, 120, 300, 600, 1800))
+        self.chunk_duration = Histogram('reconciliation_chunk_duration_seconds', 'Duration of one chunk query', buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10))
+        self.run_failure_count = Counter('reconciliation_run_failure_count', 'Total number of failed reconciliation runs')
+
+    async def start(self, interval: float):
+        """Run reconciliation every `interval` seconds until cancelled."""
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.run_failure_count.inc()
+                logger.exception("Reconciliation run failed", error=str(e))
+            await asyncio.sleep(interval)
+
+    async def run_once(self) -> dict:
+        """Check every user once and write a report. Returns the report."""
+        with self.otel_manager.start_trace("Reconciliation Run") as span:
+            started = time.perf_counter()
+            started_at = datetime.utcnow()
+
+            semaphore = asyncio.Semaphore(self.concurrency)
+            tasks: List[asyncio.Task] = []
+            users = 0
+
+            async for lower, upper, count in self._chunks():
+                users += count
+                await semaphore.acquire()
+                task = asyncio.create_task(self._check_chunk(lower, upper))
+                task.add_done_callback(lambda _: semaphore.release())
+                tasks.append(task)
+
+            discrepancies = []
+            for chunk in await asyncio.gather(*tasks):
+                discrepancies.extend(chunk)
+
+            duration = time.perf_counter() - started
+            drift = sum(abs(d["difference"]) for d in discrepancies)
+
+            self.users_checked.set(users)
+            self.discrepancy_count.set(len(discrepancies))
+            self.discrepancy_amount.set(drift)
+            self.run_duration.observe(duration)
+            self.last_success.set(time.time())
+
+            span.set_attribute("users_checked", users)
+            span.set_attribute("discrepancies", len(discrepancies))
+
+            report = {
+                "started_at": started_at.isoformat(),
+                "duration_seconds": round(duration, 3),
+                "users_checked": users,
+                "chunks": len(tasks),
+                "discrepancy_count": len(discrepancies),
+                "discrepancy_amount": drift,
+                "discrepancies": discrepancies[: self.max_reported],
+            }
+            path = self._write_report(report, started_at)
+
+            logger.info(
+                "Reconciliation finished",
+                users_checked=users,
+                discrepancies=len(discrepancies),
+                discrepancy_amount=drift,
+                duration_seconds=round(duration, 3),
+                report=path,
+            )
+            return report
+
+    async def _chunks(self):
+        """Yield (lower, upper, user_count) ranges of at most `chunk_size` users."""
+        lower = 0
+        async with self.engine.connect() as conn:
+            while True:
+                row = (
+                    await conn.execute(
+                        NEXT_CHUNK_SQL, {"lower": lower, "chunk_size": self.chunk_size}
+                    )
+                ).one()
+                if row.upper is None:
+                    return
+                yield lower, row.upper, row.users
+                lower = row.upper
+
+    async def _check_chunk(self, lower: int, upper: int) -> List[dict]:
+        started = time.perf_counter()
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                DISCREPANCIES_SQL, {"lower": lower, "upper": upper}
+            )
+            rows: List[Tuple[int, int, Optional[int]]] = result.all()
+        self.chunk_duration.observe(time.perf_counter() - started)
+
+        return [
+            {
+                "user_id": user_id,
+                "expected_balance": expected,
+                "actual_balance": actual,
+                "difference": (actual or 0) - expected,
+            }
+            for user_id, expected, actual in rows
+        ]
+
+    def _write_report(self, report: dict, started_at: datetime) -> str:
+        os.makedirs(self.report_dir, exist_ok=True)
+        path = os.path.join(
+            self.report_dir, f"reconciliation-{started_at:%Y%m%dT%H%M%S}.json"
+        )
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        return path
@@ -10,6 +10,7 @@ from domain.dtos.response.saldo import SaldoResponse
 from infrastructure.service.saldo import SaldoService
 
 from lib.security.header import token_security
+from lib.http.response import ORJSONResponse
 from infrastructure.di import get_saldo_service
 
 router = APIRouter()
@@ -34,12 +35,12 @@ async def get_saldos(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=500, detail=response.message)
-            return response
+            return ORJSONResponse(response)
 
         response = await saldo_service.get_saldos()
         if isinstance(response, ErrorResponse):
             raise HTTPException(status_code=500, detail=response.message)
-        return response
+        return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -61,7 +62,7 @@ async def get_saldo(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=404, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -83,7 +84,7 @@ async def get_saldo_user(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=404, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -107,7 +108,7 @@ async def get_saldo_users(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=404, detail=response.message)
-            return response
+            return ORJSONResponse(response)
 
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
@@ -130,7 +131,7 @@ async def create_saldo(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=400, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -154,7 +155,7 @@ async def update_saldo(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=400, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -176,7 +177,7 @@ async def delete_saldo(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=404, detail=response.message)
-            return response
+            return ORJSONResponse(response)
 
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
@@ -11,13 +11,16 @@ from domain.dtos.request.saldo import (
 )
 from domain.dtos.record.saldo import SaldoRecordDTO
 from domain.repository.saldo import ISaldoRepository
+from lib.ledger.ledger import LedgerManager, adjustment_legs
 from lib.model.saldo import Saldo
+from lib.utils.errors import ValidationError
 from datetime import datetime
 
 
 class SaldoRepository(ISaldoRepository):
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, ledger: LedgerManager):
         self.session = session
+        self.ledger = ledger
 
     async def find_all(self) -> List[SaldoRecordDTO]:
         """
@@ -57,64 +60,107 @@ class SaldoRepository(ISaldoRepository):
 
     async def create(self, input: CreateSaldoRequest) -> SaldoRecordDTO:
         """
-        Create a new saldo record from the given input.
+        Create a new saldo record from the given input. The opening balance is
+        posted to the ledger as an adjustment.
         """
         new_saldo = Saldo(
             user_id=input.user_id,
-            total_balance=input.total_balance,
+            total_balance=0,
             created_at=datetime.utcnow(),
             updated_at=datetime.utcnow(),
         )
         self.session.add(new_saldo)
+        try:
+            await self.session.flush()
+            await self.ledger.post(
+                self.session,
+                "adjustment",
+                new_saldo.saldo_id,
+                adjustment_legs(input.user_id, input.total_balance),
+            )
+        except Exception:
+            await self.session.rollback()
+            raise
         await self.session.commit()
         await self.session.refresh(new_saldo)
         return SaldoRecordDTO.from_orm(new_saldo)
 
     async def update(self, input: UpdateSaldoRequest) -> SaldoRecordDTO:
         """
-        Update an existing saldo record based on the given input.
+        Update an existing saldo record based on the given input. The balance
+        change is posted to the ledger as an adjustment.
         """
-        result = await self.session.execute(
-            update(Saldo)
-            .where(Saldo.saldo_id == input.saldo_id)
-            .values(
-                user_id=input.user_id,
-                total_balance=input.total_balance,
-                updated_at=datetime.utcnow(),
-            )
-            .returning(Saldo)
-        )
-        updated_saldo = result.scalars().first()
-        if updated_saldo:
-            await self.session.commit()
-            await self.session.refresh(updated_saldo)
-            return SaldoRecordDTO.from_orm(updated_saldo)
-        else:
+        current = await self._lock(Saldo.saldo_id == input.saldo_id)
+        if current is None:
+            await self.session.rollback()
             raise ValueError("Saldo record not found")
+        if current.user_id != input.user_id:
+            # Release the row lock taken above.
+            await self.session.rollback()
+            raise ValidationError("Saldo cannot be moved to another user")
+
+        return await self._adjust(current, input.total_balance)
 
     async def update_balance(self, input: UpdateSaldoBalanceRequest) -> SaldoRecordDTO:
         """
-        Update the balance of an existing saldo record.
+        Update the balance of an existing saldo record. The balance change is
+        posted to the ledger as an adjustment.
         """
-        result = await self.session.execute(
-            update(Saldo)
-            .where(Saldo.user_id == input.user_id)
-            .values(total_balance=input.total_balance, updated_at=datetime.utcnow())
-            .returning(Saldo)
-        )
-        updated_saldo = result.scalars().first()
-        if updated_saldo:
-            await self.session.commit()
-            await self.session.refresh(updated_saldo)
-            return SaldoRecordDTO.from_orm(updated_saldo)
-        else:
+        current = await self._lock(Saldo.user_id == input.user_id)
+        if current is None:
+            await self.session.rollback()
             raise ValueError("Saldo record not found")
 
+        return await self._adjust(current, input.total_balance)
+
     async def delete(self, id: int) -> None:
         """
-        Delete a saldo record by its ID.
+        Delete a saldo record by its ID, posting its remaining balance out of the
+        ledger first.
         """
-        result = await self.session.execute(delete(Saldo).where(Saldo.saldo_id == id))
-        if result.rowcount == 0:
+        current = await self._lock(Saldo.saldo_id == id)
+        if current is None:
+            await self.session.rollback()
             raise ValueError("Saldo record not found")
+
+        try:
+            await self.ledger.post(
+                self.session,
+                "adjustment",
+                id,
+                adjustment_legs(current.user_id, -current.total_balance),
+            )
+            await self.session.execute(delete(Saldo).where(Saldo.saldo_id == id))
+        except Exception:
+            await self.session.rollback()
+            raise
         await self.session.commit()
+
+    async def _lock(self, condition):
+        """
+        Lock a saldo row for the rest of the transaction.
+        """
+        result = await self.session.execute(
+            select(Saldo.saldo_id, Saldo.user_id, Saldo.total_balance)
+            .where(condition)
+            .with_for_update()
+        )
+        return result.first()
+
+    async def _adjust(self, current, total_balance: int) -> SaldoRecordDTO:
+        try:
+            await self.ledger.post(
+                self.session,
+                "adjustment",
+                current.saldo_id,
+                adjustment_legs(current.user_id, total_balance - current.total_balance),
+            )
+        except Exception:
+            await self.session.rollback()
+            raise
+        await self.session.commit()
+
+        result = await self.session.execute(
+            select(Saldo).filter(Saldo.saldo_id == current.saldo_id)
+        )
+        return SaldoRecordDTO.from_orm(result.scalars().first())
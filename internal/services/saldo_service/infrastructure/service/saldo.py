@@ -10,10 +10,11 @@ from domain.dtos.response.api import ApiResponse, ErrorResponse
 from lib.utils.errors import AppError, NotFoundError
 
 from domain.dtos.response.saldo import SaldoResponse
+from lib.events.codec import publish
+from lib.events.events import SaldoCreated
 from lib.kafka.kafka_config import KafkaManager
 from lib.otel.otel_config import OpenTelemetryManager
 
-import json
 
 
 logger = get_logger()
@@ -113,12 +114,12 @@ class SaldoService(ISaldoService):
             try:
                 user = await self.user_repository.find_by_id(id)
                 if not user:
-                    logger.error(f"User with id {id} not found")
+                    logger.error("User not found", user_id=id)
                     span.set_attribute("error", "User not found")
                     raise NotFoundError(f"User with id {id} not found")
             except Exception as e:
                 span.record_exception(e)
-                logger.error(f"Error finding user with id {id}: {e}")
+                logger.error("Error finding user", user_id=id, error=str(e))
                 return ErrorResponse(
                     status="error",
                     message=f"Error finding user with id {id}: {e}"
@@ -134,7 +135,7 @@ class SaldoService(ISaldoService):
                 span.set_attribute("saldo_found", saldo is not None)
             except Exception as e:
                 span.record_exception(e)
-                logger.error(f"Error retrieving saldo for user with id {id}: {e}")
+                logger.error("Error retrieving saldo for user", user_id=id, error=str(e))
                 return ErrorResponse(
                     status="error",
                     message=f"Error retrieving saldo for user with id {id}: {e}"
@@ -142,14 +143,14 @@ class SaldoService(ISaldoService):
 
             # Prepare and return the response
             if saldo is None:
-                logger.info(f"No saldo found for user with id {id}")
+                logger.info("No saldo found for user", user_id=id)
                 return ApiResponse(
                     status="success",
                     message=f"No saldo found for user with id {id}",
                     data=None,
                 )
 
-            logger.info(f"Saldo retrieved successfully for user with id {id}")
+            logger.info("Saldo retrieved successfully for user", user_id=id)
             return ApiResponse(
                 status="success",
                 message="Saldo retrieved successfully",
@@ -161,7 +162,6 @@ class SaldoService(ISaldoService):
         with self.otel_manager.start_trace("Create Saldo") as span:
             span.set_attribute("user_id", input.user_id)
             span.set_attribute("total_balance", input.total_balance)
-            producer = None
             try:
                 user = await self.user_repository.find_by_id(input.user_id)
                 if not user:
@@ -169,19 +169,16 @@ class SaldoService(ISaldoService):
 
                 saldo = await self.saldo_repository.create(input)
 
-                producer = await self.kafka_manager.get_producer()
-            
-                email_message = {
-                    "email": user.email,
-                    "subject": "Saldo Created",
-                    "body": f"Hi {user.firstname} {user.lastname}, your saldo has been successfully created with an amount of {input.total_balance}."
-                }
-                
-                # Use send with value only
-                await producer.send(
-                    topic="email-service-topic-saldo", 
-                    value=json.dumps(email_message).encode("utf-8")
+                producer = await self.kafka_manager.producer()
+
+                # The email service renders the notification from the event
+                event = SaldoCreated(
+                    user_id=user.user_id,
+                    email=user.email,
+                    name=f"{user.firstname} {user.lastname}",
+                    total_balance=input.total_balance,
                 )
+                await publish(producer, event)
 
                 logger.info("Saldo created successfully", user_id=input.user_id)
                 return ApiResponse(
@@ -203,9 +200,6 @@ class SaldoService(ISaldoService):
                     status="error",
                     message="An unexpected error occurred. Please try again later."
                 )
-            finally:
-                if producer:
-                    await producer.stop()
 
     async def update_saldo(self, input: UpdateSaldoRequest) -> Union[ApiResponse[Optional[SaldoResponse]], ErrorResponse]:
         with self.otel_manager.start_trace("Update Saldo") as span:
@@ -1,19 +1,42 @@
-import uvicorn
+# Imported first, so the startup clock covers every import below.
+from lib.runtime.startup import startup
 
-from fastapi import FastAPI, Response
+from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
 from api.routes import router as api_router
+from infrastructure.di import container
 from lib.logging.logging_config import LoggerConfigurator
+from lib.logging.sampling import LogSamplingMiddleware
 from lib.config.main import get_app_settings
+from lib.http.response import ORJSONResponse
+from lib.runtime.health import InFlightMiddleware, health_router
+from lib.runtime.lifespan import warmup_lifespan
+from lib.runtime.metrics import metrics_response
+from lib.runtime.server import serve
 
-from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 
 def create_app() -> FastAPI:
+    startup.mark("import")
     settings = get_app_settings()
 
-    application = FastAPI(**settings.fastapi_kwargs)
+    application = FastAPI(
+        **settings.fastapi_kwargs,
+        default_response_class=ORJSONResponse,
+        lifespan=warmup_lifespan(
+            warmups={
+                "tracing": container.get_otel,
+                "database": container.warm_database,
+                "revocations": container.follow_revocations,
+                "jwks": container.get_jwt().warm,
+                "kafka": container.warm_kafka,
+            },
+            shutdown=[container.close],
+        ),
+    )
+
 
+    application.state.jwt_config = container.get_jwt()
 
     application.add_middleware(
         CORSMiddleware,
@@ -22,14 +45,24 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    application.add_middleware(LogSamplingMiddleware)
+    application.add_middleware(InFlightMiddleware)
 
     application.include_router(api_router, prefix="/api")
+    application.include_router(
+        health_router(
+            checks={
+                "database": container.check_database,
+                "kafka": container.check_kafka,
+            }
+        )
+    )
 
 
     logger_configurator = LoggerConfigurator(logger_name="saldo-service")
     logger_configurator.configure_logger(json_logs=True)
 
-
+    startup.mark("app")
     return application
 
 
@@ -37,9 +70,9 @@ app = create_app()
 
 @app.get("/metrics")
 async def metrics():
-    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    return metrics_response()
 
 
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8002, reload=True)
\ No newline at end of file
+    serve("main:app", port=8002)
\ No newline at end of file
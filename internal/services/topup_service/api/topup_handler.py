@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from datetime import date, datetime
 from typing import Union, List, Optional
 from prometheus_client import Counter, Histogram
 
@@ -7,9 +8,11 @@ from domain.dtos.request.topup import CreateTopupRequest, UpdateTopupRequest
 from domain.dtos.response.api import ApiResponse, ErrorResponse
 from domain.service.topup import ITopupService
 from domain.dtos.response.topup import TopupResponse
+from domain.dtos.response.daily_summary import DailySummaryResponse
 from infrastructure.service.topup import TopupService
 
 from lib.security.header import token_security
+from lib.http.response import ORJSONResponse
 from infrastructure.di import get_topup_service
 
 
@@ -20,23 +23,52 @@ REQUEST_DURATION = Histogram('topup_service_request_duration_seconds', 'Duration
 
 
 @router.get("", response_model=ApiResponse[List[TopupResponse]])
-async def get_topups(topup_service: ITopupService = Depends(get_topup_service), token: str =Depends(token_security)):
+async def get_topups(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    topup_service: ITopupService = Depends(get_topup_service),
+    token: str = Depends(token_security),
+):
     """Retrieve a list of all topups."""
     method = 'GET'
     endpoint = '/'
 
     try:
         with REQUEST_DURATION.labels(method, endpoint).time():
-            response = await topup_service.get_topups()
+            response = await topup_service.get_topups(start_date, end_date)
             if isinstance(response, ErrorResponse):
                 raise HTTPException(status_code=500, detail=response.message)
-            return response
+            return ORJSONResponse(response)
 
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
 
+@router.get("/stats", response_model=ApiResponse[List[DailySummaryResponse]])
+async def get_topup_stats(
+    user_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    topup_service: ITopupService = Depends(get_topup_service),
+    token: str = Depends(token_security),
+):
+    """Retrieve daily topup count, sum, min and max from the rollup table."""
+    method = 'GET'
+    endpoint = '/stats'
+    try:
+        with REQUEST_DURATION.labels(method, endpoint).time():
+            response = await topup_service.get_stats(user_id, start_date, end_date)
+            status = 'success' if not isinstance(response, ErrorResponse) else 'error'
+            REQUEST_COUNT.labels(method, endpoint, status).inc()
+            if status == 'error':
+                raise HTTPException(status_code=500, detail=response.message)
+            return ORJSONResponse(response)
+    except Exception as e:
+        REQUEST_COUNT.labels(method, endpoint, 'error').inc()
+        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+
+
 @router.get("/{id}", response_model=ApiResponse[Optional[TopupResponse]])
 async def get_topup(id: int, topup_service: ITopupService = Depends(get_topup_service), token: str =Depends(token_security)):
     """Retrieve a single topup by its ID."""
@@ -49,7 +81,7 @@ async def get_topup(id: int, topup_service: ITopupService = Depends(get_topup_se
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=404, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -68,7 +100,7 @@ async def get_topup_user(
         REQUEST_COUNT.labels(method, endpoint, status).inc()
         if status == 'error':
             raise HTTPException(status_code=404, detail=response.message)
-        return response
+        return ORJSONResponse(response)
 
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
@@ -77,19 +109,23 @@ async def get_topup_user(
 
 @router.get("/users/{user_id}", response_model=ApiResponse[Optional[List[TopupResponse]]])
 async def get_topup_users(
-    user_id: int, topup_service: ITopupService = Depends(get_topup_service), token: str =Depends(token_security)
+    user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    topup_service: ITopupService = Depends(get_topup_service),
+    token: str = Depends(token_security),
 ):
     """Retrieve all topups associated with a specific user ID."""
     method = 'GET'
     endpoint = f'/users/{user_id}'
     try:
         with REQUEST_DURATION.labels(method, endpoint).time():
-            response = await topup_service.get_topup_users(user_id)
+            response = await topup_service.get_topup_users(user_id, start_date, end_date)
             status = 'success' if not isinstance(response, ErrorResponse) else 'error'
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=404, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -109,7 +145,7 @@ async def create_topup(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=400, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -133,7 +169,7 @@ async def update_topup(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=400, detail=response.message)
-            return response
+            return ORJSONResponse(response)
 
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
@@ -152,6 +188,6 @@ async def delete_topup(id: int, topup_service: ITopupService = Depends(get_topup
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=404, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import Any, Iterable, List, Sequence
 from datetime import datetime
 from domain.dtos.record.topup import TopupRecordDTO
 
@@ -29,3 +29,14 @@ class TopupResponse(BaseModel):
         Converts a list of TopupRecordDTO to a list of TopupResponse.
         """
         return [TopupResponse.from_dto(dto) for dto in dtos]
+
+    @staticmethod
+    def from_rows(rows: Iterable[Sequence[Any]]) -> List[dict]:
+        """
+        Converts rows selected in TOPUP_RESPONSE_FIELDS order straight into
+        response dicts, skipping the per-row record DTO and response model.
+        """
+        return [dict(zip(TOPUP_RESPONSE_FIELDS, row)) for row in rows]
+
+
+TOPUP_RESPONSE_FIELDS = tuple(TopupResponse.model_fields)
@@ -0,0 +1,25 @@
+import abc
+from datetime import date
+from typing import Any, List, Optional, Sequence, Tuple
+
+
+class IDailySummaryRepository(abc.ABC):
+    """
+    Read-only access to the daily transaction rollups. They are written by the
+    movement repositories in the same transaction as the movement.
+    """
+
+    @abc.abstractmethod
+    async def find_daily(
+        self,
+        transaction_types: Sequence[str],
+        user_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Daily rollups of the given transaction types in [start_date, end_date) as
+        row tuples in DAILY_SUMMARY_RESPONSE_FIELDS order, for one user or summed
+        over all users.
+        """
+        pass
@@ -1,5 +1,6 @@
 import abc
-from typing import List, Optional, Any
+from datetime import datetime
+from typing import List, Optional, Any, Tuple
 from domain.dtos.record.topup import TopupRecordDTO
 from domain.dtos.request.topup import (
     CreateTopupRequest,
@@ -20,6 +21,18 @@ class ITopupRepository(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    async def find_all_rows(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Retrieve all topup records as plain row tuples in TOPUP_RESPONSE_FIELDS order,
+        optionally limited to those created in [start_date, end_date).
+        """
+        pass
+
     @abc.abstractmethod
     async def find_by_id(self, id: int) -> Optional[TopupRecordDTO]:
         """
@@ -34,6 +47,20 @@ class ITopupRepository(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    async def find_by_users_rows(
+        self,
+        user_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Find all topup records associated with a given user ID as plain row tuples in
+        TOPUP_RESPONSE_FIELDS order, optionally limited to those created in
+        [start_date, end_date).
+        """
+        pass
+
     @abc.abstractmethod
     async def find_by_user(self, user_id: int) -> Optional[TopupRecordDTO]:
         """
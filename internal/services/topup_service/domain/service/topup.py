@@ -1,7 +1,9 @@
 import abc
+from datetime import date, datetime
 from typing import List, Optional, Any, Union
 from domain.dtos.response.api import ApiResponse, ErrorResponse
 from domain.dtos.response.topup import TopupResponse
+from domain.dtos.response.daily_summary import DailySummaryResponse
 from domain.dtos.request.topup import CreateTopupRequest, UpdateTopupRequest
 
 
@@ -11,7 +13,9 @@ class ITopupService(abc.ABC):
     """
 
     @abc.abstractmethod
-    async def get_topups(self) -> Union[ApiResponse[List[TopupResponse]], ErrorResponse]:
+    async def get_topups(
+        self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+    ) -> Union[ApiResponse[List[TopupResponse]], ErrorResponse]:
         """
         Retrieve a list of all topups.
         """
@@ -25,7 +29,9 @@ class ITopupService(abc.ABC):
         pass
 
     @abc.abstractmethod
-    async def get_topup_users(self, id: int) -> Union[ApiResponse[Optional[List[TopupResponse]]], ErrorResponse]:
+    async def get_topup_users(
+        self, id: int, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+    ) -> Union[ApiResponse[Optional[List[TopupResponse]]], ErrorResponse]:
         """
         Retrieve all topups associated with a specific user ID.
         """
@@ -38,6 +44,19 @@ class ITopupService(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    async def get_stats(
+        self,
+        user_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Union[ApiResponse[List[DailySummaryResponse]], ErrorResponse]:
+        """
+        Retrieve daily topup count, sum, min and max from the rollup table, for one
+        user or over all users.
+        """
+        pass
+
     @abc.abstractmethod
     async def create_topup(self, input: CreateTopupRequest) -> Union[ApiResponse[TopupResponse], ErrorResponse]:
         """
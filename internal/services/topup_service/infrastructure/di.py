@@ -1,6 +1,8 @@
 import contextlib
 from collections.abc import AsyncIterator
+from typing import Optional
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from lib.config.main import get_app_settings
@@ -16,6 +18,9 @@ from infrastructure.repository.user import UserRepository
 from domain.repository.saldo import ISaldoRepository
 from infrastructure.repository.saldo import SaldoRepository
 
+from domain.repository.daily_summary import IDailySummaryRepository
+from infrastructure.repository.daily_summary import DailySummaryRepository
+
 from domain.repository.topup import ITopupRepository
 from infrastructure.repository.topup import TopupRepository
 
@@ -23,10 +28,17 @@ from domain.service.topup import ITopupService
 from infrastructure.service.topup import TopupService
 
 from lib.security.jwt import JwtConfig
+from lib.security.revocation import RevocationPoller, RevocationSet
 from lib.security.hash_password import Hashing
 
+from lib.events.events import TopupCreated
 from lib.kafka.kafka_config import KafkaManager
+from lib.ledger.ledger import LedgerManager
+from lib.summary.daily_summary import DailySummaryManager
 from lib.otel.otel_config import OpenTelemetryManager
+from lib.events.user_changes import UserChangeFollower
+from lib.resolver.noc_transfer import NocTransferResolver
+from lib.runtime.lifespan import open_pool
 
 
 class Container:
@@ -34,27 +46,86 @@ class Container:
         self._settings = settings
         self._engine = create_async_engine(
             **settings.sqlalchemy_engine_props,
-            pool_size=10,
-            max_overflow=20,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
             pool_timeout=30,
             pool_recycle=1800,
             pool_pre_ping=True
         )
         self._session = async_sessionmaker(bind=self._engine, expire_on_commit=False)
+        self._kafka: Optional[KafkaManager] = None
+        self._otel: Optional[OpenTelemetryManager] = None
+        self._jwt = JwtConfig.for_verifier(settings, RevocationSet())
+        self._revocations = RevocationPoller(
+            self._engine,
+            self._jwt.revocations,
+            interval=settings.token_revocation_poll_seconds,
+        )
+        self._ledger = LedgerManager(
+            checkpoint_interval=settings.ledger_checkpoint_interval
+        )
+        self._summary = DailySummaryManager()
+        self._noc_resolver = NocTransferResolver(
+            size=settings.noc_resolver_size, ttl=settings.noc_resolver_ttl_seconds
+        )
+        self._user_changes: Optional[UserChangeFollower] = None
 
     def get_jwt(self) -> JwtConfig:
-        return JwtConfig(
-            self._settings.jwt_secret_key, self._settings.jwt_token_expiration_minutes
-        )
+        return self._jwt
 
     def get_kafka(self) -> KafkaManager:
-        return KafkaManager(bootstrap_servers="kafka:9092")
+        if self._kafka is None:
+            self._kafka = KafkaManager(bootstrap_servers="kafka:9092")
+        return self._kafka
 
     def get_otel(self) -> OpenTelemetryManager:
-        return OpenTelemetryManager(
-            service_name="topup-service", endpoint="http://jaeger:4317"
+        if self._otel is None:
+            self._otel = OpenTelemetryManager(
+                service_name="topup-service", endpoint="http://jaeger:4317"
+            )
+        return self._otel
+
+    async def warm_database(self) -> None:
+        await open_pool(
+            self._engine,
+            min(self._settings.startup_db_connections, self._settings.db_pool_size),
+        )
+
+    async def warm_kafka(self) -> None:
+        kafka = self.get_kafka()
+        await kafka.producer()
+        await kafka.ensure_topics(
+            [TopupCreated.topic],
+            self._settings.kafka_topic_partitions,
+            self._settings.kafka_topic_replication_factor,
         )
 
+    def follow_user_changes(self) -> None:
+        if self._user_changes is None:
+            self._user_changes = UserChangeFollower(self.get_kafka(), [self._noc_resolver])
+        self._user_changes.start()
+
+    async def follow_revocations(self) -> None:
+        await self._revocations.start()
+
+    async def check_database(self) -> None:
+        async with self._engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    async def check_kafka(self) -> None:
+        await self.get_kafka().check()
+
+    async def close(self) -> None:
+        await self._revocations.stop()
+        await self._jwt.close()
+        if self._user_changes is not None:
+            await self._user_changes.stop()
+        if self._kafka is not None:
+            await self._kafka.close()
+        if self._otel is not None:
+            await self._otel.flush()
+        await self._engine.dispose()
+
     async def user_repository(self) -> IUserRepository:
         session = self._session()
         return UserRepository(session)
@@ -63,21 +134,28 @@ class Container:
         session = self._session()
         return SaldoRepository(session)
 
+    async def daily_summary_repository(self) -> IDailySummaryRepository:
+        session = self._session()
+        return DailySummaryRepository(session)
+
     async def topup_repository(self) -> ITopupRepository:
         session = self._session()
-        return TopupRepository(session)
+        return TopupRepository(session, self._ledger, self._summary)
 
     async def topup_service(self) -> ITopupService:
         user_repo = await self.user_repository()
         saldo_repo = await self.saldo_repository()
+        daily_summary_repo = await self.daily_summary_repository()
         topup_repo = await self.topup_repository()
 
         return TopupService(
             topup_repository=topup_repo,
             user_repository=user_repo,
             saldo_repository=saldo_repo,
+            daily_summary_repository=daily_summary_repo,
             kafka_manager=self.get_kafka(),
             otel_manager=self.get_otel(),
+            noc_resolver=self._noc_resolver,
         )
 
 
@@ -4,7 +4,7 @@ from sqlalchemy.orm import selectinload
 from sqlalchemy.future import select
 from datetime import datetime
 
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 
 from domain.dtos.request.topup import (
     CreateTopupRequest,
@@ -13,12 +13,26 @@ from domain.dtos.request.topup import (
 )
 from domain.dtos.record.topup import TopupRecordDTO
 from domain.repository.topup import ITopupRepository
+from domain.dtos.response.topup import TOPUP_RESPONSE_FIELDS
+from lib.ledger.ledger import LedgerManager, reverse, topup_legs
+from lib.partition.partition import created_between
+from lib.summary.daily_summary import TOPUP, DailySummaryManager
 from lib.model.topup import Topup
 
 
+# Columns backing TopupResponse, for read paths that skip ORM hydration.
+TOPUP_RESPONSE_COLUMNS = tuple(
+    getattr(Topup, field) for field in TOPUP_RESPONSE_FIELDS
+)
+
+
 class TopupRepository(ITopupRepository):
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self, session: AsyncSession, ledger: LedgerManager, summary: DailySummaryManager
+    ):
         self.session = session
+        self.ledger = ledger
+        self.summary = summary
 
     async def find_all(self) -> List[TopupRecordDTO]:
         """
@@ -28,6 +42,22 @@ class TopupRepository(ITopupRepository):
         topups = result.scalars().all()
         return [TopupRecordDTO.from_orm(topup) for topup in topups]
 
+    async def find_all_rows(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Retrieve all topup records as plain row tuples in TOPUP_RESPONSE_FIELDS order,
+        optionally limited to those created in [start_date, end_date).
+        """
+        result = await self.session.execute(
+            select(*TOPUP_RESPONSE_COLUMNS).filter(
+                *created_between(Topup.created_at, start_date, end_date)
+            )
+        )
+        return result.tuples().all()
+
     async def find_by_id(self, id: int) -> Optional[TopupRecordDTO]:
         """
         Find a topup record by its ID.
@@ -46,6 +76,25 @@ class TopupRepository(ITopupRepository):
         topups = result.scalars().all()
         return [TopupRecordDTO.from_orm(topup) for topup in topups]
 
+    async def find_by_users_rows(
+        self,
+        user_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Find all topup records associated with a given user ID as plain row tuples in
+        TOPUP_RESPONSE_FIELDS order, optionally limited to those created in
+        [start_date, end_date).
+        """
+        result = await self.session.execute(
+            select(*TOPUP_RESPONSE_COLUMNS).filter(
+                Topup.user_id == user_id,
+                *created_between(Topup.created_at, start_date, end_date),
+            )
+        )
+        return result.tuples().all()
+
     async def find_by_user(self, user_id: int) -> Optional[TopupRecordDTO]:
         """
         Find a single topup record associated with a given user ID.
@@ -70,6 +119,24 @@ class TopupRepository(ITopupRepository):
             updated_at=datetime.utcnow(),
         )
         self.session.add(new_topup)
+        try:
+            await self.session.flush()
+            await self.ledger.post(
+                self.session,
+                "topup",
+                new_topup.topup_id,
+                topup_legs(new_topup.user_id, new_topup.topup_amount),
+            )
+            await self.summary.add(
+                self.session,
+                TOPUP,
+                new_topup.user_id,
+                new_topup.created_at,
+                new_topup.topup_amount,
+            )
+        except Exception:
+            await self.session.rollback()
+            raise
         await self.session.commit()
         await self.session.refresh(new_topup)
         return TopupRecordDTO.from_orm(new_topup)
@@ -78,50 +145,109 @@ class TopupRepository(ITopupRepository):
         """
         Update an existing topup record based on the given input.
         """
-        result = await self.session.execute(
-            update(Topup)
-            .where(Topup.topup_id == input.topup_id)
-            .values(
-                topup_no=input.topup_no,
-                user_id=input.user_id,
-                topup_amount=input.topup_amount,
-                topup_method=input.topup_method,
-                topup_time=datetime.utcnow(),
-                updated_at=datetime.utcnow(),
-            )
-            .returning(Topup)
-        )
-        updated_topup = result.scalars().first()
-        if updated_topup:
-            await self.session.commit()
-            await self.session.refresh(updated_topup)
-            return TopupRecordDTO.from_orm(updated_topup)
-        else:
+        previous = await self._lock(input.topup_id)
+        if previous is None:
+            await self.session.rollback()
             raise ValueError("Topup record not found")
 
+        try:
+            result = await self.session.execute(
+                update(Topup)
+                .where(Topup.topup_id == input.topup_id)
+                .values(
+                    topup_no=input.topup_no,
+                    user_id=input.user_id,
+                    topup_amount=input.topup_amount,
+                    topup_method=input.topup_method,
+                    topup_time=datetime.utcnow(),
+                    updated_at=datetime.utcnow(),
+                )
+                .returning(Topup)
+            )
+            updated_topup = result.scalars().first()
+            await self.ledger.post(
+                self.session,
+                "topup",
+                input.topup_id,
+                reverse(topup_legs(previous.user_id, previous.topup_amount))
+                + topup_legs(input.user_id, input.topup_amount),
+            )
+            await self.summary.refresh(
+                self.session, TOPUP, (previous.user_id, input.user_id), previous.created_at
+            )
+        except Exception:
+            await self.session.rollback()
+            raise
+        await self.session.commit()
+        await self.session.refresh(updated_topup)
+        return TopupRecordDTO.from_orm(updated_topup)
+
     async def update_amount(self, input: UpdateTopupAmount) -> TopupRecordDTO:
         """
         Update the amount of an existing topup record.
         """
-        result = await self.session.execute(
-            update(Topup)
-            .where(Topup.topup_id == input.topup_id)
-            .values(topup_amount=input.topup_amount, updated_at=datetime.utcnow())
-            .returning(Topup)
-        )
-        updated_topup = result.scalars().first()
-        if updated_topup:
-            await self.session.commit()
-            await self.session.refresh(updated_topup)
-            return TopupRecordDTO.from_orm(updated_topup)
-        else:
+        previous = await self._lock(input.topup_id)
+        if previous is None:
+            await self.session.rollback()
             raise ValueError("Topup record not found")
 
+        try:
+            result = await self.session.execute(
+                update(Topup)
+                .where(Topup.topup_id == input.topup_id)
+                .values(topup_amount=input.topup_amount, updated_at=datetime.utcnow())
+                .returning(Topup)
+            )
+            updated_topup = result.scalars().first()
+            await self.ledger.post(
+                self.session,
+                "topup",
+                input.topup_id,
+                topup_legs(previous.user_id, input.topup_amount - previous.topup_amount),
+            )
+            await self.summary.refresh(
+                self.session, TOPUP, (previous.user_id,), previous.created_at
+            )
+        except Exception:
+            await self.session.rollback()
+            raise
+        await self.session.commit()
+        await self.session.refresh(updated_topup)
+        return TopupRecordDTO.from_orm(updated_topup)
+
     async def delete(self, id: int) -> None:
         """
-        Delete a topup record by its ID.
+        Delete a topup record by its ID, reversing its ledger entries.
         """
-        result = await self.session.execute(delete(Topup).where(Topup.topup_id == id))
-        if result.rowcount == 0:
+        previous = await self._lock(id)
+        if previous is None:
+            await self.session.rollback()
             raise ValueError("Topup record not found")
+
+        try:
+            await self.ledger.post(
+                self.session,
+                "topup",
+                id,
+                reverse(topup_legs(previous.user_id, previous.topup_amount)),
+            )
+            await self.session.execute(delete(Topup).where(Topup.topup_id == id))
+            await self.summary.refresh(
+                self.session, TOPUP, (previous.user_id,), previous.created_at
+            )
+        except Exception:
+            await self.session.rollback()
+            raise
         await self.session.commit()
+
+    async def _lock(self, id: int):
+        """
+        Lock a topup row for the rest of the transaction and return the values
+        its ledger entries and daily summary were posted with.
+        """
+        result = await self.session.execute(
+            select(Topup.user_id, Topup.topup_amount, Topup.created_at)
+            .where(Topup.topup_id == id)
+            .with_for_update()
+        )
+        return result.first()
@@ -1,3 +1,4 @@
+from datetime import date, datetime
 from typing import List, Optional, Union
 from sqlalchemy.ext.asyncio import AsyncSession
 from structlog import get_logger
@@ -8,19 +9,23 @@ from domain.repository.topup import ITopupRepository
 from domain.service.topup import ITopupService
 
 from domain.repository.saldo import ISaldoRepository
+from domain.repository.daily_summary import IDailySummaryRepository
 
 from domain.dtos.request.topup import CreateTopupRequest, UpdateTopupRequest, UpdateTopupAmount
-from domain.dtos.request.saldo import UpdateSaldoBalanceRequest
 
 from domain.dtos.response.api import ApiResponse, ErrorResponse
 from domain.dtos.response.topup import TopupResponse
 
 from lib.utils.errors import AppError, NotFoundError
 
+from domain.dtos.response.daily_summary import DailySummaryResponse
+from lib.summary.daily_summary import TOPUP
+from lib.events.codec import publish
+from lib.events.events import TopupCreated
 from lib.kafka.kafka_config import KafkaManager
 from lib.otel.otel_config import OpenTelemetryManager
+from lib.resolver.noc_transfer import NocTransferResolver
 
-import json
 
 
 logger = get_logger()
@@ -32,26 +37,32 @@ class TopupService(ITopupService):
         topup_repository: ITopupRepository,
         user_repository: IUserRepository,
         saldo_repository: ISaldoRepository,
+        daily_summary_repository: IDailySummaryRepository,
         kafka_manager: KafkaManager,
-        otel_manager: OpenTelemetryManager
+        otel_manager: OpenTelemetryManager,
+        noc_resolver: Optional[NocTransferResolver] = None,
     ):
         self.user_repository = user_repository
         self.saldo_repository = saldo_repository
+        self.daily_summary_repository = daily_summary_repository
         self.topup_repository = topup_repository
         self.kafka_manager = kafka_manager
         self.otel_manager = otel_manager
+        self.noc_resolver = noc_resolver or NocTransferResolver()
 
 
     
 
     async def get_topups(
         self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
     ) -> Union[ApiResponse[List[TopupResponse]], ErrorResponse]:
         with self.otel_manager.start_trace("Get All Topups") as span:
             try:
                 # Fetch all topups
-                topups = await self.topup_repository.find_all()
-                topup_responses = TopupResponse.from_dtos(topups)
+                topups = await self.topup_repository.find_all_rows(start_date, end_date)
+                topup_responses = TopupResponse.from_rows(topups)
 
                 logger.info("Successfully retrieved topups", count=len(topup_responses))
                 span.set_attribute("topup_count", len(topup_responses))
@@ -110,7 +121,10 @@ class TopupService(ITopupService):
 
     
     async def get_topup_users(
-    self, user_id: int
+        self,
+        user_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
     ) -> Union[ApiResponse[Optional[List[TopupResponse]]], ErrorResponse]:
         with self.otel_manager.start_trace("Get Topups for User") as span:
             span.set_attribute("user_id", user_id)
@@ -118,14 +132,14 @@ class TopupService(ITopupService):
             try:
                 user = await self.user_repository.find_by_id(user_id)
                 if not user:
-                    logger.error(f"User with id {user_id} not found")
+                    logger.error("User not found", user_id=user_id)
                     span.set_attribute("error", "User not found")
                     raise NotFoundError(f"User with id {user_id} not found")
 
-                topups = await self.topup_repository.find_by_users(user_id)
+                topups = await self.topup_repository.find_by_users_rows(user_id, start_date, end_date)
 
                 if not topups:
-                    logger.info(f"No topups found for user with id {user_id}")
+                    logger.info("No topups found for user", user_id=user_id)
                     span.set_attribute("topup_count", 0)
                     return ApiResponse(
                         status="success",
@@ -133,8 +147,8 @@ class TopupService(ITopupService):
                         data=None,
                     )
 
-                topup_response = TopupResponse.from_dtos(topups)
-                logger.info(f"Successfully retrieved topups for user with id {user_id}")
+                topup_response = TopupResponse.from_rows(topups)
+                logger.info("Successfully retrieved topups for user", user_id=user_id)
                 span.set_attribute("topup_count", len(topup_response))
 
                 return ApiResponse(
@@ -152,7 +166,7 @@ class TopupService(ITopupService):
 
             except Exception as e:
                 span.record_exception(e)
-                logger.error(f"Failed to fetch topups for user with id {user_id}: {e}")
+                logger.error("Failed to fetch topups for user", user_id=user_id, error=str(e))
                 return ErrorResponse(
                     status="error",
                     message="An unexpected error occurred. Please try again later."
@@ -168,19 +182,19 @@ class TopupService(ITopupService):
             try:
                 user = await self.user_repository.find_by_id(user_id)
                 if not user:
-                    logger.error(f"User with id {user_id} not found")
+                    logger.error("User not found", user_id=user_id)
                     span.set_attribute("error", "User not found")
                     raise NotFoundError(f"User with id {user_id} not found")
 
                 topup = await self.topup_repository.find_by_user(user_id)
 
                 if not topup:
-                    logger.info(f"No topup found for user with id {user_id}")
+                    logger.info("No topup found for user", user_id=user_id)
                     span.set_attribute("error", "Topup not found")
                     raise NotFoundError(f"Topup with user id {user_id} not found")
 
                 topup_response = TopupResponse.from_dto(topup)
-                logger.info(f"Successfully retrieved topup for user with id {user_id}")
+                logger.info("Successfully retrieved topup for user", user_id=user_id)
                 span.set_attribute("topup_found", True)
 
                 return ApiResponse(
@@ -198,88 +212,109 @@ class TopupService(ITopupService):
 
             except Exception as e:
                 span.record_exception(e)
-                logger.error(f"Failed to fetch topup for user with id {user_id}: {e}")
+                logger.error("Failed to fetch topup for user", user_id=user_id, error=str(e))
                 return ErrorResponse(
                     status="error",
                     message="An unexpected error occurred. Please try again later."
                 )
 
     
+    async def get_stats(
+        self,
+        user_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Union[ApiResponse[List[DailySummaryResponse]], ErrorResponse]:
+        with self.otel_manager.start_trace("Get Topup Stats") as span:
+            if user_id is not None:
+                span.set_attribute("user_id", user_id)
+            try:
+                logger.info("Retrieving topup stats", user_id=user_id)
+                rows = await self.daily_summary_repository.find_daily(
+                    (TOPUP,), user_id, start_date, end_date
+                )
+                span.set_attribute("row_count", len(rows))
+
+                return ApiResponse(
+                    status="success",
+                    message="Topup stats retrieved successfully",
+                    data=DailySummaryResponse.from_rows(rows),
+                )
+            except Exception as e:
+                span.record_exception(e)
+                logger.error("Failed to retrieve topup stats", error=str(e))
+                return ErrorResponse(
+                    status="error", message="Failed to retrieve topup stats"
+                )
+
     async def create_topup(self, input: CreateTopupRequest) -> Union[ApiResponse[TopupResponse], ErrorResponse]:
         with self.otel_manager.start_trace("Create Topup") as span:
-            span.set_attribute("user_id", input.user_id)
-            producer = None
             try:
+                # Resolve an account addressed by noc_transfer
+                if input.user_id is None:
+                    user_id = await self.noc_resolver.resolve(
+                        input.noc_transfer, self.user_repository.find_id_by_noc_transfer
+                    )
+                    if user_id is None:
+                        logger.error("User not found by noc_transfer")
+                        span.set_attribute("error", "User not found")
+                        raise NotFoundError("User with the given noc_transfer not found")
+                    input = input.model_copy(update={"user_id": user_id})
+                span.set_attribute("user_id", input.user_id)
+
                 # Check if the user exists
                 user = await self.user_repository.find_by_id(input.user_id)
                 if not user:
-                    logger.error(f"User with id {input.user_id} not found")
+                    logger.error("User not found", user_id=input.user_id)
                     span.set_attribute("error", "User not found")
                     raise NotFoundError(f"User with id {input.user_id} not found")
 
-                logger.info(f"User with id {input.user_id} found, proceeding with topup creation")
+                logger.info("User found, proceeding with topup creation", user_id=input.user_id)
                 span.set_attribute("user_found", True)
 
-                # Create topup entry
+                # Create topup entry; the ledger posting and the saldo update
+                # are written in the same transaction
                 try:
                     topup = await self.topup_repository.create(input)
-                    logger.info(f"Topup created for user {input.user_id}: topup amount {topup.topup_amount}")
+                    logger.info("Topup created", user_id=input.user_id, topup_amount=topup.topup_amount)
                     span.set_attribute("topup_amount", topup.topup_amount)
                 except Exception as e:
                     span.record_exception(e)
-                    logger.error(f"Error creating topup for user {input.user_id}: {e}")
+                    logger.error("Error creating topup", user_id=input.user_id, error=str(e))
                     return ErrorResponse(
                         status="error",
                         message="Failed to create topup"
                     )
 
-                # Update or create saldo
                 saldo = await self.saldo_repository.find_by_user_id(input.user_id)
-                try:
-                    if saldo:
-                        new_balance = saldo.total_balance + topup.topup_amount
-                        update_request = UpdateSaldoBalanceRequest(user_id=input.user_id, total_balance=new_balance)
-                        await self.saldo_repository.update_balance(update_request)
-                        logger.info(f"Saldo updated successfully for user {input.user_id}. New balance: {new_balance}")
-                        span.set_attribute("new_balance", new_balance)
-                    else:
-                        create_saldo_request = CreateSaldoRequest(user_id=input.user_id, total_balance=topup.topup_amount)
-                        await self.saldo_repository.create(create_saldo_request)
-                        logger.info(f"Initial saldo created for user {input.user_id} with balance {topup.topup_amount}")
-                        span.set_attribute("initial_balance", topup.topup_amount)
-                except Exception as db_err:
-                    span.record_exception(db_err)
-                    logger.error(f"Failed to update/create saldo for user {input.user_id}: {db_err}")
-                    await self.topup_repository.delete(topup.topup_id)
-                    return ErrorResponse(
-                        status="error",
-                        message=f"Failed to update/create saldo for user {input.user_id}"
-                    )
+                new_balance = saldo.total_balance
+                logger.info("Saldo updated successfully", user_id=input.user_id, new_balance=new_balance)
+                span.set_attribute("new_balance", new_balance)
 
                 # Send email notification via Kafka
                 try:
-                    producer = await self.kafka_manager.get_producer()
-                    email_message = {
-                        "email": user.email,
-                        "subject": "Top-Up Successful",
-                        "body": f"Hi {user.firstname} {user.lastname}, your top-up of {topup.topup_amount} has been successfully added. Your new balance is {new_balance if saldo else topup.topup_amount}."
-                    }
-                    await producer.send(
-                        topic="email-service-topic-topup",
-                        value=json.dumps(email_message).encode("utf-8")
+                    producer = await self.kafka_manager.producer()
+                    event = TopupCreated(
+                        topup_id=topup.topup_id,
+                        user_id=input.user_id,
+                        email=user.email,
+                        name=f"{user.firstname} {user.lastname}",
+                        amount=topup.topup_amount,
+                        balance=new_balance,
                     )
+                    await publish(producer, event)
                     
-                    logger.info(f"Email notification sent to Kafka for user {input.user_id} on topic 'email-service-topic-topup'.")
+                    logger.info("Email notification sent to Kafka", user_id=input.user_id, topic="email-service-topic-topup")
                     span.set_attribute("email_notification_sent", True)
                 except Exception as kafka_err:
                     span.record_exception(kafka_err)
-                    logger.error(f"Failed to send email notification for user {input.user_id}: {kafka_err}")
+                    logger.error("Failed to send email notification", user_id=input.user_id, error=str(kafka_err))
                     return ErrorResponse(
                         status="error",
                         message="Failed to send email notification"
                     )
 
-                logger.info(f"Topup successfully created for user {input.user_id}. Total balance updated.")
+                logger.info("Topup successfully created", user_id=input.user_id)
                 return ApiResponse(
                     status="success",
                     message="Topup created successfully",
@@ -295,14 +330,11 @@ class TopupService(ITopupService):
 
             except Exception as e:
                 span.record_exception(e)
-                logger.error(f"Error processing topup for user {input.user_id}: {e}")
+                logger.error("Error processing topup", user_id=input.user_id, error=str(e))
                 return ErrorResponse(
                     status="error",
                     message="An unexpected error occurred while creating topup"
                 )
-            finally:
-                if producer:
-                    await producer.stop()
 
 
 
@@ -342,23 +374,12 @@ class TopupService(ITopupService):
                 )
                 span.set_attribute("topup_difference", topup_difference)
 
-                # Update topup amount
+                # Update topup amount together with its ledger entries and saldo
                 await self.topup_repository.update_amount(input=UpdateTopupAmount(topup_id=input.topup_id, topup_amount=input.topup_amount))
 
-                # Update saldo
-                saldo = await self.saldo_repository.find_by_user_id(input.user_id)
-                if not saldo:
-                    logger.error("Saldo not found", user_id=input.user_id)
-                    span.set_attribute("error", "Saldo not found")
-                    raise NotFoundError(f"Saldo for user {input.user_id} not found")
-
-                new_balance = saldo.total_balance + topup_difference
-                saldo_input = UpdateSaldoBalanceRequest(user_id=input.user_id, total_balance=new_balance)
-
-                await self.saldo_repository.update_balance(saldo_input)
-
-                logger.info("Saldo updated", user_id=input.user_id, new_balance=new_balance)
-                span.set_attribute("new_balance", new_balance)
+                saldo = await self.saldo_repository.find_by_user_id(existing_topup.user_id)
+                logger.info("Saldo updated", user_id=existing_topup.user_id, new_balance=saldo.total_balance)
+                span.set_attribute("new_balance", saldo.total_balance)
 
                 # Retrieve updated topup
                 updated_topup = await self.topup_repository.find_by_id(input.topup_id)
@@ -397,7 +418,7 @@ class TopupService(ITopupService):
                 # Find user by ID
                 user = await self.user_repository.find_by_id(id)
                 if not user:
-                    logger.error(f"User with id {id} not found")
+                    logger.error("User not found", user_id=id)
                     span.set_attribute("error", "User not found")
                     return ErrorResponse(
                         status="error",
@@ -407,7 +428,7 @@ class TopupService(ITopupService):
                 # Find topup by user ID
                 existing_topup = await self.topup_repository.find_by_user(user.user_id)
                 if not existing_topup:
-                    logger.error(f"Topup with id {id} not found")
+                    logger.error("Topup not found", topup_id=id)
                     span.set_attribute("error", "Topup not found")
                     return ErrorResponse(
                         status="error",
@@ -416,7 +437,7 @@ class TopupService(ITopupService):
 
                 # Delete topup
                 await self.topup_repository.delete(existing_topup.topup_id)
-                logger.info(f"Topup deleted successfully for id: {id}")
+                logger.info("Topup deleted successfully", topup_id=id)
 
                 return ApiResponse[None](
                     status="success",
@@ -426,7 +447,7 @@ class TopupService(ITopupService):
 
             except Exception as e:
                 span.record_exception(e)
-                logger.error(f"Failed to delete topup for id {id}: {str(e)}")
+                logger.error("Failed to delete topup", topup_id=id, error=str(e))
                 return ErrorResponse(
                     status="error",
                     message=f"Failed to delete topup for id {id}"
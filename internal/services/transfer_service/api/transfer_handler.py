@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from datetime import date, datetime
 from typing import Union, List, Optional
 from prometheus_client import Counter, Histogram
 
@@ -6,8 +7,10 @@ from domain.dtos.request.transfer import CreateTransferRequest, UpdateTransferRe
 from domain.dtos.response.api import ApiResponse, ErrorResponse
 from domain.service.transfer import ITransferService
 from domain.dtos.response.transfer import TransferResponse
+from domain.dtos.response.daily_summary import DailySummaryResponse
 from infrastructure.service.transfer import TransferService
 from lib.security.header import token_security
+from lib.http.response import ORJSONResponse
 from infrastructure.di import get_transfer_service
 
 # Prometheus metrics for transfer service
@@ -18,6 +21,8 @@ router = APIRouter()
 
 @router.get("", response_model=ApiResponse[List[TransferResponse]])
 async def get_transfers(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     transfer_service: ITransferService = Depends(get_transfer_service),
     token: str = Depends(token_security),
 ):
@@ -26,12 +31,36 @@ async def get_transfers(
     endpoint = '/'
     try:
         with REQUEST_DURATION.labels(method, endpoint).time():
-            response = await transfer_service.get_transfers()
+            response = await transfer_service.get_transfers(start_date, end_date)
             status = 'success' if not isinstance(response, ErrorResponse) else 'error'
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=500, detail=response.message)
-            return response
+            return ORJSONResponse(response)
+    except Exception as e:
+        REQUEST_COUNT.labels(method, endpoint, 'error').inc()
+        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+
+
+@router.get("/stats", response_model=ApiResponse[List[DailySummaryResponse]])
+async def get_transfer_stats(
+    user_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    transfer_service: ITransferService = Depends(get_transfer_service),
+    token: str = Depends(token_security),
+):
+    """Retrieve daily transfer count, sum, min and max from the rollup table."""
+    method = 'GET'
+    endpoint = '/stats'
+    try:
+        with REQUEST_DURATION.labels(method, endpoint).time():
+            response = await transfer_service.get_stats(user_id, start_date, end_date)
+            status = 'success' if not isinstance(response, ErrorResponse) else 'error'
+            REQUEST_COUNT.labels(method, endpoint, status).inc()
+            if status == 'error':
+                raise HTTPException(status_code=500, detail=response.message)
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -53,7 +82,7 @@ async def get_transfer(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=404, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -75,7 +104,7 @@ async def get_transfer_user(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=404, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -84,6 +113,8 @@ async def get_transfer_user(
 @router.get("/users/{user_id}", response_model=ApiResponse[Optional[List[TransferResponse]]])
 async def get_transfer_users(
     user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     transfer_service: ITransferService = Depends(get_transfer_service),
     token: str = Depends(token_security),
 ):
@@ -92,12 +123,12 @@ async def get_transfer_users(
     endpoint = f'/users/{user_id}'
     try:
         with REQUEST_DURATION.labels(method, endpoint).time():
-            response = await transfer_service.get_transfer_users(user_id)
+            response = await transfer_service.get_transfer_users(user_id, start_date, end_date)
             status = 'success' if not isinstance(response, ErrorResponse) else 'error'
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=404, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -119,7 +150,7 @@ async def create_transfer(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=400, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -143,7 +174,7 @@ async def update_transfer(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=400, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -165,7 +196,7 @@ async def delete_transfer(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=404, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
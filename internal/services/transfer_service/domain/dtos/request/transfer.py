@@ -1,8 +1,12 @@
+from typing import Optional
+
 from pydantic import BaseModel, model_validator
 
 class CreateTransferRequest(BaseModel):
     transfer_from: int
-    transfer_to: int
+    # The receiver, by user id or by the noc_transfer on their account.
+    transfer_to: Optional[int] = None
+    transfer_to_noc: Optional[str] = None
     transfer_amount: int
 
     @model_validator(mode="before")
@@ -11,6 +15,12 @@ class CreateTransferRequest(BaseModel):
             raise ValueError('Transfer amount must be at least 50000')
         return values
 
+    @model_validator(mode="after")
+    def validate_receiver(self):
+        if (self.transfer_to is None) == (self.transfer_to_noc is None):
+            raise ValueError('Exactly one of transfer_to and transfer_to_noc is required')
+        return self
+
 
 
 class UpdateTransferRequest(BaseModel):
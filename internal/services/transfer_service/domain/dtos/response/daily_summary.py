@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import Any, Iterable, List, Optional, Sequence
+from datetime import date
+
+
+class DailySummaryResponse(BaseModel):
+    day: date
+    transaction_type: str
+    transaction_count: int
+    total_amount: int
+    min_amount: Optional[int]
+    max_amount: Optional[int]
+
+    @staticmethod
+    def from_rows(rows: Iterable[Sequence[Any]]) -> List[dict]:
+        """
+        Converts rows selected in DAILY_SUMMARY_RESPONSE_FIELDS order straight into
+        response dicts.
+        """
+        return [dict(zip(DAILY_SUMMARY_RESPONSE_FIELDS, row)) for row in rows]
+
+
+DAILY_SUMMARY_RESPONSE_FIELDS = tuple(DailySummaryResponse.model_fields)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import Any, Iterable, List, Sequence
 from datetime import datetime
 from domain.dtos.record.transfer import TransferRecordDTO
 
@@ -30,3 +30,13 @@ class TransferResponse(BaseModel):
         """
         return [TransferResponse.from_dto(dto) for dto in dtos]
 
+    @staticmethod
+    def from_rows(rows: Iterable[Sequence[Any]]) -> List[dict]:
+        """
+        Converts rows selected in TRANSFER_RESPONSE_FIELDS order straight into
+        response dicts, skipping the per-row record DTO and response model.
+        """
+        return [dict(zip(TRANSFER_RESPONSE_FIELDS, row)) for row in rows]
+
+
+TRANSFER_RESPONSE_FIELDS = tuple(TransferResponse.model_fields)
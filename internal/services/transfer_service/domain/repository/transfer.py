@@ -1,5 +1,6 @@
 import abc
-from typing import List, Optional, Any
+from datetime import datetime
+from typing import List, Optional, Any, Tuple
 from domain.dtos.record.transfer import TransferRecordDTO
 from domain.dtos.request.transfer import CreateTransferRequest, UpdateTransferRequest, UpdateTransferAmountRequest
 
@@ -17,6 +18,18 @@ class ITransferRepository(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    async def find_all_rows(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Retrieve all transfer records as plain row tuples in TRANSFER_RESPONSE_FIELDS order,
+        optionally limited to those created in [start_date, end_date).
+        """
+        pass
+
     @abc.abstractmethod
     async def find_by_id(self, id: int) -> Optional[TransferRecordDTO]:
         """
@@ -31,6 +44,20 @@ class ITransferRepository(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    async def find_by_users_rows(
+        self,
+        user_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Find all transfer records associated with a given user ID as plain row tuples in
+        TRANSFER_RESPONSE_FIELDS order, optionally limited to those created in
+        [start_date, end_date).
+        """
+        pass
+
     @abc.abstractmethod
     async def find_by_user(self, user_id: int) -> Optional[TransferRecordDTO]:
         """
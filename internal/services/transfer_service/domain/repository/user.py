@@ -13,4 +13,11 @@ class IUserRepository(abc.ABC):
         """
         Find a user by their ID.
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abc.abstractmethod
+    async def find_id_by_noc_transfer(self, noc_transfer: str) -> Optional[int]:
+        """
+        Find the ID of the user owning a noc_transfer.
+        """
+        pass
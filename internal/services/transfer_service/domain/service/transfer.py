@@ -1,7 +1,9 @@
 import abc
+from datetime import date, datetime
 from typing import List, Optional, Any, Union
 from domain.dtos.response.api import ApiResponse, ErrorResponse
 from domain.dtos.response.transfer import TransferResponse
+from domain.dtos.response.daily_summary import DailySummaryResponse
 from domain.dtos.request.transfer import CreateTransferRequest, UpdateTransferRequest
 
 
@@ -12,7 +14,9 @@ class ITransferService(abc.ABC):
     """
 
     @abc.abstractmethod
-    async def get_transfers(self) -> Union[ApiResponse[List[TransferResponse]], ErrorResponse]:
+    async def get_transfers(
+        self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+    ) -> Union[ApiResponse[List[TransferResponse]], ErrorResponse]:
         """
         Retrieve a list of all transfers.
         """
@@ -26,7 +30,9 @@ class ITransferService(abc.ABC):
         pass
 
     @abc.abstractmethod
-    async def get_transfer_users(self, id: int) -> Union[ApiResponse[Optional[List[TransferResponse]]], ErrorResponse]:
+    async def get_transfer_users(
+        self, id: int, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+    ) -> Union[ApiResponse[Optional[List[TransferResponse]]], ErrorResponse]:
         """
         Retrieve all transfers associated with a specific user ID.
         """
@@ -39,6 +45,19 @@ class ITransferService(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    async def get_stats(
+        self,
+        user_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Union[ApiResponse[List[DailySummaryResponse]], ErrorResponse]:
+        """
+        Retrieve daily transfer count, sum, min and max from the rollup table, for one
+        user or over all users.
+        """
+        pass
+
     @abc.abstractmethod
     async def create_transfer(self, input: CreateTransferRequest) -> Union[ApiResponse[TransferResponse], ErrorResponse]:
         """
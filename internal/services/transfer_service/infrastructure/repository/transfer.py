@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlalchemy.future import select
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 
 from domain.dtos.request.transfer import (
     CreateTransferRequest,
@@ -16,12 +16,26 @@ from domain.dtos.record.transfer import (
 from domain.repository.transfer import (
     ITransferRepository,
 )
+from domain.dtos.response.transfer import TRANSFER_RESPONSE_FIELDS
+from lib.ledger.ledger import LedgerManager, reverse, transfer_legs
+from lib.partition.partition import created_between
+from lib.summary.daily_summary import TRANSFER_IN, TRANSFER_OUT, DailySummaryManager
 from lib.model.transfer import Transfer
 
 
+# Columns backing TransferResponse, for read paths that skip ORM hydration.
+TRANSFER_RESPONSE_COLUMNS = tuple(
+    getattr(Transfer, field) for field in TRANSFER_RESPONSE_FIELDS
+)
+
+
 class TransferRepository(ITransferRepository):
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self, session: AsyncSession, ledger: LedgerManager, summary: DailySummaryManager
+    ):
         self.session = session
+        self.ledger = ledger
+        self.summary = summary
 
     async def find_all(self) -> List[TransferRecordDTO]:
         """
@@ -31,6 +45,22 @@ class TransferRepository(ITransferRepository):
         transfers = result.scalars().all()
         return [TransferRecordDTO.from_orm(transfer) for transfer in transfers]
 
+    async def find_all_rows(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Retrieve all transfer records as plain row tuples in TRANSFER_RESPONSE_FIELDS order,
+        optionally limited to those created in [start_date, end_date).
+        """
+        result = await self.session.execute(
+            select(*TRANSFER_RESPONSE_COLUMNS).filter(
+                *created_between(Transfer.created_at, start_date, end_date)
+            )
+        )
+        return result.tuples().all()
+
     async def find_by_id(self, id: int) -> Optional[TransferRecordDTO]:
         """
         Find a transfer record by its ID.
@@ -58,6 +88,30 @@ class TransferRepository(ITransferRepository):
         transfers = result.scalars().all() 
         return [TransferRecordDTO.from_orm(t) for t in transfers]
 
+    async def find_by_users_rows(
+        self,
+        user_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Find all transfer records associated with a given user ID as plain row tuples in
+        TRANSFER_RESPONSE_FIELDS order, optionally limited to those created in
+        [start_date, end_date).
+        """
+        result = await self.session.execute(
+            select(*TRANSFER_RESPONSE_COLUMNS)
+            .filter(
+                or_(
+                    Transfer.transfer_from == user_id,
+                    Transfer.transfer_to == user_id
+                ),
+                *created_between(Transfer.created_at, start_date, end_date),
+            )
+            .order_by(Transfer.created_at.desc())
+        )
+        return result.tuples().all()
+
     async def find_by_user(self, user_id: int) -> Optional[TransferRecordDTO]:
         """
         Find a single transfer record associated with a given user ID.
@@ -89,6 +143,35 @@ class TransferRepository(ITransferRepository):
             updated_at=datetime.utcnow(),
         )
         self.session.add(new_transfer)
+        try:
+            await self.session.flush()
+            await self.ledger.post(
+                self.session,
+                "transfer",
+                new_transfer.transfer_id,
+                transfer_legs(
+                    new_transfer.transfer_from,
+                    new_transfer.transfer_to,
+                    new_transfer.transfer_amount,
+                ),
+            )
+            await self.summary.add(
+                self.session,
+                TRANSFER_OUT,
+                new_transfer.transfer_from,
+                new_transfer.created_at,
+                new_transfer.transfer_amount,
+            )
+            await self.summary.add(
+                self.session,
+                TRANSFER_IN,
+                new_transfer.transfer_to,
+                new_transfer.created_at,
+                new_transfer.transfer_amount,
+            )
+        except Exception:
+            await self.session.rollback()
+            raise
         await self.session.commit()
         await self.session.refresh(new_transfer)
         return TransferRecordDTO.from_orm(new_transfer)
@@ -97,58 +180,154 @@ class TransferRepository(ITransferRepository):
         """
         Update an existing transfer record based on the given input.
         """
-        result = await self.session.execute(
-            update(Transfer)
-            .where(Transfer.transfer_id == input.transfer_id)
-            .values(
-                transfer_id=input.transfer_id,
-                transfer_from=input.transfer_from,
-                transfer_to=input.transfer_to,
-                transfer_amount=input.transfer_amount,
-                transfer_time=datetime.utcnow(),
-                updated_at=datetime.utcnow(),
-            )
-            .returning(Transfer)
-        )
-        updated_transfer = result.scalars().first()
-        if updated_transfer:
-            await self.session.commit()
-            await self.session.refresh(updated_transfer)
-            return TransferRecordDTO.from_orm(updated_transfer)
-        else:
+        previous = await self._lock(input.transfer_id)
+        if previous is None:
+            await self.session.rollback()
             raise ValueError("Transfer record not found")
 
+        try:
+            result = await self.session.execute(
+                update(Transfer)
+                .where(Transfer.transfer_id == input.transfer_id)
+                .values(
+                    transfer_id=input.transfer_id,
+                    transfer_from=input.transfer_from,
+                    transfer_to=input.transfer_to,
+                    transfer_amount=input.transfer_amount,
+                    transfer_time=datetime.utcnow(),
+                    updated_at=datetime.utcnow(),
+                )
+                .returning(Transfer)
+            )
+            updated_transfer = result.scalars().first()
+            await self.ledger.post(
+                self.session,
+                "transfer",
+                input.transfer_id,
+                reverse(
+                    transfer_legs(
+                        previous.transfer_from,
+                        previous.transfer_to,
+                        previous.transfer_amount,
+                    )
+                )
+                + transfer_legs(
+                    input.transfer_from, input.transfer_to, input.transfer_amount
+                ),
+            )
+            await self._refresh_summary(
+                previous,
+                (previous.transfer_from, input.transfer_from),
+                (previous.transfer_to, input.transfer_to),
+            )
+        except Exception:
+            await self.session.rollback()
+            raise
+        await self.session.commit()
+        await self.session.refresh(updated_transfer)
+        return TransferRecordDTO.from_orm(updated_transfer)
+
     async def update_amount(
         self, input: UpdateTransferAmountRequest
     ) -> TransferRecordDTO:
         """
         Update the amount of an existing transfer record.
         """
-        result = await self.session.execute(
-            update(Transfer)
-            .where(Transfer.transfer_id == input.transfer_id)
-            .values(
-                transfer_id=input.transfer_id,
-                transfer_amount=input.transfer_amount,
-                updated_at=datetime.utcnow(),
-            )
-            .returning(Transfer)
-        )
-        updated_transfer = result.scalars().first()
-        if updated_transfer:
-            await self.session.commit()
-            await self.session.refresh(updated_transfer)
-            return TransferRecordDTO.from_orm(updated_transfer)
-        else:
+        previous = await self._lock(input.transfer_id)
+        if previous is None:
+            await self.session.rollback()
             raise ValueError("Transfer record not found")
 
+        try:
+            result = await self.session.execute(
+                update(Transfer)
+                .where(Transfer.transfer_id == input.transfer_id)
+                .values(
+                    transfer_id=input.transfer_id,
+                    transfer_amount=input.transfer_amount,
+                    updated_at=datetime.utcnow(),
+                )
+                .returning(Transfer)
+            )
+            updated_transfer = result.scalars().first()
+            await self.ledger.post(
+                self.session,
+                "transfer",
+                input.transfer_id,
+                transfer_legs(
+                    previous.transfer_from,
+                    previous.transfer_to,
+                    input.transfer_amount - previous.transfer_amount,
+                ),
+            )
+            await self._refresh_summary(
+                previous, (previous.transfer_from,), (previous.transfer_to,)
+            )
+        except Exception:
+            await self.session.rollback()
+            raise
+        await self.session.commit()
+        await self.session.refresh(updated_transfer)
+        return TransferRecordDTO.from_orm(updated_transfer)
+
     async def delete(self, id: int) -> None:
         """
-        Delete a transfer record by its ID.
+        Delete a transfer record by its ID, reversing its ledger entries.
         """
-        result = await self.session.execute(
-            delete(Transfer).where(Transfer.transfer_id == id)
-        )
-        if result.rowcount == 0:
+        previous = await self._lock(id)
+        if previous is None:
+            await self.session.rollback()
             raise ValueError("Transfer record not found")
+
+        try:
+            await self.ledger.post(
+                self.session,
+                "transfer",
+                id,
+                reverse(
+                    transfer_legs(
+                        previous.transfer_from,
+                        previous.transfer_to,
+                        previous.transfer_amount,
+                    )
+                ),
+            )
+            await self.session.execute(
+                delete(Transfer).where(Transfer.transfer_id == id)
+            )
+            await self._refresh_summary(
+                previous, (previous.transfer_from,), (previous.transfer_to,)
+            )
+        except Exception:
+            await self.session.rollback()
+            raise
         await self.session.commit()
+
+    async def _lock(self, id: int):
+        """
+        Lock a transfer row for the rest of the transaction and return the values
+        its ledger entries and daily summaries were posted with.
+        """
+        result = await self.session.execute(
+            select(
+                Transfer.transfer_from,
+                Transfer.transfer_to,
+                Transfer.transfer_amount,
+                Transfer.created_at,
+            )
+            .where(Transfer.transfer_id == id)
+            .with_for_update()
+        )
+        return result.first()
+
+    async def _refresh_summary(self, previous, senders, receivers) -> None:
+        """
+        Recompute the outgoing and incoming daily summaries touched by a changed
+        or deleted transfer.
+        """
+        await self.summary.refresh(
+            self.session, TRANSFER_OUT, senders, previous.created_at
+        )
+        await self.summary.refresh(
+            self.session, TRANSFER_IN, receivers, previous.created_at
+        )
@@ -17,4 +17,8 @@ class UserRepository(IUserRepository):
         result = await self.session.execute(select(User).filter(User.user_id == user_id))
         user = result.scalars().first()
         return UserRecordDTO.from_orm(user) if user else None
-        
\ No newline at end of file
+
+    async def find_id_by_noc_transfer(self, noc_transfer: str) -> Optional[int]:
+        # Answered from the unique index on noc_transfer.
+        result = await self.session.execute(select(User.user_id).where(User.noc_transfer == noc_transfer))
+        return result.scalars().first()
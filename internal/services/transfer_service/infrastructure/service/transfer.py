@@ -1,4 +1,4 @@
-import json
+from datetime import date, datetime
 from typing import List, Optional, Union
 from sqlalchemy.ext.asyncio import AsyncSession
 from structlog import get_logger
@@ -12,6 +12,7 @@ from domain.repository.transfer import (
 from domain.service.transfer import ITransferService
 
 from domain.repository.saldo import ISaldoRepository
+from domain.repository.daily_summary import IDailySummaryRepository
 
 
 from domain.dtos.request.transfer import (
@@ -20,8 +21,6 @@ from domain.dtos.request.transfer import (
     UpdateTransferAmountRequest,
 )
 
-from domain.dtos.request.saldo import UpdateSaldoBalanceRequest
-
 from domain.dtos.response.api import (
     ApiResponse,
     ErrorResponse,
@@ -30,8 +29,13 @@ from lib.utils.errors import AppError, NotFoundError, ValidationError
 from domain.dtos.response.transfer import (
     TransferResponse,
 )
+from domain.dtos.response.daily_summary import DailySummaryResponse
+from lib.summary.daily_summary import TRANSFER_IN, TRANSFER_OUT
+from lib.events.codec import publish
+from lib.events.events import TransferCreated
 from lib.kafka.kafka_config import KafkaManager
 from lib.otel.otel_config import OpenTelemetryManager
+from lib.resolver.noc_transfer import NocTransferResolver
 
 
 logger = get_logger()
@@ -43,25 +47,31 @@ class TransferService(ITransferService):
         transfer_repository: ITransferRepository,
         user_repository: IUserRepository,
         saldo_repository: ISaldoRepository,
+        daily_summary_repository: IDailySummaryRepository,
         kafka_manager: KafkaManager,
         otel_manager: OpenTelemetryManager,
+        noc_resolver: Optional[NocTransferResolver] = None,
     ):
         self.user_repository = user_repository
         self.saldo_repository = saldo_repository
+        self.daily_summary_repository = daily_summary_repository
         self.transfer_repository = transfer_repository
         self.kafka_manager = kafka_manager
         self.otel_manager = otel_manager
+        self.noc_resolver = noc_resolver or NocTransferResolver()
 
     async def get_transfers(
         self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
     ) -> Union[ApiResponse[List[TransferResponse]], ErrorResponse]:
         with self.otel_manager.start_trace("Get Transfers") as span:
             try:
                 logger.info("Retrieving all transfers")
-                transfers = await self.transfer_repository.find_all()
-                transfer_responses = TransferResponse.from_dtos(transfers)
+                transfers = await self.transfer_repository.find_all_rows(start_date, end_date)
+                transfer_responses = TransferResponse.from_rows(transfers)
 
-                logger.info(f"Successfully retrieved {len(transfers)} transfers")
+                logger.info("Successfully retrieved transfers", count=len(transfers))
                 span.set_attribute("transfer_count", len(transfers))
 
                 return ApiResponse(
@@ -83,16 +93,16 @@ class TransferService(ITransferService):
             span.set_attribute("transfer_id", id)
 
             try:
-                logger.info(f"Retrieving transfer with id {id}")
+                logger.info("Retrieving transfer", transfer_id=id)
                 transfer = await self.transfer_repository.find_by_id(id)
 
                 if transfer is None:
-                    logger.error(f"Transfer with id {id} not found")
+                    logger.error("Transfer not found", transfer_id=id)
                     span.set_attribute("error", "Transfer not found")
                     raise NotFoundError(f"Transfer with id {id} not found")
 
                 transfer_response = TransferResponse.from_dto(transfer)
-                logger.info(f"Successfully retrieved transfer with id {id}")
+                logger.info("Successfully retrieved transfer", transfer_id=id)
 
                 return ApiResponse(
                     status="success",
@@ -101,29 +111,34 @@ class TransferService(ITransferService):
                 )
             except Exception as e:
                 span.record_exception(e)
-                logger.error(f"Failed to retrieve transfer with id {id}", error=str(e))
+                logger.error("Failed to retrieve transfer", transfer_id=id, error=str(e))
                 return ErrorResponse(
                     status="error", message=f"Failed to retrieve transfer with id {id}"
                 )
 
     async def get_transfer_users(
-        self, id: int
+        self,
+        id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
     ) -> Union[ApiResponse[Optional[List[TransferResponse]]], ErrorResponse]:
         with self.otel_manager.start_trace("Get Transfer Users") as span:
             span.set_attribute("user_id", id)
             try:
-                logger.info(f"Retrieving transfers for user with id {id}")
+                logger.info("Retrieving transfers for user", user_id=id)
                 user = await self.user_repository.find_by_id(id)
                 if user is None:
-                    logger.error(f"User with id {id} not found")
+                    logger.error("User not found", user_id=id)
                     span.set_attribute("error", "User not found")
                     raise NotFoundError(f"User with id {id} not found")
 
-                transfers = await self.transfer_repository.find_by_users(id)
-                transfer_responses = TransferResponse.from_dtos(transfers)
+                transfers = await self.transfer_repository.find_by_users_rows(id, start_date, end_date)
+                transfer_responses = TransferResponse.from_rows(transfers)
 
                 logger.info(
-                    f"Successfully retrieved {len(transfer_responses) if transfer_responses else 0} transfers for user {id}"
+                    "Successfully retrieved transfers for user",
+                    user_id=id,
+                    count=len(transfer_responses) if transfer_responses else 0,
                 )
                 span.set_attribute(
                     "transfer_count",
@@ -138,7 +153,7 @@ class TransferService(ITransferService):
             except Exception as e:
                 span.record_exception(e)
                 logger.error(
-                    f"Failed to retrieve transfers for user {id}", error=str(e)
+                    "Failed to retrieve transfers for user", user_id=id, error=str(e)
                 )
                 return ErrorResponse(
                     status="error",
@@ -151,10 +166,10 @@ class TransferService(ITransferService):
         with self.otel_manager.start_trace("Get Transfer User") as span:
             span.set_attribute("user_id", id)
             try:
-                logger.info(f"Retrieving transfer for user with id {id}")
+                logger.info("Retrieving transfer for user", user_id=id)
                 user = await self.user_repository.find_by_id(id)
                 if user is None:
-                    logger.error(f"User with id {id} not found")
+                    logger.error("User not found", user_id=id)
                     span.set_attribute("error", "User not found")
                     raise NotFoundError(f"User with id {id} not found")
 
@@ -166,11 +181,9 @@ class TransferService(ITransferService):
                 )
 
                 if transfer_response is not None:
-                    logger.info(
-                        f"Successfully retrieved transfer for user with id {id}"
-                    )
+                    logger.info("Successfully retrieved transfer for user", user_id=id)
                 else:
-                    logger.info(f"No transfer found for user with id {id}")
+                    logger.info("No transfer found for user", user_id=id)
 
                 return ApiResponse(
                     status="success",
@@ -179,119 +192,127 @@ class TransferService(ITransferService):
                 )
             except Exception as e:
                 span.record_exception(e)
-                logger.error(f"Failed to retrieve transfer for user {id}", error=str(e))
+                logger.error("Failed to retrieve transfer for user", user_id=id, error=str(e))
                 return ErrorResponse(
                     status="error", message=f"Failed to retrieve transfer for user {id}"
                 )
 
+    async def get_stats(
+        self,
+        user_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Union[ApiResponse[List[DailySummaryResponse]], ErrorResponse]:
+        with self.otel_manager.start_trace("Get Transfer Stats") as span:
+            if user_id is not None:
+                span.set_attribute("user_id", user_id)
+            try:
+                logger.info("Retrieving transfer stats", user_id=user_id)
+                rows = await self.daily_summary_repository.find_daily(
+                    (TRANSFER_OUT, TRANSFER_IN), user_id, start_date, end_date
+                )
+                span.set_attribute("row_count", len(rows))
+
+                return ApiResponse(
+                    status="success",
+                    message="Transfer stats retrieved successfully",
+                    data=DailySummaryResponse.from_rows(rows),
+                )
+            except Exception as e:
+                span.record_exception(e)
+                logger.error("Failed to retrieve transfer stats", error=str(e))
+                return ErrorResponse(
+                    status="error", message="Failed to retrieve transfer stats"
+                )
+
     async def create_transfer(
         self, input: CreateTransferRequest
     ) -> Union[ApiResponse[TransferResponse], ErrorResponse]:
         with self.otel_manager.start_trace("Create Transfer") as span:
             span.set_attribute("transfer_from", input.transfer_from)
-            span.set_attribute("transfer_to", input.transfer_to)
             span.set_attribute("transfer_amount", input.transfer_amount)
 
-            producer = None
-
             try:
+                # Resolve a receiver addressed by noc_transfer
+                if input.transfer_to is None:
+                    receiver_id = await self.noc_resolver.resolve(
+                        input.transfer_to_noc, self.user_repository.find_id_by_noc_transfer
+                    )
+                    if receiver_id is None:
+                        logger.error("Receiver not found by noc_transfer")
+                        span.set_attribute("error", "Receiver not found")
+                        raise NotFoundError("User with the given noc_transfer not found")
+                    input = input.model_copy(update={"transfer_to": receiver_id})
+                span.set_attribute("transfer_to", input.transfer_to)
+
                 # Check sender user
                 sender = await self.user_repository.find_by_id(input.transfer_from)
                 if sender is None:
-                    logger.error(f"User with id {input.transfer_from} not found")
+                    logger.error("Sender not found", user_id=input.transfer_from)
                     span.set_attribute("error", "Sender not found")
                     raise NotFoundError(f"User with id {input.transfer_from} not found")
 
                 # Check receiver user
                 receiver = await self.user_repository.find_by_id(input.transfer_to)
                 if receiver is None:
-                    logger.error(f"User with id {input.transfer_to} not found")
+                    logger.error("Receiver not found", user_id=input.transfer_to)
                     span.set_attribute("error", "Receiver not found")
                     raise NotFoundError(f"User with id {input.transfer_to} not found")
 
-                # Create transfer record
-                transfer = await self.transfer_repository.create(input)
-
-                # Update sender balance
+                # Check sender balance before creating the transfer
                 sender_saldo = await self.saldo_repository.find_by_user_id(
                     input.transfer_from
                 )
                 if sender_saldo is None:
-                    logger.error(f"Saldo with User id {input.transfer_from} not found")
+                    logger.error("Sender saldo not found", user_id=input.transfer_from)
                     span.set_attribute("error", "Sender saldo not found")
                     raise NotFoundError(
                         f"Saldo with User id {input.transfer_from} not found"
                     )
 
-                sender_balance = sender_saldo.total_balance - input.transfer_amount
-                request_sender_balance = UpdateSaldoBalanceRequest(
-                    user_id=input.transfer_from,
-                    total_balance=sender_balance,
-                )
+                if sender_saldo.total_balance < input.transfer_amount:
+                    logger.error("Insufficient balance for sender")
+                    span.set_attribute("error", "Insufficient balance")
+                    raise ValidationError("Insufficient balance for sender")
 
-                # Rollback transfer if updating sender's balance fails
+                # Create transfer record; both balances move in the same
+                # transaction through the ledger
                 try:
-                    await self.saldo_repository.update_balance(request_sender_balance)
+                    transfer = await self.transfer_repository.create(input)
                 except Exception as db_err:
-                    logger.error(f"Failed to update saldo balance for sender: {db_err}")
+                    logger.error("Failed to create transfer", error=str(db_err))
                     span.record_exception(db_err)
-                    await self.transfer_repository.delete(transfer.transfer_id)
                     return ErrorResponse(
                         status="error",
-                        message="Failed to update saldo balance for sender",
+                        message="Failed to create transfer",
                     )
 
-                # Update receiver balance
-                receiver_saldo = await self.saldo_repository.find_by_user_id(
-                    input.transfer_to
-                )
-                if receiver_saldo is None:
-                    logger.error(f"Saldo with User id {input.transfer_to} not found")
-                    span.set_attribute("error", "Receiver saldo not found")
-                    raise NotFoundError(
-                        f"Saldo with User id {input.transfer_to} not found"
-                    )
-
-                receiver_balance = receiver_saldo.total_balance + input.transfer_amount
-                request_receiver_balance = UpdateSaldoBalanceRequest(
-                    user_id=input.transfer_to,
-                    total_balance=receiver_balance,
-                )
-
-                # Rollback transfer if updating receiver's balance fails
-                try:
-                    await self.saldo_repository.update_balance(request_receiver_balance)
-                except Exception as db_err:
-                    logger.error(
-                        f"Failed to update saldo balance for receiver: {db_err}"
-                    )
-                    span.record_exception(db_err)
-                    await self.transfer_repository.delete(transfer.transfer_id)
-                    return ErrorResponse(
-                        status="error",
-                        message="Failed to update saldo balance for receiver",
-                    )
+                sender_balance = (
+                    await self.saldo_repository.find_by_user_id(input.transfer_from)
+                ).total_balance
+                receiver_balance = (
+                    await self.saldo_repository.find_by_user_id(input.transfer_to)
+                ).total_balance
 
                 # Send Kafka message for email notification
-                producer = await self.kafka_manager.get_producer()
-                email_message = {
-                    "sender_email": sender.email,
-                    "receiver_email": receiver.email,
-                    "subject": "Transfer Successful",
-                    "body": (
-                        f"Hi {sender.firstname} {sender.lastname}, you have successfully transferred {input.transfer_amount} to {receiver.firstname} {receiver.lastname}. "
-                        f"Your new balance is {sender_balance}. \n\n"
-                        f"Hi {receiver.firstname} {receiver.lastname}, you have received {input.transfer_amount} from {sender.firstname} {sender.lastname}. "
-                        f"Your new balance is {receiver_balance}."
-                    ),
-                }
-                await producer.send(
-                    topic="email-service-topic-transfer",
-                    value=json.dumps(email_message).encode("utf-8"),
+                producer = await self.kafka_manager.producer()
+                event = TransferCreated(
+                    transfer_id=transfer.transfer_id,
+                    amount=input.transfer_amount,
+                    sender_id=sender.user_id,
+                    sender_email=sender.email,
+                    sender_name=f"{sender.firstname} {sender.lastname}",
+                    sender_balance=sender_balance,
+                    receiver_id=receiver.user_id,
+                    receiver_email=receiver.email,
+                    receiver_name=f"{receiver.firstname} {receiver.lastname}",
+                    receiver_balance=receiver_balance,
                 )
-                await producer.stop()
+                await publish(producer, event)
                 logger.info(
-                    f"Email notification sent to Kafka for transfer from {input.transfer_from} to {input.transfer_to}."
+                    "Email notification sent to Kafka",
+                    transfer_from=input.transfer_from,
+                    transfer_to=input.transfer_to,
                 )
 
                 return ApiResponse(
@@ -302,18 +323,15 @@ class TransferService(ITransferService):
 
             except NotFoundError as e:
                 span.record_exception(e)
-                logger.error(f"Not found: {e}")
+                logger.error("Not found", error=str(e))
                 return ErrorResponse(status="error", message=str(e))
 
             except Exception as e:
                 span.record_exception(e)
-                logger.error(f"Failed to create transfer: {e}")
+                logger.error("Failed to create transfer", error=str(e))
                 return ErrorResponse(
                     status="error", message="Failed to create transfer"
                 )
-            finally:
-                if producer:
-                    await producer.stop()
 
     async def update_transfer(
         self, input: UpdateTransferRequest
@@ -326,7 +344,7 @@ class TransferService(ITransferService):
                 # Retrieve the existing transfer
                 transfer = await self.transfer_repository.find_by_id(input.transfer_id)
                 if not transfer:
-                    logger.error(f"Transfer with id {input.transfer_id} not found")
+                    logger.error("Transfer not found", transfer_id=input.transfer_id)
                     span.set_attribute("error", "Transfer not found")
                     raise NotFoundError(
                         f"Transfer with id {input.transfer_id} not found"
@@ -334,86 +352,10 @@ class TransferService(ITransferService):
 
                 # Calculate the difference in transfer amount
                 amount_difference = input.transfer_amount - transfer.transfer_amount
+                span.set_attribute("amount_difference", amount_difference)
 
-                # Update sender's saldo
-                sender_saldo = await self.saldo_repository.find_by_user_id(
-                    transfer.transfer_from
-                )
-                if not sender_saldo:
-                    logger.error(
-                        f"Saldo with User id {transfer.transfer_from} not found"
-                    )
-                    span.set_attribute("error", "Sender saldo not found")
-                    raise NotFoundError(
-                        f"Saldo with User id {transfer.transfer_from} not found"
-                    )
-
-                new_sender_balance = sender_saldo.total_balance - amount_difference
-
-                if new_sender_balance < 0:
-                    logger.error("Insufficient balance for sender")
-                    span.set_attribute("error", "Insufficient balance")
-                    raise ValidationError("Insufficient balance for sender")
-
-                update_sender_balance = UpdateSaldoBalanceRequest(
-                    user_id=transfer.transfer_from,
-                    total_balance=new_sender_balance,
-                )
-
-                # Update the sender's balance in the repository
-                try:
-                    await self.saldo_repository.update_balance(update_sender_balance)
-                except Exception as db_err:
-                    logger.error(f"Failed to update sender's saldo: {db_err}")
-                    span.record_exception(db_err)
-                    return ErrorResponse(
-                        status="error", message=f"Failed to update sender's saldo"
-                    )
-
-                # Update receiver's saldo
-                receiver_saldo = await self.saldo_repository.find_by_user_id(
-                    transfer.transfer_to
-                )
-                if not receiver_saldo:
-                    logger.error(f"Saldo with User id {transfer.transfer_to} not found")
-                    span.set_attribute("error", "Receiver saldo not found")
-                    raise NotFoundError(
-                        f"Saldo with User id {transfer.transfer_to} not found"
-                    )
-
-                new_receiver_balance = receiver_saldo.total_balance + amount_difference
-
-                update_receiver_balance = UpdateSaldoBalanceRequest(
-                    user_id=transfer.transfer_to,
-                    total_balance=new_receiver_balance,
-                )
-
-                # Update the receiver's balance in the repository
-                try:
-                    await self.saldo_repository.update_balance(update_receiver_balance)
-                except Exception as db_err:
-                    logger.error(f"Failed to update receiver's saldo: {db_err}")
-                    span.record_exception(db_err)
-
-                    # Rollback sender's saldo update if receiver's update fails
-                    rollback_sender_balance = UpdateSaldoBalanceRequest(
-                        user_id=transfer.transfer_from,
-                        total_balance=sender_saldo.total_balance,
-                    )
-
-                    try:
-                        await self.saldo_repository.update_balance(
-                            rollback_sender_balance
-                        )
-                    except Exception as rollback_err:
-                        logger.error(
-                            f"Failed to rollback sender's saldo update: {rollback_err}"
-                        )
-                        span.record_exception(rollback_err)
-
-                    return ErrorResponse(f"Failed to rollback sender's saldo update")
-
-                # Update the transfer record
+                # Update the transfer record; the ledger reverses the old
+                # movement and posts the new one in the same transaction
                 updated_transfer = await self.transfer_repository.update(input)
                 return ApiResponse(
                     status="success",
@@ -422,7 +364,7 @@ class TransferService(ITransferService):
                 )
 
             except Exception as e:
-                logger.error(f"Failed to update transfer: {e}")
+                logger.error("Failed to update transfer", error=str(e))
                 span.record_exception(e)
                 return ErrorResponse(
                     status="error", message="Failed to update transfer"
@@ -436,7 +378,7 @@ class TransferService(ITransferService):
                 # Retrieve the user
                 user = await self.user_repository.find_by_id(id)
                 if not user:
-                    logger.error(f"User with id {id} not found")
+                    logger.error("User not found", user_id=id)
                     span.set_attribute("error", "User not found")
                     raise NotFoundError(f"User with id {id} not found")
 
@@ -450,7 +392,7 @@ class TransferService(ITransferService):
                         await self.transfer_repository.delete(
                             existing_transfer.transfer_id
                         )
-                        logger.info(f"Transfer deleted successfully for id: {id}")
+                        logger.info("Transfer deleted successfully", user_id=id)
                         span.set_attribute("transfer_id", existing_transfer.transfer_id)
 
                         return ApiResponse(
@@ -460,7 +402,7 @@ class TransferService(ITransferService):
                         )
                     except Exception as db_err:
                         logger.error(
-                            f"Failed to delete transfer for user id {id}: {db_err}"
+                            "Failed to delete transfer for user", user_id=id, error=str(db_err)
                         )
                         span.record_exception(db_err)
                         span.set_attribute("error", "Failed to delete transfer")
@@ -469,12 +411,12 @@ class TransferService(ITransferService):
                             message=f"Failed to delete transfer for user id {id}",
                         )
                 else:
-                    logger.error(f"Transfer with user id {id} not found")
+                    logger.error("Transfer not found for user", user_id=id)
                     span.set_attribute("error", "Transfer not found")
                     raise NotFoundError(f"Transfer with user id {id} not found")
 
             except Exception as e:
-                logger.error(f"Failed to delete transfer: {e}")
+                logger.error("Failed to delete transfer", error=str(e))
                 span.record_exception(e)
                 return ErrorResponse(
                     status="error", message="Failed to delete transfer"
@@ -7,6 +7,7 @@ from domain.service.user import IUserService
 from domain.dtos.response.user import UserResponse
 from infrastructure.service.user import UserService
 from lib.security.header import token_security
+from lib.http.response import ORJSONResponse
 from infrastructure.di import get_user_service
 
 # Prometheus metrics for user service
@@ -30,7 +31,7 @@ async def get_users(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=500, detail="Failed to retrieve users")
-            return response
+            return ORJSONResponse(response)
     except Exception:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(
@@ -54,7 +55,7 @@ async def get_user_by_id(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=404, detail="User not found")
-            return response
+            return ORJSONResponse(response)
     except Exception:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(
@@ -78,7 +79,7 @@ async def create_user(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=400, detail="Failed to create user")
-            return response
+            return ORJSONResponse(response)
     except Exception:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(
@@ -104,7 +105,7 @@ async def update_user(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=400, detail="Failed to update user")
-            return response
+            return ORJSONResponse(response)
     except Exception:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(
@@ -128,7 +129,7 @@ async def delete_user(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=404, detail="User not found")
-            return response
+            return ORJSONResponse(response)
     except Exception:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(
@@ -11,7 +11,8 @@ class IUserRepository(abc.ABC):
     @abc.abstractmethod
     async def create_user(self, user: CreateUserRequest) -> UserRecordDTO:
         """
-        Add a new user record to the repository.
+        Add a new user record to the repository. Raises
+        EmailAlreadyExistsError if the email is already registered.
         """
         pass
 
@@ -15,10 +15,13 @@ from domain.dtos.response.api import (
     ApiResponse,
     ErrorResponse,
 )
-from lib.utils.errors import AppError, ValidationError
+from lib.utils.errors import AppError, EmailAlreadyExistsError, ValidationError
 from domain.dtos.response.user import UserResponse
-from lib.utils.random_vcc import random_vcc
+from lib.utils.account_number import AccountNumberAllocator
 
+from lib.events.codec import publish
+from lib.events.events import UserChanged
+from lib.kafka.kafka_config import KafkaManager
 from lib.otel.otel_config import OpenTelemetryManager
 
 logger = get_logger()
@@ -28,11 +31,30 @@ class UserService(IUserService):
         self,
         repository: IUserRepository,
         hashing: Hashing,
+        kafka_manager: KafkaManager,
         otel_manager: OpenTelemetryManager,
+        account_numbers: AccountNumberAllocator,
     ) -> None:
         self.repository = repository
         self.hashing = hashing
+        self.kafka_manager = kafka_manager
         self.otel_manager = otel_manager
+        self.account_numbers = account_numbers
+
+    async def publish_change(self, user_id: int, noc_transfer: str, email: str, deleted: bool) -> None:
+        """
+        Tell the services caching users by noc_transfer or by email to drop
+        this one. The change itself is already committed, so a failure is
+        only logged: the caches then catch up when their entries expire.
+        """
+        try:
+            producer = await self.kafka_manager.producer()
+            await publish(
+                producer,
+                UserChanged(user_id=user_id, noc_transfer=noc_transfer, deleted=deleted, email=email),
+            )
+        except Exception as e:
+            logger.error("Failed to publish user change", user_id=user_id, error=str(e))
 
     async def get_users(self) -> Union[ApiResponse[List[UserResponse]], ErrorResponse]:
         with self.otel_manager.start_trace("Get Users") as span:
@@ -85,6 +107,8 @@ class UserService(IUserService):
         with self.otel_manager.start_trace("Create User") as span:
             span.set_attribute("email", input.email)
             try:
+                # Spares the password hashing for a taken email; the insert
+                # still checks, as another request may take it meanwhile.
                 exists = await self.repository.find_by_email_exists(email=input.email)
                 if exists:
                     logger.error("Email already exists", email=input.email)
@@ -100,16 +124,27 @@ class UserService(IUserService):
 
                 hashed_password = await self.hashing.hash_password(input.password)
                 input.password = hashed_password
-                input.noc_transfer = random_vcc()
-
-                user = await self.repository.create_user(user=input)
+                input.noc_transfer = await self.account_numbers.allocate()
 
+                try:
+                    user = await self.repository.create_user(user=input)
+                except EmailAlreadyExistsError:
+                    self.account_numbers.release(input.noc_transfer)
+                    raise
+                await self.publish_change(user.user_id, user.noc_transfer, user.email, deleted=False)
 
                 return ApiResponse(
                     status="success",
                     message="User created successfully.",
                     data=UserResponse.from_dto(user),
                 )
+            except EmailAlreadyExistsError:
+                logger.error("Email already exists", email=input.email)
+                span.set_attribute("error", "Email already exists")
+                return ErrorResponse(
+                    status="error",
+                    message="Email already exists.",
+                )
             except Exception as e:
                 logger.error("Error creating user", error=str(e))
                 span.record_exception(e)
@@ -137,6 +172,9 @@ class UserService(IUserService):
                 input.password = hashed_password
 
                 updated_user = await self.repository.update_user(user=input)
+                await self.publish_change(
+                    user.user_id, user.noc_transfer, updated_user.email, deleted=False
+                )
                 return ApiResponse(
                     status="success",
                     message="User updated successfully.",
@@ -163,6 +201,7 @@ class UserService(IUserService):
                     )
 
                 await self.repository.delete_user(user_id=id)
+                await self.publish_change(user.user_id, user.noc_transfer, user.email, deleted=True)
                 return ApiResponse(
                     status="success",
                     message="User deleted successfully.",
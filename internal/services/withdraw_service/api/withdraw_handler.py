@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from datetime import date, datetime
 from typing import Union, List, Optional
 from prometheus_client import Counter, Histogram
 
@@ -6,8 +7,10 @@ from domain.dtos.request.withdraw import CreateWithdrawRequest, UpdateWithdrawRe
 from domain.dtos.response.api import ApiResponse, ErrorResponse
 from domain.service.withdraw import IWithdrawService
 from domain.dtos.response.withdraw import WithdrawResponse
+from domain.dtos.response.daily_summary import DailySummaryResponse
 from infrastructure.service.withdraw import WithdrawResponse
 from lib.security.header import token_security
+from lib.http.response import ORJSONResponse
 from infrastructure.di import get_withdraw_service
 
 # Prometheus metrics
@@ -18,6 +21,8 @@ router = APIRouter()
 
 @router.get("", response_model=ApiResponse[List[WithdrawResponse]])
 async def get_withdraws(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     withdraw_service: IWithdrawService = Depends(get_withdraw_service),
     token: str = Depends(token_security),
 ):
@@ -26,16 +31,40 @@ async def get_withdraws(
     endpoint = '/'
     try:
         with REQUEST_DURATION.labels(method, endpoint).time():
-            response = await withdraw_service.get_withdraws()
+            response = await withdraw_service.get_withdraws(start_date, end_date)
             status = 'success' if not isinstance(response, ErrorResponse) else 'error'
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=500, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
+@router.get("/stats", response_model=ApiResponse[List[DailySummaryResponse]])
+async def get_withdraw_stats(
+    user_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    withdraw_service: IWithdrawService = Depends(get_withdraw_service),
+    token: str = Depends(token_security),
+):
+    """Retrieve daily withdrawal count, sum, min and max from the rollup table."""
+    method = 'GET'
+    endpoint = '/stats'
+    try:
+        with REQUEST_DURATION.labels(method, endpoint).time():
+            response = await withdraw_service.get_stats(user_id, start_date, end_date)
+            status = 'success' if not isinstance(response, ErrorResponse) else 'error'
+            REQUEST_COUNT.labels(method, endpoint, status).inc()
+            if status == 'error':
+                raise HTTPException(status_code=500, detail=response.message)
+            return ORJSONResponse(response)
+    except Exception as e:
+        REQUEST_COUNT.labels(method, endpoint, 'error').inc()
+        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+
+
 @router.get("/{id}", response_model=ApiResponse[Optional[WithdrawResponse]])
 async def get_withdraw(
     id: int,
@@ -52,7 +81,7 @@ async def get_withdraw(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=404, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -73,7 +102,7 @@ async def get_withdraw_user(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=404, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -83,6 +112,8 @@ async def get_withdraw_user(
 )
 async def get_withdraw_users(
     user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     withdraw_service: IWithdrawService = Depends(get_withdraw_service),
     token: str = Depends(token_security),
 ):
@@ -91,12 +122,12 @@ async def get_withdraw_users(
     endpoint = f'/users/{user_id}'
     try:
         with REQUEST_DURATION.labels(method, endpoint).time():
-            response = await withdraw_service.get_withdraw_users(user_id)
+            response = await withdraw_service.get_withdraw_users(user_id, start_date, end_date)
             status = 'success' if not isinstance(response, ErrorResponse) else 'error'
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=404, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -117,7 +148,7 @@ async def create_withdraw(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=400, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -140,7 +171,7 @@ async def update_withdraw(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=400, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -161,7 +192,7 @@ async def delete_withdraw(
             REQUEST_COUNT.labels(method, endpoint, status).inc()
             if status == 'error':
                 raise HTTPException(status_code=404, detail=response.message)
-            return response
+            return ORJSONResponse(response)
     except Exception as e:
         REQUEST_COUNT.labels(method, endpoint, 'error').inc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import Any, Iterable, List, Sequence
 from datetime import datetime
 from domain.dtos.record.withdraw import WithdrawRecordDTO
 
@@ -26,4 +26,15 @@ class WithdrawResponse(BaseModel):
         """
         Converts a list of WithdrawRecordDTO to a list of WithdrawResponse.
         """
-        return [WithdrawResponse.from_dto(dto) for dto in dtos]
\ No newline at end of file
+        return [WithdrawResponse.from_dto(dto) for dto in dtos]
+
+    @staticmethod
+    def from_rows(rows: Iterable[Sequence[Any]]) -> List[dict]:
+        """
+        Converts rows selected in WITHDRAW_RESPONSE_FIELDS order straight into
+        response dicts, skipping the per-row record DTO and response model.
+        """
+        return [dict(zip(WITHDRAW_RESPONSE_FIELDS, row)) for row in rows]
+
+
+WITHDRAW_RESPONSE_FIELDS = tuple(WithdrawResponse.model_fields)
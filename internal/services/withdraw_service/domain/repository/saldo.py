@@ -1,12 +1,12 @@
 import abc
-from typing import List, Optional, Any
+from typing import Optional
 from domain.dtos.record.saldo import SaldoRecordDTO
-from domain.dtos.request.saldo import CreateSaldoRequest, UpdateSaldoBalanceRequest, UpdateSaldoWithdraw
 
 
 class ISaldoRepository(abc.ABC):
     """
-    Saldo Repository interface defining operations for saldo management.
+    Saldo Repository interface. Balances are read-only here: they change only
+    through the ledger postings made by the movement repositories.
     """
 
     @abc.abstractmethod
@@ -15,21 +15,3 @@ class ISaldoRepository(abc.ABC):
         Find a single saldo record associated with a given user ID.
         """
         pass
-
-    @abc.abstractmethod
-    async def create(self, input: CreateSaldoRequest) -> SaldoRecordDTO:
-        """
-        Create a new saldo record from the given input.
-        """
-        pass
-
-    @abc.abstractmethod
-    async def update_balance(self, input: UpdateSaldoBalanceRequest) -> SaldoRecordDTO:
-        """
-        Update the balance of an existing saldo record.
-        """
-        pass
-
-    @abc.abstractmethod
-    async def update_saldo_withdraw(self, input: UpdateSaldoWithdraw) -> Optional[SaldoRecordDTO]:
-        pass
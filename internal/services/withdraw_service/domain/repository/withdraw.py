@@ -1,5 +1,6 @@
 import abc
-from typing import List, Optional, Any
+from datetime import datetime
+from typing import List, Optional, Any, Tuple
 from domain.dtos.record.withdraw import WithdrawRecordDTO
 from domain.dtos.request.withdraw import (
     CreateWithdrawRequest,
@@ -19,6 +20,18 @@ class IWithdrawRepository(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    async def find_all_rows(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Retrieve all withdrawal records as plain row tuples in WITHDRAW_RESPONSE_FIELDS order,
+        optionally limited to those created in [start_date, end_date).
+        """
+        pass
+
     @abc.abstractmethod
     async def find_by_id(self, id: int) -> Optional[WithdrawRecordDTO]:
         """
@@ -33,6 +46,20 @@ class IWithdrawRepository(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    async def find_by_users_rows(
+        self,
+        user_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Find all withdrawal records associated with a given user ID as plain row tuples in
+        WITHDRAW_RESPONSE_FIELDS order, optionally limited to those created in
+        [start_date, end_date).
+        """
+        pass
+
     @abc.abstractmethod
     async def find_by_user(self, user_id: int) -> Optional[WithdrawRecordDTO]:
         """
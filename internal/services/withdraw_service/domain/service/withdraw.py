@@ -1,7 +1,9 @@
 import abc
+from datetime import date, datetime
 from typing import List, Optional, Any, Union
 from domain.dtos.response.api import ApiResponse, ErrorResponse
 from domain.dtos.response.withdraw import WithdrawResponse
+from domain.dtos.response.daily_summary import DailySummaryResponse
 from domain.dtos.request.withdraw import CreateWithdrawRequest, UpdateWithdrawRequest
 
 
@@ -11,7 +13,9 @@ class IWithdrawService(abc.ABC):
     """
 
     @abc.abstractmethod
-    async def get_withdraws(self) -> Union[ApiResponse[List[WithdrawResponse]], ErrorResponse]:
+    async def get_withdraws(
+        self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+    ) -> Union[ApiResponse[List[WithdrawResponse]], ErrorResponse]:
         """
         Retrieve a list of all withdrawal records.
         """
@@ -25,7 +29,9 @@ class IWithdrawService(abc.ABC):
         pass
 
     @abc.abstractmethod
-    async def get_withdraw_users(self, user_id: int) -> Union[ApiResponse[Optional[List[WithdrawResponse]]], ErrorResponse]:
+    async def get_withdraw_users(
+        self, user_id: int, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+    ) -> Union[ApiResponse[Optional[List[WithdrawResponse]]], ErrorResponse]:
         """
         Retrieve all withdrawal records associated with a specific user ID.
         """
@@ -38,6 +44,19 @@ class IWithdrawService(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    async def get_stats(
+        self,
+        user_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Union[ApiResponse[List[DailySummaryResponse]], ErrorResponse]:
+        """
+        Retrieve daily withdrawal count, sum, min and max from the rollup table, for one
+        user or over all users.
+        """
+        pass
+
     @abc.abstractmethod
     async def create_withdraw(self, input: CreateWithdrawRequest) -> Union[ApiResponse[WithdrawResponse], ErrorResponse]:
         """
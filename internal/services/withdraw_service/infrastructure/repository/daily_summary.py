@@ -0,0 +1,61 @@
+from sqlalchemy import BigInteger, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from datetime import date
+from typing import Any, List, Optional, Sequence, Tuple
+
+from domain.repository.daily_summary import IDailySummaryRepository
+
+from lib.model.summary import DailyTransactionSummary
+
+
+class DailySummaryRepository(IDailySummaryRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def find_daily(
+        self,
+        transaction_types: Sequence[str],
+        user_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Daily rollups of the given transaction types in [start_date, end_date) as
+        row tuples in DAILY_SUMMARY_RESPONSE_FIELDS order, for one user or summed
+        over all users.
+        """
+        summary = DailyTransactionSummary
+        conditions = [summary.transaction_type.in_(transaction_types)]
+        if start_date is not None:
+            conditions.append(summary.day >= start_date)
+        if end_date is not None:
+            conditions.append(summary.day < end_date)
+
+        if user_id is not None:
+            stmt = select(
+                summary.day,
+                summary.transaction_type,
+                summary.transaction_count,
+                summary.total_amount,
+                summary.min_amount,
+                summary.max_amount,
+            ).where(summary.user_id == user_id, *conditions)
+        else:
+            stmt = (
+                select(
+                    summary.day,
+                    summary.transaction_type,
+                    cast(func.sum(summary.transaction_count), BigInteger),
+                    cast(func.sum(summary.total_amount), BigInteger),
+                    func.min(summary.min_amount),
+                    func.max(summary.max_amount),
+                )
+                .where(*conditions)
+                .group_by(summary.day, summary.transaction_type)
+            )
+
+        result = await self.session.execute(
+            stmt.order_by(summary.day, summary.transaction_type)
+        )
+        return result.tuples().all()
@@ -3,17 +3,32 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlalchemy.future import select
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 
 from domain.dtos.request.withdraw import CreateWithdrawRequest, UpdateWithdrawRequest
 from domain.dtos.record.withdraw import WithdrawRecordDTO
 from domain.repository.withdraw import IWithdrawRepository
+from domain.dtos.response.withdraw import WITHDRAW_RESPONSE_FIELDS
+from lib.ledger.ledger import LedgerManager, reverse, withdraw_legs
+from lib.partition.partition import created_between
+from lib.summary.daily_summary import WITHDRAW, DailySummaryManager
+from lib.model.saldo import Saldo
 from lib.model.withdraw import Withdraw
 
 
+# Columns backing WithdrawResponse, for read paths that skip ORM hydration.
+WITHDRAW_RESPONSE_COLUMNS = tuple(
+    getattr(Withdraw, field) for field in WITHDRAW_RESPONSE_FIELDS
+)
+
+
 class WithdrawRepository(IWithdrawRepository):
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self, session: AsyncSession, ledger: LedgerManager, summary: DailySummaryManager
+    ):
         self.session = session
+        self.ledger = ledger
+        self.summary = summary
 
     async def find_all(self) -> List[WithdrawRecordDTO]:
         """
@@ -23,6 +38,22 @@ class WithdrawRepository(IWithdrawRepository):
         withdrawals = result.scalars().all()
         return [WithdrawRecordDTO.from_orm(withdrawal) for withdrawal in withdrawals]
 
+    async def find_all_rows(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Retrieve all withdrawal records as plain row tuples in WITHDRAW_RESPONSE_FIELDS order,
+        optionally limited to those created in [start_date, end_date).
+        """
+        result = await self.session.execute(
+            select(*WITHDRAW_RESPONSE_COLUMNS).filter(
+                *created_between(Withdraw.created_at, start_date, end_date)
+            )
+        )
+        return result.tuples().all()
+
     async def find_by_id(self, id: int) -> Optional[WithdrawRecordDTO]:
         """
         Find a withdrawal record by its ID.
@@ -43,6 +74,25 @@ class WithdrawRepository(IWithdrawRepository):
         withdraws = result.scalars().all()
         return [WithdrawRecordDTO.from_orm(withdraw) for withdraw in withdraws]
 
+    async def find_by_users_rows(
+        self,
+        user_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Find all withdrawal records associated with a given user ID as plain row tuples in
+        WITHDRAW_RESPONSE_FIELDS order, optionally limited to those created in
+        [start_date, end_date).
+        """
+        result = await self.session.execute(
+            select(*WITHDRAW_RESPONSE_COLUMNS).filter(
+                Withdraw.user_id == user_id,
+                *created_between(Withdraw.created_at, start_date, end_date),
+            )
+        )
+        return result.tuples().all()
+
     async def find_by_user(self, user_id: int) -> Optional[WithdrawRecordDTO]:
         """
         Find a single withdrawal record associated with a given user ID.
@@ -71,6 +121,21 @@ class WithdrawRepository(IWithdrawRepository):
             updated_at=updated_at,
         )
         self.session.add(new_withdrawal)
+        try:
+            await self.session.flush()
+            await self.ledger.post(
+                self.session,
+                "withdraw",
+                new_withdrawal.withdraw_id,
+                withdraw_legs(input.user_id, input.withdraw_amount),
+            )
+            await self._record_on_saldo(input.user_id, input.withdraw_amount, withdraw_time)
+            await self.summary.add(
+                self.session, WITHDRAW, input.user_id, created_at, input.withdraw_amount
+            )
+        except Exception:
+            await self.session.rollback()
+            raise
         await self.session.commit()
         await self.session.refresh(new_withdrawal)
         return WithdrawRecordDTO.from_orm(new_withdrawal)
@@ -81,30 +146,87 @@ class WithdrawRepository(IWithdrawRepository):
         """
         withdraw_time = input.withdraw_time.replace(tzinfo=None) if input.withdraw_time.tzinfo else input.withdraw_time
 
-        result = await self.session.execute(
-            update(Withdraw)
-            .where(Withdraw.withdraw_id == input.withdraw_id)
-            .values(
-                user_id=input.user_id,
-                withdraw_amount=input.withdraw_amount,
-                withdraw_time=withdraw_time,
-                updated_at=datetime.utcnow(),
-            )
-            .returning(Withdraw)
-        )
-        updated_withdrawal = result.scalars().first()
-        if updated_withdrawal:
-            await self.session.commit()
-            await self.session.refresh(updated_withdrawal)
-            return WithdrawRecordDTO.from_orm(updated_withdrawal)
-        else:
+        previous = await self._lock(input.withdraw_id)
+        if previous is None:
+            await self.session.rollback()
             raise ValueError("Withdrawal record not found")
 
+        try:
+            result = await self.session.execute(
+                update(Withdraw)
+                .where(Withdraw.withdraw_id == input.withdraw_id)
+                .values(
+                    user_id=input.user_id,
+                    withdraw_amount=input.withdraw_amount,
+                    withdraw_time=withdraw_time,
+                    updated_at=datetime.utcnow(),
+                )
+                .returning(Withdraw)
+            )
+            updated_withdrawal = result.scalars().first()
+            await self.ledger.post(
+                self.session,
+                "withdraw",
+                input.withdraw_id,
+                reverse(withdraw_legs(previous.user_id, previous.withdraw_amount))
+                + withdraw_legs(input.user_id, input.withdraw_amount),
+            )
+            await self._record_on_saldo(input.user_id, input.withdraw_amount, withdraw_time)
+            await self.summary.refresh(
+                self.session, WITHDRAW, (previous.user_id, input.user_id), previous.created_at
+            )
+        except Exception:
+            await self.session.rollback()
+            raise
+        await self.session.commit()
+        await self.session.refresh(updated_withdrawal)
+        return WithdrawRecordDTO.from_orm(updated_withdrawal)
+
     async def delete(self, id: int) -> None:
         """
-        Delete a withdrawal record by its ID.
+        Delete a withdrawal record by its ID, reversing its ledger entries.
         """
-        result = await self.session.execute(delete(Withdraw).where(Withdraw.withdraw_id == id))
-        if result.rowcount == 0:
+        previous = await self._lock(id)
+        if previous is None:
+            await self.session.rollback()
             raise ValueError("Withdrawal record not found")
+
+        try:
+            await self.ledger.post(
+                self.session,
+                "withdraw",
+                id,
+                reverse(withdraw_legs(previous.user_id, previous.withdraw_amount)),
+            )
+            await self.session.execute(delete(Withdraw).where(Withdraw.withdraw_id == id))
+            await self.summary.refresh(
+                self.session, WITHDRAW, (previous.user_id,), previous.created_at
+            )
+        except Exception:
+            await self.session.rollback()
+            raise
         await self.session.commit()
+
+    async def _lock(self, id: int):
+        """
+        Lock a withdrawal row for the rest of the transaction and return the
+        values its ledger entries and daily summary were posted with.
+        """
+        result = await self.session.execute(
+            select(Withdraw.user_id, Withdraw.withdraw_amount, Withdraw.created_at)
+            .where(Withdraw.withdraw_id == id)
+            .with_for_update()
+        )
+        return result.first()
+
+    async def _record_on_saldo(
+        self, user_id: int, withdraw_amount: int, withdraw_time: datetime
+    ) -> None:
+        """
+        Keep the last withdrawal shown on the saldo row in step with the ledger.
+        """
+        await self.session.execute(
+            update(Saldo)
+            .where(Saldo.user_id == user_id)
+            .values(withdraw_amount=withdraw_amount, withdraw_time=withdraw_time)
+        )
@@ -1,7 +1,7 @@
 from typing import List, Optional, Union
 from sqlalchemy.ext.asyncio import AsyncSession
 from structlog import get_logger
-from datetime import datetime
+from datetime import date, datetime
 from domain.repository.user import IUserRepository
 
 from domain.repository.withdraw import (
@@ -10,8 +10,8 @@ from domain.repository.withdraw import (
 from domain.service.withdraw import IWithdrawService
 
 from domain.repository.saldo import ISaldoRepository
+from domain.repository.daily_summary import IDailySummaryRepository
 
-from domain.dtos.request.saldo import UpdateSaldoWithdraw, UpdateSaldoBalanceRequest
 from domain.dtos.request.withdraw import (
     CreateWithdrawRequest,
     UpdateWithdrawRequest,
@@ -27,6 +27,8 @@ from domain.dtos.response.withdraw import (
     WithdrawResponse,
 )
 
+from domain.dtos.response.daily_summary import DailySummaryResponse
+from lib.summary.daily_summary import WITHDRAW
 from lib.kafka.kafka_config import KafkaManager
 from lib.otel.otel_config import OpenTelemetryManager
 
@@ -40,37 +42,39 @@ class WithdrawService(IWithdrawService):
         withdraw_repository: IWithdrawRepository,
         user_repository: IUserRepository,
         saldo_repository: ISaldoRepository,
+        daily_summary_repository: IDailySummaryRepository,
         kafka_manager: KafkaManager,
         otel_manager: OpenTelemetryManager,
     ):
         self.user_repository = user_repository
         self.saldo_repository = saldo_repository
+        self.daily_summary_repository = daily_summary_repository
         self.withdraw_repository = withdraw_repository
         self.kafka_manager = kafka_manager
         self.otel_manager = otel_manager
 
     async def get_withdraws(
         self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
     ) -> Union[ApiResponse[List[WithdrawResponse]], ErrorResponse]:
         """
         Retrieve all withdrawal records.
         """
         with self.otel_manager.start_trace("Get Withdraws") as span:
             try:
-                withdraws = await self.withdraw_repository.find_all()
-                withdraw_responses = WithdrawResponse.from_dtos(withdraws)
+                withdraws = await self.withdraw_repository.find_all_rows(start_date, end_date)
+                withdraw_responses = WithdrawResponse.from_rows(withdraws)
 
                 span.set_attribute("total_withdrawals", len(withdraw_responses))
-                logger.info(
-                    f"Successfully fetched {len(withdraw_responses)} withdrawals."
-                )
+                logger.info("Successfully fetched withdrawals", count=len(withdraw_responses))
                 return ApiResponse(
                     status="success",
                     message="Withdrawals retrieved successfully.",
                     data=withdraw_responses,
                 )
             except Exception as e:
-                logger.error(f"Failed to fetch withdrawals: {str(e)}")
+                logger.error("Failed to fetch withdrawals", error=str(e))
                 span.record_exception(e)
                 span.set_attribute("error", "An unexpected error occurred.")
                 return ErrorResponse(
@@ -88,7 +92,7 @@ class WithdrawService(IWithdrawService):
 
                 if withdraw:
                     span.set_attribute("withdraw_found", True)
-                    logger.info(f"Successfully retrieved withdrawal with ID: {id}.")
+                    logger.info("Successfully retrieved withdrawal", withdraw_id=id)
                     return ApiResponse(
                         status="success",
                         message="Withdrawal retrieved successfully.",
@@ -96,10 +100,10 @@ class WithdrawService(IWithdrawService):
                     )
                 else:
                     span.set_attribute("withdraw_found", False)
-                    logger.error(f"Withdrawal with ID {id} not found.")
+                    logger.error("Withdrawal not found", withdraw_id=id)
                     raise NotFoundError(f"Withdrawal with ID {id} not found.")
             except Exception as e:
-                logger.error(f"Failed to retrieve withdrawal with ID {id}: {str(e)}")
+                logger.error("Failed to retrieve withdrawal", withdraw_id=id, error=str(e))
                 span.record_exception(e)
                 span.set_attribute("error", "An unexpected error occurred.")
                 return ErrorResponse(
@@ -108,21 +112,24 @@ class WithdrawService(IWithdrawService):
                 )
 
     async def get_withdraw_users(
-        self, user_id: int
+        self,
+        user_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
     ) -> Union[ApiResponse[Optional[List[WithdrawResponse]]], ErrorResponse]:
         with self.otel_manager.start_trace("Get Withdraws by User ID") as span:
             span.set_attribute("user_id", user_id)
             try:
                 user = await self.user_repository.find_by_id(user_id)
                 if not user:
-                    logger.error(f"User with ID {user_id} not found.")
+                    logger.error("User not found", user_id=user_id)
                     span.set_attribute("user_found", False)
                     return NotFoundError(f"User with ID {user_id} not found.")
 
                 # Retrieve withdrawals for the user
-                withdrawals = await self.withdraw_repository.find_by_users(user_id)
+                withdrawals = await self.withdraw_repository.find_by_users_rows(user_id, start_date, end_date)
                 if not withdrawals:
-                    logger.info(f"No withdrawals found for user with ID {user_id}.")
+                    logger.info("No withdrawals found for user", user_id=user_id)
                     span.set_attribute("withdrawals_found", False)
                     return ApiResponse(
                         status="success",
@@ -131,11 +138,9 @@ class WithdrawService(IWithdrawService):
                     )
 
                 # Map withdrawals to response DTOs
-                withdrawal_responses = WithdrawResponse.from_dtos(withdrawals)
+                withdrawal_responses = WithdrawResponse.from_rows(withdrawals)
 
-                logger.info(
-                    f"Successfully retrieved withdrawals for user with ID {user_id}."
-                )
+                logger.info("Successfully retrieved withdrawals for user", user_id=user_id)
                 span.set_attribute("withdrawals_found", True)
                 span.set_attribute("total_withdrawals", len(withdrawals))
 
@@ -146,7 +151,7 @@ class WithdrawService(IWithdrawService):
                 )
             except Exception as e:
                 logger.error(
-                    f"Failed to retrieve withdrawals for user with ID {user_id}: {str(e)}"
+                    "Failed to retrieve withdrawals for user", user_id=user_id, error=str(e)
                 )
                 span.record_exception(e)
                 span.set_attribute("error", "An unexpected error occurred.")
@@ -164,14 +169,14 @@ class WithdrawService(IWithdrawService):
                 # Check if the user exists
                 user = await self.user_repository.find_by_id(user_id)
                 if not user:
-                    logger.error(f"User with ID {user_id} not found.")
+                    logger.error("User not found", user_id=user_id)
                     span.set_attribute("user_found", False)
                     raise NotFoundError(f"User with ID {user_id} not found.")
 
                 # Retrieve the withdrawal for the user
                 withdrawal = await self.withdraw_repository.find_by_user(user_id)
                 if not withdrawal:
-                    logger.info(f"No withdrawal found for user with ID {user_id}.")
+                    logger.info("No withdrawal found for user", user_id=user_id)
                     span.set_attribute("withdrawal_found", False)
                     raise NotFoundError(
                         f"Withdrawal for user with ID {user_id} not found."
@@ -179,9 +184,7 @@ class WithdrawService(IWithdrawService):
 
                 # Map withdrawal to response DTO
                 withdrawal_response = WithdrawResponse.from_dto(withdrawal)
-                logger.info(
-                    f"Successfully retrieved withdrawal for user with ID {user_id}."
-                )
+                logger.info("Successfully retrieved withdrawal for user", user_id=user_id)
                 span.set_attribute("withdrawal_found", True)
 
                 return ApiResponse(
@@ -191,7 +194,7 @@ class WithdrawService(IWithdrawService):
                 )
             except Exception as e:
                 logger.error(
-                    f"Failed to retrieve withdrawal for user with ID {user_id}: {str(e)}"
+                    "Failed to retrieve withdrawal for user", user_id=user_id, error=str(e)
                 )
                 span.record_exception(e)
                 span.set_attribute("error", "An unexpected error occurred.")
@@ -200,26 +203,55 @@ class WithdrawService(IWithdrawService):
                     message=f"Failed to retrieve withdrawal for user with ID {user_id}",
                 )
 
+    async def get_stats(
+        self,
+        user_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Union[ApiResponse[List[DailySummaryResponse]], ErrorResponse]:
+        with self.otel_manager.start_trace("Get Withdrawal Stats") as span:
+            if user_id is not None:
+                span.set_attribute("user_id", user_id)
+            try:
+                logger.info("Retrieving withdrawal stats", user_id=user_id)
+                rows = await self.daily_summary_repository.find_daily(
+                    (WITHDRAW,), user_id, start_date, end_date
+                )
+                span.set_attribute("row_count", len(rows))
+
+                return ApiResponse(
+                    status="success",
+                    message="Withdrawal stats retrieved successfully",
+                    data=DailySummaryResponse.from_rows(rows),
+                )
+            except Exception as e:
+                span.record_exception(e)
+                logger.error("Failed to retrieve withdrawal stats", error=str(e))
+                return ErrorResponse(
+                    status="error", message="Failed to retrieve withdrawal stats"
+                )
+
     async def create_withdraw(
         self, input: CreateWithdrawRequest
     ) -> Union[ApiResponse[WithdrawResponse], ErrorResponse]:
         with self.otel_manager.start_trace("Create Withdraw") as span:
             span.set_attribute("user_id", input.user_id)
             try:
-                logger.info(f"Creating withdraw for user_id: {input.user_id}")
+                logger.info("Creating withdraw", user_id=input.user_id)
 
                 # Check if the saldo exists for the user
                 saldo = await self.saldo_repository.find_by_user_id(input.user_id)
                 if not saldo:
-                    logger.error(f"Saldo with user_id {input.user_id} not found")
+                    logger.error("Saldo not found", user_id=input.user_id)
                     span.set_attribute("saldo_found", False)
                     raise NotFoundError(f"Saldo with user_id {input.user_id} not found")
 
                 # Check if the user has sufficient balance
                 if saldo.total_balance < input.withdraw_amount:
                     logger.error(
-                        f"Insufficient balance for user_id {input.user_id}. "
-                        f"Attempted withdrawal: {input.withdraw_amount}"
+                        "Insufficient balance",
+                        user_id=input.user_id,
+                        withdraw_amount=input.withdraw_amount,
                     )
                     span.set_attribute("sufficient_balance", False)
                     raise ValidationError("Insufficient balance")
@@ -227,35 +259,11 @@ class WithdrawService(IWithdrawService):
                 logger.info("User has sufficient balance for withdrawal")
                 span.set_attribute("sufficient_balance", True)
 
-                # Deduct the withdraw amount from the user's balance
-                new_total_balance = saldo.total_balance - input.withdraw_amount
-                try:
-                    await self.saldo_repository.update_saldo_withdraw(
-                        input=UpdateSaldoWithdraw(
-                            user_id=input.user_id,
-                            withdraw_amount=input.withdraw_amount,
-                            withdraw_time=datetime.utcnow(),
-                            total_balance=new_total_balance,
-                        )
-                    )
-                    logger.info(
-                        f"Saldo balance updated for user_id {input.user_id}. "
-                        f"New balance: {new_total_balance}"
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to update saldo balance: {e}")
-                    span.record_exception(e)
-                    span.set_attribute("error", "Failed to update saldo balance")
-                    return ErrorResponse(
-                        status="error", message=f"Failed to update saldo balance: {e}"
-                    )
-
-                # Create the withdraw record
+                # Create the withdraw record; the balance is debited through the
+                # ledger in the same transaction
                 try:
                     withdraw_record = await self.withdraw_repository.create(input)
-                    logger.info(
-                        f"Withdraw created successfully for user_id {input.user_id}"
-                    )
+                    logger.info("Withdraw created successfully", user_id=input.user_id)
                     span.set_attribute("withdraw_created", True)
 
                     return ApiResponse(
@@ -264,7 +272,7 @@ class WithdrawService(IWithdrawService):
                         data=WithdrawResponse.from_dto(withdraw_record),
                     )
                 except Exception as e:
-                    logger.error(f"Failed to create withdraw: {e}")
+                    logger.error("Failed to create withdraw", error=str(e))
                     span.record_exception(e)
                     span.set_attribute("error", "Failed to create withdraw")
                     return ErrorResponse(
@@ -272,7 +280,7 @@ class WithdrawService(IWithdrawService):
                     )
             except Exception as e:
                 logger.error(
-                    f"Unexpected error while creating withdraw for user_id {input.user_id}: {str(e)}"
+                    "Unexpected error while creating withdraw", user_id=input.user_id, error=str(e)
                 )
                 span.record_exception(e)
                 span.set_attribute("error", "An unexpected error occurred.")
@@ -293,7 +301,7 @@ class WithdrawService(IWithdrawService):
                     input.withdraw_id
                 )
                 if not withdraw_record:
-                    logger.error(f"Withdraw with id {input.withdraw_id} not found")
+                    logger.error("Withdraw not found", withdraw_id=input.withdraw_id)
                     span.set_attribute("withdraw_found", False)
                     raise NotFoundError(
                         f"Withdraw with id {input.withdraw_id} not found"
@@ -302,65 +310,39 @@ class WithdrawService(IWithdrawService):
                 # Fetch the user's saldo
                 saldo = await self.saldo_repository.find_by_user_id(input.user_id)
                 if not saldo:
-                    logger.error(f"Saldo with user_id {input.user_id} not found")
+                    logger.error("Saldo not found", user_id=input.user_id)
                     span.set_attribute("saldo_found", False)
                     raise NotFoundError(f"Saldo with user_id {input.user_id} not found")
 
-                # Check if the new withdrawal amount can be updated within the current balance
-                new_total_balance = saldo.total_balance - input.withdraw_amount
-                if new_total_balance < 0:
+                # Check if the new withdrawal amount can be updated within the current
+                # balance, which already has the old amount deducted
+                available_balance = saldo.total_balance
+                if withdraw_record.user_id == input.user_id:
+                    available_balance += withdraw_record.withdraw_amount
+                if available_balance < input.withdraw_amount:
                     logger.error(
-                        f"Insufficient balance for user_id {input.user_id}. "
-                        f"Attempted withdrawal: {input.withdraw_amount}"
+                        "Insufficient balance",
+                        user_id=input.user_id,
+                        withdraw_amount=input.withdraw_amount,
                     )
                     span.set_attribute("sufficient_balance", False)
                     raise ValidationError("Insufficient balance")
 
                 span.set_attribute("sufficient_balance", True)
 
-                # Try updating the withdrawal record
+                # Update the withdrawal record; the ledger reverses the old
+                # amount and debits the new one in the same transaction
                 try:
                     updated_withdraw = await self.withdraw_repository.update(input)
                 except Exception as e:
-                    # Rollback saldo if the withdrawal update fails
-                    await self.saldo_repository.update_balance(
-                        input=UpdateSaldoBalanceRequest(
-                            user_id=input.user_id,
-                            total_balance=saldo.total_balance,
-                        )
-                    )
-                    logger.error(
-                        f"Rollback: Saldo reverted due to withdraw update failure: {e}"
-                    )
-                    span.record_exception(e)
-                    return ErrorResponse(
-                        status="error",
-                        message=f"Rollback: Saldo reverted due to withdraw update failure",
-                    )
-
-                # Update the saldo to reflect the new withdrawal amount
-                try:
-                    await self.saldo_repository.update_saldo_withdraw(
-                        input=UpdateSaldoWithdraw(
-                            user_id=input.user_id,
-                            withdraw_amount=input.withdraw_amount,
-                            withdraw_time=datetime.utcnow(),
-                            total_balance=new_total_balance,
-                        )
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Failed to update saldo balance after withdrawal update: {e}"
-                    )
+                    logger.error("Failed to update withdraw", error=str(e))
                     span.record_exception(e)
                     return ErrorResponse(
                         status="error",
-                        message=f"Failed to update saldo balance after withdrawal update",
+                        message="Failed to update withdraw",
                     )
 
-                logger.info(
-                    f"Withdraw updated successfully for withdraw_id {input.withdraw_id}"
-                )
+                logger.info("Withdraw updated successfully", withdraw_id=input.withdraw_id)
                 span.set_attribute("withdraw_updated", True)
 
                 return ApiResponse(
@@ -370,7 +352,9 @@ class WithdrawService(IWithdrawService):
                 )
             except Exception as e:
                 logger.error(
-                    f"Unexpected error while updating withdraw for withdraw_id {input.withdraw_id}: {str(e)}"
+                    "Unexpected error while updating withdraw",
+                    withdraw_id=input.withdraw_id,
+                    error=str(e),
                 )
                 span.record_exception(e)
                 span.set_attribute("error", "An unexpected error occurred.")
@@ -386,17 +370,17 @@ class WithdrawService(IWithdrawService):
                 # Check if the withdraw exists
                 existing_withdraw = await self.withdraw_repository.find_by_id(id)
                 if not existing_withdraw:
-                    logger.error(f"Withdraw with id {id} not found")
+                    logger.error("Withdraw not found", withdraw_id=id)
                     span.set_attribute("withdraw_found", False)
                     raise NotFoundError(f"Withdraw with id {id} not found")
 
                 # Attempt to delete the withdraw record
                 try:
                     await self.withdraw_repository.delete(id)
-                    logger.info(f"Withdraw deleted successfully for id: {id}")
+                    logger.info("Withdraw deleted successfully", withdraw_id=id)
                     span.set_attribute("withdraw_deleted", True)
                 except Exception as e:
-                    logger.error(f"Error deleting withdraw with id {id}: {e}")
+                    logger.error("Error deleting withdraw", withdraw_id=id, error=str(e))
                     span.record_exception(e)
                     span.set_attribute(
                         "error", "Error occurred while deleting withdraw"
@@ -406,7 +390,7 @@ class WithdrawService(IWithdrawService):
                     )
 
                 # Return a success response
-                logger.info(f"Withdraw with id {id} deleted successfully")
+                logger.info("Withdraw deleted", withdraw_id=id)
                 return ApiResponse(
                     status="success",
                     message="Withdraw deleted successfully",
@@ -414,7 +398,7 @@ class WithdrawService(IWithdrawService):
                 )
             except Exception as e:
                 logger.error(
-                    f"Unexpected error while deleting withdraw with id {id}: {str(e)}"
+                    "Unexpected error while deleting withdraw", withdraw_id=id, error=str(e)
                 )
                 span.record_exception(e)
                 span.set_attribute("error", "An unexpected error occurred")